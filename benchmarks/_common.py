@@ -0,0 +1,139 @@
+"""Shared helpers for the benchmark scripts."""
+
+import argparse
+from base64 import b64encode
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable
+
+from ansys.grantami.dataflow_extensions import generate_payload
+
+WORKFLOW_URL = "http://localhost/mi_dataflow"
+
+
+def example_payload(workflow_url: str = WORKFLOW_URL) -> dict[str, Any]:
+    """Return a small, valid Basic authentication payload."""
+    credentials = b64encode(b"username:password").decode("ascii")
+    return {
+        "WorkflowId": "67eb55ff-363a-42c7-9793-df363f1ecc83",
+        "WorkflowDefinitionId": "Example; Version=1.0.0.0",
+        "TransitionName": "Python_83e51914 - 3752-40d0-8350-c096674873e2",
+        "Record": {
+            "Database": "MI_Training",
+            "Table": "Metals Pedigree",
+            "RecordHistoryGuid": "d2f51a3d-c274-4a1e-b7c9-8ba2976202cc",
+        },
+        "WorkflowUrl": workflow_url,
+        "AuthorizationHeader": f"Basic {credentials}",
+        "ClientCredentialType": "Basic",
+        "Attributes": {
+            "Record": {"Value": ["d2f51a3d-c274-4a1e-b7c9-8ba2976202cc+MI_Training"]},
+            "TransitionId": {"Value": "9f1bf6e7-0b05-4cd3-ac61-1d2d11a1d351"},
+        },
+        "CustomValues": {},
+    }
+
+
+def large_payload(attribute_count: int, custom_value_bytes: int, workflow_url: str = WORKFLOW_URL) -> dict[str, Any]:
+    """Return a valid payload with ``attribute_count`` attributes and a base64 custom value of about the given size."""
+    return generate_payload(
+        workflow_url=workflow_url,
+        attribute_count=attribute_count,
+        blob_count=1 if custom_value_bytes else 0,
+        blob_size=custom_value_bytes * 3 // 4,
+        seed=0,
+    )
+
+
+def time_calls(func: Callable[[], Any], repeat: int) -> list[float]:
+    """Call ``func`` ``repeat`` times and return the duration of each call in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations: list[float]) -> dict[str, float]:
+    """Summarize a list of durations in seconds as milliseconds."""
+    ordered = sorted(durations)
+    return {
+        "runs": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
+
+
+def print_table(results: dict[str, dict[str, float]]) -> None:
+    """Print a table of benchmark summaries."""
+    print(f"{'benchmark':<45} {'runs':>5} {'mean ms':>10} {'median ms':>10} {'min ms':>10} {'p95 ms':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<45} {result['runs']:>5} {result['mean_ms']:>10.2f} {result['median_ms']:>10.2f} "
+            f"{result['min_ms']:>10.2f} {result['p95_ms']:>10.2f}"
+        )
+
+
+def add_output_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the ``--output`` argument, which writes the results to a JSON file."""
+    parser.add_argument("--output", type=Path, help="A JSON file to write the results to, for use with compare.py.")
+
+
+def environment() -> dict[str, Any]:
+    """Return a description of the interpreter, machine, and source revision which produced a set of results."""
+    import importlib.metadata
+
+    try:
+        version = importlib.metadata.version("ansys-grantami-dataflow-extensions")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "package_version": version,
+        "git_commit": commit,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(
+    path: Path | None, results: dict[str, dict[str, float]], parameters: dict[str, Any] | None = None
+) -> None:
+    """
+    Write results to a JSON file, if a path was provided.
+
+    The file contains the results of the running script under ``benchmarks``, keyed by script name, so that files
+    written by several scripts can be merged by ``run_benchmarks.py`` and compared by ``compare.py``.
+    """
+    if path is None:
+        return
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "benchmarks": {
+            Path(sys.argv[0]).stem: {
+                "parameters": parameters or {},
+                "results": {" ".join(name.split()): result for name, result in results.items()},
+            }
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2) + "\n")
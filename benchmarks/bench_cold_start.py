@@ -0,0 +1,136 @@
+"""
+Compare the start-up latency of a step launched as a new interpreter with a step run by a fork server.
+
+Usage::
+
+    python benchmarks/bench_cold_start.py --repeat 20
+
+Three scenarios are measured:
+
+* ``subprocess``: Data Flow runs a script which imports this package and instantiates ``MIDataflowIntegration``.
+* ``fork-server (launcher subprocess)``: Data Flow runs a launcher script, which forwards the payload to a fork server.
+* ``fork-server (fork only)``: The round trip from ``launch_step`` to the fork server and back, excluding the
+  interpreter start-up of the launcher.
+
+The step does not send any requests, so only start-up and payload parsing costs are measured.
+"""
+
+import argparse
+from io import StringIO
+import json
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import add_output_argument, example_payload, print_table, summarize, time_calls, write_results
+
+AUTHKEY = b"benchmark"
+
+STEP_MODULE = """
+from ansys.grantami.dataflow_extensions import MIDataflowIntegration
+
+
+def main():
+    MIDataflowIntegration(use_https=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+"""
+
+LAUNCHER_SCRIPT = """
+import sys
+from ansys.grantami.dataflow_extensions import launch_step
+
+sys.exit(launch_step("benchmark", authkey={authkey!r}, address=("localhost", {port})))
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _run_script(script: Path, payload: str) -> None:
+    subprocess.run([sys.executable, str(script)], input=payload, text=True, check=True, capture_output=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("The fork server requires os.fork, which is not available on this platform.")
+
+    payload = json.dumps(example_payload())
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        step_script = directory / "benchmark_step.py"
+        step_script.write_text(STEP_MODULE)
+        port = _free_port()
+        launcher_script = directory / "launcher.py"
+        launcher_script.write_text(LAUNCHER_SCRIPT.format(authkey=AUTHKEY, port=port))
+        authkey_file = directory / "authkey"
+        authkey_file.write_bytes(AUTHKEY)
+
+        results["subprocess"] = summarize(time_calls(lambda: _run_script(step_script, payload), args.repeat))
+
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "ansys.grantami.dataflow_extensions",
+                "--log-level",
+                "WARNING",
+                "fork-server",
+                "--port",
+                str(port),
+                "--authkey-file",
+                str(authkey_file),
+                "--path",
+                str(directory),
+                "--step",
+                "benchmark=benchmark_step:main",
+            ]
+        )
+        try:
+            from ansys.grantami.dataflow_extensions import launch_step
+
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    socket.create_connection(("localhost", port)).close()
+                    break
+                except ConnectionRefusedError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.05)
+
+            results["fork-server (launcher subprocess)"] = summarize(
+                time_calls(lambda: _run_script(launcher_script, payload), args.repeat)
+            )
+
+            def launch_in_process() -> None:
+                sys.stdin = StringIO(payload)
+                launch_step("benchmark", authkey=AUTHKEY, address=("localhost", port))
+
+            results["fork-server (fork only)"] = summarize(time_calls(launch_in_process, args.repeat))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print_table(results)
+    write_results(args.output, results, {"repeat": args.repeat})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Measure ``MIDataflowIntegration`` constructor time against payload size, with debug logging disabled and enabled.
+
+Usage::
+
+    python benchmarks/bench_constructor.py --repeat 50
+
+With debug logging disabled, the constructor does not copy or serialize the payload for logging, so the difference
+between the two columns is the cost of debug logging.
+"""
+
+import argparse
+import json
+import logging
+
+from _common import add_output_argument, large_payload, print_table, summarize, time_calls, write_results
+
+from ansys.grantami.dataflow_extensions import MIDataflowIntegration
+
+# (attribute count, custom value size in bytes)
+PAYLOAD_SIZES = [(0, 0), (100, 10_000), (1_000, 1_000_000), (5_000, 10_000_000)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    package_logger = logging.getLogger("ansys.grantami.dataflow_extensions")
+    package_logger.addHandler(logging.NullHandler())
+    package_logger.propagate = False
+
+    results = {}
+    for attribute_count, custom_value_bytes in PAYLOAD_SIZES:
+        payload = large_payload(attribute_count, custom_value_bytes)
+        payload_str = json.dumps(payload)
+        size_kb = len(payload_str) / 1000
+        for level in [logging.WARNING, logging.DEBUG]:
+            package_logger.setLevel(level)
+            durations = time_calls(
+                lambda: MIDataflowIntegration.from_string_payload(payload_str, use_https=False), args.repeat
+            )
+            results[f"{size_kb:>9.1f} kB, {logging.getLevelName(level).lower()}"] = summarize(durations)
+    print_table(results)
+    write_results(args.output, results, {"repeat": args.repeat})
+
+
+if __name__ == "__main__":
+    main()
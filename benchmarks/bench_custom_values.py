@@ -0,0 +1,66 @@
+"""
+Compare the peak memory used to read a Base64-encoded custom value in memory and from a temporary file.
+
+Usage::
+
+    python benchmarks/bench_custom_values.py
+
+For each value size, reports the peak memory allocated while computing the SHA-256 hash of the decoded value, when the
+value is decoded with :func:`base64.b64decode` and when it is accessed through :attr:`.CustomValueFile.buffer`. The
+encoded value is allocated before measurement starts.
+"""
+
+import argparse
+import base64
+import hashlib
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from _common import add_output_argument, large_payload, write_results
+
+from ansys.grantami.dataflow_extensions import CustomValues
+
+VALUE_SIZES = [1_000_000, 10_000_000, 100_000_000]
+
+
+def in_memory(custom_values: CustomValues) -> None:
+    hashlib.sha256(base64.b64decode(custom_values["File"])).hexdigest()
+
+
+def spilled(custom_values: CustomValues) -> None:
+    file = custom_values["File"]
+    hashlib.sha256(file.buffer).hexdigest()
+    custom_values.close()
+
+
+def measure(func: Callable[[CustomValues], None], value: str, spill_threshold: Any) -> tuple[float, float]:
+    """Return the duration in milliseconds and the peak memory allocated in megabytes."""
+    custom_values = CustomValues({"File": value}, spill_threshold=spill_threshold)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func(custom_values)
+        return (time.perf_counter() - start) * 1000, tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'benchmark':<30} {'time ms':>10} {'peak MB':>10}")
+    for size in VALUE_SIZES:
+        value = large_payload(0, size)["CustomValues"]["Blob 0"]
+        for name, func, spill_threshold in [("in memory", in_memory, None), ("spilled", spilled, 0)]:
+            duration, peak = measure(func, value, spill_threshold)
+            print(f"{size / 1e6:>8.0f} MB, {name:<18} {duration:>10.2f} {peak:>10.2f}")
+            results[f"{size / 1e6:.0f} MB, {name}"] = {"time_ms": duration, "peak_mb": peak}
+    write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
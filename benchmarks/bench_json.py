@@ -0,0 +1,92 @@
+"""
+Compare the JSON serializers used to parse payloads and serialize MI Data Flow API requests.
+
+Usage::
+
+    python benchmarks/bench_json.py --repeat 50
+
+For a typical payload and for large payloads, reports the time to parse the payload, to serialize it, and to create
+an ``MIDataflowIntegration`` instance, with each available serializer. The time to serialize a ``resume_bookmark``
+request body is also reported. ``orjson`` results are only reported if ``orjson`` is installed, together with the
+speed-up of ``orjson`` over the standard library for each payload size.
+"""
+
+import argparse
+from io import StringIO
+import json
+import logging
+import sys
+
+from _common import add_output_argument, large_payload, print_table, summarize, time_calls, write_results
+
+from ansys.grantami.dataflow_extensions import JsonSerializer, MIDataflowIntegration, OrjsonSerializer
+
+# (attribute count, custom value size in bytes)
+PAYLOAD_SIZES = [(0, 0), (1_000, 1_000_000), (10_000, 10_000_000)]
+RESUME_BODY = {"Values": {"ExitCode": 0}, "WorkflowDefinitionName": "Definition", "TransitionName": "Transition"}
+
+
+def available_serializers() -> list[JsonSerializer]:
+    serializers = [JsonSerializer()]
+    try:
+        serializers.append(OrjsonSerializer())
+    except ImportError:
+        print("orjson is not installed. Only the standard library serializer is measured.")
+    return serializers
+
+
+def create_integration(payload_str: str, serializer: JsonSerializer) -> MIDataflowIntegration:
+    sys.stdin = StringIO(payload_str)
+    return MIDataflowIntegration(use_https=False, json_serializer=serializer)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("ansys.grantami.dataflow_extensions").addHandler(logging.NullHandler())
+    serializers = available_serializers()
+
+    results = {}
+    speedups = {}
+    for serializer in serializers:
+        results[f"resume body dumps, {serializer.name}"] = summarize(
+            time_calls(lambda: serializer.dumps(RESUME_BODY), args.repeat)
+        )
+    for attribute_count, custom_value_bytes in PAYLOAD_SIZES:
+        payload = large_payload(attribute_count, custom_value_bytes)
+        payload_str = json.dumps(payload)
+        size_kb = len(payload_str) / 1000
+        outputs = []
+        for serializer in serializers:
+            outputs.append(json.loads(serializer.dumps(payload)))
+            prefix = f"{size_kb:>9.1f} kB, {serializer.name}"
+            results[f"{prefix} loads"] = summarize(time_calls(lambda: serializer.loads(payload_str), args.repeat))
+            results[f"{prefix} dumps"] = summarize(time_calls(lambda: serializer.dumps(payload), args.repeat))
+            results[f"{prefix} constructor"] = summarize(
+                time_calls(lambda: create_integration(payload_str, serializer), args.repeat)
+            )
+        if any(output != outputs[0] for output in outputs):
+            raise RuntimeError(f"Serializers produced different documents for the {size_kb:.1f} kB payload.")
+        if len(serializers) > 1:
+            for operation in ["loads", "dumps", "constructor"]:
+                json_ms, orjson_ms = (
+                    results[f"{size_kb:>9.1f} kB, {serializer.name} {operation}"]["median_ms"]
+                    for serializer in serializers
+                )
+                speedups[f"{size_kb:.1f} kB {operation}"] = json_ms / orjson_ms
+    sys.stdin = sys.__stdin__
+    print_table(results)
+    for name, speedup in speedups.items():
+        print(f"orjson speed-up, {name}: {speedup:.1f}x")
+    write_results(
+        args.output,
+        results,
+        {"repeat": args.repeat, "serializers": [s.name for s in serializers], "orjson_speedups": speedups},
+    )
+
+
+if __name__ == "__main__":
+    main()
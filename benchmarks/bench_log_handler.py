@@ -0,0 +1,84 @@
+"""
+Measure the latency and throughput of logging to the Data Flow instance from concurrent threads.
+
+Usage::
+
+    python benchmarks/bench_log_handler.py --messages 500 --latency 0.005
+
+Messages are sent to a local ``DataflowStandIn`` with the given response delay. For ``MIDataflowApiLogHandler`` and
+``MIDataflowQueuedApiLogHandler`` and each number of threads, reports the time taken by each logging call, and the
+number of messages sent per second, including the time to flush the handler when the workflow is resumed.
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import time
+
+from _common import add_output_argument, print_table, summarize, write_results
+
+from ansys.grantami.dataflow_extensions import (
+    DataflowStandIn,
+    EndpointBehavior,
+    MIDataflowApiLogHandler,
+    MIDataflowIntegration,
+    MIDataflowQueuedApiLogHandler,
+    generate_payload,
+)
+
+THREAD_COUNTS = [1, 4, 16]
+
+
+def run(url: str, handler_type: type[MIDataflowApiLogHandler], threads: int, messages: int) -> dict[str, float]:
+    data_flow = MIDataflowIntegration.from_dict_payload(generate_payload("Basic", url), use_https=False)
+    step_logger = logging.getLogger(f"bench_log_handler.{handler_type.__name__}.{threads}")
+    step_logger.propagate = False
+    step_logger.setLevel(logging.INFO)
+    handler = data_flow.get_api_log_handler(handler_type)
+    step_logger.addHandler(handler)
+
+    def log_messages(count: int) -> list[float]:
+        durations = []
+        for index in range(count):
+            start = time.perf_counter()
+            step_logger.info("Benchmark message %s", index)
+            durations.append(time.perf_counter() - start)
+        return durations
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(log_messages, [messages // threads] * threads))
+    data_flow.resume_bookmark(0)
+    elapsed = time.perf_counter() - start
+    step_logger.removeHandler(handler)
+
+    durations = [duration for thread_durations in results for duration in thread_durations]
+    return {**summarize(durations), "messages_per_s": len(durations) / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=480, help="The number of messages logged at each level.")
+    parser.add_argument("--latency", type=float, default=0.0, help="The response delay of the stand-in in seconds.")
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("ansys.grantami.dataflow_extensions").addHandler(logging.NullHandler())
+
+    results = {}
+    with DataflowStandIn(behavior=EndpointBehavior(latency=args.latency)) as stand_in:
+        for handler_type in [MIDataflowApiLogHandler, MIDataflowQueuedApiLogHandler]:
+            for threads in THREAD_COUNTS:
+                results[f"{handler_type.__name__}, {threads} threads"] = run(
+                    stand_in.url, handler_type, threads, args.messages
+                )
+    print_table(results)
+    print()
+    print(f"{'benchmark':<45} {'messages/s':>10}")
+    for name, result in results.items():
+        print(f"{name:<45} {result['messages_per_s']:>10.1f}")
+    write_results(args.output, results, {"messages": args.messages, "latency": args.latency})
+
+
+if __name__ == "__main__":
+    main()
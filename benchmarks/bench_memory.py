@@ -0,0 +1,91 @@
+"""
+Measure the time and peak memory used to read payloads of realistic and extreme size.
+
+Usage::
+
+    python benchmarks/bench_memory.py --scale realistic --scale large
+
+Payloads are created with :func:`.generate_payload`. For each scale, reports the time and the peak memory allocated
+while creating an ``MIDataflowIntegration`` instance from the payload string, and while reading all record references,
+attributes, and custom values through :attr:`.MIDataflowIntegration.workflow_payload`. The payload string is allocated
+before measurement starts.
+"""
+
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+from typing import Any
+
+from _common import WORKFLOW_URL, add_output_argument, write_results
+
+from ansys.grantami.dataflow_extensions import MIDataflowIntegration, generate_payload
+
+SCALES: dict[str, dict[str, Any]] = {
+    "realistic": {"record_count": 10, "attribute_count": 50, "custom_value_count": 5, "custom_value_size": 1_000},
+    "large": {
+        "record_count": 10_000,
+        "database_count": 3,
+        "attribute_count": 1_000,
+        "custom_value_count": 100,
+        "custom_value_size": 10_000,
+        "blob_count": 1,
+        "blob_size": 10_000_000,
+    },
+    "extreme": {
+        "record_count": 100_000,
+        "database_count": 10,
+        "attribute_count": 10_000,
+        "attribute_value_size": 1_000,
+        "custom_value_count": 1_000,
+        "custom_value_size": 100_000,
+        "blob_count": 2,
+        "blob_size": 100_000_000,
+    },
+}
+
+
+def read_payload(payload_str: str) -> None:
+    data_flow = MIDataflowIntegration.from_string_payload(payload_str, use_https=False)
+    payload = data_flow.workflow_payload
+    for database_key in payload.database_keys:
+        payload.get_record_references(database_key)
+    for attribute in payload.attributes.values():
+        attribute.value
+    for name in payload.custom_values:
+        payload.custom_values[name]
+    payload.close()
+
+
+def measure(payload_str: str) -> tuple[float, float]:
+    """Return the duration in milliseconds and the peak memory allocated in megabytes."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        read_payload(payload_str)
+        return (time.perf_counter() - start) * 1000, tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", action="append", choices=list(SCALES), help="Defaults to all scales.")
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("ansys.grantami.dataflow_extensions").addHandler(logging.NullHandler())
+
+    results = {}
+    print(f"{'scale':<12} {'payload MB':>12} {'time ms':>10} {'peak MB':>10}")
+    for scale in args.scale or list(SCALES):
+        payload_str = json.dumps(generate_payload("Windows", WORKFLOW_URL, seed=0, **SCALES[scale]))
+        duration, peak = measure(payload_str)
+        print(f"{scale:<12} {len(payload_str) / 1e6:>12.2f} {duration:>10.2f} {peak:>10.2f}")
+        results[scale] = {"payload_mb": len(payload_str) / 1e6, "time_ms": duration, "peak_mb": peak}
+    write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
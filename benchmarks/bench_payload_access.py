@@ -0,0 +1,52 @@
+"""
+Measure the cost of accessing the payload of an ``MIDataflowIntegration`` instance against payload size.
+
+Usage::
+
+    python benchmarks/bench_payload_access.py --repeat 50
+
+Compares reading a value through the read-only ``payload`` view, serializing the payload with
+``get_payload_as_string()``, and copying it with ``get_payload_as_dict()``. The ``deepcopy`` row is the cost of the
+copy previously made by every call to ``get_payload_as_string()`` and ``get_payload_as_dict()``.
+"""
+
+import argparse
+import copy
+import json
+import logging
+
+from _common import add_output_argument, large_payload, print_table, summarize, time_calls, write_results
+
+from ansys.grantami.dataflow_extensions import MIDataflowIntegration
+
+# (attribute count, custom value size in bytes)
+PAYLOAD_SIZES = [(0, 0), (1_000, 1_000_000), (5_000, 10_000_000)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("ansys.grantami.dataflow_extensions").addHandler(logging.NullHandler())
+
+    results = {}
+    for attribute_count, custom_value_bytes in PAYLOAD_SIZES:
+        payload = large_payload(attribute_count, custom_value_bytes)
+        size_kb = len(json.dumps(payload)) / 1000
+        df = MIDataflowIntegration.from_dict_payload(payload, use_https=False)
+        benchmarks = {
+            "payload view": lambda: df.payload["Attributes"]["Record"]["Value"][0],
+            "get_payload_as_string": lambda: df.get_payload_as_string(),
+            "get_payload_as_dict": lambda: df.get_payload_as_dict(),
+            "deepcopy": lambda: copy.deepcopy(df._df_data),
+        }
+        for name, func in benchmarks.items():
+            results[f"{size_kb:>9.1f} kB, {name}"] = summarize(time_calls(func, args.repeat))
+    print_table(results)
+    write_results(args.output, results, {"repeat": args.repeat})
+
+
+if __name__ == "__main__":
+    main()
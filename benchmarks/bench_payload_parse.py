@@ -0,0 +1,74 @@
+"""
+Compare eager and lazy decoding of the payload read from stdin.
+
+Usage::
+
+    python benchmarks/bench_payload_parse.py --repeat 20
+
+For each payload size, reports the time to create an ``MIDataflowIntegration`` instance and the peak memory allocated
+while doing so, with ``lazy_payload`` set to ``False`` and ``True``. The payload string is allocated before
+measurement starts, so the peak memory is the memory used by the decoded payload and the instance.
+"""
+
+import argparse
+from io import StringIO
+import json
+import logging
+import sys
+import tracemalloc
+
+from _common import add_output_argument, large_payload, print_table, summarize, time_calls, write_results
+
+from ansys.grantami.dataflow_extensions import MIDataflowIntegration
+
+# (attribute count, custom value size in bytes)
+PAYLOAD_SIZES = [(0, 0), (1_000, 1_000_000), (10_000, 10_000_000), (50_000, 50_000_000)]
+
+
+def create_integration(payload_str: str, lazy_payload: bool) -> MIDataflowIntegration:
+    sys.stdin = StringIO(payload_str)
+    return MIDataflowIntegration(use_https=False, lazy_payload=lazy_payload)
+
+
+def measure_peak_memory(payload_str: str, lazy_payload: bool) -> float:
+    """Return the peak memory allocated while creating an instance, in megabytes."""
+    sys.stdin = StringIO(payload_str)
+    tracemalloc.start()
+    try:
+        MIDataflowIntegration(use_https=False, lazy_payload=lazy_payload)
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("ansys.grantami.dataflow_extensions").addHandler(logging.NullHandler())
+
+    results = {}
+    peak_memory = {}
+    for attribute_count, custom_value_bytes in PAYLOAD_SIZES:
+        payload_str = json.dumps(large_payload(attribute_count, custom_value_bytes))
+        size_kb = len(payload_str) / 1000
+        for lazy_payload in [False, True]:
+            name = f"{size_kb:>9.1f} kB, {'lazy' if lazy_payload else 'eager'}"
+            durations = time_calls(lambda: create_integration(payload_str, lazy_payload), args.repeat)
+            results[name] = summarize(durations)
+            peak_memory[name] = measure_peak_memory(payload_str, lazy_payload)
+    sys.stdin = sys.__stdin__
+
+    print_table(results)
+    print()
+    print(f"{'benchmark':<45} {'peak MB':>10}")
+    for name, value in peak_memory.items():
+        print(f"{name:<45} {value:>10.2f}")
+        results[name]["peak_mb"] = value
+    write_results(args.output, results, {"repeat": args.repeat})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measure the time to create a PyGranta client with ``configure_pygranta_connection`` for each authentication mode.
+
+Usage::
+
+    python benchmarks/bench_pygranta_connect.py --repeat 50
+
+The Granta MI service layer and the OpenID Connect identity provider are mocked with ``requests_mock``, which is
+installed with the ``tests`` dependency group, so the results show the client-side cost of configuring the connection
+and of each authentication handshake. Windows authentication requires a Negotiate backend, and is reported as skipped
+if it is not available on this platform.
+"""
+
+import argparse
+import logging
+
+from _common import add_output_argument, print_table, summarize, time_calls, write_results
+from ansys.openapi.common import ApiClientFactory
+import requests_mock
+
+from ansys.grantami.dataflow_extensions import MIDataflowIntegration, generate_payload
+
+WORKFLOW_URL = "https://localhost/mi_dataflow/"
+SERVICE_LAYER_URL = "https://localhost/mi_servicelayer"
+AUTHORITY_URL = "https://identity.localhost/"
+
+CHALLENGES = {
+    "Windows": "Negotiate",
+    "Basic": 'Basic realm="Granta MI"',
+    "None": f'Bearer redirecturi="https://localhost/", authority="{AUTHORITY_URL}", clientid="dataflow"',
+}
+
+
+def mock_server(mocker: requests_mock.Mocker, client_credential_type: str, authorization: str) -> None:
+    """Respond to unauthenticated requests with a challenge, and to requests with ``authorization`` with success."""
+    mocker.get(SERVICE_LAYER_URL, status_code=401, headers={"WWW-Authenticate": CHALLENGES[client_credential_type]})
+    mocker.get(SERVICE_LAYER_URL, request_headers={"Authorization": authorization}, json={})
+    mocker.get(
+        f"{AUTHORITY_URL}.well-known/openid-configuration",
+        json={"authorization_endpoint": f"{AUTHORITY_URL}authorize", "token_endpoint": f"{AUTHORITY_URL}token"},
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("ansys.grantami.dataflow_extensions").addHandler(logging.NullHandler())
+    logging.getLogger("ansys.openapi.common").addHandler(logging.NullHandler())
+    logging.getLogger("ansys.openapi.common").propagate = False
+
+    results = {}
+    for client_credential_type in CHALLENGES:
+        mode = "OIDC" if client_credential_type == "None" else client_credential_type
+        payload = generate_payload(client_credential_type, WORKFLOW_URL, seed=0)
+        with requests_mock.Mocker() as mocker:
+            mock_server(mocker, client_credential_type, payload["AuthorizationHeader"])
+            data_flow = MIDataflowIntegration.from_dict_payload(payload)
+
+            def configure() -> None:
+                data_flow.configure_pygranta_connection(ApiClientFactory)
+
+            def connect() -> None:
+                data_flow.configure_pygranta_connection(ApiClientFactory).connect()
+
+            try:
+                connect()
+            except (ImportError, ConnectionError) as e:
+                print(f"Skipping {mode} authentication: {e!r}")
+                continue
+            results[f"{mode}, configure"] = summarize(time_calls(configure, args.repeat))
+            results[f"{mode}, configure and connect"] = summarize(time_calls(connect, args.repeat))
+    print_table(results)
+    write_results(args.output, results, {"repeat": args.repeat})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measure the round-trip time of resuming a workflow.
+
+Usage::
+
+    python benchmarks/bench_resume.py --repeat 50 --latency 0.005
+
+Requests are sent to a local ``DataflowStandIn`` with the given response delay. Reports the time taken by
+``resume_bookmark`` on a new connection, the time taken by ``resume_bookmark`` on a connection already opened by
+``log_msg_to_instance``, and the time taken by a whole step which creates an ``MIDataflowIntegration`` instance and
+resumes the workflow.
+"""
+
+import argparse
+import logging
+import time
+
+from _common import add_output_argument, print_table, summarize, time_calls, write_results
+
+from ansys.grantami.dataflow_extensions import (
+    DataflowStandIn,
+    EndpointBehavior,
+    MIDataflowIntegration,
+    generate_payload,
+)
+
+
+def resume_only(url: str, repeat: int, log_first: bool) -> list[float]:
+    durations = []
+    for _ in range(repeat):
+        data_flow = MIDataflowIntegration.from_dict_payload(generate_payload("Basic", url), use_https=False)
+        if log_first:
+            data_flow.log_msg_to_instance("Benchmark message", "Info")
+        start = time.perf_counter()
+        data_flow.resume_bookmark(0)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0, help="The response delay of the stand-in in seconds.")
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("ansys.grantami.dataflow_extensions").addHandler(logging.NullHandler())
+
+    results = {}
+    with DataflowStandIn(behavior=EndpointBehavior(latency=args.latency)) as stand_in:
+        payloads = [generate_payload("Basic", stand_in.url) for _ in range(args.repeat)]
+
+        def step() -> None:
+            MIDataflowIntegration.from_dict_payload(payloads.pop(), use_https=False).resume_bookmark(0)
+
+        results["resume_bookmark, new connection"] = summarize(resume_only(stand_in.url, args.repeat, False))
+        results["resume_bookmark, reused connection"] = summarize(resume_only(stand_in.url, args.repeat, True))
+        results["constructor and resume_bookmark"] = summarize(time_calls(step, args.repeat))
+    print_table(results)
+    write_results(args.output, results, {"repeat": args.repeat, "latency": args.latency})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measure the cold-start cost of this package: import time and ``MIDataflowIntegration`` constructor time.
+
+Usage::
+
+    python benchmarks/bench_startup.py --repeat 20 --import-budget-ms 50
+
+Import time is measured in a new interpreter for each run, so it includes the cost of importing all modules loaded by
+``import ansys.grantami.dataflow_extensions``. The script exits with a non-zero exit code if the median import time
+exceeds the budget, or if a dependency which should be imported on first use is imported with the package.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from _common import add_output_argument, example_payload, print_table, summarize, time_calls, write_results
+
+# Modules which must not be imported by 'import ansys.grantami.dataflow_extensions'
+DEFERRED_MODULES = [
+    "requests",
+    "requests_negotiate_sspi",
+    "ansys.openapi.common",
+    "ansys.grantami.core",
+    "GRANTA_MIScriptingToolkit",
+    "asyncio",
+]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import ansys.grantami.dataflow_extensions
+duration = time.perf_counter() - start
+print(json.dumps({"duration": duration, "modules": [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+
+def measure_import() -> tuple[float, set[str]]:
+    result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout)
+    return data["duration"], set(data["modules"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--import-budget-ms", type=float, default=None)
+    add_output_argument(parser)
+    args = parser.parse_args()
+
+    import_durations = []
+    imported_modules: set[str] = set()
+    for _ in range(args.repeat):
+        duration, modules = measure_import()
+        import_durations.append(duration)
+        imported_modules |= modules
+
+    from ansys.grantami.dataflow_extensions import MIDataflowIntegration
+
+    payload = example_payload()
+    constructor_durations = time_calls(
+        lambda: MIDataflowIntegration.from_dict_payload(payload, use_https=False), args.repeat
+    )
+
+    results = {
+        "import ansys.grantami.dataflow_extensions": summarize(import_durations),
+        "MIDataflowIntegration constructor": summarize(constructor_durations),
+    }
+    print_table(results)
+    write_results(args.output, results, {"repeat": args.repeat})
+
+    failed = False
+    if imported_modules:
+        print(f"FAIL: deferred modules imported with the package: {', '.join(sorted(imported_modules))}")
+        failed = True
+    median_import_ms = results["import ansys.grantami.dataflow_extensions"]["median_ms"]
+    if args.import_budget_ms is not None and median_import_ms > args.import_budget_ms:
+        print(f"FAIL: median import time {median_import_ms:.2f} ms exceeds budget of {args.import_budget_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
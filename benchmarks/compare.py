@@ -0,0 +1,67 @@
+"""
+Compare two benchmark result files and report regressions.
+
+Usage::
+
+    python benchmarks/compare.py results/0.3.0.json results/0.4.0.json --threshold 10
+
+Result files are written by ``run_benchmarks.py``, or by any benchmark script run with ``--output``. For each result
+present in both files, reports the change in each metric. Times and memory are regressions if they increase by more
+than the threshold percentage, and throughput metrics, which end in ``_per_s``, are regressions if they decrease by
+more than the threshold percentage. The script exits with a non-zero exit code if any metric regressed.
+"""
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+DEFAULT_METRICS = ["median_ms", "p95_ms", "time_ms", "peak_mb", "messages_per_s"]
+
+
+def load_results(path: Path) -> dict[tuple[str, str], dict[str, Any]]:
+    document = json.loads(path.read_text())
+    return {
+        (benchmark, name): result
+        for benchmark, data in document["benchmarks"].items()
+        for name, result in data["results"].items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="The regression threshold as a percentage.")
+    parser.add_argument("--metric", action="append", help=f"A metric to compare. Defaults to {DEFAULT_METRICS}.")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    metrics = args.metric or DEFAULT_METRICS
+
+    regressions = 0
+    print(f"{'benchmark':<70} {'metric':<15} {'baseline':>12} {'current':>12} {'change':>9}")
+    for key in sorted(baseline.keys() & current.keys()):
+        for metric in metrics:
+            if metric not in baseline[key] or metric not in current[key] or not baseline[key][metric]:
+                continue
+            change = (current[key][metric] - baseline[key][metric]) / baseline[key][metric] * 100
+            regressed = -change > args.threshold if metric.endswith("_per_s") else change > args.threshold
+            regressions += regressed
+            name = f"{key[0]}: {key[1]}"
+            print(
+                f"{name:<70} {metric:<15} {baseline[key][metric]:>12.2f} {current[key][metric]:>12.2f} "
+                f"{change:>+8.1f}%{'  REGRESSION' if regressed else ''}"
+            )
+    current_benchmarks = {benchmark for benchmark, _ in current}
+    for key in sorted(baseline.keys() - current.keys()):
+        if key[0] in current_benchmarks:
+            print(f"Missing from {args.current}: {key[0]}: {key[1]}")
+    print(f"{regressions} regressions above {args.threshold}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Run the benchmark suite and write the results of every benchmark to one JSON file.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --output results/0.4.0.json
+    python benchmarks/run_benchmarks.py --only bench_resume --only bench_log_handler
+
+Each benchmark script runs in a new interpreter. Benchmarks which send requests use a local ``DataflowStandIn`` or
+``requests_mock``, so the suite runs offline. Compare two result files with ``compare.py`` to find regressions between
+releases. The script exits with a non-zero exit code if any benchmark fails; the results of the other benchmarks are
+still written.
+"""
+
+import argparse
+import json
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+
+from _common import environment
+
+# Benchmark scripts and the arguments used to run them as part of the suite
+SUITE: dict[str, list[str]] = {
+    "bench_startup": [],
+    "bench_constructor": [],
+    "bench_payload_access": [],
+    "bench_payload_parse": [],
+    "bench_json": [],
+    "bench_custom_values": [],
+    "bench_memory": ["--scale", "realistic", "--scale", "large"],
+    "bench_resume": [],
+    "bench_log_handler": [],
+    "bench_pygranta_connect": [],
+    "bench_cold_start": [],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="The results file. Defaults to results/<package version>.json.")
+    parser.add_argument("--only", action="append", choices=list(SUITE), help="Run only this benchmark.")
+    args = parser.parse_args()
+
+    directory = Path(__file__).parent
+    document = {"environment": environment(), "benchmarks": {}, "failed": []}
+    output = args.output or directory / "results" / f"{document['environment']['package_version']}.json"
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        for name in args.only or list(SUITE):
+            print(f"Running {name}", flush=True)
+            result_file = Path(temporary_directory) / f"{name}.json"
+            command = [sys.executable, str(directory / f"{name}.py"), "--output", str(result_file), *SUITE[name]]
+            process = subprocess.run(command, cwd=directory)
+            if result_file.is_file():
+                result = json.loads(result_file.read_text())
+                document.setdefault("created_at", result["created_at"])
+                document["benchmarks"].update(result["benchmarks"])
+            if process.returncode != 0:
+                print(f"{name} failed with exit code {process.returncode}", flush=True)
+                document["failed"].append(name)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"Results written to {output}")
+    sys.exit(1 if document["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,13 +22,154 @@
 
 """Granta MI Data Flow Extensions."""
 
-import importlib.metadata as importlib_metadata
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from ._mi_dataflow import MIDataflowApiLogHandler, MIDataflowIntegration, MissingClientModuleException
+from ._capture import CapturedStep, read_capture_file
+from ._json import JsonSerializer, OrjsonSerializer
+from ._mi_dataflow import (
+    MIDataflowApiLogHandler,
+    MIDataflowIntegration,
+    MIDataflowQueuedApiLogHandler,
+    MissingClientModuleException,
+)
+from ._payload import (
+    CustomValueFile,
+    CustomValues,
+    PayloadAttribute,
+    PayloadAttributes,
+    PayloadRecord,
+    RecordReference,
+    WorkflowPayload,
+)
+from ._spans import JsonFileSpanExporter, Span, SpanExporter
+from ._trace_context import TraceContext
+
+if TYPE_CHECKING:
+    from ._async_mi_dataflow import AsyncHttpClient, AsyncMIDataflowApiLogHandler, AsyncMIDataflowIntegration
+    from ._load_test import LoadLevelResult, LoadTestResult, StepWorkload, run_load_test
+    from ._metrics import HttpMetrics, MetricsServer
+    from ._payload_generator import generate_payload
+    from ._profiling import ProfiledFunction, StepProfile
+    from ._replay import ReplayResult, replay
+    from ._retry import RetryPolicy
+    from ._stand_in import DataflowStandIn, EndpointBehavior
+    from ._step_host import ForkStepServer, StepHost, launch_step
+    from ._telemetry import Regression, StepTelemetry, TelemetryStore, TelemetrySummary
+    from ._transport import TransportConfiguration
 
 __all__ = [
+    "AsyncHttpClient",
+    "AsyncMIDataflowApiLogHandler",
+    "AsyncMIDataflowIntegration",
+    "CapturedStep",
+    "CustomValueFile",
+    "CustomValues",
+    "DataflowStandIn",
+    "EndpointBehavior",
+    "ForkStepServer",
+    "HttpMetrics",
+    "JsonFileSpanExporter",
+    "JsonSerializer",
+    "LoadLevelResult",
+    "LoadTestResult",
     "MIDataflowApiLogHandler",
     "MIDataflowIntegration",
+    "MIDataflowQueuedApiLogHandler",
+    "MetricsServer",
     "MissingClientModuleException",
+    "OrjsonSerializer",
+    "PayloadAttribute",
+    "PayloadAttributes",
+    "PayloadRecord",
+    "ProfiledFunction",
+    "RecordReference",
+    "Regression",
+    "ReplayResult",
+    "RetryPolicy",
+    "Span",
+    "SpanExporter",
+    "StepHost",
+    "StepProfile",
+    "StepTelemetry",
+    "StepWorkload",
+    "TelemetryStore",
+    "TelemetrySummary",
+    "TraceContext",
+    "TransportConfiguration",
+    "WorkflowPayload",
+    "generate_payload",
+    "launch_step",
+    "read_capture_file",
+    "replay",
+    "run_load_test",
 ]
-__version__ = importlib_metadata.version(__name__.replace(".", "-"))
+
+# Objects which depend on modules that are slow to import, such as asyncio or requests, are imported on first access.
+_LAZY_ATTRIBUTES = {
+    "AsyncHttpClient": "._async_mi_dataflow",
+    "AsyncMIDataflowApiLogHandler": "._async_mi_dataflow",
+    "AsyncMIDataflowIntegration": "._async_mi_dataflow",
+    "DataflowStandIn": "._stand_in",
+    "EndpointBehavior": "._stand_in",
+    "ForkStepServer": "._step_host",
+    "HttpMetrics": "._metrics",
+    "LoadLevelResult": "._load_test",
+    "LoadTestResult": "._load_test",
+    "MetricsServer": "._metrics",
+    "ProfiledFunction": "._profiling",
+    "Regression": "._telemetry",
+    "ReplayResult": "._replay",
+    "RetryPolicy": "._retry",
+    "StepHost": "._step_host",
+    "StepProfile": "._profiling",
+    "StepTelemetry": "._telemetry",
+    "StepWorkload": "._load_test",
+    "TelemetryStore": "._telemetry",
+    "TelemetrySummary": "._telemetry",
+    "TransportConfiguration": "._transport",
+    "generate_payload": "._payload_generator",
+    "launch_step": "._step_host",
+    "replay": "._replay",
+    "run_load_test": "._load_test",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import objects which are not imported with the package on first access.
+
+    Looking up ``__version__`` scans the installed distributions, so it is also deferred until it is used.
+
+    Parameters
+    ----------
+    name : str
+        The attribute name.
+
+    Returns
+    -------
+    Any
+        The attribute value.
+    """
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    elif name == "__version__":
+        import importlib.metadata as importlib_metadata
+
+        value = importlib_metadata.version(__name__.replace(".", "-"))
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """
+    List the public attributes of the package, including those which are imported on first access.
+
+    Returns
+    -------
+    list[str]
+        The attribute names.
+    """
+    return sorted(set(globals()) | set(__all__) | {"__version__"})
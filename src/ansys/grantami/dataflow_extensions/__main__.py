@@ -0,0 +1,866 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Command line tools for Granta MI Data Flow Extensions.
+
+Run ``python -m ansys.grantami.dataflow_extensions --help`` to list the available commands.
+"""
+
+import argparse
+import importlib
+import json
+import logging
+from pathlib import Path
+import signal
+import sys
+from typing import Any
+
+
+def _import_step_function(spec: str) -> tuple[str, Any]:
+    """
+    Import a step function from a ``name=module:function`` specification.
+
+    Parameters
+    ----------
+    spec : str
+        The step specification. If ``name=`` is omitted, the function name is used as the step name.
+
+    Returns
+    -------
+    tuple[str, Any]
+        The step name and the step function.
+    """
+    name, _, target = spec.rpartition("=")
+    module_name, _, function_name = target.partition(":")
+    if not module_name or not function_name:
+        raise argparse.ArgumentTypeError(f'Invalid step "{spec}". Expected "name=module:function".')
+    function = getattr(importlib.import_module(module_name), function_name)
+    return name or function_name, function
+
+
+def _step_host(args: argparse.Namespace) -> int:
+    """
+    Run a step host or fork server until interrupted.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    from ._step_host import DEFAULT_FORK_SERVER_PRELOAD_MODULES, DEFAULT_PRELOAD_MODULES, ForkStepServer, StepHost
+
+    for path in args.path:
+        sys.path.insert(0, str(path))
+    host_class = ForkStepServer if args.fork else StepHost
+    default_preload_modules = DEFAULT_FORK_SERVER_PRELOAD_MODULES if args.fork else DEFAULT_PRELOAD_MODULES
+    host = host_class(
+        authkey=args.authkey_file.read_bytes().strip(),
+        address=(args.host, args.port),
+        max_concurrent_steps=args.max_concurrent_steps,
+        preload_modules=args.preload or default_preload_modules,
+    )
+    for spec in args.step:
+        host.register(*_import_step_function(spec))
+    signal.signal(signal.SIGINT, lambda *_: host.shutdown())
+    signal.signal(signal.SIGTERM, lambda *_: host.shutdown())
+    host.serve_forever()
+    return 0
+
+
+def _replay(args: argparse.Namespace) -> int:
+    """
+    Replay the steps in a capture file and print the latency of each step.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    int
+        ``0`` if all steps succeeded, otherwise ``1``.
+    """
+    from ._replay import PERCENTILES, replay
+
+    for path in args.path:
+        sys.path.insert(0, str(path))
+    _, step_function = _import_step_function(args.step)
+    result = replay(
+        args.capture_file,
+        step_function,
+        concurrency=args.concurrency,
+        repeat=args.repeat,
+        dataflow_url=args.dataflow_url,
+        supporting_files_dir=args.supporting_files_dir,
+    )
+    summary = result.summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        columns = ["runs", "failures", "mean_ms"] + [f"p{percentile}_ms" for percentile in PERCENTILES] + ["max_ms"]
+        print(f"{'step':<30}" + "".join(f"{column:>10}" for column in columns))
+        for name, step_summary in summary.items():
+            values = "".join(
+                f"{step_summary[column]:>10}" if column in ("runs", "failures") else f"{step_summary[column]:>10.2f}"
+                for column in columns
+            )
+            print(f"{name:<30}{values}")
+        print(
+            f"Throughput: {result.throughput:.1f} steps/s ({result.count()} steps in {result.elapsed:.2f} s, "
+            f"concurrency {result.concurrency})"
+        )
+    return 1 if result.failure_count() else 0
+
+
+def _stand_in(args: argparse.Namespace) -> int:
+    """
+    Run a stand-in for the MI Data Flow API and the Granta MI service layer until interrupted.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    stand_in = _create_stand_in(args, address=(args.host, args.port))
+    signal.signal(signal.SIGINT, lambda *_: stand_in.stop())
+    signal.signal(signal.SIGTERM, lambda *_: stand_in.stop())
+    stand_in.start()
+    print(f"Data Flow stand-in listening on {stand_in.url}", flush=True)
+    stand_in.serve_forever()
+    print(f"Requests: {stand_in.request_counts}. Errors: {stand_in.error_counts}.")
+    return 0
+
+
+def _serve_metrics(args: argparse.Namespace) -> int:
+    """
+    Serve a Prometheus text file written by steps on a local port.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    from ._metrics import MetricsServer
+
+    metrics_file: Path = args.metrics_file
+
+    def read_metrics() -> str:
+        return metrics_file.read_text(encoding="utf-8") if metrics_file.exists() else ""
+
+    server = MetricsServer(read_metrics, address=(args.host, args.port))
+    signal.signal(signal.SIGINT, lambda *_: server.stop())
+    signal.signal(signal.SIGTERM, lambda *_: server.stop())
+    server.start()
+    print(f"Serving {metrics_file} on {server.url}", flush=True)
+    server.serve_forever()
+    return 0
+
+
+def _telemetry_report(args: argparse.Namespace) -> int:
+    """
+    Print the percentiles of a metric for each workflow definition and transition in a telemetry store.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    from ._telemetry import TelemetryStore
+
+    summaries = TelemetryStore(args.database).percentiles(args.metric, since=args.since, until=args.until)
+    if args.json:
+        print(json.dumps([summary._asdict() for summary in summaries], indent=2))
+        return 0
+    scale, unit = _telemetry_metric_unit(args.metric)
+    print(
+        f"{'workflow definition':<38}{'transition':<30}{'steps':>8}{'failures':>10}"
+        + "".join(f"{f'p{percentile}_{unit}':>12}" for percentile in (50, 95, 99))
+    )
+    for summary in summaries:
+        percentiles = "".join(f"{value * scale:>12.1f}" for value in (summary.p50, summary.p95, summary.p99))
+        print(
+            f"{summary.workflow_definition_id or '':<38}{summary.transition_name or '':<30}"
+            f"{summary.steps:>8}{summary.failures:>10}{percentiles}"
+        )
+    return 0
+
+
+def _telemetry_compare(args: argparse.Namespace) -> int:
+    """
+    Compare two time windows of a telemetry store, and print the transitions which regressed.
+
+    By default, the most recent window is compared with the window of the same length before it.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    int
+        ``1`` if any transition regressed, otherwise ``0``.
+    """
+    import time
+
+    from ._telemetry import TelemetryStore
+
+    now = time.time()
+    current = (args.since if args.since is not None else now - args.window, args.until)
+    baseline_until = args.baseline_until if args.baseline_until is not None else current[0]
+    baseline_since = args.baseline_since if args.baseline_since is not None else baseline_until - args.window
+    regressions = TelemetryStore(args.database).find_regressions(
+        (baseline_since, baseline_until),
+        current,
+        metric=args.metric,
+        percentile=args.percentile,
+        threshold=args.threshold,
+        min_steps=args.min_steps,
+    )
+    if args.json:
+        print(json.dumps([{**regression._asdict(), "change": regression.change} for regression in regressions]))
+    elif not regressions:
+        print(f"No transitions regressed by more than {args.threshold:.0%}.")
+    else:
+        scale, unit = _telemetry_metric_unit(args.metric)
+        for regression in regressions:
+            print(
+                f"{regression.workflow_definition_id} {regression.transition_name}: p{args.percentile:g} "
+                f"{args.metric} {regression.baseline * scale:.1f} {unit} -> {regression.current * scale:.1f} {unit} "
+                f"({regression.change:+.0%}, {regression.baseline_steps} -> {regression.current_steps} steps)"
+            )
+    return 1 if regressions else 0
+
+
+def _telemetry_metric_unit(metric: str) -> tuple[float, str]:
+    """
+    Get the unit in which a telemetry metric is printed.
+
+    Parameters
+    ----------
+    metric : str
+        The metric.
+
+    Returns
+    -------
+    tuple[float, str]
+        The factor by which values are multiplied, and the name of the unit.
+    """
+    return (1 / 1024**2, "MiB") if metric == "peak_memory" else (1000, "ms")
+
+
+def _time_argument(value: str) -> float:
+    """
+    Parse a time from an ISO 8601 string, or from a duration before now such as ``"7d"``.
+
+    Parameters
+    ----------
+    value : str
+        The time. Durations are a number followed by ``s``, ``m``, ``h``, ``d``, or ``w``.
+
+    Returns
+    -------
+    float
+        The time in seconds since the epoch.
+    """
+    import time
+
+    seconds = _duration_argument(value, strict=False)
+    if seconds is not None:
+        return time.time() - seconds
+    from datetime import datetime
+
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f'Invalid time "{value}". Expected "2026-01-31T12:00" or "7d".') from e
+
+
+def _duration_argument(value: str, strict: bool = True) -> float | None:
+    """
+    Parse a duration such as ``"12h"`` or ``"7d"``.
+
+    Parameters
+    ----------
+    value : str
+        The duration, as a number followed by ``s``, ``m``, ``h``, ``d``, or ``w``.
+    strict : bool, default ``True``
+        Whether to raise an exception if the value is not a duration. If ``False``, ``None`` is returned instead.
+
+    Returns
+    -------
+    float | None
+        The duration in seconds.
+    """
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+    try:
+        return float(value[:-1]) * units[value[-1:]]
+    except (KeyError, ValueError) as e:
+        if not strict:
+            return None
+        raise argparse.ArgumentTypeError(f'Invalid duration "{value}". Expected "30m", "12h", or "7d".') from e
+
+
+def _create_stand_in(args: argparse.Namespace, address: tuple[str, int]) -> Any:
+    """
+    Create a stand-in for the MI Data Flow API from the stand-in command line arguments.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+    address : tuple[str, int]
+        The address on which the stand-in listens.
+
+    Returns
+    -------
+    DataflowStandIn
+        The stand-in, which has not been started.
+    """
+    from ._stand_in import DataflowStandIn, EndpointBehavior
+
+    behavior = EndpointBehavior(
+        latency=args.latency,
+        latency_distribution=args.latency_distribution,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        disconnect_rate=args.disconnect_rate,
+    )
+    return DataflowStandIn(
+        address=address,
+        behavior=behavior,
+        max_connections=args.max_connections,
+        connection_limit_policy=args.connection_limit_policy,
+        seed=args.seed,
+    )
+
+
+def _load_test(args: argparse.Namespace) -> int:
+    """
+    Run a load test and print the results of each concurrency level.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    from ._load_test import StepWorkload, run_load_test
+    from ._payload_generator import generate_payload
+
+    workload = StepWorkload(
+        log_messages=args.log_messages,
+        pygranta_calls=args.pygranta_calls,
+        business_logic_duration=args.business_logic_duration,
+    )
+
+    payload_size = _payload_size_arguments(args)
+
+    def run(dataflow_url: str) -> Any:
+        return run_load_test(
+            args.concurrency,
+            workload,
+            steps_per_level=args.steps_per_level,
+            mode=args.mode,
+            dataflow_url=dataflow_url,
+            payload_factory=lambda url: generate_payload("Basic", url, **payload_size),
+        )
+
+    if args.dataflow_url:
+        result = run(args.dataflow_url)
+    else:
+        with _create_stand_in(args, address=("127.0.0.1", 0)) as stand_in:
+            result = run(stand_in.url)
+    if args.json:
+        print(json.dumps(result.summary(), indent=2))
+        return 0
+    columns = [
+        "concurrency",
+        "steps",
+        "failures",
+        "retries",
+        "throughput_per_s",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+        "max_ms",
+    ]
+    print("".join(f"{column:>17}" for column in columns))
+    for summary in result.summary():
+        print(
+            "".join(
+                f"{summary[column]:>17.2f}" if column.endswith(("_s", "_ms")) else f"{summary[column]:>17}"
+                for column in columns
+            )
+        )
+    print(f"Maximum sustainable concurrency: {result.max_sustainable_concurrency()}")
+    return 0
+
+
+def _generate_payload(args: argparse.Namespace) -> int:
+    """
+    Generate a synthetic payload and write it as JSON.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    from ._payload_generator import generate_payload
+
+    payload = generate_payload(
+        args.client_credential_type, args.workflow_url, seed=args.seed, **_payload_size_arguments(args)
+    )
+    if args.output is None:
+        json.dump(payload, sys.stdout, indent=args.indent)
+        print()
+    else:
+        with args.output.open("w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=args.indent)
+    return 0
+
+
+def _payload_size_arguments(args: argparse.Namespace) -> dict[str, int]:
+    """
+    Get the keyword arguments of :func:`~.generate_payload` which control the payload size.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+
+    Returns
+    -------
+    dict[str, int]
+        The keyword arguments.
+    """
+    return {
+        "record_count": args.record_count,
+        "database_count": args.database_count,
+        "attribute_count": args.attribute_count,
+        "attribute_value_size": args.attribute_value_size,
+        "custom_value_count": args.custom_value_count,
+        "custom_value_size": args.custom_value_size,
+        "blob_count": args.blob_count,
+        "blob_size": args.blob_size,
+    }
+
+
+def _concurrency_levels(value: str) -> list[int]:
+    """
+    Parse a comma-separated list of concurrency levels.
+
+    Parameters
+    ----------
+    value : str
+        The command line argument.
+
+    Returns
+    -------
+    list[int]
+        The concurrency levels.
+    """
+    try:
+        return [int(level) for level in value.split(",")]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f'Invalid concurrency levels "{value}". Expected "1,2,4,8".') from e
+
+
+def _add_payload_size_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments which control the size of generated payloads.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        The command parser.
+    """
+    parser.add_argument("--record-count", type=int, default=1, help="The number of record references.")
+    parser.add_argument(
+        "--database-count",
+        type=int,
+        default=1,
+        help="The number of databases across which record references are distributed.",
+    )
+    parser.add_argument("--attribute-count", type=int, default=0, help="The number of additional attributes.")
+    parser.add_argument(
+        "--attribute-value-size",
+        type=int,
+        default=32,
+        help="The length in characters of text attribute values.",
+    )
+    parser.add_argument("--custom-value-count", type=int, default=0, help="The number of text custom values.")
+    parser.add_argument(
+        "--custom-value-size",
+        type=int,
+        default=32,
+        help="The length in characters of text custom values.",
+    )
+    parser.add_argument(
+        "--blob-count",
+        type=int,
+        default=0,
+        help="The number of custom values which contain Base64-encoded binary data.",
+    )
+    parser.add_argument(
+        "--blob-size",
+        type=int,
+        default=1024,
+        help="The size in bytes of the binary data in each Base64-encoded custom value.",
+    )
+
+
+def _add_endpoint_behavior_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments which configure the behavior of a stand-in for the MI Data Flow API.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        The command parser.
+    """
+    parser.add_argument("--latency", type=float, default=0.0, help="The typical response delay in seconds.")
+    parser.add_argument(
+        "--latency-distribution",
+        choices=["constant", "uniform", "exponential", "lognormal"],
+        default="constant",
+        help="The distribution of response delays.",
+    )
+    parser.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=1.0,
+        help="The shape parameter of the lognormal distribution.",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="The probability of an error response.")
+    parser.add_argument("--error-status", type=int, default=503, help="The status code of error responses.")
+    parser.add_argument("--retry-after", type=float, help="The Retry-After header of error responses, in seconds.")
+    parser.add_argument(
+        "--disconnect-rate",
+        type=float,
+        default=0.0,
+        help="The probability that a connection is closed without a response.",
+    )
+    parser.add_argument("--max-connections", type=int, help="The maximum number of connections handled at once.")
+    parser.add_argument(
+        "--connection-limit-policy",
+        choices=["queue", "reject"],
+        default="queue",
+        help="Whether connections beyond the limit wait or are rejected.",
+    )
+    parser.add_argument("--seed", type=int, help="The seed for sampling latency and errors.")
+
+
+def _add_step_host_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments shared by the ``step-host`` and ``fork-server`` commands.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        The command parser.
+    """
+    parser.add_argument(
+        "--step",
+        action="append",
+        required=True,
+        help='A step to register, in the form "name=module:function". Can be specified multiple times.',
+    )
+    parser.add_argument("--host", default="localhost", help="The host name to listen on.")
+    parser.add_argument("--port", type=int, default=50717, help="The port to listen on.")
+    parser.add_argument(
+        "--authkey-file",
+        type=Path,
+        required=True,
+        help="A file containing the shared secret used to authenticate launcher scripts.",
+    )
+    parser.add_argument("--max-concurrent-steps", type=int, default=8)
+    parser.add_argument("--preload", action="append", help="A module to import on startup.")
+    parser.add_argument(
+        "--path",
+        action="append",
+        type=Path,
+        default=[],
+        help="A directory to add to sys.path before importing steps.",
+    )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line argument parser.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        The argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m ansys.grantami.dataflow_extensions",
+        description="Command line tools for Granta MI Data Flow Extensions.",
+    )
+    parser.add_argument("--log-level", default="INFO", help="Log level for messages written to stderr.")
+    subparsers = parser.add_subparsers(required=True, metavar="command")
+
+    step_host = subparsers.add_parser(
+        "step-host",
+        help="Run a long-lived process which runs steps forwarded by launcher scripts.",
+    )
+    _add_step_host_arguments(step_host)
+    step_host.set_defaults(func=_step_host, fork=False)
+
+    fork_server = subparsers.add_parser(
+        "fork-server",
+        help="Run a pre-initialized process which forks a child process for each step forwarded by launcher scripts.",
+    )
+    _add_step_host_arguments(fork_server)
+    fork_server.set_defaults(func=_step_host, fork=True)
+
+    replay = subparsers.add_parser(
+        "replay",
+        help="Replay the steps recorded in a capture file, and report the latency of each step and the throughput.",
+    )
+    replay.add_argument("capture_file", type=Path, help="A capture file written by steps created with capture_file.")
+    replay.add_argument(
+        "--step",
+        required=True,
+        help='The step function to run for each captured step, in the form "module:function".',
+    )
+    replay.add_argument("--concurrency", type=int, default=1, help="The number of steps which run at the same time.")
+    replay.add_argument("--repeat", type=int, default=1, help="The number of times to replay each captured step.")
+    replay.add_argument(
+        "--dataflow-url",
+        help="The URL to which steps send requests. By default, a local stand-in for MI Data Flow is started.",
+    )
+    replay.add_argument("--supporting-files-dir", type=Path, help="The supporting files directory for the steps.")
+    replay.add_argument(
+        "--path",
+        action="append",
+        type=Path,
+        default=[],
+        help="A directory to add to sys.path before importing the step.",
+    )
+    replay.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    replay.set_defaults(func=_replay)
+
+    stand_in = subparsers.add_parser(
+        "stand-in",
+        help="Run a local stand-in for the MI Data Flow API and the Granta MI service layer, with configurable latency "
+        "and errors.",
+    )
+    stand_in.add_argument("--host", default="127.0.0.1", help="The host name to listen on.")
+    stand_in.add_argument("--port", type=int, default=8080, help="The port to listen on.")
+    _add_endpoint_behavior_arguments(stand_in)
+    stand_in.set_defaults(func=_stand_in)
+
+    load_test = subparsers.add_parser(
+        "load-test",
+        help="Run simulated steps at increasing concurrency, and report throughput, latency, and error rates.",
+    )
+    load_test.add_argument(
+        "--concurrency",
+        type=_concurrency_levels,
+        default=[1, 2, 4, 8, 16, 32, 64],
+        help='Comma-separated concurrency levels, for example "1,8,64,256".',
+    )
+    load_test.add_argument(
+        "--steps-per-level",
+        type=int,
+        help="The number of steps run at each level. Defaults to four times the concurrency.",
+    )
+    load_test.add_argument(
+        "--mode",
+        choices=["thread", "process"],
+        default="thread",
+        help="Whether steps run on threads or in separate Python processes.",
+    )
+    load_test.add_argument("--log-messages", type=int, default=0, help="The number of messages logged by each step.")
+    load_test.add_argument(
+        "--pygranta-calls",
+        type=int,
+        default=0,
+        help="The number of service layer requests sent by a PyGranta client in each step.",
+    )
+    load_test.add_argument(
+        "--business-logic-duration",
+        type=float,
+        default=0.0,
+        help="The time in seconds each step waits before resuming the workflow.",
+    )
+    load_test.add_argument(
+        "--dataflow-url",
+        help="The URL to which steps send requests. By default, a local stand-in is started with the options below.",
+    )
+    _add_payload_size_arguments(load_test)
+    _add_endpoint_behavior_arguments(load_test)
+    load_test.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    load_test.set_defaults(func=_load_test)
+
+    generate = subparsers.add_parser(
+        "generate-payload",
+        help="Generate a synthetic payload of configurable size, for testing steps without MI Data Flow.",
+    )
+    generate.add_argument(
+        "--client-credential-type",
+        choices=["Windows", "Basic", "None"],
+        default="Basic",
+        help='The type of credentials. "None" is used for OIDC authentication.',
+    )
+    generate.add_argument(
+        "--workflow-url",
+        default="https://localhost/mi_dataflow/",
+        help="The URL of the MI Data Flow API.",
+    )
+    _add_payload_size_arguments(generate)
+    generate.add_argument("--seed", type=int, help="The seed for generated IDs and values.")
+    generate.add_argument("--indent", type=int, help="The indentation of the JSON output. Compact by default.")
+    generate.add_argument("--output", type=Path, help="The file to write the payload to. Defaults to stdout.")
+    generate.set_defaults(func=_generate_payload)
+
+    serve_metrics = subparsers.add_parser(
+        "serve-metrics",
+        help="Serve a Prometheus text file written by steps created with http_metrics, so that it can be scraped.",
+    )
+    serve_metrics.add_argument("metrics_file", type=Path, help="The Prometheus text file written by the steps.")
+    serve_metrics.add_argument("--host", default="127.0.0.1", help="The host name to listen on.")
+    serve_metrics.add_argument("--port", type=int, default=9464, help="The port to listen on.")
+    serve_metrics.set_defaults(func=_serve_metrics)
+
+    from ._telemetry import TELEMETRY_METRICS
+
+    telemetry_report = subparsers.add_parser(
+        "telemetry-report",
+        help="Report the 50th, 95th, and 99th percentiles of a metric for each workflow definition and transition in "
+        "a telemetry store.",
+    )
+    telemetry_report.add_argument("database", type=Path, help="The telemetry store written by the steps.")
+    telemetry_report.add_argument("--metric", choices=TELEMETRY_METRICS, default="total_duration")
+    telemetry_report.add_argument(
+        "--since",
+        type=_time_argument,
+        help='Only include steps which started at or after this time, for example "2026-01-31T12:00" or "7d" ago.',
+    )
+    telemetry_report.add_argument(
+        "--until", type=_time_argument, help="Only include steps which started before this time."
+    )
+    telemetry_report.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    telemetry_report.set_defaults(func=_telemetry_report)
+
+    telemetry_compare = subparsers.add_parser(
+        "telemetry-compare",
+        help="Compare two time windows of a telemetry store, and report the transitions which became slower.",
+    )
+    telemetry_compare.add_argument("database", type=Path, help="The telemetry store written by the steps.")
+    telemetry_compare.add_argument("--metric", choices=TELEMETRY_METRICS, default="total_duration")
+    telemetry_compare.add_argument("--percentile", type=float, default=95, help="The percentile to compare.")
+    telemetry_compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="The relative increase above which a transition is reported, for example 0.2 for 20%%.",
+    )
+    telemetry_compare.add_argument(
+        "--min-steps",
+        type=int,
+        default=5,
+        help="The minimum number of steps in each window for a transition to be compared.",
+    )
+    telemetry_compare.add_argument(
+        "--window",
+        type=_duration_argument,
+        default=_duration_argument("7d"),
+        help='The length of the windows which are compared by default, for example "24h". Defaults to "7d".',
+    )
+    telemetry_compare.add_argument(
+        "--since",
+        type=_time_argument,
+        help="The start of the current window. Defaults to the window length before now.",
+    )
+    telemetry_compare.add_argument("--until", type=_time_argument, help="The end of the current window.")
+    telemetry_compare.add_argument(
+        "--baseline-since",
+        type=_time_argument,
+        help="The start of the baseline window. Defaults to the window length before the end of the baseline window.",
+    )
+    telemetry_compare.add_argument(
+        "--baseline-until",
+        type=_time_argument,
+        help="The end of the baseline window. Defaults to the start of the current window.",
+    )
+    telemetry_compare.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    telemetry_compare.set_defaults(func=_telemetry_compare)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the command line tools.
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        The command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    return args.func(args)  # type: ignore[no-any-return]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
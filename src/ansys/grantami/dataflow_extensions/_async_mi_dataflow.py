@@ -0,0 +1,568 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Asynchronous Granta MI Data Flow Extensions module.
+
+Provides an asyncio counterpart of :class:`~.MIDataflowIntegration` for step scripts which are written as asyncio
+programs.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial
+import logging
+from pathlib import Path
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Optional, Type
+
+if TYPE_CHECKING:
+    import requests
+
+    from ._json import JsonSerializer
+    from ._metrics import HttpMetrics
+    from ._retry import RetryPolicy
+    from ._telemetry import TelemetryStore
+    from ._transport import TransportConfiguration
+
+from ._logger import logger
+from ._mi_dataflow import _JSON_CONTENT_TYPE_HEADER, ApiLogLevel, MIDataflowApiLogHandler, MIDataflowIntegration
+from ._spans import SpanExporter
+
+
+class AsyncHttpClient:
+    """
+    A pooled asynchronous HTTP client which can be shared between coroutines.
+
+    Requests are sent by a :class:`requests.Session` on a dedicated pool of worker threads, so the TLS, CA certificate,
+    and authentication configuration of the session apply to every request, including Windows authentication. The
+    connection pool of the session is sized to match the number of worker threads, so concurrent requests reuse
+    connections instead of opening new ones. If the session is already configured with a suitably sized connection
+    pool, set ``mount_adapter`` to ``False`` to keep it.
+
+    Parameters
+    ----------
+    session : requests.Session
+        The configured session used to send requests.
+    max_concurrent_requests : int, default ``10``
+        The maximum number of requests in progress at the same time. Additional requests wait until a worker thread is
+        available.
+    mount_adapter : bool, default ``True``
+        Whether to mount a transport adapter with a connection pool of ``max_concurrent_requests`` connections on the
+        session.
+
+    Raises
+    ------
+    ValueError
+        If ``max_concurrent_requests`` is less than 1.
+    """
+
+    def __init__(
+        self,
+        session: "requests.Session",
+        max_concurrent_requests: int = 10,
+        mount_adapter: bool = True,
+    ) -> None:
+        if max_concurrent_requests < 1:
+            raise ValueError(
+                f'"max_concurrent_requests" must be at least 1. Value provided was {max_concurrent_requests}.'
+            )
+        self._session = session
+        if mount_adapter:
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrent_requests)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_requests,
+            thread_name_prefix="AsyncHttpClient",
+        )
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        The session used to send requests.
+
+        Returns
+        -------
+        requests.Session
+            The configured session.
+        """
+        return self._session
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> "requests.Response":
+        """
+        Send an HTTP request without blocking the event loop.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method, for example ``"GET"`` or ``"POST"``.
+        url : str
+            The request URL.
+        **kwargs
+            Additional keyword arguments are passed to :meth:`requests.Session.request`.
+
+        Returns
+        -------
+        requests.Response
+            The response to the request.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(self._session.request, method, url, **kwargs))
+
+    async def aclose(self) -> None:
+        """Wait for in-progress requests to complete and release the worker threads and connections."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self._executor.shutdown, wait=True))
+        self._session.close()
+
+
+class AsyncMIDataflowApiLogHandler(MIDataflowApiLogHandler):  # numpydoc ignore=PR01
+    """
+    A logging handler which sends log messages to the Data Flow API without blocking the event loop.
+
+    Each record is sent by a task scheduled on the event loop. Messages are sent in the order in which they were
+    emitted. Await :meth:`drain` to wait until all scheduled messages have been sent.
+
+    Records can be emitted from any thread once the handler has been used from within the event loop. If no event loop
+    is running, the message is sent before the logging call returns.
+    """
+
+    def __init__(self, callback: Callable[[str, ApiLogLevel], Coroutine[Any, Any, None]]) -> None:
+        logging.Handler.__init__(self)
+        self._async_callback = callback
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._send_lock: asyncio.Lock | None = None
+        self._pending: set[asyncio.Task[None]] = set()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Schedule a log record to be sent to the MI Data Flow API.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            The log record to emit.
+        """
+        msg = self.format(record)
+        level = self._resolve_level_name(record.levelno)
+
+        try:
+            running_loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is not None:
+            self._create_task(running_loop, msg, level, record)
+        elif self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._create_task, self._loop, msg, level, record)
+        else:
+            asyncio.run(self._async_callback(msg, level))
+
+    async def drain(self) -> None:
+        """Wait until all scheduled messages have been sent."""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def _create_task(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        msg: str,
+        level: ApiLogLevel,
+        record: logging.LogRecord,
+    ) -> None:
+        """
+        Create a task which sends a message, and track it until it completes.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop
+            The event loop on which to create the task.
+        msg : str
+            The message to send.
+        level : ApiLogLevel
+            The Data Flow log level.
+        record : logging.LogRecord
+            The log record which produced the message.
+        """
+        if loop is not self._loop:
+            self._loop = loop
+            self._send_lock = asyncio.Lock()
+        task = loop.create_task(self._send(msg, level, record))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, msg: str, level: ApiLogLevel, record: logging.LogRecord) -> None:
+        """
+        Send a message, holding the lock so that messages are sent in the order they were scheduled.
+
+        Parameters
+        ----------
+        msg : str
+            The message to send.
+        level : ApiLogLevel
+            The Data Flow log level.
+        record : logging.LogRecord
+            The log record which produced the message.
+        """
+        assert self._send_lock is not None
+        async with self._send_lock:
+            try:
+                await self._async_callback(msg, level)
+            except Exception:
+                self.handleError(record)
+
+
+class AsyncMIDataflowIntegration(MIDataflowIntegration):
+    """
+    Represents a MI Data Flow step in an asyncio-based Python script.
+
+    The payload provided by MI Data Flow is parsed in the same way as :class:`~.MIDataflowIntegration`, and the same
+    HTTPS, CA certificate, and authentication rules apply. Requests to the Data Flow API are sent through a pooled
+    :class:`~.AsyncHttpClient`, and so :meth:`resume_bookmark` and :meth:`log_msg_to_instance` can be awaited
+    without blocking the event loop.
+
+    Parameters
+    ----------
+    use_https : bool, default ``True``
+        Whether to use HTTPS if supported by the Granta MI application server.
+    verify_ssl : bool, default ``True``
+        Whether to verify the SSL certificate CA. Has no effect if ``use_https`` is set to ``False``.
+    certificate_file : str | pathlib.Path | None, default ``None``
+        The CA certificate file. See :class:`~.MIDataflowIntegration` for more details.
+    max_concurrent_requests : int, default ``10``
+        The maximum number of requests sent concurrently by :attr:`http_client`.
+    transport_configuration : TransportConfiguration | None, default ``None``
+        The configuration of the shared connection pool. If ``None``, the pool is sized to keep
+        ``max_concurrent_requests`` connections open.
+    retry_policy : RetryPolicy | None, default ``None``
+        The policy for retrying MI Data Flow API requests. See :class:`~.MIDataflowIntegration` for more details.
+    deadline : float | None, default ``None``
+        The time in seconds within which the step must resume the workflow. See :class:`~.MIDataflowIntegration` for
+        more details.
+    deadline_exit_code : str | int, default ``1``
+        The exit code used to resume the workflow if the deadline is reached.
+    lazy_payload : bool, default ``False``
+        Whether to decode the payload lazily. See :class:`~.MIDataflowIntegration` for more details.
+    custom_value_spill_threshold : int | None, default ``1048576``
+        The length in characters above which Base64-encoded custom values are decoded to a temporary file. See
+        :class:`~.MIDataflowIntegration` for more details.
+    json_serializer : JsonSerializer | None, default ``None``
+        The serializer used to parse the payload and to serialize MI Data Flow API requests. See
+        :class:`~.MIDataflowIntegration` for more details.
+    capture_file : str | pathlib.Path | None, default ``None``
+        A capture file to which the payload and the timing of the step are appended when the workflow is resumed. See
+        :class:`~.MIDataflowIntegration` for more details.
+    span_exporter : SpanExporter | str | pathlib.Path | None, default ``None``
+        The exporter to which the timing spans of the step are passed when the workflow is resumed. See
+        :class:`~.MIDataflowIntegration` for more details.
+    log_span_summary : bool, default ``False``
+        Whether to log a summary of the time taken by each phase of the step to the workflow instance before the
+        workflow is resumed.
+    http_metrics : HttpMetrics | str | pathlib.Path | None, default ``None``
+        Aggregates to which the latency, status, size, and connection reuse of each request sent to Granta MI are
+        added. See :class:`~.MIDataflowIntegration` for more details.
+    telemetry_store : TelemetryStore | str | pathlib.Path | None, default ``None``
+        The SQLite telemetry store to which a row is added for this step when the workflow is resumed. See
+        :class:`~.MIDataflowIntegration` for more details.
+    propagate_trace_context : bool, default ``True``
+        Whether to add a W3C ``traceparent`` header to the requests sent to Granta MI. See
+        :class:`~.MIDataflowIntegration` for more details.
+    profile_step : bool | None, default ``None``
+        Whether to profile the business logic of the step with :mod:`cProfile`. On Python 3.11 and earlier, only the
+        thread running the event loop is profiled. See :class:`~.MIDataflowIntegration` for more details.
+    profile_dir : str | pathlib.Path | None, default ``None``
+        The directory to which profiles are written. If ``None``, profiles are written to the temporary directory.
+
+    Examples
+    --------
+    >>> async def main():
+    ...     async with AsyncMIDataflowIntegration() as data_flow:
+    ...         await data_flow.log_msg_to_instance("Step started", "Info")
+    ...         await data_flow.resume_bookmark(0)
+    >>> asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        use_https: bool = True,
+        verify_ssl: bool = True,
+        certificate_file: str | Path | None = None,
+        max_concurrent_requests: int = 10,
+        transport_configuration: Optional["TransportConfiguration"] = None,
+        retry_policy: Optional["RetryPolicy"] = None,
+        deadline: float | None = None,
+        deadline_exit_code: str | int = 1,
+        lazy_payload: bool = False,
+        custom_value_spill_threshold: int | None = 1_048_576,
+        json_serializer: Optional["JsonSerializer"] = None,
+        capture_file: str | Path | None = None,
+        span_exporter: SpanExporter | str | Path | None = None,
+        log_span_summary: bool = False,
+        http_metrics: Optional["HttpMetrics"] | str | Path = None,
+        telemetry_store: Optional["TelemetryStore"] | str | Path = None,
+        propagate_trace_context: bool = True,
+        profile_step: bool | None = None,
+        profile_dir: str | Path | None = None,
+    ) -> None:
+        super().__init__(
+            use_https=use_https,
+            verify_ssl=verify_ssl,
+            certificate_file=certificate_file,
+            transport_configuration=transport_configuration,
+            retry_policy=retry_policy,
+            deadline=deadline,
+            deadline_exit_code=deadline_exit_code,
+            lazy_payload=lazy_payload,
+            custom_value_spill_threshold=custom_value_spill_threshold,
+            json_serializer=json_serializer,
+            capture_file=capture_file,
+            span_exporter=span_exporter,
+            log_span_summary=log_span_summary,
+            http_metrics=http_metrics,
+            telemetry_store=telemetry_store,
+            propagate_trace_context=propagate_trace_context,
+            profile_step=profile_step,
+            profile_dir=profile_dir,
+        )
+        self._max_concurrent_requests = max_concurrent_requests
+
+    def _default_transport_configuration(self) -> "TransportConfiguration":
+        """
+        Create a transport configuration with a connection pool sized for ``max_concurrent_requests``.
+
+        Returns
+        -------
+        TransportConfiguration
+            The default transport configuration.
+        """
+        from ._transport import TransportConfiguration
+
+        # An invalid value is reported by AsyncHttpClient
+        return TransportConfiguration(pool_maxsize=max(self._max_concurrent_requests, 1))
+
+    @cached_property
+    def http_client(self) -> AsyncHttpClient:
+        """
+        The pooled asynchronous HTTP client used to send requests to the Data Flow API.
+
+        The client is configured with the TLS and authentication settings of this object, and can be used by other
+        coroutines to send requests to Granta MI.
+
+        Returns
+        -------
+        AsyncHttpClient
+            The shared HTTP client.
+        """
+        return AsyncHttpClient(
+            self._api_session,
+            max_concurrent_requests=self._max_concurrent_requests,
+            mount_adapter=False,
+        )
+
+    async def resume_bookmark(self, exit_code: str | int) -> None:  # type: ignore[override]
+        """
+        Call the Data Flow API to allow the MI Data Flow step to continue.
+
+        All messages emitted to log handlers created by :meth:`get_api_log_handler` are sent before the workflow is
+        resumed.
+
+        Parameters
+        ----------
+        exit_code : str | int
+            An exit code to inform Data Flow of success or otherwise of the business logic script.
+        """
+        # The lock is not awaited, so that the event loop is never blocked. If it is held, the workflow is already being
+        # resumed by another coroutine or by the deadline watchdog.
+        if not self._resume_lock.acquire(blocking=False):
+            logger.warning("The workflow is already being resumed. Ignoring repeated request.")
+            return
+        try:
+            if self._is_already_resumed():
+                return
+            logger.debug("Returning control to MI Data Flow with exit code %s", exit_code)
+            self._end_business_logic(exit_code)
+            profile_summary = self._stop_profiler()
+            for handler in self._api_log_handlers:
+                if isinstance(handler, AsyncMIDataflowApiLogHandler):
+                    try:
+                        await asyncio.wait_for(handler.drain(), self.remaining_time)
+                    except asyncio.TimeoutError:
+                        logger.warning("Log messages could not be sent before the step deadline.")
+                else:
+                    handler.flush()
+            if profile_summary is not None:
+                try:
+                    await self.log_msg_to_instance(profile_summary, "Info")
+                except Exception:
+                    logger.warning("Failed to log the step profile to the workflow instance.", exc_info=True)
+            if self._log_span_summary:
+                try:
+                    await self.log_msg_to_instance(self.get_span_summary(), "Info")
+                except Exception:
+                    logger.warning("Failed to log the step timing summary to the workflow instance.", exc_info=True)
+
+            request_url, request_data = self._get_resume_bookmark_request(exit_code)
+            resume_start = time.perf_counter()
+            with self._span_recorder.span("resume_bookmark", exit_code=exit_code):
+                await self._send_api_request_async("resume_bookmark", "POST", request_url, request_data)
+            self._set_resumed(exit_code, resume_start)
+        finally:
+            self._resume_lock.release()
+        logger.info("---------------- Workflow successfully resumed -----------------")
+
+    async def log_msg_to_instance(self, msg: str, level: ApiLogLevel) -> None:  # type: ignore[override]
+        """
+        Log a message to the workflow instance.
+
+        The message is emitted via the Data Flow API and associated with the current workflow instance.
+
+        Parameters
+        ----------
+        msg : str
+            The message to log.
+        level : str
+            The log level. One of: ``Verbose``, ``Debug``, ``Info``, ``Warn``, ``Error``, ``Fatal``.
+        """
+        request_url, request_data = self._get_log_request(msg, level)
+        with self._span_recorder.span("log_shipping"):
+            await self._send_api_request_async("log_msg_to_instance", "PUT", request_url, request_data)
+
+    async def _send_api_request_async(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        data: dict[str, Any],
+    ) -> "requests.Response":
+        """
+        Send a request to the Data Flow API, retrying it according to the retry policy.
+
+        Parameters
+        ----------
+        operation : str
+            The name of the operation, used to count retries.
+        method : str
+            The HTTP method.
+        url : str
+            The request URL.
+        data : dict[str, Any]
+            The JSON-serializable request body.
+
+        Returns
+        -------
+        requests.Response
+            The successful response.
+        """
+        body = self._json_serializer.dumps(data)
+        attempt = 1
+        while True:
+            try:
+                timeout = self._get_request_timeout()
+                response = await self.http_client.request(
+                    method, url, data=body, headers=_JSON_CONTENT_TYPE_HEADER, timeout=timeout
+                )
+            except Exception as e:
+                delay = self._get_retry_delay(operation, attempt, exception=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self._get_retry_delay(operation, attempt, response=response)
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def get_api_log_handler(  # type: ignore[override]
+        self,
+        handler_type: Type[AsyncMIDataflowApiLogHandler] = AsyncMIDataflowApiLogHandler,
+        **kwargs: Any,
+    ) -> AsyncMIDataflowApiLogHandler:
+        """
+        Get a logging handler which logs messages to the Data Flow instance without blocking the event loop.
+
+        Parameters
+        ----------
+        handler_type : Type[AsyncMIDataflowApiLogHandler], default ``AsyncMIDataflowApiLogHandler``
+            The logging handler class to instantiate.
+        **kwargs
+            Additional keyword arguments are passed to the handler constructor.
+
+        Returns
+        -------
+        AsyncMIDataflowApiLogHandler
+            A logging handler which logs messages to the Data Flow instance.
+
+        Raises
+        ------
+        TypeError
+            If ``handler_type`` is not a subclass of :class:`~.AsyncMIDataflowApiLogHandler`.
+        """
+        if not issubclass(handler_type, AsyncMIDataflowApiLogHandler):
+            raise TypeError('"handler_type" must be a subclass of AsyncMIDataflowApiLogHandler.')
+        handler = handler_type(self.log_msg_to_instance, **kwargs)
+        self._api_log_handlers.append(handler)
+        return handler
+
+    async def aclose(self) -> None:
+        """Send any remaining log messages and close the HTTP client."""
+        for handler in self._api_log_handlers:
+            if isinstance(handler, AsyncMIDataflowApiLogHandler):
+                await handler.drain()
+        if "http_client" in self.__dict__:
+            await self.http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncMIDataflowIntegration":
+        """
+        Enter the asynchronous context manager.
+
+        Returns
+        -------
+        AsyncMIDataflowIntegration
+            This object.
+        """
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Exit the asynchronous context manager and close the HTTP client.
+
+        Parameters
+        ----------
+        exc_type : Type[BaseException] | None
+            The type of the exception raised in the context, if any.
+        exc_value : BaseException | None
+            The exception raised in the context, if any.
+        traceback : TracebackType | None
+            The traceback of the exception raised in the context, if any.
+        """
+        await self.aclose()
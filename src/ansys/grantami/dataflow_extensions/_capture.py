@@ -0,0 +1,153 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Capture files, which record the payloads and timing of steps so that they can be replayed.
+
+A capture file is a gzip-compressed JSON Lines file. Each record is compressed as a separate gzip member, so that
+records can be appended by concurrent steps without rewriting the file, and a record interrupted by the step process
+exiting only loses that record.
+"""
+
+import json
+from pathlib import Path
+import threading
+from typing import Any, Iterator, NamedTuple
+
+from ._logger import logger
+
+# Serializes appends from steps which run on different threads of the same process, for example in a step host.
+_append_lock = threading.Lock()
+
+
+class CapturedStep(NamedTuple):
+    """
+    A step recorded in a capture file.
+
+    Attributes
+    ----------
+    payload : dict[str, Any]
+        The payload of the step, with the Basic or OIDC credentials removed.
+    captured_at : str
+        The time at which the step started, as an ISO 8601 string in UTC.
+    exit_code : str | int
+        The exit code with which the workflow was resumed.
+    timing : dict[str, float]
+        The durations in seconds of the phases of the step:
+
+        * ``"initialization"``: Creating the :class:`~.MIDataflowIntegration` object, including parsing the payload.
+        * ``"step"``: From creating the object until the request to resume the workflow was sent.
+        * ``"resume"``: The request to resume the workflow, including any retries.
+        * ``"total"``: From creating the object until the workflow was resumed.
+    retry_counts : dict[str, int]
+        The number of times MI Data Flow API requests were retried, by operation.
+    """
+
+    payload: dict[str, Any]
+    captured_at: str
+    exit_code: str | int
+    timing: dict[str, float]
+    retry_counts: dict[str, int]
+
+    @property
+    def step_name(self) -> str:
+        """
+        The name of the step, which is the name of the workflow transition that ran it.
+
+        Returns
+        -------
+        str
+            The transition name, or an empty string if the payload does not include a transition name.
+        """
+        return str(self.payload.get("TransitionName", ""))
+
+
+def append_capture_record(path: str | Path, record: bytes) -> None:
+    """
+    Append a serialized record to a capture file, creating the file if it does not exist.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        The capture file.
+    record : bytes
+        The UTF-8 encoded JSON record, without a trailing newline.
+    """
+    import gzip
+
+    # Compress outside the lock, and write the whole member with a single call to a file opened in append mode, so
+    # that records appended by other processes are not interleaved with this record.
+    member = gzip.compress(record + b"\n")
+    with _append_lock, Path(path).open("ab") as f:
+        f.write(member)
+
+
+def read_capture_file(path: str | Path) -> Iterator[CapturedStep]:
+    """
+    Read the steps recorded in a capture file.
+
+    A truncated record at the end of the file, for example if a step process was terminated while the record was
+    written, is ignored with a warning.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        The capture file, written by an :class:`~.MIDataflowIntegration` object created with ``capture_file``.
+
+    Yields
+    ------
+    CapturedStep
+        The recorded steps, in the order in which they were resumed.
+
+    Raises
+    ------
+    ValueError
+        If a record is not valid JSON or does not include a payload.
+    """
+    import gzip
+    import zlib
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        line_number = 0
+        while True:
+            try:
+                line = f.readline()
+            except (EOFError, zlib.error):
+                logger.warning('Capture file "%s" ends with a truncated record, which is ignored.', path)
+                return
+            if not line:
+                return
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                step = CapturedStep(
+                    payload=record["payload"],
+                    captured_at=record.get("captured_at", ""),
+                    exit_code=record.get("exit_code", 0),
+                    timing=record.get("timing", {}),
+                    retry_counts=record.get("retry_counts", {}),
+                )
+            except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+                raise ValueError(f'Record {line_number} of capture file "{path}" is not a valid step record.') from e
+            yield step
@@ -0,0 +1,185 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+JSON serialization of payloads and MI Data Flow API request bodies.
+
+The serializer is used to parse the payload and to serialize request bodies. :class:`OrjsonSerializer` is used if
+``orjson`` is installed, otherwise :class:`JsonSerializer` is used. Both serializers produce compact JSON which parses
+to the same value.
+"""
+
+import json
+from typing import Any
+
+from ._logger import logger
+
+
+class JsonSerializer:
+    """
+    Serialize and parse JSON with the :mod:`json` module in the standard library.
+
+    Subclass this class and pass an instance to :class:`~.MIDataflowIntegration` to use a different JSON library.
+    Subclasses must produce compact JSON which parses to the same value as the output of this class.
+
+    Examples
+    --------
+    >>> data_flow = MIDataflowIntegration(json_serializer=JsonSerializer())
+    """
+
+    name = "json"
+
+    def loads(self, data: str | bytes) -> Any:
+        """
+        Parse a JSON document.
+
+        Parameters
+        ----------
+        data : str | bytes
+            The JSON document. If ``bytes``, must be UTF-8 encoded.
+
+        Returns
+        -------
+        Any
+            The parsed document.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If ``data`` is not valid JSON.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Serialize an object to compact, UTF-8 encoded JSON.
+
+        Parameters
+        ----------
+        obj : Any
+            The object to serialize.
+
+        Returns
+        -------
+        bytes
+            The JSON document, without whitespace between elements.
+
+        Raises
+        ------
+        TypeError
+            If ``obj`` is not JSON-serializable.
+        ValueError
+            If ``obj`` contains ``NaN`` or infinite floating-point values.
+        """
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}()"
+
+
+class OrjsonSerializer(JsonSerializer):
+    """
+    Serialize and parse JSON with ``orjson``.
+
+    Documents which ``orjson`` does not support, such as integers larger than 64 bits, are handled by the :mod:`json`
+    module in the standard library. ``orjson`` formats floats with an exponent differently to the standard library, for
+    example ``1e16`` instead of ``1e+16``, and serializes ``NaN`` and infinite values as ``null`` instead of raising an
+    exception.
+
+    Raises
+    ------
+    ImportError
+        If ``orjson`` is not installed.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: str | bytes) -> Any:
+        """
+        Parse a JSON document.
+
+        Parameters
+        ----------
+        data : str | bytes
+            The JSON document. If ``bytes``, must be UTF-8 encoded.
+
+        Returns
+        -------
+        Any
+            The parsed document.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If ``data`` is not valid JSON.
+        """
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            return super().loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Serialize an object to compact, UTF-8 encoded JSON.
+
+        Parameters
+        ----------
+        obj : Any
+            The object to serialize.
+
+        Returns
+        -------
+        bytes
+            The JSON document, without whitespace between elements.
+
+        Raises
+        ------
+        TypeError
+            If ``obj`` is not JSON-serializable.
+        """
+        try:
+            return self._orjson.dumps(obj)
+        except self._orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+
+def default_json_serializer() -> JsonSerializer:
+    """
+    Get the fastest available JSON serializer.
+
+    Returns
+    -------
+    JsonSerializer
+        An :class:`OrjsonSerializer` if ``orjson`` is installed, otherwise a :class:`JsonSerializer`.
+    """
+    try:
+        serializer: JsonSerializer = OrjsonSerializer()
+    except ImportError:
+        serializer = JsonSerializer()
+    logger.debug("Using %s JSON serializer.", serializer.name)
+    return serializer
@@ -0,0 +1,582 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Load testing of MI Data Flow steps.
+
+Runs many simulated steps at the same time against an MI Data Flow server or a :class:`~.DataflowStandIn`, and
+measures how step latency, throughput, and error rates change as the number of concurrent steps increases.
+"""
+
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+import json
+import math
+import subprocess
+import sys
+import time
+import traceback
+from typing import Any, Literal, get_args
+
+from ._logger import logger
+from ._mi_dataflow import MIDataflowIntegration
+from ._payload_generator import generate_payload
+from ._replay import PERCENTILES, _percentile
+
+LoadTestMode = Literal["thread", "process"]
+
+
+class StepWorkload:
+    """
+    The work done by each simulated step in a load test.
+
+    Each step creates an :class:`~.MIDataflowIntegration` object, sends ``log_messages`` messages to the workflow
+    instance, connects a PyGranta client and sends ``pygranta_calls`` requests to the service layer, waits for
+    ``business_logic_duration`` seconds, and resumes the workflow with ``exit_code``.
+
+    Parameters
+    ----------
+    log_messages : int, default ``0``
+        The number of messages sent with :meth:`~.MIDataflowIntegration.log_msg_to_instance`.
+    pygranta_calls : int, default ``0``
+        The number of ``GET`` requests sent to the service layer by a PyGranta client created with
+        :meth:`~.MIDataflowIntegration.configure_pygranta_connection`. If ``0``, no client is created.
+    business_logic_duration : float, default ``0.0``
+        The time in seconds spent waiting before the workflow is resumed, to simulate business logic which does not
+        send requests.
+    exit_code : int, default ``0``
+        The exit code used to resume the workflow.
+
+    Raises
+    ------
+    ValueError
+        If any argument is negative.
+    """
+
+    def __init__(
+        self,
+        log_messages: int = 0,
+        pygranta_calls: int = 0,
+        business_logic_duration: float = 0.0,
+        exit_code: int = 0,
+    ) -> None:
+        for name, value in [
+            ("log_messages", log_messages),
+            ("pygranta_calls", pygranta_calls),
+            ("business_logic_duration", business_logic_duration),
+        ]:
+            if value < 0:
+                raise ValueError(f'"{name}" must not be negative. Value provided was {value}.')
+        self.log_messages = log_messages
+        self.pygranta_calls = pygranta_calls
+        self.business_logic_duration = business_logic_duration
+        self.exit_code = exit_code
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return (
+            f"{self.__class__.__name__}(log_messages={self.log_messages}, pygranta_calls={self.pygranta_calls}, "
+            f"business_logic_duration={self.business_logic_duration}, exit_code={self.exit_code})"
+        )
+
+    def run(self, integration: MIDataflowIntegration) -> dict[str, list[float]]:
+        """
+        Run the workload for a step.
+
+        Parameters
+        ----------
+        integration : MIDataflowIntegration
+            The integration object of the step.
+
+        Returns
+        -------
+        dict[str, list[float]]
+            The duration in seconds of each request, by operation: ``"log_msg_to_instance"``, ``"pygranta_connect"``,
+            ``"pygranta_request"``, and ``"resume_bookmark"``.
+        """
+        durations: dict[str, list[float]] = {}
+
+        def timed(operation: str, function: Callable[[], Any]) -> Any:
+            start = time.perf_counter()
+            result = function()
+            durations.setdefault(operation, []).append(time.perf_counter() - start)
+            return result
+
+        for index in range(self.log_messages):
+            timed("log_msg_to_instance", lambda: integration.log_msg_to_instance(f"Load test message {index}", "Info"))
+        if self.pygranta_calls:
+            from ansys.openapi.common import ApiClientFactory
+
+            def connect() -> Any:
+                return integration.configure_pygranta_connection(ApiClientFactory).connect()
+
+            client = timed("pygranta_connect", connect)
+            for _ in range(self.pygranta_calls):
+                response = timed("pygranta_request", lambda: client.request("GET", client.api_url))
+                response.raise_for_status()
+        if self.business_logic_duration:
+            time.sleep(self.business_logic_duration)
+        timed("resume_bookmark", lambda: integration.resume_bookmark(self.exit_code))
+        return durations
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the workload as a JSON-serializable dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            The constructor arguments of the workload.
+        """
+        return {
+            "log_messages": self.log_messages,
+            "pygranta_calls": self.pygranta_calls,
+            "business_logic_duration": self.business_logic_duration,
+            "exit_code": self.exit_code,
+        }
+
+
+class LoadLevelResult:
+    """
+    The results of the steps run at one concurrency level of a load test.
+
+    Parameters
+    ----------
+    concurrency : int
+        The number of steps which were run at the same time.
+    durations : list[float]
+        The duration in seconds of each successful step.
+    operation_durations : dict[str, list[float]]
+        The duration in seconds of each successful request, by operation.
+    failures : int
+        The number of steps which failed.
+    retries : int
+        The number of requests which were retried.
+    elapsed : float
+        The time in seconds taken to run all steps at this level.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        durations: list[float],
+        operation_durations: dict[str, list[float]],
+        failures: int,
+        retries: int,
+        elapsed: float,
+    ) -> None:
+        self.concurrency = concurrency
+        self._durations = sorted(durations)
+        self._operation_durations = {name: sorted(values) for name, values in operation_durations.items()}
+        self.failures = failures
+        self.retries = retries
+        self.elapsed = elapsed
+
+    @property
+    def steps(self) -> int:
+        """
+        The number of steps run, including failed steps.
+
+        Returns
+        -------
+        int
+            The number of steps.
+        """
+        return len(self._durations) + self.failures
+
+    @property
+    def error_rate(self) -> float:
+        """
+        The proportion of steps which failed.
+
+        Returns
+        -------
+        float
+            The error rate, between 0 and 1.
+        """
+        return self.failures / self.steps if self.steps else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of steps completed successfully per second.
+
+        Returns
+        -------
+        float
+            The throughput in steps per second.
+        """
+        return len(self._durations) / self.elapsed if self.elapsed > 0 else math.nan
+
+    @property
+    def operations(self) -> list[str]:
+        """
+        The operations which were performed by the steps.
+
+        Returns
+        -------
+        list[str]
+            The operation names, in alphabetical order.
+        """
+        return sorted(self._operation_durations)
+
+    def percentile(self, percentile: float, operation: str | None = None) -> float:
+        """
+        Get a percentile of the latency of successful steps, or of an operation.
+
+        Parameters
+        ----------
+        percentile : float
+            The percentile, between 0 and 100.
+        operation : str | None, default ``None``
+            The operation. If ``None``, the percentile of the step latency is returned.
+
+        Returns
+        -------
+        float
+            The latency in seconds, or ``nan`` if no step or operation succeeded.
+        """
+        durations = self._durations if operation is None else self._operation_durations.get(operation, [])
+        return _percentile(durations, percentile)
+
+    def summary(self) -> dict[str, float]:
+        """
+        Summarize the results of this level.
+
+        Returns
+        -------
+        dict[str, float]
+            A dictionary with the keys ``"concurrency"``, ``"steps"``, ``"failures"``, ``"error_rate"``,
+            ``"retries"``, ``"throughput_per_s"``, ``"p50_ms"``, ``"p90_ms"``, ``"p95_ms"``, ``"p99_ms"``, and
+            ``"max_ms"`` for the step latency, and ``"{operation}_p50_ms"`` and ``"{operation}_p99_ms"`` for each
+            operation.
+        """
+        summary: dict[str, float] = {
+            "concurrency": self.concurrency,
+            "steps": self.steps,
+            "failures": self.failures,
+            "error_rate": self.error_rate,
+            "retries": self.retries,
+            "throughput_per_s": self.throughput,
+        }
+        for percentile in PERCENTILES:
+            summary[f"p{percentile}_ms"] = self.percentile(percentile) * 1000
+        summary["max_ms"] = self._durations[-1] * 1000 if self._durations else math.nan
+        for operation in self.operations:
+            summary[f"{operation}_p50_ms"] = self.percentile(50, operation) * 1000
+            summary[f"{operation}_p99_ms"] = self.percentile(99, operation) * 1000
+        return summary
+
+
+class LoadTestResult:
+    """
+    The results of a load test, with one :class:`LoadLevelResult` for each concurrency level.
+
+    Parameters
+    ----------
+    levels : list[LoadLevelResult]
+        The results of each concurrency level, in the order in which they were run.
+    """
+
+    def __init__(self, levels: list[LoadLevelResult]) -> None:
+        self.levels = levels
+
+    def summary(self) -> list[dict[str, float]]:
+        """
+        Summarize the results of each concurrency level.
+
+        Returns
+        -------
+        list[dict[str, float]]
+            The summary of each level. See :meth:`LoadLevelResult.summary`.
+        """
+        return [level.summary() for level in self.levels]
+
+    def max_sustainable_concurrency(
+        self, latency_factor: float = 2.0, percentile: float = 95, max_error_rate: float = 0.01
+    ) -> int | None:
+        """
+        Get the highest concurrency level at which step latency has not degraded.
+
+        Latency has degraded at a level if its step latency percentile is more than ``latency_factor`` times the
+        percentile at the first level, or if its error rate is more than ``max_error_rate``. Levels after the first
+        degraded level are not considered.
+
+        Parameters
+        ----------
+        latency_factor : float, default ``2.0``
+            The maximum ratio of the latency at a level to the latency at the first level.
+        percentile : float, default ``95``
+            The latency percentile which is compared.
+        max_error_rate : float, default ``0.01``
+            The maximum proportion of steps which fail.
+
+        Returns
+        -------
+        int | None
+            The concurrency, or ``None`` if latency has degraded at the first level.
+        """
+        sustainable = None
+        baseline = self.levels[0].percentile(percentile) if self.levels else math.nan
+        for level in self.levels:
+            latency = level.percentile(percentile)
+            if level.error_rate > max_error_rate or not latency <= baseline * latency_factor:
+                break
+            sustainable = level.concurrency
+        return sustainable
+
+
+def _run_step_in_thread(
+    payload: Mapping[str, Any], workload: StepWorkload, use_https: bool, verify_ssl: bool
+) -> tuple[dict[str, list[float]], int]:
+    """
+    Run a simulated step on the current thread.
+
+    Parameters
+    ----------
+    payload : Mapping[str, Any]
+        The payload of the step.
+    workload : StepWorkload
+        The work done by the step.
+    use_https : bool
+        Whether to use HTTPS.
+    verify_ssl : bool
+        Whether to verify the server certificate.
+
+    Returns
+    -------
+    tuple[dict[str, list[float]], int]
+        The duration of each request by operation, and the number of retried requests.
+    """
+    integration = MIDataflowIntegration.from_payload(payload, use_https=use_https, verify_ssl=verify_ssl)
+    try:
+        return workload.run(integration), sum(integration.retry_counts.values())
+    finally:
+        # Connections are closed when the step completes, as they would be when a step process exits
+        if "_transport" in integration.__dict__:
+            integration._transport.close()
+
+
+def _run_step_in_process(
+    payload: Mapping[str, Any], workload: StepWorkload, use_https: bool, verify_ssl: bool
+) -> tuple[dict[str, list[float]], int]:
+    """
+    Run a simulated step in a new Python process, which reads the payload from ``stdin``.
+
+    Parameters
+    ----------
+    payload : Mapping[str, Any]
+        The payload of the step.
+    workload : StepWorkload
+        The work done by the step.
+    use_https : bool
+        Whether to use HTTPS.
+    verify_ssl : bool
+        Whether to verify the server certificate.
+
+    Returns
+    -------
+    tuple[dict[str, list[float]], int]
+        The duration of each request by operation, and the number of retried requests.
+
+    Raises
+    ------
+    RuntimeError
+        If the step process exits with a non-zero exit code.
+    """
+    arguments = json.dumps({"workload": workload.to_dict(), "use_https": use_https, "verify_ssl": verify_ssl})
+    result = subprocess.run(
+        [sys.executable, "-m", __name__, arguments],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Step process exited with exit code {result.returncode}:\n{result.stderr}")
+    output = json.loads(result.stdout.splitlines()[-1])
+    return output["durations"], output["retries"]
+
+
+def _step_process_main(arguments: str) -> int:
+    """
+    Run a simulated step in a step process started by a load test.
+
+    The payload is read from ``stdin``, and the request durations are written to ``stdout`` as JSON.
+
+    Parameters
+    ----------
+    arguments : str
+        The JSON-formatted workload and integration arguments.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    options = json.loads(arguments)
+    try:
+        integration = MIDataflowIntegration(use_https=options["use_https"], verify_ssl=options["verify_ssl"])
+        durations = StepWorkload(**options["workload"]).run(integration)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    print(json.dumps({"durations": durations, "retries": sum(integration.retry_counts.values())}))
+    return 0
+
+
+def run_load_test(
+    concurrency_levels: Iterable[int],
+    workload: StepWorkload | None = None,
+    steps_per_level: int | None = None,
+    mode: LoadTestMode = "thread",
+    dataflow_url: str | None = None,
+    payload_factory: Callable[[str], Mapping[str, Any]] | None = None,
+    use_https: bool = False,
+    verify_ssl: bool = True,
+) -> LoadTestResult:
+    """
+    Run simulated steps at increasing concurrency, and measure step latency, throughput, and error rates.
+
+    At each concurrency level, ``steps_per_level`` steps are run, with ``concurrency`` steps running at any time. Each
+    step creates an :class:`~.MIDataflowIntegration` object from a new payload, and runs ``workload``.
+
+    In ``"thread"`` mode, each step runs on a thread of this process, and the :class:`~.MIDataflowIntegration` object
+    is created with :meth:`~.MIDataflowIntegration.from_payload`. In ``"process"`` mode, each step runs in a new Python
+    process which reads the payload from ``stdin``, in the same way as a step launched by MI Data Flow, so the step
+    latency includes the interpreter start-up time.
+
+    Steps which raise an exception are counted as failures and are not included in the latency percentiles. The
+    traceback of each failure is logged at debug level.
+
+    Parameters
+    ----------
+    concurrency_levels : Iterable[int]
+        The number of steps which run at the same time at each level, in the order in which levels are run. For
+        example, ``[1, 2, 4, 8, 16, 32]``.
+    workload : StepWorkload | None, default ``None``
+        The work done by each step. If ``None``, each step only resumes the workflow.
+    steps_per_level : int | None, default ``None``
+        The number of steps run at each level. If ``None``, four times the concurrency of the level is used.
+    mode : {"thread", "process"}, default ``"thread"``
+        Whether steps run on threads of this process or in separate processes.
+    dataflow_url : str | None, default ``None``
+        The URL of the MI Data Flow API which steps send requests to. If ``None``, a :class:`~.DataflowStandIn` is
+        started for the duration of the load test. The MI Data Flow API rejects requests to resume unknown workflows,
+        so a ``payload_factory`` which returns payloads for real workflows is required to test a Granta MI server.
+    payload_factory : Callable[[str], Mapping[str, Any]] | None, default ``None``
+        A function which is called with ``dataflow_url`` and returns the payload of a step. If ``None``, each step uses
+        a payload created by :func:`~.generate_payload` with Basic authentication. Pass a function which calls
+        :func:`~.generate_payload` to test steps with larger payloads.
+    use_https : bool, default ``False``
+        Whether steps use HTTPS if ``dataflow_url`` supports it.
+    verify_ssl : bool, default ``True``
+        Whether steps verify the server certificate.
+
+    Returns
+    -------
+    LoadTestResult
+        The results of each concurrency level.
+
+    Raises
+    ------
+    ValueError
+        If a concurrency level or ``steps_per_level`` is less than 1, or if ``mode`` is not a supported value.
+
+    Examples
+    --------
+    >>> workload = StepWorkload(log_messages=5, pygranta_calls=2)
+    >>> with DataflowStandIn(behavior=EndpointBehavior(latency=0.02), max_connections=64) as stand_in:
+    ...     result = run_load_test([1, 8, 64, 256], workload, dataflow_url=stand_in.url)
+    >>> result.max_sustainable_concurrency()
+    64
+    """
+    levels = list(concurrency_levels)
+    if any(level < 1 for level in levels):
+        raise ValueError(f"Concurrency levels must be at least 1. Values provided were {levels}.")
+    if steps_per_level is not None and steps_per_level < 1:
+        raise ValueError(f'"steps_per_level" must be at least 1. Value provided was {steps_per_level}.')
+    if mode not in get_args(LoadTestMode):
+        raise ValueError(f'Unknown mode "{mode}". Must be one of {", ".join(get_args(LoadTestMode))}.')
+    workload = workload or StepWorkload()
+
+    if dataflow_url is None:
+        from ._stand_in import DataflowStandIn
+
+        with DataflowStandIn() as stand_in:
+            return run_load_test(
+                levels, workload, steps_per_level, mode, stand_in.url, payload_factory, use_https, verify_ssl
+            )
+
+    factory = payload_factory or (lambda url: generate_payload("Basic", url))
+    run_step = _run_step_in_thread if mode == "thread" else _run_step_in_process
+    url = dataflow_url
+
+    def measure_step(_: int) -> tuple[float, dict[str, list[float]], int] | None:
+        payload = factory(url)
+        start = time.perf_counter()
+        try:
+            durations, retries = run_step(payload, workload, use_https, verify_ssl)
+        except Exception:
+            logger.debug("Load test step failed.", exc_info=True)
+            return None
+        return time.perf_counter() - start, durations, retries
+
+    results = []
+    for concurrency in levels:
+        step_count = steps_per_level or 4 * concurrency
+        logger.info("Running %s steps with concurrency %s", step_count, concurrency)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="LoadTestStep") as executor:
+            measurements = list(executor.map(measure_step, range(step_count)))
+        elapsed = time.perf_counter() - start
+
+        step_durations = []
+        operation_durations: dict[str, list[float]] = {}
+        retries = 0
+        for measurement in measurements:
+            if measurement is None:
+                continue
+            step_durations.append(measurement[0])
+            for operation, durations in measurement[1].items():
+                operation_durations.setdefault(operation, []).extend(durations)
+            retries += measurement[2]
+        level = LoadLevelResult(
+            concurrency,
+            step_durations,
+            operation_durations,
+            failures=measurements.count(None),
+            retries=retries,
+            elapsed=elapsed,
+        )
+        logger.info(
+            "Concurrency %s: %.1f steps/s, p95 %.1f ms, error rate %.1f%%",
+            concurrency,
+            level.throughput,
+            level.percentile(95) * 1000,
+            level.error_rate * 100,
+        )
+        results.append(level)
+    return LoadTestResult(results)
+
+
+if __name__ == "__main__":
+    sys.exit(_step_process_main(sys.argv[1]))
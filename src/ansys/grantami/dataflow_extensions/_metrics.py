@@ -0,0 +1,613 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Per-endpoint metrics of the HTTP requests sent by steps, with export in the Prometheus text format.
+
+Requests are aggregated by host, HTTP method, and endpoint, so that the latency of the MI Data Flow API and of the
+Granta MI service layer can be followed across many steps.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Optional, Type
+from urllib.parse import urlsplit
+
+from ._logger import logger
+
+if TYPE_CHECKING:
+    from ._transport import RequestRecord
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_PREFIX = "granta_dataflow_http"
+_DURATION = f"{_PREFIX}_request_duration_seconds"
+_REQUESTS = f"{_PREFIX}_requests_total"
+_BYTES_SENT = f"{_PREFIX}_request_body_bytes_total"
+_BYTES_RECEIVED = f"{_PREFIX}_response_body_bytes_total"
+_CONNECTIONS = f"{_PREFIX}_connection_requests_total"
+
+# Name, type, and help text of each metric family, in the order in which they are written
+_FAMILIES = (
+    (_DURATION, "histogram", "Time taken to receive the response to a request to Granta MI."),
+    (
+        _REQUESTS,
+        "counter",
+        "Number of requests to Granta MI, by status code, or none if no response was received.",
+    ),
+    (_BYTES_SENT, "counter", "Size of the request bodies sent to Granta MI."),
+    (_BYTES_RECEIVED, "counter", "Size of the response bodies received from Granta MI, before decompression."),
+    (_CONNECTIONS, "counter", "Number of requests sent on a new connection, or on a reused pooled connection."),
+)
+
+# Path segments which identify a resource, such as a workflow ID, are replaced so that they form one endpoint
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}|\d+)$")
+
+
+def _endpoint(url: str) -> tuple[str, str]:
+    """
+    Get the host and endpoint of a request URL.
+
+    Parameters
+    ----------
+    url : str
+        The request URL.
+
+    Returns
+    -------
+    tuple[str, str]
+        The host and port, and the path of the URL with GUID and integer segments replaced by ``{id}``.
+    """
+    parts = urlsplit(url)
+    host = parts.netloc.rpartition("@")[2]
+    segments = ("{id}" if _ID_SEGMENT.match(segment) else segment for segment in parts.path.split("/"))
+    return host, re.sub("/{2,}", "/", "/".join(segments)) or "/"
+
+
+def _format_labels(labels: Sequence[tuple[str, str]]) -> str:
+    """
+    Format the labels of a sample.
+
+    Parameters
+    ----------
+    labels : Sequence[tuple[str, str]]
+        The label names and values.
+
+    Returns
+    -------
+    str
+        The labels, in the form ``{name="value",...}``.
+    """
+    escaped = ((name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """
+    Format a sample value.
+
+    Parameters
+    ----------
+    value : float
+        The value.
+
+    Returns
+    -------
+    str
+        The value, without a fractional part if it is a whole number.
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _render(samples: dict[str, float]) -> str:
+    """
+    Write samples in the Prometheus text format.
+
+    Parameters
+    ----------
+    samples : dict[str, float]
+        The value of each sample, keyed by the metric name and labels.
+
+    Returns
+    -------
+    str
+        The exposition text.
+    """
+    lines = []
+    for name, metric_type, description in _FAMILIES:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        sample_names = {name, f"{name}_bucket", f"{name}_sum", f"{name}_count"}
+        lines.extend(f"{key} {_format_value(value)}" for key, value in samples.items() if _name(key) in sample_names)
+    return "\n".join(lines) + "\n"
+
+
+def _name(key: str) -> str:
+    """
+    Get the metric name of a sample.
+
+    Parameters
+    ----------
+    key : str
+        The metric name and labels of the sample.
+
+    Returns
+    -------
+    str
+        The metric name.
+    """
+    return key.partition("{")[0]
+
+
+def _parse(text: str) -> dict[str, float]:
+    """
+    Read the samples from text in the Prometheus text format.
+
+    Parameters
+    ----------
+    text : str
+        The exposition text.
+
+    Returns
+    -------
+    dict[str, float]
+        The value of each sample, keyed by the metric name and labels.
+    """
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            key, _, value = line.rpartition(" ")
+            samples[key] = float(value)
+    return samples
+
+
+@contextmanager
+def _lock_file(path: Path, timeout: float = 10.0, stale_after: float = 30.0) -> Iterator[None]:
+    """
+    Hold a lock on a file, shared between processes.
+
+    The lock is a file next to ``path``, which is created exclusively. A lock which is older than ``stale_after`` is
+    assumed to have been left by a process which stopped, and is removed.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The file to lock.
+    timeout : float, default ``10.0``
+        The time in seconds to wait for the lock.
+    stale_after : float, default ``30.0``
+        The age in seconds after which a lock is removed.
+
+    Yields
+    ------
+    None
+        The lock is held until the ``with`` block exits.
+
+    Raises
+    ------
+    TimeoutError
+        If the lock could not be acquired within ``timeout``.
+    """
+    lock_path = path.with_name(path.name + ".lock")
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > stale_after:
+                    lock_path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for the lock file {lock_path}.")
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        lock_path.unlink(missing_ok=True)
+
+
+class _EndpointStats:
+    """
+    Aggregates of the requests sent to one endpoint.
+
+    Parameters
+    ----------
+    bucket_count : int
+        The number of histogram buckets, excluding the ``+Inf`` bucket.
+    """
+
+    __slots__ = ("bucket_counts", "duration_sum", "status_counts", "bytes_sent", "bytes_received", "connection_counts")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.duration_sum = 0.0
+        self.status_counts: Counter[str] = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.connection_counts: Counter[str] = Counter()
+
+
+class HttpMetrics:
+    """
+    Per-endpoint aggregates of the HTTP requests sent to Granta MI.
+
+    Pass an instance to :class:`~.MIDataflowIntegration` as the ``http_metrics`` argument to measure the requests sent
+    by the MI Data Flow API session and by PyGranta clients created with
+    :meth:`~.MIDataflowIntegration.configure_pygranta_connection`. One instance can be shared by all the steps which
+    run in a process, for example in a :class:`~.StepHost`.
+
+    Requests are grouped by host, HTTP method, and endpoint. The endpoint is the path of the request URL, with GUID and
+    integer path segments replaced by ``{id}``. For each endpoint, the following metrics are recorded:
+
+    * ``granta_dataflow_http_request_duration_seconds``: A histogram of the time taken to receive each response.
+    * ``granta_dataflow_http_requests_total``: The number of requests, by status code.
+    * ``granta_dataflow_http_request_body_bytes_total``: The total size of the request bodies.
+    * ``granta_dataflow_http_response_body_bytes_total``: The total size of the response bodies, before
+      decompression.
+    * ``granta_dataflow_http_connection_requests_total``: The number of requests which opened a new connection, and
+      the number which reused a pooled connection.
+
+    Parameters
+    ----------
+    buckets : Sequence[float], default ``DEFAULT_LATENCY_BUCKETS``
+        The upper bounds of the latency histogram buckets in seconds, in increasing order. The default buckets range
+        from 5 ms to 30 s.
+
+    Raises
+    ------
+    ValueError
+        If ``buckets`` is empty, or is not a strictly increasing sequence of positive numbers.
+
+    Examples
+    --------
+    >>> metrics = HttpMetrics()
+    >>> data_flow = MIDataflowIntegration(http_metrics=metrics)
+    >>> ...
+    >>> data_flow.resume_bookmark(0)
+    >>> metrics.write_prometheus("dataflow.prom")
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        buckets = tuple(float(bucket) for bucket in buckets)
+        if not buckets or buckets[0] <= 0 or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError(
+                f'"buckets" must be a strictly increasing sequence of positive numbers. Value provided was {buckets}.'
+            )
+        self._buckets = buckets
+        self._endpoints: dict[tuple[str, str, str], _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        """
+        The upper bounds of the latency histogram buckets in seconds.
+
+        Returns
+        -------
+        tuple[float, ...]
+            The bucket bounds, excluding ``+Inf``.
+        """
+        return self._buckets
+
+    def observe(self, record: "RequestRecord") -> None:
+        """
+        Add a request to the aggregates.
+
+        Parameters
+        ----------
+        record : RequestRecord
+            The details of the request.
+        """
+        host, endpoint = _endpoint(record.request.url or "")
+        key = (host, record.request.method or "", endpoint)
+        status = "none" if record.response is None else str(record.response.status_code)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = _EndpointStats(len(self._buckets))
+            stats.bucket_counts[bisect_left(self._buckets, record.duration)] += 1
+            stats.duration_sum += record.duration
+            stats.status_counts[status] += 1
+            stats.bytes_sent += record.bytes_sent
+            stats.bytes_received += record.bytes_received
+            if record.new_connection is not None:
+                stats.connection_counts["new" if record.new_connection else "reused"] += 1
+
+    def reset(self) -> None:
+        """Discard all aggregates."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def _samples(self) -> dict[str, float]:
+        """
+        Get the value of each sample.
+
+        Returns
+        -------
+        dict[str, float]
+            The value of each sample, keyed by the metric name and labels.
+        """
+        samples: dict[str, float] = {}
+        with self._lock:
+            for (host, method, endpoint), stats in sorted(self._endpoints.items()):
+                labels = (("host", host), ("method", method), ("endpoint", endpoint))
+                cumulative = 0
+                for bound, count in zip((*self._buckets, float("inf")), stats.bucket_counts):
+                    cumulative += count
+                    samples[f"{_DURATION}_bucket{_format_labels((*labels, ('le', _format_value(bound))))}"] = cumulative
+                samples[f"{_DURATION}_sum{_format_labels(labels)}"] = stats.duration_sum
+                samples[f"{_DURATION}_count{_format_labels(labels)}"] = cumulative
+                for status, count in sorted(stats.status_counts.items()):
+                    samples[f"{_REQUESTS}{_format_labels((*labels, ('status', status)))}"] = count
+                samples[f"{_BYTES_SENT}{_format_labels(labels)}"] = stats.bytes_sent
+                samples[f"{_BYTES_RECEIVED}{_format_labels(labels)}"] = stats.bytes_received
+                for connection, count in sorted(stats.connection_counts.items()):
+                    samples[f"{_CONNECTIONS}{_format_labels((*labels, ('connection', connection)))}"] = count
+        return samples
+
+    def to_prometheus(self) -> str:
+        """
+        Write the aggregates in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            The metrics.
+        """
+        return _render(self._samples())
+
+    def write_prometheus(self, path: str | Path, merge: bool = False) -> None:
+        """
+        Write the aggregates to a file in the Prometheus text exposition format.
+
+        The file is replaced atomically, so it can be read by the textfile collector of the Prometheus node exporter
+        while it is being written.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path
+            The file to write.
+        merge : bool, default ``False``
+            Whether to add the aggregates to the values already in the file. Use this option to accumulate the
+            metrics of steps which run in separate processes. The file is locked while it is updated. The file must
+            have been written by this method with the same histogram buckets.
+
+        Raises
+        ------
+        TimeoutError
+            If ``merge`` is ``True`` and the file is locked by another process for more than 10 seconds.
+        """
+        path = Path(path)
+        samples = self._samples()
+        with _lock_file(path) if merge else _no_lock():
+            if merge and path.exists():
+                existing = _parse(path.read_text(encoding="utf-8"))
+                for key, value in samples.items():
+                    existing[key] = existing.get(key, 0.0) + value
+                samples = existing
+            temporary_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temporary_path.write_text(_render(samples), encoding="utf-8")
+            temporary_path.replace(path)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> "MetricsServer":
+        """
+        Start serving the aggregates on a local port, so that they can be scraped by Prometheus.
+
+        Parameters
+        ----------
+        host : str, default ``"127.0.0.1"``
+            The host name to listen on.
+        port : int, default ``0``
+            The port to listen on. If ``0``, a free port is chosen.
+
+        Returns
+        -------
+        MetricsServer
+            The running server. Call :meth:`~.MetricsServer.stop` to stop it.
+        """
+        server = MetricsServer(self.to_prometheus, address=(host, port))
+        server.start()
+        return server
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}(buckets={self._buckets})"
+
+
+@contextmanager
+def _no_lock() -> Iterator[None]:
+    """
+    Do nothing.
+
+    Yields
+    ------
+    None
+        Nothing.
+    """
+    yield
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Responds to every ``GET`` request with the metrics of the server."""
+
+    server: "_MetricsHttpServer"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Send the metrics."""
+        try:
+            body = self.server.source().encode("utf-8")
+        except Exception:
+            logger.exception("Failed to read metrics.")
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Log requests at debug level instead of writing them to stderr."""
+        logger.debug("Metrics server: " + format, *args)
+
+
+class _MetricsHttpServer(ThreadingHTTPServer):
+    """
+    An HTTP server which serves metrics in the Prometheus text format.
+
+    Parameters
+    ----------
+    address : tuple[str, int]
+        The address to listen on.
+    source : Callable[[], str]
+        A function which returns the metrics.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], source: Callable[[], str]) -> None:
+        self.source = source
+        super().__init__(address, _MetricsRequestHandler)
+
+
+class MetricsServer:
+    """
+    A local HTTP server which serves metrics in the Prometheus text format.
+
+    Every ``GET`` request is answered with the current metrics, whatever the path.
+
+    Parameters
+    ----------
+    source : Callable[[], str]
+        A function which returns the metrics, for example :meth:`HttpMetrics.to_prometheus`.
+    address : tuple[str, int], default ``("127.0.0.1", 0)``
+        The host name and port to listen on. If the port is ``0``, a free port is chosen when the server is started.
+
+    Examples
+    --------
+    >>> with MetricsServer(metrics.to_prometheus, address=("0.0.0.0", 9464)) as server:
+    ...     print(server.url)
+    http://0.0.0.0:9464/metrics
+    """
+
+    def __init__(self, source: Callable[[], str], address: tuple[str, int] = ("127.0.0.1", 0)) -> None:
+        self._source = source
+        self._address = address
+        self._server: _MetricsHttpServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """
+        The URL from which the metrics can be scraped.
+
+        Returns
+        -------
+        str
+            The URL of the metrics.
+
+        Raises
+        ------
+        RuntimeError
+            If the server has not been started.
+        """
+        if self._server is None:
+            raise RuntimeError("The metrics server has not been started.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/metrics"
+
+    def start(self) -> None:
+        """Start listening for requests on a background thread."""
+        if self._server is not None:
+            return
+        self._server = _MetricsHttpServer(self._address, self._source)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        logger.debug("Serving metrics on %s", self.url)
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        assert self._thread is not None
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def serve_forever(self) -> None:
+        """Start the server, and handle requests until :meth:`stop` is called from another thread."""
+        self.start()
+        thread = self._thread
+        assert thread is not None
+        thread.join()
+
+    def __enter__(self) -> "MetricsServer":
+        """
+        Start the server.
+
+        Returns
+        -------
+        MetricsServer
+            This server.
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """
+        Stop the server.
+
+        Parameters
+        ----------
+        exc_type : Type[BaseException], optional
+            The type of the exception raised in the context, if any.
+        exc_val : BaseException, optional
+            The exception raised in the context, if any.
+        exc_tb : TracebackType, optional
+            The traceback of the exception raised in the context, if any.
+        """
+        self.stop()
@@ -28,39 +28,145 @@ Allows direct access to this data or supports spawning a MI Scripting Toolkit se
 """
 
 import base64
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Mapping
+from contextvars import ContextVar, copy_context
 import copy
 import enum
 from functools import cached_property
-from io import StringIO
 import json
 import logging
 from pathlib import Path
 import sys
-from typing import Any, Dict, Literal, Optional, Tuple, Type, TypeVar, cast
+import threading
+import time
+from typing import IO, TYPE_CHECKING, Any, Dict, Literal, Optional, Tuple, Type, TypeVar, cast, get_args
 from urllib.parse import urlparse
 import warnings
 
-from ansys.openapi.common import ApiClientFactory, SessionConfiguration
-import requests
-
-try:
-    from requests_negotiate_sspi import HttpNegotiateAuth  # type: ignore
-except ImportError:
-    pass
-
-try:
+# Third-party dependencies are imported by the code paths that need them, so that importing this package and
+# instantiating MIDataflowIntegration do not pay the cost of importing requests, ansys-openapi-common, or Scripting
+# Toolkit.
+if TYPE_CHECKING:
     import ansys.grantami.core as mpy  # type: ignore
-except ImportError:
-    try:
-        from GRANTA_MIScriptingToolkit import granta as mpy  # type: ignore
-    except ImportError:
-        mpy = None
+    from ansys.openapi.common import ApiClientFactory, SessionConfiguration
+    import requests
+
+    from ._metrics import HttpMetrics
+    from ._profiling import StepProfile, _StepProfiler
+    from ._retry import RetryPolicy
+    from ._telemetry import TelemetryStore
+    from ._transport import RequestRecord, TransportConfiguration, _HttpTransport
 
+from ._json import JsonSerializer, default_json_serializer
 from ._logger import logger
+from ._payload import LazyPayload, WorkflowPayload, _PayloadView, redact_payload
+from ._spans import JsonFileSpanExporter, Span, SpanExporter, _SpanRecorder, summarize_spans
+from ._trace_context import TRACEPARENT_HEADER, TraceContext
+
+_NOT_IMPORTED: Any = object()
+
+_JSON_CONTENT_TYPE_HEADER = {"Content-Type": "application/json"}
+
+# Data Flow API operations which can be sent more than once with the same effect as sending them once. The server
+# resumes a workflow at most once for each WorkflowId and TransitionName, and a repeated log message is harmless.
+_IDEMPOTENT_OPERATIONS = frozenset({"resume_bookmark", "log_msg_to_instance"})
+
+if not TYPE_CHECKING:
+    # Replaced with the Scripting Toolkit module, or None if it is not installed, by _import_scripting_toolkit()
+    mpy = _NOT_IMPORTED
+
+
+def _import_scripting_toolkit() -> Any:
+    """
+    Import Scripting Toolkit on first use.
+
+    Returns
+    -------
+    Any
+        The Scripting Toolkit module, or ``None`` if Scripting Toolkit is not installed.
+    """
+    global mpy
+    if mpy is _NOT_IMPORTED:
+        try:
+            import ansys.grantami.core as scripting_toolkit
+        except ImportError:
+            try:
+                from GRANTA_MIScriptingToolkit import granta as scripting_toolkit  # type: ignore
+            except ImportError:
+                scripting_toolkit = None
+        mpy = scripting_toolkit
+    return mpy
+
+
+_PayloadSource = str | bytes | Mapping[str, Any] | IO[str] | IO[bytes]
+
+
+class _StepInput:
+    """
+    The input for a step which is not run as a separate Python process launched by Data Flow.
+
+    Parameters
+    ----------
+    payload : str | bytes | Mapping[str, Any] | IO[str] | IO[bytes]
+        The JSON-formatted payload which Data Flow wrote to ``stdin``, a file-like object to read it from, or the
+        parsed payload.
+    supporting_files_dir : pathlib.Path
+        The directory containing the supporting files added to the workflow definition.
+    log_filter : logging.Filter | None, default ``None``
+        A filter which only passes records logged by the step. Set by a step host, and added to the handlers created
+        by :meth:`MIDataflowIntegration.get_api_log_handler` during the step.
+
+    Attributes
+    ----------
+    log_handlers : list[logging.Handler]
+        The handlers to which ``log_filter`` was added, which are removed from all loggers when the step completes.
+    """
+
+    __slots__ = ("payload", "supporting_files_dir", "log_filter", "log_handlers")
+
+    def __init__(
+        self, payload: "_PayloadSource", supporting_files_dir: Path, log_filter: logging.Filter | None = None
+    ) -> None:
+        self.payload = payload
+        self.supporting_files_dir = supporting_files_dir
+        self.log_filter = log_filter
+        self.log_handlers: list[logging.Handler] = []
+
 
-PyGranta_Connection_Class = TypeVar("PyGranta_Connection_Class", bound=ApiClientFactory)
+# Set by a step host for the duration of a step, or by MIDataflowIntegration.from_payload for the duration of the
+# constructor, so that MIDataflowIntegration objects read the payload from it instead of the stdin of the process.
+# Context variables are local to the thread or task, so concurrent steps do not see each other's input.
+_step_input: ContextVar[_StepInput | None] = ContextVar("_step_input", default=None)
+
+# The name of the custom value which enables profiling if the profile_step argument is not provided
+_PROFILE_CUSTOM_VALUE = "ProfileStep"
+_PROFILE_ENABLED_VALUES = frozenset(["true", "yes", "1"])
+
+
+def _profiling_requested(custom_values: Mapping[str, Any] | None) -> bool:
+    """
+    Check whether the custom values of a workflow enable profiling.
+
+    Parameters
+    ----------
+    custom_values : Mapping[str, Any] | None
+        The custom values of the workflow.
+
+    Returns
+    -------
+    bool
+        Whether the ``ProfileStep`` custom value is ``True``, or a string such as ``"true"``, ``"yes"``, or ``"1"``.
+    """
+    value = (custom_values or {}).get(_PROFILE_CUSTOM_VALUE)
+    if isinstance(value, str):
+        return value.strip().lower() in _PROFILE_ENABLED_VALUES
+    return value is True or value == 1
+
+
+PyGranta_Connection_Class = TypeVar("PyGranta_Connection_Class", bound="ApiClientFactory")
 ApiLogLevel = Literal["Debug", "Info", "Warn", "Error", "Fatal"]
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest"]
 
 
 class MIDataflowApiLogHandler(logging.Handler):  # numpydoc ignore=PR01
@@ -117,6 +223,234 @@ class MIDataflowApiLogHandler(logging.Handler):  # numpydoc ignore=PR01
         self._callback(msg, level)
 
 
+class MIDataflowQueuedApiLogHandler(MIDataflowApiLogHandler):
+    """
+    A logging handler which sends log messages to the Data Flow API from a background thread.
+
+    Log records are formatted when they are emitted and added to a bounded in-memory queue. A background thread sends
+    the queued messages to the Data Flow API in the order in which they were emitted, so logging calls made by the
+    business logic do not wait for an HTTP request to complete.
+
+    Call :meth:`flush` to wait until all queued messages have been sent. Handlers created with
+    :meth:`.MIDataflowIntegration.get_api_log_handler` are flushed automatically by
+    :meth:`.MIDataflowIntegration.resume_bookmark` before the workflow is resumed.
+
+    Parameters
+    ----------
+    callback : Callable[[str, ApiLogLevel], None]
+        The function used to send a message to the Data Flow API.
+    max_queue_size : int, default ``1000``
+        The maximum number of messages waiting to be sent.
+    overflow_policy : {"block", "drop_oldest", "drop_newest"}, default ``"block"``
+        The behavior when a record is emitted and the queue is full:
+
+        * ``"block"``: Wait until there is space in the queue. No messages are lost.
+        * ``"drop_oldest"``: Discard the oldest queued message to make space for the new message.
+        * ``"drop_newest"``: Discard the new message.
+
+    Raises
+    ------
+    ValueError
+        If ``max_queue_size`` is less than 1, or if ``overflow_policy`` is not a supported value.
+
+    Notes
+    -----
+    Records emitted from the background thread itself, for example by the logging of an HTTP library used to send the
+    messages, are ignored to avoid recursion.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, ApiLogLevel], None],
+        max_queue_size: int = 1000,
+        overflow_policy: OverflowPolicy = "block",
+    ) -> None:
+        super().__init__(callback)
+        if max_queue_size < 1:
+            raise ValueError(f'"max_queue_size" must be at least 1. Value provided was {max_queue_size}.')
+        if overflow_policy not in get_args(OverflowPolicy):
+            raise ValueError(
+                f'Unknown overflow policy "{overflow_policy}". Must be one of {", ".join(get_args(OverflowPolicy))}.'
+            )
+        self._max_queue_size = max_queue_size
+        self._overflow_policy = overflow_policy
+
+        self._queue: deque[tuple[str, ApiLogLevel, logging.LogRecord]] = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._sender: threading.Thread | None = None
+        self._closed = False
+
+        self._queued_count = 0
+        self._sent_count = 0
+        self._dropped_count = 0
+        self._failed_count = 0
+
+    @property
+    def queued_count(self) -> int:
+        """
+        The number of messages added to the queue.
+
+        Returns
+        -------
+        int
+            Number of messages added to the queue since the handler was created.
+        """
+        return self._queued_count
+
+    @property
+    def sent_count(self) -> int:
+        """
+        The number of messages successfully sent to the Data Flow API.
+
+        Returns
+        -------
+        int
+            Number of messages sent since the handler was created.
+        """
+        return self._sent_count
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        The number of messages discarded because the queue was full.
+
+        Returns
+        -------
+        int
+            Number of messages discarded since the handler was created.
+        """
+        return self._dropped_count
+
+    @property
+    def failed_count(self) -> int:
+        """
+        The number of messages which could not be sent to the Data Flow API.
+
+        Returns
+        -------
+        int
+            Number of messages for which the request failed since the handler was created.
+        """
+        return self._failed_count
+
+    @property
+    def pending_count(self) -> int:
+        """
+        The number of messages which are queued or currently being sent.
+
+        Returns
+        -------
+        int
+            Number of messages not yet sent.
+        """
+        with self._condition:
+            return len(self._queue) + self._in_flight
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Add a log record to the queue of messages to be sent to the MI Data Flow API.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            The log record to emit.
+        """
+        if threading.current_thread() is self._sender:
+            return
+        msg = self.format(record)
+        level = self._resolve_level_name(record.levelno)
+
+        with self._condition:
+            if self._closed:
+                # The background thread has stopped. Send the message directly so that it is not lost.
+                self._callback(msg, level)
+                self._queued_count += 1
+                self._sent_count += 1
+                return
+
+            if len(self._queue) >= self._max_queue_size:
+                if self._overflow_policy == "drop_newest":
+                    self._dropped_count += 1
+                    return
+                elif self._overflow_policy == "drop_oldest":
+                    self._queue.popleft()
+                    self._dropped_count += 1
+                else:
+                    self._start_sender()
+                    while len(self._queue) >= self._max_queue_size:
+                        self._condition.wait()
+
+            self._queue.append((msg, level, record))
+            self._queued_count += 1
+            self._start_sender()
+            self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> None:
+        """
+        Wait until all queued messages have been sent to the MI Data Flow API.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time in seconds to wait. By default, wait until the queue is empty. Messages still queued
+            after the timeout are sent in the background.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: not self._queue and not self._in_flight, timeout=timeout)
+
+    def close(self) -> None:
+        """Send all queued messages, stop the background thread, and close the handler."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            sender = self._sender
+        if sender is not None and sender is not threading.current_thread():
+            sender.join()
+        super().close()
+
+    def _start_sender(self) -> None:
+        """Start the background thread if it is not already running. Must be called with the condition held."""
+        if self._sender is None:
+            # Run in a copy of the current context, so that records logged while sending are attributed to the step
+            self._sender = threading.Thread(
+                target=copy_context().run,
+                args=(self._send_queued_messages,),
+                name="MIDataflowQueuedApiLogHandler",
+                daemon=True,
+            )
+            self._sender.start()
+
+    def _send_queued_messages(self) -> None:
+        """Send queued messages in order until the handler is closed and the queue is empty."""
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                batch = list(self._queue)
+                self._queue.clear()
+                self._in_flight = len(batch)
+                self._condition.notify_all()
+
+            for msg, level, record in batch:
+                try:
+                    self._callback(msg, level)
+                except Exception:
+                    succeeded = False
+                    self.handleError(record)
+                else:
+                    succeeded = True
+                with self._condition:
+                    if succeeded:
+                        self._sent_count += 1
+                    else:
+                        self._failed_count += 1
+                    self._in_flight -= 1
+                    self._condition.notify_all()
+
+
 class _AuthenticationMode(enum.Enum):
     """The authentication mode of the Granta MI server."""
 
@@ -152,6 +486,65 @@ class MIDataflowIntegration:
 
         If specified, the certificate will be used to verify PyGranta and MI Data Flow requests. Has no effect if
         ``use_https`` or ``verify_ssl`` are set to ``False``.
+    transport_configuration : TransportConfiguration | None, default ``None``
+        The configuration of the connection pool shared by the MI Data Flow API session and by PyGranta clients
+        created with :meth:`.configure_pygranta_connection`. If ``None``, the default configuration is used.
+    retry_policy : RetryPolicy | None, default ``None``
+        The policy for retrying MI Data Flow API requests which fail because the server is temporarily unavailable.
+        If ``None``, the default :class:`~.RetryPolicy` is used.
+    deadline : float | None, default ``None``
+        The time in seconds, measured from when this object is created, within which the step must resume the
+        workflow. Request timeouts are reduced so that requests do not continue after the deadline. If the workflow has
+        not been resumed when the deadline is reached, it is resumed with ``deadline_exit_code``. If ``None``, the
+        step has no deadline.
+    deadline_exit_code : str | int, default ``1``
+        The exit code used to resume the workflow if the deadline is reached.
+    lazy_payload : bool, default ``False``
+        Whether to decode the payload lazily. If ``True``, only the values required to instantiate this class are
+        decoded when the payload is read. Other values, such as ``Attributes`` and ``CustomValues``, are decoded the
+        first time they are accessed. Use this option to reduce the start-up time and memory use of steps which
+        receive large payloads. If debug logging is enabled, the whole payload is decoded to log it. Has no effect if
+        the payload is provided as a mapping to :meth:`from_payload` or :meth:`from_dict_payload`.
+    custom_value_spill_threshold : int | None, default ``1048576``
+        The length in characters above which Base64-encoded custom values are decoded to a temporary file instead of
+        being returned as a string by :attr:`workflow_payload`. Temporary files are deleted when the workflow is
+        resumed. If ``None``, custom values are always returned as strings.
+    json_serializer : JsonSerializer | None, default ``None``
+        The serializer used to parse the payload and to serialize MI Data Flow API requests. If ``None``, ``orjson``
+        is used if it is installed, otherwise the :mod:`json` module in the standard library is used.
+    capture_file : str | pathlib.Path | None, default ``None``
+        A gzip-compressed JSON Lines file to which the payload and the timing of the step are appended when the
+        workflow is resumed. Credentials are removed from the recorded payload. Use
+        ``python -m ansys.grantami.dataflow_extensions replay`` or :func:`~.replay` to replay the recorded steps.
+        If ``None``, the step is not recorded.
+    span_exporter : SpanExporter | str | pathlib.Path | None, default ``None``
+        The exporter to which the timing spans of the step are passed when the workflow is resumed. If a path is
+        provided, spans are appended to the file by a :class:`~.JsonFileSpanExporter`. If ``None``, spans are recorded
+        and available from :attr:`spans`, but are not exported.
+    log_span_summary : bool, default ``False``
+        Whether to log a summary of the time taken by each phase of the step to the workflow instance before the
+        workflow is resumed. See :meth:`get_span_summary`.
+    http_metrics : HttpMetrics | str | pathlib.Path | None, default ``None``
+        Aggregates to which the latency, status, size, and connection reuse of each request sent to Granta MI are
+        added. Share one :class:`~.HttpMetrics` object between the steps which run in a process, and export it with
+        :meth:`~.HttpMetrics.write_prometheus` or :meth:`~.HttpMetrics.serve`. If a path is provided, the metrics of
+        this step are added to the Prometheus text file when the workflow is resumed. If ``None``, requests are not
+        measured.
+    telemetry_store : TelemetryStore | str | pathlib.Path | None, default ``None``
+        The SQLite telemetry store to which a row is added for this step when the workflow is resumed, with the
+        duration of each phase, the number of HTTP requests, the peak memory of the process, and the exit code. If a
+        path is provided, a :class:`~.TelemetryStore` is opened at that path. If ``None``, telemetry is not stored.
+    propagate_trace_context : bool, default ``True``
+        Whether to add a W3C ``traceparent`` header to the requests sent to Granta MI by the MI Data Flow API session
+        and by PyGranta clients, so that they can be correlated with the step in server logs. See
+        :attr:`trace_context`.
+    profile_step : bool | None, default ``None``
+        Whether to profile the business logic of the step with :mod:`cProfile`, from the end of initialization until
+        the workflow is resumed. If ``None``, the step is profiled if the ``ProfileStep`` custom value of the workflow
+        is ``True`` or ``"true"``. The functions with the highest own time are logged to the workflow instance before
+        it is resumed, and the profile is written to ``profile_dir``. See :attr:`step_profile`.
+    profile_dir : str | pathlib.Path | None, default ``None``
+        The directory to which profiles are written. If ``None``, profiles are written to the temporary directory.
 
     Raises
     ------
@@ -159,6 +552,8 @@ class MIDataflowIntegration:
         If the string read from stdin is invalid JSON.
     KeyError
         If the JSON read from stdin does not conform to the correct data structure.
+    ValueError
+        If ``deadline`` is not a positive number.
 
     Warns
     -----
@@ -205,22 +600,82 @@ class MIDataflowIntegration:
         use_https: bool = True,
         verify_ssl: bool = True,
         certificate_file: str | Path | None = None,
+        transport_configuration: Optional["TransportConfiguration"] = None,
+        retry_policy: Optional["RetryPolicy"] = None,
+        deadline: float | None = None,
+        deadline_exit_code: str | int = 1,
+        lazy_payload: bool = False,
+        custom_value_spill_threshold: int | None = 1_048_576,
+        json_serializer: JsonSerializer | None = None,
+        capture_file: str | Path | None = None,
+        span_exporter: SpanExporter | str | Path | None = None,
+        log_span_summary: bool = False,
+        http_metrics: Optional["HttpMetrics"] | str | Path = None,
+        telemetry_store: Optional["TelemetryStore"] | str | Path = None,
+        propagate_trace_context: bool = True,
+        profile_step: bool | None = None,
+        profile_dir: str | Path | None = None,
     ) -> None:
+        self._started_at = time.time()
+        self._start_time = time.perf_counter()
+        self._span_recorder = _SpanRecorder(self._started_at, self._start_time)
+        if deadline is not None and deadline <= 0:
+            raise ValueError(f'"deadline" must be a positive number. Value provided was {deadline}.')
+        # The budget starts before the payload is parsed, so that all work done by the step counts towards it
+        self._deadline = None if deadline is None else time.monotonic() + deadline
+        self._deadline_exit_code = deadline_exit_code
+        self._watchdog: threading.Timer | None = None
+
         # Define properties
-        self._supporting_files_dir = Path(sys.path[0])
+        step_input = _step_input.get()
+        self._supporting_files_dir = step_input.supporting_files_dir if step_input else Path(sys.path[0])
         self._requests_timeout: int = 30
 
         self._mi_session: mpy.Session | None = None
+        self._api_log_handlers: list[MIDataflowApiLogHandler] = []
+        self._transport_configuration = transport_configuration
+        self._retry_policy = retry_policy
+        self._retry_counts: Dict[str, int] = {"resume_bookmark": 0, "log_msg_to_instance": 0}
+        self._retry_counts_lock = threading.Lock()
+        self._resumed = False
+        self._resume_lock = threading.Lock()
+        self._custom_value_spill_threshold = custom_value_spill_threshold
+        self._json_serializer = json_serializer if json_serializer is not None else default_json_serializer()
+        self._capture_file = capture_file
+        if isinstance(span_exporter, (str, Path)):
+            span_exporter = JsonFileSpanExporter(span_exporter)
+        self._span_exporter = span_exporter
+        self._log_span_summary = log_span_summary
+        self._http_metrics_file: Path | None = None
+        if isinstance(http_metrics, (str, Path)):
+            from ._metrics import HttpMetrics
+
+            self._http_metrics_file = Path(http_metrics)
+            http_metrics = HttpMetrics()
+        self._http_metrics = http_metrics
+        if isinstance(telemetry_store, (str, Path)):
+            from ._telemetry import TelemetryStore
+
+            telemetry_store = TelemetryStore(telemetry_store)
+        self._telemetry_store = telemetry_store
+        self._propagate_trace_context = propagate_trace_context
+        self._profiler: Optional["_StepProfiler"] = None
+        self._step_profile: Optional["StepProfile"] = None
 
         # Logger
         logger.info("")
         logger.info("---------- Initializing new Data Flow Extensions instance ----------")
 
-        # Get data from data flow. Getting the payload as a sanitized string performs a basic check that we have
-        # an expected data structure.
-        self._df_data = self._get_standard_input()
-        sanitized_payload = self.get_payload_as_string(indent=False)
-        logger.debug(f"Dataflow data received: {sanitized_payload}")
+        # Get data from data flow and perform a basic check that we have an expected data structure. The payload is
+        # only copied and serialized for logging if debug logging is enabled.
+        with self._span_recorder.span("parse_payload"):
+            self._df_data = self._get_standard_input(lazy=lazy_payload)
+            self._check_payload_structure()
+        workflow_id = self._df_data.get("WorkflowId")
+        self._trace_context = TraceContext.from_workflow_id(None if workflow_id is None else str(workflow_id))
+        self._redacted_payload_strings: Dict[bool, str] = {}
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Dataflow data received: %s", self.get_payload_as_string(indent=False))
 
         # Parse url
         logger.debug("Parsing Data Flow URL")
@@ -233,8 +688,8 @@ class MIDataflowIntegration:
         parsed_url = urlparse(url)
         self._hostname = parsed_url.netloc
         self._dataflow_path = parsed_url.path
-        logger.debug(f'Data Flow hostname: "{self._hostname}"')
-        logger.debug(f'Data Flow path: "{self._dataflow_path}"')
+        logger.debug('Data Flow hostname: "%s"', self._hostname)
+        logger.debug('Data Flow path: "%s"', self._dataflow_path)
 
         # Authentication method
         client_credential_type = self._df_data["ClientCredentialType"]
@@ -242,7 +697,7 @@ class MIDataflowIntegration:
             self._authentication_mode = _AuthenticationMode(client_credential_type)
         except ValueError as e:
             raise NotImplementedError(f'Unknown ClientCredentialType "{client_credential_type}"') from e
-        logger.debug(f'Authentication mode: "{self._authentication_mode.name}"')
+        logger.debug('Authentication mode: "%s"', self._authentication_mode.name)
 
         # Configure HTTPS
         server_supports_https = parsed_url.scheme == "https"
@@ -279,11 +734,11 @@ class MIDataflowIntegration:
 
         # HTTPS is enabled, verification is enabled, and a CA certificate has been provided as an absolute Path
         elif isinstance(certificate_file, Path) and certificate_file.is_absolute():
-            logger.debug(f'CA certificate absolute file path "{certificate_file}" provided.')
+            logger.debug('CA certificate absolute file path "%s" provided.', certificate_file)
 
             self._ca_path = certificate_file
             if self._ca_path.is_file():
-                logger.debug(f'Successfully resolved file "{self._ca_path}"')
+                logger.debug('Successfully resolved file "%s"', self._ca_path)
             else:
                 raise FileNotFoundError(
                     f'CA certificate "{certificate_file}" not found. Ensure the path refers to a file on disk '
@@ -297,10 +752,10 @@ class MIDataflowIntegration:
             else:
                 value_type = "relative file path"
 
-            logger.debug(f'CA certificate {value_type} "{certificate_file}" provided.')
+            logger.debug('CA certificate %s "%s" provided.', value_type, certificate_file)
             self._ca_path = self.supporting_files_dir / certificate_file
             if self._ca_path.is_file():
-                logger.debug(f'Successfully resolved file "{self._ca_path}"')
+                logger.debug('Successfully resolved file "%s"', self._ca_path)
             else:
                 raise FileNotFoundError(
                     f'CA certificate "{certificate_file}" not found. Ensure the {value_type} is '
@@ -312,7 +767,13 @@ class MIDataflowIntegration:
         else:
             logger.debug("No CA certificate provided. Using public CAs to verify certificates.")
 
+        self._initialization_duration = time.perf_counter() - self._start_time
+        self._span_recorder.add("initialization", "phase", self._start_time, self._initialization_duration)
+        if deadline is not None:
+            self._start_watchdog(deadline)
+
         logger.info("------------------- Initialization complete --------------------")
+        self._start_profiler(profile_step, profile_dir)
 
     @classmethod
     def from_dict_payload(
@@ -326,6 +787,9 @@ class MIDataflowIntegration:
         Can be used for testing purposes to avoid needing to trigger the Python script from within Data Flow.
         See :meth:`~.MIDataflowIntegration.get_payload_as_dict` for information on generating a suitable payload.
 
+        This method is equivalent to :meth:`~.MIDataflowIntegration.from_payload`, and can be called from multiple
+        threads concurrently.
+
         Parameters
         ----------
         dataflow_payload : Dict[str, Any]
@@ -348,10 +812,7 @@ class MIDataflowIntegration:
         >>> dataflow_payload = {"WorkflowId": "67eb55ff-363a-42c7-9793-df363f1ecc83", ...: ...}
         >>> df = MIDataflowIntegration.from_dict_payload(dataflow_payload, verify_ssl=False)
         """
-        serialized_payload = json.dumps(dataflow_payload)
-        sys.stdin = StringIO(serialized_payload)
-        df = cls(**kwargs)
-        return df
+        return cls.from_payload(dataflow_payload, **kwargs)
 
     @classmethod
     def from_string_payload(
@@ -367,6 +828,8 @@ class MIDataflowIntegration:
         Can be used for testing purposes to avoid needing to trigger the Python script from within Data Flow.
         See :meth:`~.MIDataflowIntegration.get_payload_as_string` for information on generating a suitable payload.
 
+        The payload is parsed once. This method can be called from multiple threads concurrently.
+
         Parameters
         ----------
         dataflow_payload : str
@@ -396,15 +859,74 @@ class MIDataflowIntegration:
         >>> df = MIDataflowIntegration.from_string_payload(dataflow_payload, verify_ssl=False)
         """
         try:
-            json.loads(dataflow_payload)
+            return cls.from_payload(dataflow_payload, **kwargs)
         except json.JSONDecodeError as e:
             raise ValueError(
                 "'dataflow_payload' is not valid JSON. Ensure the dataflow_payload argument contains a valid JSON "
                 "string and try again."
             ) from e
-        sys.stdin = StringIO(dataflow_payload)
-        df = cls(**kwargs)
-        return df
+
+    @classmethod
+    def from_payload(
+        cls,
+        dataflow_payload: _PayloadSource,
+        **kwargs: Any,
+    ) -> "MIDataflowIntegration":
+        """
+        Instantiate an :class:`~.MIDataflowIntegration` object with a payload which is not read from ``stdin``.
+
+        Unlike the constructor, this method does not read ``stdin``, and does not modify any global state. It can be
+        called from multiple threads concurrently, for example to replay recorded payloads.
+
+        Parameters
+        ----------
+        dataflow_payload : str | bytes | Mapping[str, Any] | IO[str] | IO[bytes]
+            The Data Flow payload. Either a mapping which is used without being serialized, a JSON-formatted string,
+            or a file-like object from which a JSON-formatted payload is read. The top level of a mapping is copied,
+            but nested values are not, and must not be modified while the object is in use.
+        **kwargs
+            Additional keyword arguments are passed to the :class:`~.MIDataflowIntegration` constructor.
+
+        Returns
+        -------
+        MIDataflowIntegration
+            The instantiated class.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If the payload is not valid JSON.
+
+        Examples
+        --------
+        >>> with open("payload.json", "rb") as f:
+        ...     df = MIDataflowIntegration.from_payload(f, use_https=False)
+
+        >>> payloads = [json.loads(line) for line in open("payloads.jsonl")]
+        >>> with ThreadPoolExecutor() as executor:
+        ...     integrations = list(executor.map(MIDataflowIntegration.from_payload, payloads))
+        """
+        current_input = _step_input.get()
+        supporting_files_dir = current_input.supporting_files_dir if current_input else Path(sys.path[0])
+        token = _step_input.set(_StepInput(dataflow_payload, supporting_files_dir))
+        try:
+            return cls(**kwargs)
+        finally:
+            _step_input.reset(token)
+
+    def _check_payload_structure(self) -> None:
+        """
+        Check that the payload contains the authorization header.
+
+        Raises
+        ------
+        KeyError
+            If the payload does not contain the ``AuthorizationHeader`` key.
+        """
+        if "AuthorizationHeader" not in self._df_data:
+            raise KeyError(
+                'Key "AuthorizationHeader" not found in provided payload. Ensure the payload is correct and try again.'
+            )
 
     def get_payload_as_dict(self, include_credentials: bool = False) -> Dict[str, Any]:
         """
@@ -438,15 +960,11 @@ class MIDataflowIntegration:
         Alternatively, you can invoke this method with ``include_credentials=True``, however you **must** ensure that
         the result is stored securely to avoid leaking credentials.
         """
-        data = copy.deepcopy(self._df_data)
-        try:
-            if not include_credentials and data["AuthorizationHeader"]:
-                data["AuthorizationHeader"] = "<HeaderRemoved>"
-        except KeyError as e:
-            raise KeyError(
-                'Key "AuthorizationHeader" not found in provided payload. Ensure the payload is correct and try again.'
-            ) from e
-        return data
+        self._check_payload_structure()
+        if include_credentials:
+            return copy.deepcopy(self._get_payload_dict())
+        # Parsing the cached redacted JSON string produces an independent copy more cheaply than a deep copy.
+        return cast(Dict[str, Any], self._json_serializer.loads(self._get_redacted_payload_string(indent=False)))
 
     def get_payload_as_string(self, indent: bool = False, **kwargs: Any) -> str:
         """
@@ -471,12 +989,99 @@ class MIDataflowIntegration:
         str
             A static copy of a Data Flow data payload used for testing purposes.
         """
-        data = self.get_payload_as_dict(**kwargs)
+        include_credentials = kwargs.pop("include_credentials", False)
+        if kwargs:
+            raise TypeError(f"get_payload_as_string() got an unexpected keyword argument '{next(iter(kwargs))}'")
+        self._check_payload_structure()
+        if not include_credentials:
+            return self._get_redacted_payload_string(indent=indent)
+        data = self._get_payload_dict()
         if indent:
             return json.dumps(data, indent=4)
         else:
             return json.dumps(data)
 
+    def _get_redacted_payload_string(self, indent: bool) -> str:
+        """
+        Get the payload with credentials removed as a JSON string.
+
+        The result is cached, because the payload does not change after the class is instantiated.
+
+        Parameters
+        ----------
+        indent : bool
+            Whether to indent the JSON representation of the payload.
+
+        Returns
+        -------
+        str
+            The JSON representation of the redacted payload.
+        """
+        try:
+            return self._redacted_payload_strings[indent]
+        except KeyError:
+            pass
+        data = redact_payload(self._get_payload_dict())
+        result = json.dumps(data, indent=4) if indent else json.dumps(data)
+        self._redacted_payload_strings[indent] = result
+        return result
+
+    def _get_payload_dict(self) -> Dict[str, Any]:
+        """
+        Get the payload as a dictionary, decoding any values which have not been decoded yet.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The payload. This is not a copy, and must not be modified.
+        """
+        if isinstance(self._df_data, LazyPayload):
+            return self._df_data.to_dict()
+        return self._df_data
+
+    @cached_property
+    def workflow_payload(self) -> WorkflowPayload:
+        """
+        The payload used to instantiate this class, parsed into typed objects.
+
+        The payload is parsed the first time this property is accessed. Record references in the ``Record`` attribute
+        are parsed into :class:`~.RecordReference` objects and indexed by database key. Large Base64-encoded custom
+        values are decoded to temporary files, which are deleted when the workflow is resumed. See
+        :class:`~.CustomValues`.
+
+        Returns
+        -------
+        WorkflowPayload
+            The parsed Data Flow payload.
+
+        Examples
+        --------
+        >>> payload = dataflow_integration.workflow_payload
+        >>> payload.record.history_guid
+        'd2f51a3d-c274-4a1e-b7c9-8ba2976202cc'
+        >>> payload.get_record_references("MI_Training")
+        (RecordReference(history_guid='d2f51a3d-c274-4a1e-b7c9-8ba2976202cc', database_key='MI_Training'),)
+        """
+        return WorkflowPayload.from_dict(self._df_data, spill_threshold=self._custom_value_spill_threshold)
+
+    @property
+    def payload(self) -> Mapping[str, Any]:
+        """
+        A read-only view of the payload used to instantiate this class.
+
+        Accessing values through this view does not copy the payload. Nested objects and arrays are also returned as
+        read-only views. Use :meth:`~.MIDataflowIntegration.get_payload_as_dict` to obtain a mutable copy.
+
+        The value of ``AuthorizationHeader`` is replaced with ``"<HeaderRemoved>"`` for Basic and OIDC
+        authentication.
+
+        Returns
+        -------
+        Mapping[str, Any]
+            A read-only view of the Data Flow payload.
+        """
+        return _PayloadView(self._df_data)
+
     @property
     def service_layer_url(self) -> str:
         """
@@ -538,7 +1143,7 @@ class MIDataflowIntegration:
         if self._mi_session is not None:
             return self._mi_session
 
-        if mpy is None:
+        if _import_scripting_toolkit() is None:
             raise MissingClientModuleException(
                 "Could not find Scripting Toolkit. Ensure Scripting Toolkit is installed and try again."
             )
@@ -581,7 +1186,7 @@ class MIDataflowIntegration:
         """
         if self._mi_session is not None:
             return self._mi_session
-        if mpy is None:
+        if _import_scripting_toolkit() is None:
             raise MissingClientModuleException(
                 "Could not find Scripting Toolkit. Ensure Scripting Toolkit is installed and try again."
             )
@@ -618,16 +1223,22 @@ class MIDataflowIntegration:
         mpy.Session
             A Scripting Toolkit session object.
         """
-        if mpy.__version__ >= "5.0.0":
-            logger.debug("Using new Scripting Toolkit SessionBuilder API.")
-            return self._start_stk_session_from_dataflow_credentials_with_session_builder(
-                timeout=timeout, max_retries=max_retries
-            )
-        else:
-            logger.debug("Using legacy Scripting Toolkit connect API.")
-            return self._start_stk_session_from_dataflow_credentials_with_connect(
-                timeout=timeout, max_retries=max_retries
-            )
+        with self._span_recorder.span("scripting_toolkit_session"):
+            if self._propagate_trace_context:
+                logger.debug(
+                    "Scripting Toolkit requests do not include the traceparent header. Trace ID: %s",
+                    self._trace_context.trace_id,
+                )
+            if mpy.__version__ >= "5.0.0":
+                logger.debug("Using new Scripting Toolkit SessionBuilder API.")
+                return self._start_stk_session_from_dataflow_credentials_with_session_builder(
+                    timeout=timeout, max_retries=max_retries
+                )
+            else:
+                logger.debug("Using legacy Scripting Toolkit connect API.")
+                return self._start_stk_session_from_dataflow_credentials_with_connect(
+                    timeout=timeout, max_retries=max_retries
+                )
 
     def _start_stk_session_from_dataflow_credentials_with_connect(
         self,
@@ -659,6 +1270,7 @@ class MIDataflowIntegration:
         logger.debug("Creating MI Scripting Toolkit session.")
 
         session_args = {}
+        timeout = self._limit_scripting_toolkit_timeout(timeout)
         if timeout is not None:
             session_args["timeout"] = timeout
         if max_retries is not None:
@@ -713,6 +1325,7 @@ class MIDataflowIntegration:
         logger.debug("Creating MI Scripting Toolkit session.")
 
         session_configuration = mpy.SessionConfiguration()
+        timeout = self._limit_scripting_toolkit_timeout(timeout)
         if timeout is not None:
             session_configuration.timeout = timeout
         if max_retries is not None:
@@ -739,6 +1352,29 @@ class MIDataflowIntegration:
 
         return session
 
+    def _limit_scripting_toolkit_timeout(self, timeout: int | None) -> int | None:
+        """
+        Limit the Scripting Toolkit timeout to the time remaining until the step deadline.
+
+        Scripting Toolkit sessions are configured when they are created, and so the timeout is based on the time
+        remaining when the session is created.
+
+        Parameters
+        ----------
+        timeout : int | None
+            The requested timeout in milliseconds, or ``None`` to use the Scripting Toolkit default.
+
+        Returns
+        -------
+        int | None
+            The timeout in milliseconds.
+        """
+        remaining_time = self.remaining_time
+        if remaining_time is None:
+            return timeout
+        remaining_ms = max(1, int(remaining_time * 1000))
+        return remaining_ms if timeout is None else min(timeout, remaining_ms)
+
     @property
     def supporting_files_dir(self) -> Path:
         """
@@ -757,7 +1393,7 @@ class MIDataflowIntegration:
     def configure_pygranta_connection(
         self,
         pygranta_connection_class: Type[PyGranta_Connection_Class],
-        session_configuration: SessionConfiguration = SessionConfiguration(),
+        session_configuration: Optional["SessionConfiguration"] = None,
     ) -> PyGranta_Connection_Class:
         """
         Configure a PyGranta connection object with credentials provided by Data Flow.
@@ -796,34 +1432,68 @@ class MIDataflowIntegration:
         <JobQueueApiClient: url: http://my_mi_server/mi_servicelayer>
         """
         logger.debug("Creating PyGranta client.")
+        from ansys.openapi.common import ApiClientFactory, SessionConfiguration
 
         if not issubclass(pygranta_connection_class, ApiClientFactory):
             raise TypeError('"pygranta_connection_class" must be a subclass of ansys.openapi.common.ApiClientFactory')
 
-        session_configuration.verify_ssl = self._verify_ssl
-        if self._ca_path:
-            session_configuration.cert_store_path = str(self._ca_path)
-
-        # We rename the first argument from 'api_url' to 'servicelayer_url', so use a positional
-        # argument to avoid type errors.
-        builder = pygranta_connection_class(self.service_layer_url, session_configuration=session_configuration)
-
-        if self._authentication_mode == _AuthenticationMode.BASIC_AUTHENTICATION:
-            logger.debug("Using Basic authentication.")
-            username, password = self._get_basic_creds()
-            return builder.with_credentials(username=username, password=password)
-
-        elif self._authentication_mode == _AuthenticationMode.INTEGRATED_WINDOWS_AUTHENTICATION:
-            logger.debug("Using Windows authentication.")
-            return builder.with_autologon()
+        with self._span_recorder.span("pygranta_connection", client=pygranta_connection_class.__name__):
+            if session_configuration is None:
+                session_configuration = SessionConfiguration()
+
+            session_configuration.verify_ssl = self._verify_ssl
+            if self._ca_path:
+                session_configuration.cert_store_path = str(self._ca_path)
+
+            # We rename the first argument from 'api_url' to 'servicelayer_url', so use a positional
+            # argument to avoid type errors.
+            builder = pygranta_connection_class(self.service_layer_url, session_configuration=session_configuration)
+
+            # Replace the connection pool created by the builder with the shared transport, keeping the timeout and
+            # retry configuration of the builder's transport adapter. The session is a private attribute of
+            # ansys-openapi-common, so the builder keeps its own connection pool if it is not found.
+            from ._transport import get_client_session
+
+            timeout = session_configuration.request_timeout
+            max_retries: Any = 0
+            builder_session = get_client_session(builder)
+            if builder_session is not None:
+                builder_adapter = builder_session.get_adapter(self.service_layer_url)
+                timeout = getattr(builder_adapter, "timeout", timeout)
+                max_retries = getattr(builder_adapter, "max_retries", max_retries)
+                self._transport.mount(
+                    builder_session,
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    remaining_time=self._get_remaining_time,
+                )
 
-        elif self._authentication_mode == _AuthenticationMode.OIDC_AUTHENTICATION:
-            logger.debug("Using OIDC authentication.")
-            access_token = self._get_oidc_token()
-            return cast(PyGranta_Connection_Class, builder.with_oidc().with_access_token(access_token=access_token))
+            if self._authentication_mode == _AuthenticationMode.BASIC_AUTHENTICATION:
+                logger.debug("Using Basic authentication.")
+                username, password = self._get_basic_creds()
+                return builder.with_credentials(username=username, password=password)
+
+            elif self._authentication_mode == _AuthenticationMode.INTEGRATED_WINDOWS_AUTHENTICATION:
+                logger.debug("Using Windows authentication.")
+                return builder.with_autologon()
+
+            elif self._authentication_mode == _AuthenticationMode.OIDC_AUTHENTICATION:
+                logger.debug("Using OIDC authentication.")
+                access_token = self._get_oidc_token()
+                connection = builder.with_oidc().with_access_token(access_token=access_token)
+                # The OIDC session factory replaces the builder's session with a new session
+                connection_session = get_client_session(connection)
+                if connection_session is not None:
+                    self._transport.mount(
+                        connection_session,
+                        timeout=timeout,
+                        max_retries=max_retries,
+                        remaining_time=self._get_remaining_time,
+                    )
+                return cast(PyGranta_Connection_Class, connection)
 
-        else:
-            raise NotImplementedError(f"Unsupported authentication mode {self._authentication_mode.name}")
+            else:
+                raise NotImplementedError(f"Unsupported authentication mode {self._authentication_mode.name}")
 
     def _get_basic_creds(self) -> Tuple[str, str]:
         """
@@ -854,24 +1524,40 @@ class MIDataflowIntegration:
         access_token = auth_header[7:]
         return access_token
 
-    def _get_standard_input(self) -> dict[str, Any]:
+    def _get_standard_input(self, lazy: bool = False) -> dict[str, Any] | LazyPayload:
         """
         Parse the data payload from Data Flow to a dictionary.
 
+        Parameters
+        ----------
+        lazy : bool, default ``False``
+            Whether to decode the payload lazily.
+
         Returns
         -------
-        dict[str, Any]
+        dict[str, Any] | LazyPayload
             The parsed payload from Data Flow.
         """
-        return cast(dict[str, Any], json.load(sys.stdin))
-
-    def _get_workflow_id(self, data: dict[str, Any]) -> str:
+        step_input = _step_input.get()
+        source = step_input.payload if step_input is not None else sys.stdin
+        if isinstance(source, LazyPayload):
+            return source
+        if isinstance(source, Mapping):
+            return dict(source)
+        text = source if isinstance(source, (str, bytes)) else source.read()
+        if lazy:
+            if isinstance(text, bytes):
+                text = text.decode("utf-8")
+            return LazyPayload(text, loads=self._json_serializer.loads)
+        return cast(dict[str, Any], self._json_serializer.loads(text))
+
+    def _get_workflow_id(self, data: Mapping[str, Any]) -> str:
         """
         Extract the workflow ID from the parsed data payload.
 
         Parameters
         ----------
-        data : dict[str, Any]
+        data : Mapping[str, Any]
             The parsed payload from Data Flow.
 
         Returns
@@ -882,7 +1568,62 @@ class MIDataflowIntegration:
         return cast(str, data["WorkflowId"])
 
     @cached_property
-    def _api_session(self) -> requests.Session:
+    def _transport(self) -> "_HttpTransport":
+        """
+        Create the HTTP transport shared by the Data Flow API session and PyGranta clients.
+
+        Returns
+        -------
+        _HttpTransport
+            The shared HTTP transport.
+        """
+        from ._transport import _HttpTransport
+
+        configuration = self._transport_configuration or self._default_transport_configuration()
+        verify = self._verify_ssl if self._ca_path is None else str(self._ca_path)
+        transport = _HttpTransport(configuration, verify=verify)
+        transport.add_request_observer(self._record_request_span)
+        if self._propagate_trace_context:
+            transport.default_headers[TRACEPARENT_HEADER] = self._trace_context.traceparent
+        if self._http_metrics is not None:
+            transport.add_request_observer(self._http_metrics.observe)
+        return transport
+
+    def _record_request_span(self, record: "RequestRecord") -> None:
+        """
+        Record a span for a request sent through the shared transport.
+
+        Parameters
+        ----------
+        record : RequestRecord
+            The details of the request.
+        """
+        request, response = record.request, record.response
+        status_code = None if response is None else response.status_code
+        attributes = {
+            "method": request.method,
+            # The query string is not recorded, because it could contain sensitive values
+            "url": (request.url or "").split("?", 1)[0],
+            "status_code": status_code,
+        }
+        outcome: Literal["ok", "error"] = "error" if status_code is None or status_code >= 400 else "ok"
+        self._span_recorder.add("http_request", "call", record.start, record.duration, outcome, attributes)
+
+    def _default_transport_configuration(self) -> "TransportConfiguration":
+        """
+        Create the transport configuration used if no configuration was provided to the constructor.
+
+        Returns
+        -------
+        TransportConfiguration
+            The default transport configuration.
+        """
+        from ._transport import TransportConfiguration
+
+        return TransportConfiguration()
+
+    @cached_property
+    def _api_session(self) -> "requests.Session":
         """
         Create and configure a requests session for use with the Data Flow API.
 
@@ -891,8 +1632,10 @@ class MIDataflowIntegration:
         requests.Session
             A requests session configured for the Data Flow API.
         """
+        import requests
+
         session = requests.Session()
-        session.verify = self._verify_ssl if self._ca_path is None else str(self._ca_path)
+        self._transport.mount(session)
 
         if self._authentication_mode in [
             _AuthenticationMode.OIDC_AUTHENTICATION,
@@ -900,6 +1643,8 @@ class MIDataflowIntegration:
         ]:
             session.headers.update({"Authorization": self._df_data["AuthorizationHeader"]})
         elif self._authentication_mode == _AuthenticationMode.INTEGRATED_WINDOWS_AUTHENTICATION:
+            from requests_negotiate_sspi import HttpNegotiateAuth  # type: ignore
+
             session.auth = HttpNegotiateAuth()
         else:
             raise NotImplementedError()
@@ -914,23 +1659,385 @@ class MIDataflowIntegration:
         exit_code : str | int
             An exit code to inform Data Flow of success or otherwise of the business logic script.
         """
-        logger.debug(f"Returning control to MI Data Flow with exit code {exit_code}")
+        with self._resume_lock:
+            if self._is_already_resumed():
+                return
+            logger.debug("Returning control to MI Data Flow with exit code %s", exit_code)
+            self._end_business_logic(exit_code)
+            profile_summary = self._stop_profiler()
+            self._flush_api_log_handlers()
+            if profile_summary is not None:
+                try:
+                    self.log_msg_to_instance(profile_summary, "Info")
+                except Exception:
+                    logger.warning("Failed to log the step profile to the workflow instance.", exc_info=True)
+            if self._log_span_summary:
+                try:
+                    self.log_msg_to_instance(self.get_span_summary(), "Info")
+                except Exception:
+                    logger.warning("Failed to log the step timing summary to the workflow instance.", exc_info=True)
+
+            request_url, request_data = self._get_resume_bookmark_request(exit_code)
+            resume_start = time.perf_counter()
+            with self._span_recorder.span("resume_bookmark", exit_code=exit_code):
+                self._send_api_request("resume_bookmark", "POST", request_url, request_data)
+            self._set_resumed(exit_code, resume_start)
+        logger.info("---------------- Workflow successfully resumed -----------------")
+
+    def _set_resumed(self, exit_code: str | int, resume_start: float) -> None:
+        """
+        Record that the workflow has been resumed, stop the watchdog, and delete temporary payload files.
+
+        Parameters
+        ----------
+        exit_code : str | int
+            The exit code with which the workflow was resumed.
+        resume_start : float
+            The value of :func:`time.perf_counter` when the request to resume the workflow was started.
+        """
+        self._resumed = True
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+        if self._capture_file is not None:
+            self._capture_step(exit_code, resume_start)
+        if self._span_exporter is not None:
+            self._export_spans(exit_code)
+        if self._telemetry_store is not None:
+            self._record_telemetry(exit_code)
+        if self._http_metrics_file is not None:
+            try:
+                cast("HttpMetrics", self._http_metrics).write_prometheus(self._http_metrics_file, merge=True)
+            except Exception:
+                logger.exception("Failed to write HTTP metrics to %s.", self._http_metrics_file)
+        # Only clean up the parsed payload if it has been created
+        if "workflow_payload" in self.__dict__:
+            self.workflow_payload.close()
+
+    def _capture_step(self, exit_code: str | int, resume_start: float) -> None:
+        """
+        Append the redacted payload and the timing of the step to the capture file.
+
+        Failing to record the step is logged, but does not affect the step.
+
+        Parameters
+        ----------
+        exit_code : str | int
+            The exit code with which the workflow was resumed.
+        resume_start : float
+            The value of :func:`time.perf_counter` when the request to resume the workflow was started.
+        """
+        from datetime import datetime, timezone
+
+        from ._capture import append_capture_record
+
+        resume_end = time.perf_counter()
+        record = {
+            "captured_at": datetime.fromtimestamp(self._started_at, timezone.utc).isoformat(),
+            "exit_code": exit_code,
+            "timing": {
+                "initialization": self._initialization_duration,
+                "step": resume_start - self._start_time,
+                "resume": resume_end - resume_start,
+                "total": resume_end - self._start_time,
+            },
+            "retry_counts": self.retry_counts,
+            "payload": self.get_payload_as_dict(),
+        }
+        try:
+            append_capture_record(cast(str | Path, self._capture_file), self._json_serializer.dumps(record))
+        except Exception:
+            logger.exception('Failed to record the step in capture file "%s".', self._capture_file)
+
+    def _start_profiler(self, profile_step: bool | None, profile_dir: str | Path | None) -> None:
+        """
+        Start profiling the business logic if profiling is enabled by the argument or by the workflow custom values.
+
+        Parameters
+        ----------
+        profile_step : bool | None
+            Whether to profile the step. If ``None``, the ``ProfileStep`` custom value is used.
+        profile_dir : str | pathlib.Path | None
+            The directory to which the profile is written. If ``None``, the temporary directory is used.
+        """
+        if profile_step is None:
+            profile_step = _profiling_requested(self._df_data.get("CustomValues"))
+        if not profile_step:
+            return
+        if sys.version_info >= (3, 12):
+            # From Python 3.12, cProfile profiles all threads, so the work of other steps would be included
+            from ._step_host import _running_step_count
+
+            if _running_step_count() > 1:
+                logger.warning("The step is not profiled because other steps are running in the same process.")
+                return
+        import tempfile
+
+        from ._profiling import _StepProfiler
+
+        directory = Path(profile_dir) if profile_dir is not None else Path(tempfile.gettempdir())
+        name = f"dataflow_profile_{self._df_data.get('TransitionName')}_{self._trace_context.span_id}"
+        profiler = _StepProfiler(directory, name)
+        if profiler.start():
+            logger.info("Profiling the business logic of the step.")
+            self._profiler = profiler
+
+    def _stop_profiler(self) -> str | None:
+        """
+        Stop profiling the business logic and write the profile files.
+
+        Returns
+        -------
+        str | None
+            The profile summary to log to the workflow instance, or ``None`` if the step was not profiled.
+        """
+        if self._profiler is None:
+            return None
+        self._step_profile = self._profiler.stop()
+        self._profiler = None
+        return None if self._step_profile is None else self._step_profile.format()
+
+    def _end_business_logic(self, exit_code: str | int, deadline_exceeded: bool = False) -> None:
+        """
+        Record the business logic phase, from the end of initialization until the workflow is resumed.
+
+        Parameters
+        ----------
+        exit_code : str | int
+            The exit code with which the workflow is resumed. Any exit code other than ``0`` is recorded as an error.
+        deadline_exceeded : bool, default ``False``
+            Whether the business logic was interrupted by the step deadline, which is recorded as an error.
+        """
+        start = self._start_time + self._initialization_duration
+        failed = deadline_exceeded or str(exit_code) != "0"
+        attributes: dict[str, Any] = {"exit_code": exit_code}
+        if deadline_exceeded:
+            attributes["deadline_exceeded"] = True
+        self._span_recorder.add(
+            "business_logic",
+            "phase",
+            start,
+            time.perf_counter() - start,
+            "error" if failed else "ok",
+            attributes,
+        )
+
+    def _get_step_details(self, exit_code: str | int) -> dict[str, Any]:
+        """
+        Get the details of the step which are recorded with its spans.
+
+        Parameters
+        ----------
+        exit_code : str | int
+            The exit code with which the workflow was resumed.
+
+        Returns
+        -------
+        dict[str, Any]
+            The workflow ID, workflow definition ID, transition name, start time as an ISO 8601 string in UTC, exit
+            code, and the trace ID and span ID of the step.
+        """
+        from datetime import datetime, timezone
+
+        return {
+            "workflow_id": self._df_data.get("WorkflowId"),
+            "workflow_definition_id": self._df_data.get("WorkflowDefinitionId"),
+            "transition_name": self._df_data.get("TransitionName"),
+            "started_at": datetime.fromtimestamp(self._started_at, timezone.utc).isoformat(),
+            "exit_code": exit_code,
+            "trace_id": self._trace_context.trace_id,
+            "span_id": self._trace_context.span_id,
+        }
+
+    def _export_spans(self, exit_code: str | int) -> None:
+        """
+        Pass the spans recorded by the step to the span exporter.
+
+        Failing to export the spans is logged, but does not affect the step.
+
+        Parameters
+        ----------
+        exit_code : str | int
+            The exit code with which the workflow was resumed.
+        """
+        try:
+            cast(SpanExporter, self._span_exporter).export(self.spans, self._get_step_details(exit_code))
+        except Exception:
+            logger.exception("Failed to export the step timing spans with %r.", self._span_exporter)
+
+    def _record_telemetry(self, exit_code: str | int) -> None:
+        """
+        Add the telemetry of the step to the telemetry store.
+
+        Failing to record the telemetry is logged, but does not affect the step.
+
+        Parameters
+        ----------
+        exit_code : str | int
+            The exit code with which the workflow was resumed.
+        """
+        from ._telemetry import _step_telemetry, peak_memory
+
+        total_duration = time.perf_counter() - self._start_time
+        try:
+            telemetry = _step_telemetry(
+                self.spans, self._get_step_details(exit_code), self._started_at, total_duration, peak_memory()
+            )
+            cast("TelemetryStore", self._telemetry_store).add(telemetry)
+        except Exception:
+            logger.exception("Failed to record the step telemetry in %r.", self._telemetry_store)
+
+    @property
+    def spans(self) -> tuple[Span, ...]:
+        """
+        The timing spans recorded by the step so far.
+
+        A span is recorded for each phase of the step, and for each HTTP request sent to Granta MI through the
+        connection pool shared by the MI Data Flow API session and PyGranta clients. Phases are named:
+
+        * ``"parse_payload"``: Reading and parsing the payload.
+        * ``"initialization"``: Creating this object, including parsing the payload.
+        * ``"scripting_toolkit_session"``: Creating a Scripting Toolkit session.
+        * ``"pygranta_connection"``: Configuring a PyGranta connection with
+          :meth:`configure_pygranta_connection`, including authentication requests.
+        * ``"business_logic"``: From the end of initialization until the workflow is resumed. The outcome is
+          ``"error"`` if the exit code is not ``0``.
+        * ``"log_shipping"``: Each message logged to the workflow instance, including retries.
+        * ``"resume_bookmark"``: The request to resume the workflow, including retries.
+
+        HTTP requests are named ``"http_request"``, and have the kind ``"call"``. Requests sent by the Scripting
+        Toolkit are not recorded.
+
+        To limit memory use, at most 10,000 spans are kept. Further HTTP requests and repeated phases are not
+        recorded, and the number of dropped spans is included in :meth:`get_span_summary`.
+
+        Returns
+        -------
+        tuple[Span, ...]
+            The spans, in the order in which they ended.
+        """
+        return self._span_recorder.spans
+
+    @property
+    def trace_context(self) -> TraceContext:
+        """
+        The W3C trace context of the step.
+
+        The trace ID is derived from the workflow ID, so all the steps of a workflow instance share one trace. If the
+        payload does not include a workflow ID, the trace ID is random. The span ID is generated randomly for each
+        step. Unless ``propagate_trace_context`` is ``False``, the ``traceparent``
+        header is added to the requests sent by the MI Data Flow API session and by PyGranta clients created with
+        :meth:`configure_pygranta_connection`. The trace ID and span ID are also included with exported spans and in
+        the telemetry store.
+
+        The Scripting Toolkit sends requests with its own HTTP client, to which headers cannot be added. To correlate
+        other requests with the step, add the header to them.
+
+        Returns
+        -------
+        TraceContext
+            The trace context.
+
+        Examples
+        --------
+        >>> requests.get(url, headers={"traceparent": data_flow.trace_context.traceparent})
+        """
+        return self._trace_context
+
+    @property
+    def step_profile(self) -> Optional["StepProfile"]:
+        """
+        The profile of the business logic of the step.
+
+        The business logic is profiled if the ``profile_step`` argument is ``True``, or if it is not provided and the
+        ``ProfileStep`` custom value of the workflow is ``True`` or ``"true"``. Profiling starts at the end of
+        initialization and stops when :meth:`resume_bookmark` is called. If the step deadline resumes the workflow, the
+        profile is not recorded. If a step run by a :class:`~.StepHost` completes without resuming the workflow, for
+        example because it raises an exception, the profile is written but not logged to the workflow instance.
+
+        On Python 3.11 and earlier, only the thread which created this object is profiled. From Python 3.12,
+        :mod:`cProfile` profiles all the threads of the process, so the profile includes work done by other threads,
+        and the step is not profiled if other steps are running in the same :class:`~.StepHost`.
+
+        Returns
+        -------
+        StepProfile | None
+            The profile, or ``None`` if the step was not profiled or the workflow has not been resumed.
+        """
+        return self._step_profile
+
+    @property
+    def http_metrics(self) -> Optional["HttpMetrics"]:
+        """
+        The aggregates to which the requests sent by this step are added.
+
+        Returns
+        -------
+        HttpMetrics | None
+            The HTTP metrics, or ``None`` if requests are not measured.
+        """
+        return self._http_metrics
+
+    def get_span_summary(self) -> str:
+        """
+        Summarize the time taken by each phase of the step and by HTTP requests.
+
+        Returns
+        -------
+        str
+            A one-line summary of the spans recorded so far.
+
+        Examples
+        --------
+        >>> data_flow.get_span_summary()
+        'Step timing: parse_payload 0.4 ms, initialization 1.2 ms, pygranta_connection 48.3 ms, business_logic
+        1520.7 ms, log_shipping 31.0 ms (12 times). 15 HTTP requests (0 failed) took 74.9 ms.'
+        """
+        return summarize_spans(self.spans, self._span_recorder.dropped_count)
+
+    def _is_already_resumed(self) -> bool:
+        """
+        Check whether the workflow has already been resumed by this object.
+
+        Resuming a workflow is idempotent for a given workflow instance and transition, so repeated calls to
+        :meth:`.resume_bookmark` are ignored.
+
+        Returns
+        -------
+        bool
+            ``True`` if the workflow has already been resumed.
+        """
+        if self._resumed:
+            logger.warning(
+                'Workflow "%s" has already been resumed for transition "%s". Ignoring repeated request.',
+                self._get_workflow_id(self._df_data),
+                self._df_data["TransitionName"],
+            )
+        return self._resumed
+
+    def _get_resume_bookmark_request(self, exit_code: str | int) -> tuple[str, dict[str, Any]]:
+        """
+        Get the URL and body of the Data Flow API request which resumes the workflow.
+
+        Parameters
+        ----------
+        exit_code : str | int
+            An exit code to inform Data Flow of success or otherwise of the business logic script.
+
+        Returns
+        -------
+        tuple[str, dict[str, Any]]
+            The request URL and the JSON-serializable request body.
+        """
         request_data = {
             "Values": {"ExitCode": exit_code},
             "WorkflowDefinitionName": self._df_data["WorkflowDefinitionId"],
             "TransitionName": self._df_data["TransitionName"],
         }
 
-        logger.debug(f"Resuming bookmark using URL {self._dataflow_url}")
+        logger.debug("Resuming bookmark using URL %s", self._dataflow_url)
 
         request_url = f"{self._dataflow_url}/api/workflows/{self._get_workflow_id(self._df_data)}"
-        response = self._api_session.post(
-            url=request_url,
-            json=request_data,
-            timeout=self._requests_timeout,
-        )
-        response.raise_for_status()
-        logger.info("---------------- Workflow successfully resumed -----------------")
+        return request_url, request_data
 
     def log_msg_to_instance(self, msg: str, level: ApiLogLevel) -> None:
         """
@@ -946,6 +2053,26 @@ class MIDataflowIntegration:
         level : str
             The log level. One of: ``Verbose``, ``Debug``, ``Info``, ``Warn``, ``Error``, ``Fatal``.
         """
+        request_url, request_data = self._get_log_request(msg, level)
+        with self._span_recorder.span("log_shipping"):
+            self._send_api_request("log_msg_to_instance", "PUT", request_url, request_data)
+
+    def _get_log_request(self, msg: str, level: ApiLogLevel) -> tuple[str, dict[str, Any]]:
+        """
+        Get the URL and body of the Data Flow API request which logs a message to the workflow instance.
+
+        Parameters
+        ----------
+        msg : str
+            The message to log.
+        level : str
+            The log level.
+
+        Returns
+        -------
+        tuple[str, dict[str, Any]]
+            The request URL and the JSON-serializable request body.
+        """
         request_data: dict[str, Any] = {
             "Message": msg,
             "Level": level,
@@ -953,30 +2080,288 @@ class MIDataflowIntegration:
         }
 
         request_url = f"{self._dataflow_url}/api/logs"
-        response = self._api_session.put(
-            url=request_url,
-            json=request_data,
-            timeout=self._requests_timeout,
-        )
-        response.raise_for_status()
+        return request_url, request_data
+
+    @property
+    def remaining_time(self) -> float | None:
+        """
+        The time remaining until the step deadline.
+
+        Returns
+        -------
+        float | None
+            The time in seconds until the deadline, which is negative if the deadline has passed, or ``None`` if the
+            step has no deadline.
+        """
+        if self._deadline is None:
+            return None
+        return self._deadline - time.monotonic()
+
+    def _get_remaining_time(self) -> float | None:
+        """
+        Get the time remaining until the step deadline.
+
+        Used as a callback by transport adapters, which limit request timeouts to the remaining time.
+
+        Returns
+        -------
+        float | None
+            The time in seconds until the deadline, or ``None`` if the step has no deadline.
+        """
+        return self.remaining_time
+
+    def _start_watchdog(self, deadline: float) -> None:
+        """
+        Start a timer which resumes the workflow if the step has not resumed it before the deadline.
+
+        Parameters
+        ----------
+        deadline : float
+            The time in seconds until the deadline.
+        """
+        # Run in a copy of the current context, so that records logged by the watchdog are attributed to the step
+        self._watchdog = threading.Timer(deadline, copy_context().run, args=(self._on_deadline,))
+        self._watchdog.name = "MIDataflowWatchdog"
+        self._watchdog.daemon = True
+        self._watchdog.start()
+
+    def _on_deadline(self) -> None:
+        """
+        Resume the workflow with the deadline exit code.
+
+        Called by the watchdog timer. If the step is resuming the workflow when the deadline is reached, the step is
+        allowed to complete the request.
+        """
+        if not self._resume_lock.acquire(blocking=False):
+            return
+        try:
+            if self._resumed:
+                return
+            logger.error(
+                "Step deadline exceeded. Resuming the workflow with exit code %s before the step has completed.",
+                self._deadline_exit_code,
+            )
+            self._end_business_logic(self._deadline_exit_code, deadline_exceeded=True)
+            request_url, request_data = self._get_resume_bookmark_request(self._deadline_exit_code)
+            resume_start = time.perf_counter()
+            # The deadline has passed, so the request uses the standard timeout and retry policy.
+            with self._span_recorder.span("resume_bookmark", exit_code=self._deadline_exit_code):
+                self._send_api_request("resume_bookmark", "POST", request_url, request_data, apply_deadline=False)
+            self._set_resumed(self._deadline_exit_code, resume_start)
+        except Exception:
+            logger.exception("Failed to resume the workflow after the step deadline was exceeded.")
+        finally:
+            self._resume_lock.release()
+
+    @property
+    def retry_policy(self) -> "RetryPolicy":
+        """
+        The policy for retrying MI Data Flow API requests.
+
+        Returns
+        -------
+        RetryPolicy
+            The retry policy provided to the constructor, or the default policy.
+        """
+        if self._retry_policy is None:
+            from ._retry import RetryPolicy
+
+            self._retry_policy = RetryPolicy()
+        return self._retry_policy
+
+    @property
+    def retry_counts(self) -> Dict[str, int]:
+        """
+        The number of times MI Data Flow API requests have been retried, by operation.
+
+        Returns
+        -------
+        Dict[str, int]
+            A dictionary with the keys ``"resume_bookmark"`` and ``"log_msg_to_instance"``, and the number of retries
+            for each operation.
+        """
+        with self._retry_counts_lock:
+            return dict(self._retry_counts)
+
+    def _send_api_request(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        data: dict[str, Any],
+        apply_deadline: bool = True,
+    ) -> "requests.Response":
+        """
+        Send a request to the Data Flow API, retrying it according to the retry policy.
+
+        Parameters
+        ----------
+        operation : str
+            The name of the operation, used to count retries.
+        method : str
+            The HTTP method.
+        url : str
+            The request URL.
+        data : dict[str, Any]
+            The JSON-serializable request body.
+        apply_deadline : bool, default ``True``
+            Whether to limit the request timeout and retries to the time remaining until the step deadline.
+
+        Returns
+        -------
+        requests.Response
+            The successful response.
+        """
+        body = self._json_serializer.dumps(data)
+        attempt = 1
+        while True:
+            try:
+                timeout = self._get_request_timeout(apply_deadline)
+                response = self._api_session.request(
+                    method, url, data=body, headers=_JSON_CONTENT_TYPE_HEADER, timeout=timeout
+                )
+            except Exception as e:
+                delay = self._get_retry_delay(operation, attempt, exception=e, apply_deadline=apply_deadline)
+                if delay is None:
+                    raise
+            else:
+                delay = self._get_retry_delay(operation, attempt, response=response, apply_deadline=apply_deadline)
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_request_timeout(self, apply_deadline: bool = True) -> Any:
+        """
+        Get the timeout for a Data Flow API request.
+
+        Parameters
+        ----------
+        apply_deadline : bool, default ``True``
+            Whether to limit the timeout to the time remaining until the step deadline.
+
+        Returns
+        -------
+        float
+            The timeout in seconds.
+        """
+        if not apply_deadline or self._deadline is None:
+            return self._requests_timeout
+        from ._transport import limit_timeout
+
+        return limit_timeout(self._requests_timeout, self.remaining_time)
+
+    def _get_retry_delay(
+        self,
+        operation: str,
+        attempt: int,
+        response: Optional["requests.Response"] = None,
+        exception: BaseException | None = None,
+        apply_deadline: bool = True,
+    ) -> float | None:
+        """
+        Decide whether a Data Flow API request is retried, and record the retry.
+
+        Parameters
+        ----------
+        operation : str
+            The name of the operation, used to count retries and to decide whether a request which may have reached
+            the server is retried.
+        attempt : int
+            The number of the attempt which has completed, starting at 1.
+        response : requests.Response, optional
+            The response to the request, if one was received.
+        exception : BaseException, optional
+            The exception raised when sending the request, if no response was received.
+        apply_deadline : bool, default ``True``
+            Whether to stop retrying if the retry would start after the step deadline.
+
+        Returns
+        -------
+        float | None
+            The delay in seconds before the request is retried, or ``None`` if the request is not retried.
+        """
+        policy = self.retry_policy
+        if attempt >= policy.max_attempts:
+            return None
+        if exception is not None:
+            if not policy.is_retryable_exception(exception, operation in _IDEMPOTENT_OPERATIONS):
+                return None
+            reason = type(exception).__name__
+        elif response is not None and policy.is_retryable_response(response):
+            reason = f"HTTP status {response.status_code}"
+        else:
+            return None
+
+        delay = policy.get_delay(attempt, response)
+        remaining_time = self.remaining_time if apply_deadline else None
+        if remaining_time is not None and delay >= remaining_time:
+            return None
+        with self._retry_counts_lock:
+            self._retry_counts[operation] += 1
+        # Log messages emitted while sending a message to the Data Flow API could be sent to the Data Flow API by an
+        # API log handler, so retries of log messages are counted but not logged.
+        if operation != "log_msg_to_instance":
+            logger.warning(
+                "%s request failed with %s (attempt %d of %d). Retrying in %.2f s.",
+                operation,
+                reason,
+                attempt,
+                policy.max_attempts,
+                delay,
+            )
+        return delay
 
     def get_api_log_handler(
-        self, handler_type: Type["MIDataflowApiLogHandler"] = MIDataflowApiLogHandler
+        self,
+        handler_type: Type["MIDataflowApiLogHandler"] = MIDataflowApiLogHandler,
+        **kwargs: Any,
     ) -> "MIDataflowApiLogHandler":
         """
         Get a logging handler which logs messages to the Data Flow instance via the Data Flow API.
 
+        Handlers created by this method are flushed by :meth:`.resume_bookmark` before the workflow is resumed. If the
+        step is run by a :class:`~.StepHost`, the handler only receives records logged by the step, and is removed from
+        all loggers when the step completes.
+
         Parameters
         ----------
         handler_type : Type[MIDataflowApiLogHandler], default ``MIDataflowApiLogHandler``
-            The logging handler class to instantiate.
+            The logging handler class to instantiate. Use :class:`.MIDataflowQueuedApiLogHandler` to send messages
+            from a background thread.
+        **kwargs
+            Additional keyword arguments are passed to the handler constructor.
 
         Returns
         -------
         MIDataflowApiLogHandler
             A logging handler which logs messages to the Data Flow instance.
+
+        Examples
+        --------
+        >>> handler = data_flow.get_api_log_handler(
+        ...     MIDataflowQueuedApiLogHandler,
+        ...     max_queue_size=500,
+        ...     overflow_policy="drop_oldest",
+        ... )
         """
-        return handler_type(self.log_msg_to_instance)
+        handler = handler_type(self.log_msg_to_instance, **kwargs)
+        self._api_log_handlers.append(handler)
+        step_input = _step_input.get()
+        if step_input is not None and step_input.log_filter is not None:
+            handler.addFilter(step_input.log_filter)
+            step_input.log_handlers.append(handler)
+        return handler
+
+    def _flush_api_log_handlers(self) -> None:
+        """Wait until all messages emitted to handlers created by this object have been sent."""
+        for handler in self._api_log_handlers:
+            if isinstance(handler, MIDataflowQueuedApiLogHandler):
+                remaining_time = self.remaining_time
+                handler.flush(timeout=None if remaining_time is None else max(remaining_time, 0.0))
+            else:
+                handler.flush()
 
 
 class MissingClientModuleException(ImportError):  # noqa: N818
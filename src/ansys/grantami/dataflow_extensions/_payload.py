@@ -0,0 +1,949 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Read-only access to the payload provided by MI Data Flow."""
+
+import base64
+import binascii
+from collections.abc import Iterator, Mapping, Sequence
+import json
+import mmap
+import os
+from pathlib import Path
+import re
+import sys
+import tempfile
+import threading
+from typing import IO, Any, Callable, NamedTuple, Optional, Union, overload
+import weakref
+
+from ._logger import logger
+
+REDACTED_AUTHORIZATION_HEADER = "<HeaderRemoved>"
+
+# Keys which are decoded when a payload is parsed lazily, because they are required to instantiate the integration
+EAGER_PAYLOAD_KEYS = frozenset(
+    [
+        "WorkflowUrl",
+        "ClientCredentialType",
+        "AuthorizationHeader",
+        "WorkflowId",
+        "WorkflowDefinitionId",
+        "TransitionName",
+    ]
+)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURAL_CHARACTER = re.compile(r'["{}\[\]]')
+_DECODER = json.JSONDecoder()
+
+# Base64-encoded custom values are decoded in chunks of this many characters. Must be a multiple of 4.
+_BASE64_CHUNK_SIZE = 4 * 256 * 1024
+
+
+def _read_only(value: Any) -> Any:
+    """
+    Wrap a JSON container in a read-only view.
+
+    Parameters
+    ----------
+    value : Any
+        A value from the payload.
+
+    Returns
+    -------
+    Any
+        A read-only view of ``value`` if it is a dictionary or list, otherwise ``value``.
+    """
+    if isinstance(value, dict):
+        return _ReadOnlyMapping(value)
+    if isinstance(value, list):
+        return _ReadOnlySequence(value)
+    return value
+
+
+class _ReadOnlyMapping(Mapping[str, Any]):
+    """
+    A read-only view of a dictionary in the payload.
+
+    Nested dictionaries and lists are also returned as read-only views. The underlying data is not copied.
+
+    Parameters
+    ----------
+    data : dict[str, Any]
+        The dictionary to wrap.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return _read_only(self._data[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+
+class _ReadOnlySequence(Sequence[Any]):
+    """
+    A read-only view of a list in the payload.
+
+    Nested dictionaries and lists are also returned as read-only views. The underlying data is not copied.
+
+    Parameters
+    ----------
+    data : list[Any]
+        The list to wrap.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list[Any]) -> None:
+        self._data = data
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Any]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return _ReadOnlySequence(self._data[index])
+        return _read_only(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+class _PayloadView(_ReadOnlyMapping):
+    """
+    A read-only view of the payload provided by MI Data Flow, which hides the Basic or OIDC credentials.
+
+    The value of ``AuthorizationHeader`` is replaced by ``"<HeaderRemoved>"`` if it is not empty. The underlying data
+    is not copied.
+
+    Parameters
+    ----------
+    data : Mapping[str, Any]
+        The payload to wrap.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._data[key]
+        if key == "AuthorizationHeader" and value:
+            return REDACTED_AUTHORIZATION_HEADER
+        return _read_only(value)
+
+
+def redact_payload(data: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Get a shallow copy of the payload with the Basic or OIDC credentials removed.
+
+    Only the top level of the payload is copied. Nested values are shared with ``data``.
+
+    Parameters
+    ----------
+    data : Mapping[str, Any]
+        The payload.
+
+    Returns
+    -------
+    Mapping[str, Any]
+        The redacted payload, or ``data`` if it does not contain credentials.
+    """
+    if not data.get("AuthorizationHeader"):
+        return data
+    return {**data, "AuthorizationHeader": REDACTED_AUTHORIZATION_HEADER}
+
+
+class RecordReference(NamedTuple):
+    """
+    A reference to a Granta MI record included in the payload.
+
+    Parameters
+    ----------
+    history_guid : str
+        The record history GUID.
+    database_key : str
+        The key of the database which contains the record.
+    """
+
+    history_guid: str
+    database_key: str
+
+    @classmethod
+    def from_string(cls, value: str) -> "RecordReference":
+        """
+        Parse a record reference in the format used by the ``Record`` attribute of the payload.
+
+        Parameters
+        ----------
+        value : str
+            The record reference, in the format ``"<history GUID>+<database key>"``.
+
+        Returns
+        -------
+        RecordReference
+            The parsed record reference.
+
+        Raises
+        ------
+        ValueError
+            If the value is not in the expected format.
+        """
+        history_guid, separator, database_key = value.partition("+")
+        if not separator or not history_guid or not database_key:
+            raise ValueError(f'Record reference "{value}" is not in the format "<history GUID>+<database key>".')
+        # Interning the database key means that all references to the same database share one string
+        return cls(history_guid, sys.intern(database_key))
+
+
+class PayloadRecord:
+    """
+    The record which is the subject of the workflow.
+
+    Parameters
+    ----------
+    database_key : str
+        The key of the database which contains the record.
+    table_name : str
+        The name of the table which contains the record.
+    history_guid : str
+        The record history GUID.
+    """
+
+    __slots__ = ("database_key", "table_name", "history_guid")
+
+    def __init__(self, database_key: str, table_name: str, history_guid: str) -> None:
+        self.database_key = database_key
+        self.table_name = table_name
+        self.history_guid = history_guid
+
+    @property
+    def reference(self) -> RecordReference:
+        """
+        A reference to the record.
+
+        Returns
+        -------
+        RecordReference
+            The record history GUID and database key.
+        """
+        return RecordReference(self.history_guid, self.database_key)
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return (
+            f"{self.__class__.__name__}(database_key={self.database_key!r}, table_name={self.table_name!r}, "
+            f"history_guid={self.history_guid!r})"
+        )
+
+
+class PayloadAttribute:
+    """
+    An attribute value included in the payload.
+
+    Parameters
+    ----------
+    name : str
+        The attribute name.
+    value : Any
+        The attribute value.
+    unit : str, optional
+        The unit of the attribute value, if the attribute has a unit.
+    """
+
+    __slots__ = ("name", "value", "unit")
+
+    def __init__(self, name: str, value: Any, unit: Optional[str] = None) -> None:
+        self.name = name
+        self.value = value
+        self.unit = unit
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}(name={self.name!r}, value={self.value!r}, unit={self.unit!r})"
+
+
+class PayloadAttributes(Mapping[str, PayloadAttribute]):
+    """
+    The attribute values included in the payload, indexed by attribute name.
+
+    Parameters
+    ----------
+    attributes : dict[str, PayloadAttribute]
+        The attribute values, indexed by attribute name.
+    """
+
+    __slots__ = ("_attributes",)
+
+    def __init__(self, attributes: dict[str, PayloadAttribute]) -> None:
+        self._attributes = attributes
+
+    def __getitem__(self, name: str) -> PayloadAttribute:
+        return self._attributes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._attributes)
+
+    def __len__(self) -> int:
+        return len(self._attributes)
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}({list(self._attributes.values())!r})"
+
+
+def _remove_file(path: Path, buffer: Optional[mmap.mmap]) -> None:
+    """
+    Close the memory map of a file and delete the file.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The file to delete.
+    buffer : mmap.mmap, optional
+        The memory map of the file, if it has been created.
+    """
+    if buffer is not None:
+        try:
+            buffer.close()
+        except BufferError:
+            # A memoryview of the buffer is still in use. The map is closed when it is garbage collected.
+            logger.debug('Could not close memory map of "%s" because it is still in use.', path)
+    try:
+        path.unlink()
+    except OSError as e:
+        logger.debug('Could not delete temporary file "%s": %s', path, e)
+
+
+class CustomValueFile:
+    """
+    A Base64-encoded custom value which has been decoded to a temporary file.
+
+    The file is deleted when :meth:`close` is called, which happens automatically when the workflow is resumed.
+
+    Parameters
+    ----------
+    name : str
+        The name of the custom value.
+    path : pathlib.Path
+        The path to the temporary file.
+    size : int
+        The size of the decoded value in bytes.
+    """
+
+    __slots__ = ("name", "path", "size", "_buffer", "_finalizer", "__weakref__")
+
+    def __init__(self, name: str, path: Path, size: int) -> None:
+        self.name = name
+        self.path = path
+        self.size = size
+        self._buffer: Optional[mmap.mmap] = None
+        self._finalizer = weakref.finalize(self, _remove_file, path, None)
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the temporary file has been deleted.
+
+        Returns
+        -------
+        bool
+            ``True`` if :meth:`close` has been called.
+        """
+        return not self._finalizer.alive
+
+    @property
+    def buffer(self) -> Union[mmap.mmap, bytes]:
+        """
+        A read-only memory map of the decoded value.
+
+        The value is paged in from the temporary file as it is accessed, so it does not need to fit in memory.
+
+        Returns
+        -------
+        mmap.mmap | bytes
+            The memory-mapped file, or an empty bytes object if the value is empty.
+
+        Raises
+        ------
+        ValueError
+            If the file has been closed.
+        """
+        self._check_open()
+        if self.size == 0:
+            return b""
+        if self._buffer is None:
+            with self.path.open("rb") as f:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._finalizer.detach()
+            self._finalizer = weakref.finalize(self, _remove_file, self.path, self._buffer)
+        return self._buffer
+
+    def open(self) -> IO[bytes]:
+        """
+        Open the decoded value as a binary file.
+
+        Returns
+        -------
+        IO[bytes]
+            The file, opened for reading in binary mode.
+
+        Raises
+        ------
+        ValueError
+            If the file has been closed.
+        """
+        self._check_open()
+        return self.path.open("rb")
+
+    def close(self) -> None:
+        """Close the memory map and delete the temporary file. Has no effect if the file is already closed."""
+        self._finalizer()
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError(f'Custom value file "{self.name}" has been closed.')
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}(name={self.name!r}, path={str(self.path)!r}, size={self.size})"
+
+    @classmethod
+    def from_base64(cls, name: str, value: str) -> Optional["CustomValueFile"]:
+        """
+        Decode a Base64-encoded value to a temporary file.
+
+        The value is decoded in chunks, so the decoded value is never held in memory in full.
+
+        Parameters
+        ----------
+        name : str
+            The name of the custom value.
+        value : str
+            The Base64-encoded value.
+
+        Returns
+        -------
+        CustomValueFile | None
+            The decoded value, or ``None`` if ``value`` is not valid Base64.
+        """
+        handle, filename = tempfile.mkstemp(prefix="dataflow_custom_value_", suffix=".bin")
+        path = Path(filename)
+        size = 0
+        try:
+            with os.fdopen(handle, "wb") as f:
+                for start in range(0, len(value), _BASE64_CHUNK_SIZE):
+                    chunk = base64.b64decode(value[start : start + _BASE64_CHUNK_SIZE], validate=True)
+                    f.write(chunk)
+                    size += len(chunk)
+        except (binascii.Error, ValueError):
+            _remove_file(path, None)
+            return None
+        except BaseException:
+            _remove_file(path, None)
+            raise
+        logger.debug('Decoded custom value "%s" to temporary file "%s" (%d bytes).', name, path, size)
+        return cls(name, path, size)
+
+
+class CustomValues(Mapping[str, Any]):
+    """
+    The custom values defined for the workflow, indexed by name.
+
+    Base64-encoded values longer than ``spill_threshold`` characters are decoded to a temporary file the first time
+    they are accessed, and are returned as a :class:`~.CustomValueFile`. Other values are returned unchanged.
+
+    Parameters
+    ----------
+    values : Mapping[str, Any]
+        The custom values, indexed by name.
+    spill_threshold : int | None, default ``None``
+        The length in characters above which Base64-encoded values are decoded to a temporary file. If ``None``,
+        values are never decoded.
+    """
+
+    __slots__ = ("_values", "_spill_threshold", "_files", "_lock")
+
+    def __init__(self, values: Mapping[str, Any], spill_threshold: Optional[int] = None) -> None:
+        self._values = values
+        self._spill_threshold = spill_threshold
+        # Decoded files, or None for large values which are not Base64-encoded
+        self._files: dict[str, Optional[CustomValueFile]] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Any:
+        value = self._values[name]
+        if self._spill_threshold is None or not isinstance(value, str) or len(value) <= self._spill_threshold:
+            return _read_only(value)
+        with self._lock:
+            if name not in self._files:
+                self._files[name] = CustomValueFile.from_base64(name, value)
+            file = self._files[name]
+        if file is None or file.closed:
+            return value
+        return file
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def close(self) -> None:
+        """Delete the temporary files created for Base64-encoded values."""
+        with self._lock:
+            files = list(self._files.values())
+        for file in files:
+            if file is not None:
+                file.close()
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}({list(self._values)!r})"
+
+
+class WorkflowPayload:
+    """
+    The payload provided by MI Data Flow, parsed into typed objects.
+
+    Use :meth:`from_dict` to create an instance from a payload dictionary. Record references in the ``Record``
+    attribute are parsed once and indexed by database key.
+
+    Parameters
+    ----------
+    workflow_id : str
+        The ID of the workflow instance.
+    workflow_definition_id : str
+        The ID of the workflow definition.
+    transition_name : str
+        The name of the transition which triggered the step.
+    workflow_url : str
+        The URL of the MI Data Flow server.
+    client_credential_type : str
+        The type of credentials used by MI Data Flow.
+    record : PayloadRecord, optional
+        The record which is the subject of the workflow.
+    attributes : PayloadAttributes
+        The attribute values included in the payload.
+    custom_values : CustomValues
+        The custom values defined for the workflow.
+    record_references : tuple[RecordReference, ...]
+        The records referenced by the ``Record`` attribute.
+    """
+
+    __slots__ = (
+        "workflow_id",
+        "workflow_definition_id",
+        "transition_name",
+        "workflow_url",
+        "client_credential_type",
+        "record",
+        "attributes",
+        "custom_values",
+        "record_references",
+        "_references_by_database",
+    )
+
+    def __init__(
+        self,
+        workflow_id: str,
+        workflow_definition_id: str,
+        transition_name: str,
+        workflow_url: str,
+        client_credential_type: str,
+        record: Optional[PayloadRecord],
+        attributes: PayloadAttributes,
+        custom_values: CustomValues,
+        record_references: tuple[RecordReference, ...],
+    ) -> None:
+        self.workflow_id = workflow_id
+        self.workflow_definition_id = workflow_definition_id
+        self.transition_name = transition_name
+        self.workflow_url = workflow_url
+        self.client_credential_type = client_credential_type
+        self.record = record
+        self.attributes = attributes
+        self.custom_values = custom_values
+        self.record_references = record_references
+        references_by_database: dict[str, list[RecordReference]] = {}
+        for reference in record_references:
+            references_by_database.setdefault(reference.database_key, []).append(reference)
+        self._references_by_database = {key: tuple(value) for key, value in references_by_database.items()}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], spill_threshold: Optional[int] = None) -> "WorkflowPayload":
+        """
+        Parse a payload dictionary.
+
+        Keys which are missing from the payload are set to an empty string, and record references which are not in
+        the expected format are ignored.
+
+        Parameters
+        ----------
+        data : Mapping[str, Any]
+            The payload provided by MI Data Flow.
+        spill_threshold : int | None, default ``None``
+            The length in characters above which Base64-encoded custom values are decoded to a temporary file. See
+            :class:`~.CustomValues`.
+
+        Returns
+        -------
+        WorkflowPayload
+            The parsed payload.
+        """
+        record_data = data.get("Record")
+        record = None
+        if isinstance(record_data, dict):
+            record = PayloadRecord(
+                database_key=record_data.get("Database", ""),
+                table_name=record_data.get("Table", ""),
+                history_guid=record_data.get("RecordHistoryGuid", ""),
+            )
+
+        attributes = {}
+        for name, attribute_data in (data.get("Attributes") or {}).items():
+            if isinstance(attribute_data, dict):
+                attributes[name] = PayloadAttribute(name, attribute_data.get("Value"), attribute_data.get("Unit"))
+            else:
+                attributes[name] = PayloadAttribute(name, attribute_data)
+
+        record_references = []
+        record_attribute = attributes.get("Record")
+        if record_attribute is not None:
+            values = record_attribute.value
+            for value in values if isinstance(values, list) else [values]:
+                try:
+                    record_references.append(RecordReference.from_string(value))
+                except (TypeError, AttributeError, ValueError):
+                    logger.warning('Ignoring record reference "%s" which could not be parsed.', value)
+
+        return cls(
+            workflow_id=data.get("WorkflowId", ""),
+            workflow_definition_id=data.get("WorkflowDefinitionId", ""),
+            transition_name=data.get("TransitionName", ""),
+            workflow_url=data.get("WorkflowUrl", ""),
+            client_credential_type=data.get("ClientCredentialType", ""),
+            record=record,
+            attributes=PayloadAttributes(attributes),
+            custom_values=CustomValues(data.get("CustomValues") or {}, spill_threshold),
+            record_references=tuple(record_references),
+        )
+
+    @property
+    def database_keys(self) -> tuple[str, ...]:
+        """
+        The keys of the databases which contain the records referenced by the ``Record`` attribute.
+
+        Returns
+        -------
+        tuple[str, ...]
+            The database keys, in the order in which they first appear in the payload.
+        """
+        return tuple(self._references_by_database)
+
+    def get_record_references(self, database_key: str) -> tuple[RecordReference, ...]:
+        """
+        Get the records referenced by the ``Record`` attribute which are in a database.
+
+        Parameters
+        ----------
+        database_key : str
+            The database key.
+
+        Returns
+        -------
+        tuple[RecordReference, ...]
+            The record references in the database, or an empty tuple if no records in the database are referenced.
+        """
+        return self._references_by_database.get(database_key, ())
+
+    def close(self) -> None:
+        """Delete the temporary files created for Base64-encoded custom values."""
+        self.custom_values.close()
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return (
+            f"{self.__class__.__name__}(workflow_id={self.workflow_id!r}, "
+            f"workflow_definition_id={self.workflow_definition_id!r}, transition_name={self.transition_name!r}, "
+            f"record={self.record!r}, record_references={len(self.record_references)})"
+        )
+
+
+class _Deferred:
+    """
+    A payload value which has not been decoded.
+
+    Parameters
+    ----------
+    start : int
+        The index of the first character of the value in the payload string.
+    end : int
+        The index after the last character of the value in the payload string.
+    """
+
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: int, end: int) -> None:
+        self.start = start
+        self.end = end
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    return _WHITESPACE.match(text, index).end()  # type: ignore[union-attr]
+
+
+def _skip_string(text: str, index: int) -> int:
+    """
+    Find the end of the JSON string which starts at ``index``.
+
+    The closing quote is found with :meth:`str.find`, which is much faster than a regular expression for the long
+    Base64-encoded strings which are often included in a payload.
+
+    Parameters
+    ----------
+    text : str
+        The JSON document.
+    index : int
+        The index of the opening quote.
+
+    Returns
+    -------
+    int
+        The index after the closing quote.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the string is not terminated.
+    """
+    position = index + 1
+    while True:
+        end = text.find('"', position)
+        if end < 0:
+            raise json.JSONDecodeError("Unterminated string starting at", text, index)
+        # The quote is escaped if it is preceded by an odd number of backslashes
+        start_of_escapes = end
+        while text[start_of_escapes - 1] == "\\":
+            start_of_escapes -= 1
+        if (end - start_of_escapes) % 2 == 0:
+            return end + 1
+        position = end + 1
+
+
+def _skip_value(text: str, index: int) -> int:
+    """
+    Find the end of the JSON value which starts at ``index`` without decoding it.
+
+    Objects and arrays are skipped by matching brackets in a single pass. Each step searches for the next bracket or
+    quote, and strings are skipped by :func:`_skip_string`, so the time taken is linear in the length of the value
+    whatever the length of the strings it contains. Scalar values are decoded, because they are short.
+
+    Parameters
+    ----------
+    text : str
+        The JSON document.
+    index : int
+        The index of the first character of the value.
+
+    Returns
+    -------
+    int
+        The index after the end of the value.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the value is not terminated.
+    """
+    character = text[index : index + 1]
+    if character == '"':
+        return _skip_string(text, index)
+    if character not in ("{", "["):
+        return _DECODER.raw_decode(text, index)[1]
+    depth = 1
+    position = index + 1
+    while depth:
+        match = _STRUCTURAL_CHARACTER.search(text, position)
+        if match is None:
+            raise json.JSONDecodeError("Unterminated object or array starting at", text, index)
+        character = match.group()
+        if character == '"':
+            position = _skip_string(text, match.start())
+        else:
+            depth += 1 if character in ("{", "[") else -1
+            position = match.end()
+    return position
+
+
+class LazyPayload(Mapping[str, Any]):
+    """
+    A payload which is decoded from a JSON string on demand.
+
+    The top level of the payload is scanned when the object is created. Values of the keys in
+    ``EAGER_PAYLOAD_KEYS`` are decoded immediately. Other values are decoded the first time they are accessed. The JSON
+    string is released once all values have been decoded.
+
+    Parameters
+    ----------
+    text : str
+        The payload, serialized as a JSON object.
+    loads : Callable[[str], Any], optional
+        The function used to decode values which are decoded on demand. If not provided, values are decoded with the
+        :mod:`json` module in the standard library.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If ``text`` is not a JSON object, or the value of a key in ``EAGER_PAYLOAD_KEYS`` is invalid. Invalid values
+        of other keys raise this exception when they are accessed.
+    """
+
+    __slots__ = ("_text", "_values", "_deferred_count", "_lock", "_loads")
+
+    def __init__(self, text: str, loads: Optional[Callable[[str], Any]] = None) -> None:
+        self._text = text
+        self._loads = loads
+        self._values: dict[str, Any] = {}
+        self._deferred_count = 0
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self) -> None:
+        text = self._text
+        index = _skip_whitespace(text, 0)
+        if text[index : index + 1] != "{":
+            raise json.JSONDecodeError("Expecting '{'", text, index)
+        index = _skip_whitespace(text, index + 1)
+        if text[index : index + 1] == "}":
+            index += 1
+        else:
+            while True:
+                if text[index : index + 1] != '"':
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, index)
+                key, index = _DECODER.raw_decode(text, index)
+                index = _skip_whitespace(text, index)
+                if text[index : index + 1] != ":":
+                    raise json.JSONDecodeError("Expecting ':' delimiter", text, index)
+                index = _skip_whitespace(text, index + 1)
+                if key in EAGER_PAYLOAD_KEYS:
+                    if isinstance(self._values.get(key), _Deferred):
+                        self._deferred_count -= 1
+                    self._values[key], index = _DECODER.raw_decode(text, index)
+                else:
+                    end = _skip_value(text, index)
+                    if not isinstance(self._values.get(key), _Deferred):
+                        self._deferred_count += 1
+                    self._values[key] = _Deferred(index, end)
+                    index = end
+                index = _skip_whitespace(text, index)
+                delimiter = text[index : index + 1]
+                if delimiter == "}":
+                    index += 1
+                    break
+                if delimiter != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+                index = _skip_whitespace(text, index + 1)
+        if _skip_whitespace(text, index) != len(text):
+            raise json.JSONDecodeError("Extra data", text, index)
+        if not self._deferred_count:
+            self._text = ""
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._values[key]
+        if not isinstance(value, _Deferred):
+            return value
+        with self._lock:
+            value = self._values[key]
+            if isinstance(value, _Deferred):
+                if self._loads is None:
+                    value = _DECODER.raw_decode(self._text, value.start)[0]
+                else:
+                    value = self._loads(self._text[value.start : value.end])
+                self._values[key] = value
+                self._deferred_count -= 1
+                if not self._deferred_count:
+                    self._text = ""
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values
+
+    def is_decoded(self, key: str) -> bool:
+        """
+        Check whether the value of a key has been decoded.
+
+        Parameters
+        ----------
+        key : str
+            The key.
+
+        Returns
+        -------
+        bool
+            Whether the value has been decoded.
+        """
+        return not isinstance(self._values[key], _Deferred)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Decode all values and get the payload as a dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            The decoded payload. This is the dictionary used to store the payload, not a copy.
+        """
+        for key in self._values:
+            self[key]
+        return self._values
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}(keys={list(self._values)!r}, deferred={self._deferred_count})"
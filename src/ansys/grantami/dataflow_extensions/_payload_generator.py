@@ -0,0 +1,260 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Generate synthetic MI Data Flow payloads of configurable size for load, benchmark, and memory tests."""
+
+import base64
+import random
+import string
+from typing import Any, Literal, get_args
+import uuid
+
+ClientCredentialType = Literal["Windows", "Basic", "None"]
+
+DEFAULT_WORKFLOW_URL = "https://localhost/mi_dataflow/"
+
+_PLACEHOLDER_CREDENTIALS = base64.b64encode(b"load_test_user:load_test_password").decode("ascii")
+_ACCESS_TOKEN_BYTES = 768
+_UNITS = ("MPa", "mm", "kg/m^3", "K", "%")
+# Text is generated as a random block which is repeated, so that very large values can be generated quickly
+_TEXT_BLOCK_SIZE = 4096
+
+
+def _uuid(rng: random.Random) -> str:
+    """
+    Generate a random version 4 UUID with a seeded random number generator.
+
+    Parameters
+    ----------
+    rng : random.Random
+        The random number generator.
+
+    Returns
+    -------
+    str
+        The UUID.
+    """
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _text(rng: random.Random, size: int) -> str:
+    """
+    Generate text made of random words.
+
+    The text contains spaces, so it is never mistaken for a Base64-encoded value.
+
+    Parameters
+    ----------
+    rng : random.Random
+        The random number generator.
+    size : int
+        The length of the text in characters.
+
+    Returns
+    -------
+    str
+        The text.
+    """
+    words = []
+    length = 0
+    while length < min(size, _TEXT_BLOCK_SIZE):
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        words.append(word)
+        length += len(word) + 1
+    block = " ".join(words) + " "
+    return (block * (size // len(block) + 1))[:size]
+
+
+def _authorization_header(client_credential_type: str, rng: random.Random) -> str:
+    """
+    Generate the ``AuthorizationHeader`` value sent by MI Data Flow for a type of credentials.
+
+    Parameters
+    ----------
+    client_credential_type : str
+        The ``ClientCredentialType`` value.
+    rng : random.Random
+        The random number generator.
+
+    Returns
+    -------
+    str
+        An empty string for Windows authentication, Basic authentication with placeholder credentials, or a random
+        bearer token for OIDC authentication.
+    """
+    if client_credential_type == "Windows":
+        return ""
+    if client_credential_type == "Basic":
+        return f"Basic {_PLACEHOLDER_CREDENTIALS}"
+    return f"Bearer {base64.urlsafe_b64encode(rng.randbytes(_ACCESS_TOKEN_BYTES)).decode('ascii')}"
+
+
+def _attribute(index: int, value_size: int, rng: random.Random) -> dict[str, Any]:
+    """
+    Generate an attribute value, cycling between text, point, and multi-valued attributes.
+
+    Parameters
+    ----------
+    index : int
+        The index of the attribute.
+    value_size : int
+        The length of text values in characters.
+    rng : random.Random
+        The random number generator.
+
+    Returns
+    -------
+    dict[str, Any]
+        The attribute, in the format used by the ``Attributes`` key of the payload.
+    """
+    kind = index % 3
+    if kind == 0:
+        return {"Value": _text(rng, value_size)}
+    if kind == 1:
+        return {"Value": round(rng.uniform(0, 1000), 3), "Unit": _UNITS[index % len(_UNITS)]}
+    return {"Value": [_text(rng, max(1, value_size // 4)) for _ in range(4)]}
+
+
+def generate_payload(
+    client_credential_type: ClientCredentialType = "Basic",
+    workflow_url: str = DEFAULT_WORKFLOW_URL,
+    *,
+    record_count: int = 1,
+    database_count: int = 1,
+    attribute_count: int = 0,
+    attribute_value_size: int = 32,
+    custom_value_count: int = 0,
+    custom_value_size: int = 32,
+    blob_count: int = 0,
+    blob_size: int = 1024,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    """
+    Generate a valid MI Data Flow payload of configurable size.
+
+    The payload has the same structure as a payload provided by MI Data Flow, and can be passed to
+    :meth:`~.MIDataflowIntegration.from_dict_payload`. Use it to test steps, benchmarks, and memory use with payloads
+    of realistic or extreme size without access to a Granta MI server.
+
+    Parameters
+    ----------
+    client_credential_type : {"Windows", "Basic", "None"}, default ``"Basic"``
+        The type of credentials. Basic authentication uses placeholder credentials, and OIDC authentication
+        (``"None"``) uses a random bearer token.
+    workflow_url : str, default ``"https://localhost/mi_dataflow/"``
+        The URL of the MI Data Flow API. OIDC authentication requires an HTTPS URL.
+    record_count : int, default ``1``
+        The number of record references in the ``Record`` attribute.
+    database_count : int, default ``1``
+        The number of databases across which the record references are distributed.
+    attribute_count : int, default ``0``
+        The number of attributes in addition to ``Record`` and ``TransitionId``. Attributes alternate between text,
+        point, and multi-valued text values.
+    attribute_value_size : int, default ``32``
+        The length in characters of text attribute values.
+    custom_value_count : int, default ``0``
+        The number of text custom values.
+    custom_value_size : int, default ``32``
+        The length in characters of each text custom value.
+    blob_count : int, default ``0``
+        The number of custom values which contain Base64-encoded binary data.
+    blob_size : int, default ``1024``
+        The size in bytes of the binary data in each Base64-encoded custom value, before encoding.
+    seed : int, optional
+        The seed for generated IDs, values, and tokens. If ``None``, each payload is different.
+
+    Returns
+    -------
+    dict[str, Any]
+        The payload.
+
+    Raises
+    ------
+    ValueError
+        If ``client_credential_type`` is not supported, if ``database_count`` is less than 1, or if a count or size is
+        negative.
+
+    Examples
+    --------
+    >>> payload = generate_payload("Windows", record_count=10_000, database_count=3, blob_count=1, blob_size=50_000_000)
+    >>> data_flow = MIDataflowIntegration.from_dict_payload(payload)
+    >>> len(data_flow.workflow_payload.record_references)
+    10000
+    """
+    if client_credential_type not in get_args(ClientCredentialType):
+        raise ValueError(
+            f'Unknown ClientCredentialType "{client_credential_type}". '
+            f"Must be one of {', '.join(get_args(ClientCredentialType))}."
+        )
+    if database_count < 1:
+        raise ValueError(f'"database_count" must be at least 1. Value provided was {database_count}.')
+    for name, value in [
+        ("record_count", record_count),
+        ("attribute_count", attribute_count),
+        ("attribute_value_size", attribute_value_size),
+        ("custom_value_count", custom_value_count),
+        ("custom_value_size", custom_value_size),
+        ("blob_count", blob_count),
+        ("blob_size", blob_size),
+    ]:
+        if value < 0:
+            raise ValueError(f'"{name}" must not be negative. Value provided was {value}.')
+
+    rng = random.Random(seed)
+    database_keys = ["MI_Training"] + [f"MI_Database_{index}" for index in range(1, database_count)]
+    history_guids = [_uuid(rng) for _ in range(record_count)]
+    references = [f"{guid}+{database_keys[index % database_count]}" for index, guid in enumerate(history_guids)]
+
+    attributes: dict[str, Any] = {
+        "Record": {"Value": references},
+        "TransitionId": {"Value": _uuid(rng)},
+    }
+    for index in range(attribute_count):
+        attributes[f"Attribute {index}"] = _attribute(index, attribute_value_size, rng)
+
+    custom_values: dict[str, Any] = {}
+    for index in range(custom_value_count):
+        custom_values[f"Custom value {index}"] = _text(rng, custom_value_size)
+    for index in range(blob_count):
+        custom_values[f"Blob {index}"] = base64.b64encode(rng.randbytes(blob_size)).decode("ascii")
+
+    payload: dict[str, Any] = {
+        "WorkflowId": _uuid(rng),
+        "WorkflowDefinitionId": "Synthetic; Version=1.0.0.0",
+        "TransitionName": f"Python_{_uuid(rng)}",
+    }
+    if history_guids:
+        payload["Record"] = {
+            "Database": database_keys[0],
+            "Table": "Synthetic records",
+            "RecordHistoryGuid": history_guids[0],
+        }
+    payload.update(
+        {
+            "WorkflowUrl": workflow_url,
+            "AuthorizationHeader": _authorization_header(client_credential_type, rng),
+            "ClientCredentialType": client_credential_type,
+            "Attributes": attributes,
+            "CustomValues": custom_values,
+        }
+    )
+    return payload
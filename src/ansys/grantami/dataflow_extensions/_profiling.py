@@ -0,0 +1,305 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Deterministic profiling of the business logic of a step."""
+
+from collections import defaultdict
+import cProfile
+from pathlib import Path
+import pstats
+import re
+import threading
+import time
+from typing import Any, Mapping, NamedTuple
+
+from ._logger import logger
+
+# The number of functions included in the profile summary logged to the workflow instance
+_TOP_FUNCTIONS = 10
+
+# Stacks which account for less than this fraction of the profile are omitted from the collapsed stack file, so that
+# the number of stacks stays small when functions are called from many places
+_MIN_STACK_FRACTION = 1e-4
+_MAX_STACK_DEPTH = 200
+
+# pstats identifies a function with a (filename, line number, function name) tuple
+_Function = tuple[str, int, str]
+
+
+class ProfiledFunction(NamedTuple):
+    """
+    A function called by the business logic of a profiled step.
+
+    Parameters
+    ----------
+    function : str
+        The function, as ``filename:line(name)``. Built-in functions are identified by their name only.
+    calls : int
+        The number of times the function was called.
+    own_time : float
+        The time spent in the function itself, excluding the functions it called, in seconds.
+    cumulative_time : float
+        The time spent in the function and the functions it called, in seconds.
+    """
+
+    function: str
+    calls: int
+    own_time: float
+    cumulative_time: float
+
+
+class StepProfile(NamedTuple):
+    """
+    The profile of the business logic of a step.
+
+    Parameters
+    ----------
+    duration : float
+        The duration of the profiled business logic in seconds.
+    hot_functions : list[ProfiledFunction]
+        The functions with the highest own time, slowest first.
+    pstats_file : pathlib.Path | None
+        The profile in the format written by :meth:`cProfile.Profile.dump_stats`, which can be read with
+        :class:`pstats.Stats` or with viewers such as SnakeViz. ``None`` if the file could not be written.
+    collapsed_stack_file : pathlib.Path | None
+        The profile as collapsed stacks, one ``caller;callee count`` line per stack with the own time in
+        microseconds, which can be read by flame graph tools such as ``flamegraph.pl`` and speedscope. ``None`` if the
+        file could not be written.
+    """
+
+    duration: float
+    hot_functions: list[ProfiledFunction]
+    pstats_file: Path | None
+    collapsed_stack_file: Path | None
+
+    def format(self) -> str:
+        """
+        Format the profile as a message for the workflow instance log.
+
+        Returns
+        -------
+        str
+            The duration of the business logic, the hot functions, and the path of the profile files.
+        """
+        lines = [
+            f"Step profile: business logic took {self.duration:.3f} s. "
+            f"Top {len(self.hot_functions)} functions by own time:"
+        ]
+        lines.extend(
+            f"  {function.own_time:.3f} s own, {function.cumulative_time:.3f} s cumulative, "
+            f"{function.calls} calls: {function.function}"
+            for function in self.hot_functions
+        )
+        if self.pstats_file is not None:
+            lines.append(f"Profile written to {self.pstats_file} and {self.collapsed_stack_file}")
+        return "\n".join(lines)
+
+
+# Profilers which have been started and not stopped, indexed by the thread which started them
+_active_profilers: dict[int, list["_StepProfiler"]] = {}
+_active_profilers_lock = threading.Lock()
+
+
+def stop_thread_profilers() -> None:
+    """
+    Stop the profilers started by the current thread and write their profiles.
+
+    Called when a step function completes, so that a step which fails before the workflow is resumed does not leave
+    its profiler running in a long-lived process.
+    """
+    with _active_profilers_lock:
+        profilers = _active_profilers.pop(threading.get_ident(), [])
+    for profiler in profilers:
+        logger.warning("The step completed without resuming the workflow. Stopping the step profiler.")
+        profiler.stop()
+
+
+class _StepProfiler:
+    """
+    Profile a step with :mod:`cProfile`.
+
+    On Python 3.11 and earlier, only the thread which starts the profiler is profiled. From Python 3.12, all threads
+    are profiled.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The directory to which the profile files are written.
+    name : str
+        The name of the profile files, without extension. Characters which are not valid in file names are replaced.
+    """
+
+    def __init__(self, directory: Path, name: str) -> None:
+        self.directory = directory
+        self.name = re.sub(r"[^\w.-]+", "_", name)
+        self._profiler = cProfile.Profile()
+        self._thread_id: int | None = None
+        self._start = 0.0
+
+    def start(self) -> bool:
+        """
+        Start profiling the current thread.
+
+        Returns
+        -------
+        bool
+            Whether profiling was started. Profiling cannot be started if another profiler is active.
+        """
+        try:
+            self._profiler.enable()
+        except ValueError:
+            logger.warning("The step cannot be profiled because another profiler is active.")
+            return False
+        self._thread_id = threading.get_ident()
+        self._start = time.perf_counter()
+        with _active_profilers_lock:
+            _active_profilers.setdefault(self._thread_id, []).append(self)
+        return True
+
+    def stop(self) -> StepProfile | None:
+        """
+        Stop profiling and write the profile files.
+
+        Failing to write the files is logged, and the file paths in the returned profile are ``None``.
+
+        Returns
+        -------
+        StepProfile | None
+            The profile, or ``None`` if profiling was not started, or was started by another thread.
+        """
+        if self._thread_id is None:
+            return None
+        if self._thread_id != threading.get_ident():
+            logger.warning("The step profile is discarded because it was started by another thread.")
+            return None
+        self._profiler.disable()
+        duration = time.perf_counter() - self._start
+        with _active_profilers_lock:
+            profilers = _active_profilers.get(self._thread_id, [])
+            if self in profilers:
+                profilers.remove(self)
+            if not profilers:
+                _active_profilers.pop(self._thread_id, None)
+        self._thread_id = None
+        stats = pstats.Stats(self._profiler)
+        entries: Mapping[_Function, Any] = stats.stats  # type: ignore[attr-defined]
+        profile = StepProfile(duration, _hot_functions(entries, _TOP_FUNCTIONS), None, None)
+        pstats_file = self.directory / f"{self.name}.pstats"
+        collapsed_stack_file = self.directory / f"{self.name}.collapsed.txt"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(pstats_file)
+            collapsed_stack_file.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in _collapsed_stacks(entries)),
+                encoding="utf-8",
+            )
+        except OSError:
+            logger.exception('Failed to write the step profile to "%s".', self.directory)
+            return profile
+        logger.info('Step profile written to "%s".', pstats_file)
+        return profile._replace(pstats_file=pstats_file, collapsed_stack_file=collapsed_stack_file)
+
+
+def _label(function: _Function) -> str:
+    """
+    Get a short description of a function for logs and collapsed stacks.
+
+    Parameters
+    ----------
+    function : tuple[str, int, str]
+        The file name, line number, and name of the function, as used by :mod:`pstats`.
+
+    Returns
+    -------
+    str
+        The function as ``filename:line(name)``, or its name if it is a built-in function.
+    """
+    filename, line, name = function
+    if filename == "~" and line == 0:
+        return name
+    return f"{Path(filename).name}:{line}({name})"
+
+
+def _hot_functions(stats: Mapping[_Function, Any], count: int) -> list[ProfiledFunction]:
+    """
+    Get the functions with the highest own time.
+
+    Parameters
+    ----------
+    stats : Mapping[tuple[str, int, str], Any]
+        The statistics collected by :mod:`cProfile`, as stored by :class:`pstats.Stats`.
+    count : int
+        The maximum number of functions to return.
+
+    Returns
+    -------
+    list[ProfiledFunction]
+        The functions, slowest first.
+    """
+    functions = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:count]
+    return [
+        ProfiledFunction(_label(function), calls, own_time, cumulative_time)
+        for function, (_, calls, own_time, cumulative_time, _) in functions
+    ]
+
+
+def _collapsed_stacks(stats: Mapping[_Function, Any]) -> list[tuple[str, int]]:
+    """
+    Convert profile statistics to collapsed stacks.
+
+    :mod:`cProfile` only records the callers of each function, not complete stacks. The own time of a function is
+    divided between the stacks which reach it in proportion to the time spent in the function when called from each
+    caller. Recursive calls are not followed.
+
+    Parameters
+    ----------
+    stats : Mapping[tuple[str, int, str], Any]
+        The statistics collected by :mod:`cProfile`, as stored by :class:`pstats.Stats`.
+
+    Returns
+    -------
+    list[tuple[str, int]]
+        Each stack, as function labels separated by ``;``, and its own time in microseconds.
+    """
+    callees: defaultdict[_Function, dict[_Function, float]] = defaultdict(dict)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative_time) in callers.items():
+            callees[caller][function] = cumulative_time
+    labels = {function: _label(function).replace(";", ":") for function in stats}
+    roots = [function for function, values in stats.items() if not values[4]]
+    threshold = sum(stats[root][3] for root in roots) * _MIN_STACK_FRACTION
+    totals: dict[str, float] = defaultdict(float)
+
+    def visit(function: _Function, path: list[_Function], share: float) -> None:
+        # The share is the fraction of the calls to the function which were made along the current path
+        totals[";".join(labels[f] for f in path)] += stats[function][2] * share
+        if len(path) >= _MAX_STACK_DEPTH:
+            return
+        for callee, edge_time in callees[function].items():
+            callee_time = stats[callee][3]
+            if callee in path or callee_time <= 0 or edge_time * share < threshold:
+                continue
+            visit(callee, [*path, callee], share * edge_time / callee_time)
+
+    for root in roots:
+        visit(root, [root], 1.0)
+    stacks = [(stack, round(seconds * 1e6)) for stack, seconds in totals.items()]
+    return [(stack, count) for stack, count in stacks if count > 0]
@@ -0,0 +1,409 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Replay of captured steps.
+
+Runs the steps recorded in a capture file through a step function, against a local stand-in for the MI Data Flow API,
+and measures the latency of each step and the throughput of the replay.
+"""
+
+from base64 import b64encode
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import json
+import math
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from ._capture import CapturedStep, read_capture_file
+from ._logger import logger
+from ._mi_dataflow import _StepInput
+from ._step_host import (
+    StepFunction,
+    _install_step_output_streams,
+    _run_step_function,
+    _running_step,
+    _step_output,
+    _StepOutput,
+    _uninstall_step_output_streams,
+)
+
+# The stand-in does not check credentials. Captured credentials are redacted, and OIDC and Windows authentication
+# cannot be used with a plain HTTP stand-in, so all replayed steps use placeholder Basic credentials.
+_REPLAY_AUTHORIZATION_HEADER = "Basic " + b64encode(b"replay:replay").decode()
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _percentile(ordered: list[float], percentile: float) -> float:
+    """
+    Get a percentile of a sorted list of values, interpolating linearly between the closest ranks.
+
+    Parameters
+    ----------
+    ordered : list[float]
+        The values, in ascending order.
+    percentile : float
+        The percentile, between 0 and 100.
+
+    Returns
+    -------
+    float
+        The percentile, or ``nan`` if there are no values.
+    """
+    if not ordered:
+        return math.nan
+    position = (len(ordered) - 1) * percentile / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class ReplayResult:
+    """
+    The latencies and failures of the steps run by :func:`replay`.
+
+    Parameters
+    ----------
+    durations : dict[str, list[float]]
+        The duration in seconds of each step run, by step name.
+    failures : dict[str, int]
+        The number of step runs which returned a non-zero exit code or raised an exception, by step name.
+    elapsed : float
+        The time in seconds taken to run all steps.
+    concurrency : int
+        The number of steps which were run at the same time.
+    """
+
+    def __init__(
+        self, durations: dict[str, list[float]], failures: dict[str, int], elapsed: float, concurrency: int
+    ) -> None:
+        self._durations = {name: sorted(values) for name, values in durations.items()}
+        self._failures = failures
+        self.elapsed = elapsed
+        self.concurrency = concurrency
+
+    @property
+    def step_names(self) -> list[str]:
+        """
+        The names of the replayed steps.
+
+        Returns
+        -------
+        list[str]
+            The step names, which are the transition names in the captured payloads, in alphabetical order.
+        """
+        return sorted(self._durations)
+
+    def _durations_for(self, step_name: str | None) -> list[float]:
+        """
+        Get the sorted durations of the runs of a step, or of all steps.
+
+        Parameters
+        ----------
+        step_name : str | None
+            The step name, or ``None`` for all steps.
+
+        Returns
+        -------
+        list[float]
+            The durations in seconds, in ascending order.
+        """
+        if step_name is None:
+            return sorted(value for values in self._durations.values() for value in values)
+        return self._durations.get(step_name, [])
+
+    def count(self, step_name: str | None = None) -> int:
+        """
+        Get the number of step runs.
+
+        Parameters
+        ----------
+        step_name : str | None, default ``None``
+            The step name. If ``None``, runs of all steps are counted.
+
+        Returns
+        -------
+        int
+            The number of runs.
+        """
+        return len(self._durations_for(step_name))
+
+    def failure_count(self, step_name: str | None = None) -> int:
+        """
+        Get the number of step runs which returned a non-zero exit code or raised an exception.
+
+        Parameters
+        ----------
+        step_name : str | None, default ``None``
+            The step name. If ``None``, failed runs of all steps are counted.
+
+        Returns
+        -------
+        int
+            The number of failed runs.
+        """
+        if step_name is None:
+            return sum(self._failures.values())
+        return self._failures.get(step_name, 0)
+
+    def percentile(self, percentile: float, step_name: str | None = None) -> float:
+        """
+        Get a percentile of the step latency.
+
+        Parameters
+        ----------
+        percentile : float
+            The percentile, between 0 and 100.
+        step_name : str | None, default ``None``
+            The step name. If ``None``, the percentile of the runs of all steps is returned.
+
+        Returns
+        -------
+        float
+            The latency in seconds, or ``nan`` if the step was not run.
+        """
+        return _percentile(self._durations_for(step_name), percentile)
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of steps completed per second.
+
+        Returns
+        -------
+        float
+            The throughput of the replay in steps per second.
+        """
+        return self.count() / self.elapsed if self.elapsed > 0 else math.nan
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Summarize the latency of each step and of all steps.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            A dictionary with a key for each step name and the key ``"all"``. Values are dictionaries with the keys
+            ``"runs"``, ``"failures"``, ``"mean_ms"``, ``"p50_ms"``, ``"p90_ms"``, ``"p95_ms"``, ``"p99_ms"``, and
+            ``"max_ms"``. The ``"all"`` summary also includes ``"throughput_per_s"``.
+        """
+        summary = {name: self._summarize(name) for name in self.step_names}
+        summary["all"] = self._summarize(None)
+        summary["all"]["throughput_per_s"] = self.throughput
+        return summary
+
+    def _summarize(self, step_name: str | None) -> dict[str, float]:
+        """
+        Summarize the latency of a step, or of all steps.
+
+        Parameters
+        ----------
+        step_name : str | None
+            The step name, or ``None`` for all steps.
+
+        Returns
+        -------
+        dict[str, float]
+            The summary of the step latency, in milliseconds.
+        """
+        durations = self._durations_for(step_name)
+        summary: dict[str, float] = {
+            "runs": len(durations),
+            "failures": self.failure_count(step_name),
+            "mean_ms": sum(durations) / len(durations) * 1000 if durations else math.nan,
+        }
+        for percentile in PERCENTILES:
+            summary[f"p{percentile}_ms"] = _percentile(durations, percentile) * 1000
+        summary["max_ms"] = durations[-1] * 1000 if durations else math.nan
+        return summary
+
+
+def _prepare_payload(payload: dict[str, Any], workflow_url: str) -> str:
+    """
+    Redirect a captured payload to the stand-in, and serialize it in the same way as MI Data Flow.
+
+    Parameters
+    ----------
+    payload : dict[str, Any]
+        The captured payload.
+    workflow_url : str
+        The URL of the stand-in.
+
+    Returns
+    -------
+    str
+        The JSON-formatted payload.
+    """
+    return json.dumps(
+        {
+            **payload,
+            "WorkflowUrl": workflow_url,
+            "ClientCredentialType": "Basic",
+            "AuthorizationHeader": _REPLAY_AUTHORIZATION_HEADER,
+        }
+    )
+
+
+def replay(
+    steps: str | Path | Iterable[CapturedStep],
+    step_function: StepFunction,
+    concurrency: int = 1,
+    repeat: int = 1,
+    dataflow_url: str | None = None,
+    supporting_files_dir: str | Path | None = None,
+) -> ReplayResult:
+    """
+    Run captured steps through a step function, and measure the latency of each step.
+
+    Each captured payload is provided to the step function in the same way as by a :class:`~.StepHost`, so the step
+    function creates an :class:`~.MIDataflowIntegration` object without arguments to read it. Payloads are redirected
+    to a local stand-in for the MI Data Flow API and use placeholder Basic credentials, so the step function must
+    create the object with ``use_https=False``. Output written by the step function to ``stdout`` and ``stderr`` is
+    discarded. The output of the first failed run of each step is logged as a warning.
+
+    The latency of a step is measured from when the step function is called until it returns, which includes parsing
+    the payload and resuming the workflow.
+
+    Parameters
+    ----------
+    steps : str | pathlib.Path | Iterable[CapturedStep]
+        A capture file, or the captured steps to replay.
+    step_function : Callable[[], int | None]
+        The step function. The return value is used as the exit code, as for a :class:`~.StepHost`.
+    concurrency : int, default ``1``
+        The number of steps which run at the same time, each on its own thread.
+    repeat : int, default ``1``
+        The number of times to replay each captured step.
+    dataflow_url : str | None, default ``None``
+        The URL of the MI Data Flow API, or of a stand-in, to which the steps send requests. If ``None``, a
+        :class:`~.DataflowStandIn` is started for the duration of the replay.
+    supporting_files_dir : str | pathlib.Path | None, default ``None``
+        The supporting files directory provided to the steps. If ``None``, the current working directory is used.
+
+    Returns
+    -------
+    ReplayResult
+        The latency of each step run and the throughput of the replay.
+
+    Raises
+    ------
+    ValueError
+        If ``concurrency`` or ``repeat`` is less than 1.
+
+    Examples
+    --------
+    >>> def step():
+    ...     data_flow = MIDataflowIntegration(use_https=False)
+    ...     data_flow.resume_bookmark(0)
+    >>> result = replay("capture.jsonl.gz", step, concurrency=8)
+    >>> result.percentile(99)
+    0.0123
+    """
+    if concurrency < 1:
+        raise ValueError(f'"concurrency" must be at least 1. Value provided was {concurrency}.')
+    if repeat < 1:
+        raise ValueError(f'"repeat" must be at least 1. Value provided was {repeat}.')
+    captured_steps = list(read_capture_file(steps) if isinstance(steps, (str, Path)) else steps)
+    directory = Path(supporting_files_dir) if supporting_files_dir is not None else Path.cwd()
+
+    if dataflow_url is None:
+        from ._stand_in import DataflowStandIn
+
+        with DataflowStandIn() as stand_in:
+            return _replay(captured_steps, step_function, concurrency, repeat, stand_in.url, directory)
+    return _replay(captured_steps, step_function, concurrency, repeat, dataflow_url, directory)
+
+
+def _replay(
+    captured_steps: list[CapturedStep],
+    step_function: StepFunction,
+    concurrency: int,
+    repeat: int,
+    dataflow_url: str,
+    supporting_files_dir: Path,
+) -> ReplayResult:
+    """
+    Run captured steps through a step function against the provided MI Data Flow URL.
+
+    Parameters
+    ----------
+    captured_steps : list[CapturedStep]
+        The captured steps.
+    step_function : Callable[[], int | None]
+        The step function.
+    concurrency : int
+        The number of steps which run at the same time.
+    repeat : int
+        The number of times to replay each captured step.
+    dataflow_url : str
+        The URL to which the steps send requests.
+    supporting_files_dir : pathlib.Path
+        The supporting files directory provided to the steps.
+
+    Returns
+    -------
+    ReplayResult
+        The latency of each step run and the throughput of the replay.
+    """
+    # Payloads are serialized before the replay starts, so that the measured latency only includes work done by steps
+    runs = [(step.step_name, _prepare_payload(step.payload, dataflow_url)) for step in captured_steps] * repeat
+    durations: dict[str, list[float]] = {name: [] for name, _ in runs}
+    failures: dict[str, int] = {name: 0 for name, _ in runs}
+    lock = threading.Lock()
+
+    def run_step(step_name: str, payload: str) -> None:
+        output = _StepOutput()
+        output_token = _step_output.set(output)
+        try:
+            with _running_step(_StepInput(payload, supporting_files_dir)):
+                start = time.perf_counter()
+                exit_code = _run_step_function(step_function)
+                duration = time.perf_counter() - start
+        finally:
+            _step_output.reset(output_token)
+        with lock:
+            durations[step_name].append(duration)
+            if exit_code != 0:
+                failures[step_name] += 1
+                if failures[step_name] == 1:
+                    logger.warning(
+                        'Step "%s" failed with exit code %s. Output:\n%s',
+                        step_name,
+                        exit_code,
+                        output.stdout.getvalue() + output.stderr.getvalue(),
+                    )
+
+    logger.info("Replaying %s steps with concurrency %s against %s", len(runs), concurrency, dataflow_url)
+    _install_step_output_streams()
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="StepReplay") as executor:
+            for future in [executor.submit(run_step, name, payload) for name, payload in runs]:
+                future.result()
+        elapsed = time.perf_counter() - start
+    finally:
+        _uninstall_step_output_streams()
+    return ReplayResult(durations, failures, elapsed, concurrency)
@@ -0,0 +1,231 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Retry policy for requests sent to the MI Data Flow API."""
+
+from collections.abc import Collection
+import random
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    Policy for retrying requests to the MI Data Flow API which fail because the server is temporarily unavailable.
+
+    The delay before each retry increases exponentially, starting at ``backoff_factor`` seconds and doubling for each
+    retry up to ``backoff_max`` seconds. If ``jitter`` is enabled, the delay is chosen randomly between zero and this
+    value, so that steps which fail at the same time do not retry at the same time. If the server response includes a
+    ``Retry-After`` header, the delay is at least the requested value, up to ``backoff_max`` seconds.
+
+    Parameters
+    ----------
+    max_attempts : int, default ``5``
+        The maximum number of times a request is sent, including the first attempt. Set to ``1`` to disable retries.
+    backoff_factor : float, default ``0.5``
+        The delay in seconds before the first retry.
+    backoff_max : float, default ``30.0``
+        The maximum delay in seconds before a retry.
+    jitter : bool, default ``True``
+        Whether to randomize the delay before each retry.
+    retry_status_codes : Collection[int], default ``{429, 500, 502, 503, 504}``
+        The HTTP status codes which cause a request to be retried.
+    retry_connection_errors : bool, default ``True``
+        Whether requests which fail because the connection could not be established, was reset, or timed out are
+        retried.
+
+    Raises
+    ------
+    ValueError
+        If ``max_attempts`` is less than 1, or if ``backoff_factor`` or ``backoff_max`` is negative.
+
+    Examples
+    --------
+    >>> policy = RetryPolicy(max_attempts=10, backoff_max=60.0)
+    >>> data_flow = MIDataflowIntegration(retry_policy=policy)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        retry_status_codes: Collection[int] = DEFAULT_RETRY_STATUS_CODES,
+        retry_connection_errors: bool = True,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError(f'"max_attempts" must be at least 1. Value provided was {max_attempts}.')
+        for name, value in [("backoff_factor", backoff_factor), ("backoff_max", backoff_max)]:
+            if value < 0:
+                raise ValueError(f'"{name}" must not be negative. Value provided was {value}.')
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.retry_connection_errors = retry_connection_errors
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return (
+            f"{self.__class__.__name__}(max_attempts={self.max_attempts}, backoff_factor={self.backoff_factor}, "
+            f"backoff_max={self.backoff_max}, jitter={self.jitter}, "
+            f"retry_status_codes={sorted(self.retry_status_codes)}, "
+            f"retry_connection_errors={self.retry_connection_errors})"
+        )
+
+    def is_retryable_response(self, response: "requests.Response") -> bool:
+        """
+        Check whether a request should be retried based on the response status code.
+
+        Parameters
+        ----------
+        response : requests.Response
+            The response to the request.
+
+        Returns
+        -------
+        bool
+            ``True`` if the response status code is one of ``retry_status_codes``.
+        """
+        return response.status_code in self.retry_status_codes
+
+    def is_retryable_exception(self, exception: BaseException, idempotent: bool = True) -> bool:
+        """
+        Check whether a request should be retried based on the exception raised when sending it.
+
+        Parameters
+        ----------
+        exception : BaseException
+            The exception raised when sending the request.
+        idempotent : bool, default ``True``
+            Whether sending the request more than once has the same effect as sending it once.
+
+        Returns
+        -------
+        bool
+            ``True`` if ``retry_connection_errors`` is enabled and the exception is a connection error or a timeout.
+            For requests which are not idempotent, ``True`` only if the connection could not be established, because
+            the server may already have received a request which timed out or whose connection was reset.
+        """
+        if not self.retry_connection_errors:
+            return False
+        import requests
+
+        if not isinstance(exception, (requests.ConnectionError, requests.Timeout)):
+            return False
+        return idempotent or _is_connection_failure(exception)
+
+    def get_delay(
+        self,
+        retry_number: int,
+        response: Optional["requests.Response"] = None,
+        random_value: Callable[[float, float], float] = random.uniform,
+    ) -> float:
+        """
+        Get the delay before a retry.
+
+        Parameters
+        ----------
+        retry_number : int
+            The number of the retry, starting at 1 for the first retry.
+        response : requests.Response, optional
+            The response which caused the retry, used to read the ``Retry-After`` header.
+        random_value : Callable[[float, float], float], default ``random.uniform``
+            Function which returns a random value between the two provided values. Used to apply jitter.
+
+        Returns
+        -------
+        float
+            The delay in seconds.
+        """
+        delay = min(self.backoff_max, self.backoff_factor * 2.0 ** (retry_number - 1))
+        if self.jitter:
+            delay = random_value(0.0, delay)
+        retry_after = _parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+
+def _is_connection_failure(exception: BaseException) -> bool:
+    """
+    Check whether a request failed because the connection to the server could not be established.
+
+    A request which fails in this way was not sent. Other connection errors, such as read timeouts and connections
+    reset while waiting for the response, may occur after the server has received the request.
+
+    Parameters
+    ----------
+    exception : BaseException
+        The exception raised by :mod:`requests` when sending the request.
+
+    Returns
+    -------
+    bool
+        ``True`` if the connection timed out or was refused, or the host name could not be resolved.
+    """
+    import requests
+    from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+
+    if isinstance(exception, requests.ConnectTimeout):
+        return True
+    if isinstance(exception, requests.Timeout) or not isinstance(exception, requests.ConnectionError):
+        return False
+    reason = exception.args[0] if exception.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse the value of a ``Retry-After`` header.
+
+    Parameters
+    ----------
+    value : str | None
+        The header value, either a number of seconds or an HTTP date.
+
+    Returns
+    -------
+    float | None
+        The number of seconds to wait, or ``None`` if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
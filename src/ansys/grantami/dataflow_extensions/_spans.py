@@ -0,0 +1,347 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Timing spans, which record the start, duration, and outcome of each phase of a step and of each outbound request.
+
+Spans are recorded by :class:`~.MIDataflowIntegration` for the whole lifetime of the step, and are passed to a
+:class:`SpanExporter` when the workflow is resumed.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, Literal, NamedTuple
+
+from ._logger import logger
+
+SpanKind = Literal["phase", "call"]
+SpanOutcome = Literal["ok", "error"]
+
+# The number of spans kept for a step. Once it is reached, spans with a name which has already been recorded, such as
+# HTTP requests and log messages, are dropped, so that a step which sends many requests does not use unbounded memory.
+_MAX_SPANS = 10_000
+
+# The order in which phases are listed in summaries. Other phases are listed after these, in the order they started.
+PHASE_ORDER = (
+    "parse_payload",
+    "initialization",
+    "scripting_toolkit_session",
+    "pygranta_connection",
+    "business_logic",
+    "log_shipping",
+    "resume_bookmark",
+)
+
+# Serializes appends from steps which run on different threads of the same process, for example in a step host.
+_append_lock = threading.Lock()
+
+
+class Span(NamedTuple):
+    """
+    The timing of one phase of a step, or of one outbound request.
+
+    Attributes
+    ----------
+    name : str
+        The name of the phase, for example ``"business_logic"``, or ``"http_request"`` for outbound requests.
+    kind : {"phase", "call"}
+        ``"phase"`` for a phase of the step, or ``"call"`` for an outbound HTTP request.
+    start : float
+        The time at which the span started, in seconds since the epoch.
+    duration : float
+        The duration of the span in seconds.
+    outcome : {"ok", "error"}
+        ``"error"`` if the phase raised an exception or the request failed, otherwise ``"ok"``.
+    attributes : Mapping[str, Any]
+        Additional JSON-serializable details, such as the HTTP method and status code of a request.
+    """
+
+    name: str
+    kind: SpanKind
+    start: float
+    duration: float
+    outcome: SpanOutcome
+    attributes: Mapping[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the span to a JSON-serializable dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            The span, with the start time and duration in seconds.
+        """
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "duration": self.duration,
+            "outcome": self.outcome,
+            "attributes": dict(self.attributes),
+        }
+
+
+class SpanExporter(ABC):
+    """
+    Abstract base class for exporters, which receive the spans recorded by a step when the workflow is resumed.
+
+    Subclass this class and implement :meth:`export` to send spans to a different destination, and pass an instance to
+    :class:`~.MIDataflowIntegration` as the ``span_exporter`` argument.
+
+    Examples
+    --------
+    >>> class PrintSpanExporter(SpanExporter):
+    ...     def export(self, spans, step):
+    ...         for span in spans:
+    ...             print(step["transition_name"], span.name, span.duration)
+    >>> data_flow = MIDataflowIntegration(span_exporter=PrintSpanExporter())
+    """
+
+    @abstractmethod
+    def export(self, spans: Sequence[Span], step: Mapping[str, Any]) -> None:
+        """
+        Export the spans recorded by a step.
+
+        Called once, when the workflow is resumed. Exceptions raised by this method are logged, and do not affect the
+        step.
+
+        Parameters
+        ----------
+        spans : Sequence[Span]
+            The spans recorded by the step, in the order in which they ended.
+        step : Mapping[str, Any]
+            Details of the step: ``"workflow_id"``, ``"workflow_definition_id"``, ``"transition_name"``,
+            ``"started_at"`` as an ISO 8601 string in UTC, ``"exit_code"``, and the W3C ``"trace_id"`` and
+            ``"span_id"`` of the step.
+        """
+
+
+class JsonFileSpanExporter(SpanExporter):
+    """
+    Export spans to a JSON Lines file.
+
+    One line is appended to the file for each step. Each line is a JSON object with the details of the step, and a
+    ``"spans"`` list of the spans recorded by the step. Steps which run at the same time in one process can share a
+    file.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        The file to append to. The file is created if it does not exist.
+
+    Examples
+    --------
+    >>> data_flow = MIDataflowIntegration(span_exporter=JsonFileSpanExporter("spans.jsonl"))
+
+    Passing a path as the ``span_exporter`` argument is equivalent.
+
+    >>> data_flow = MIDataflowIntegration(span_exporter="spans.jsonl")
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def export(self, spans: Sequence[Span], step: Mapping[str, Any]) -> None:
+        """
+        Append the spans recorded by a step to the file.
+
+        Parameters
+        ----------
+        spans : Sequence[Span]
+            The spans recorded by the step.
+        step : Mapping[str, Any]
+            Details of the step.
+        """
+        line = json.dumps({**step, "spans": [span.to_dict() for span in spans]}) + "\n"
+        with _append_lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(line)
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}(path={str(self.path)!r})"
+
+
+class _SpanRecorder:
+    """
+    Records the spans of a step.
+
+    Spans can be recorded from several threads at the same time. Once ``max_spans`` spans have been recorded, spans
+    with a name which has already been recorded are counted but not kept.
+
+    Parameters
+    ----------
+    origin_time : float
+        The time, in seconds since the epoch, at which ``origin_counter`` was read.
+    origin_counter : float
+        A value of :func:`time.perf_counter`, used to convert performance counter values to times since the epoch.
+    max_spans : int, default ``10_000``
+        The number of spans to keep before repeated spans are dropped.
+    """
+
+    def __init__(self, origin_time: float, origin_counter: float, max_spans: int = _MAX_SPANS) -> None:
+        self._origin_time = origin_time
+        self._origin_counter = origin_counter
+        self._max_spans = max_spans
+        self._spans: list[Span] = []
+        self._names: set[str] = set()
+        self.dropped_count = 0
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        name: str,
+        kind: SpanKind,
+        start_counter: float,
+        duration: float,
+        outcome: SpanOutcome = "ok",
+        attributes: Mapping[str, Any] | None = None,
+    ) -> None:
+        """
+        Record a span.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span.
+        kind : {"phase", "call"}
+            The kind of span.
+        start_counter : float
+            The value of :func:`time.perf_counter` when the span started.
+        duration : float
+            The duration of the span in seconds.
+        outcome : {"ok", "error"}, default ``"ok"``
+            The outcome of the span.
+        attributes : Mapping[str, Any] | None, default ``None``
+            Additional details.
+        """
+        start = self._origin_time + (start_counter - self._origin_counter)
+        span = Span(name, kind, start, duration, outcome, attributes or {})
+        with self._lock:
+            dropped = len(self._spans) >= self._max_spans and name in self._names
+            if dropped:
+                self.dropped_count += 1
+                first_drop = self.dropped_count == 1
+            else:
+                self._spans.append(span)
+                self._names.add(name)
+        # Log outside the lock, since log handlers may record spans themselves
+        if dropped and first_drop:
+            logger.warning("%d timing spans recorded. Further repeated spans are dropped.", self._max_spans)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+        """
+        Record a phase which lasts for the duration of the ``with`` block.
+
+        The phase outcome is ``"error"`` if the block raises an exception, and the exception type is recorded as the
+        ``"error"`` attribute.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        **attributes
+            Additional details.
+
+        Yields
+        ------
+        dict[str, Any]
+            The attributes of the span, to which details can be added within the block.
+        """
+        start = time.perf_counter()
+        outcome: SpanOutcome = "ok"
+        try:
+            yield attributes
+        except BaseException as e:
+            outcome = "error"
+            attributes["error"] = type(e).__name__
+            raise
+        finally:
+            self.add(name, "phase", start, time.perf_counter() - start, outcome, attributes)
+
+    @property
+    def spans(self) -> tuple[Span, ...]:
+        """
+        The spans recorded so far.
+
+        Returns
+        -------
+        tuple[Span, ...]
+            The spans, in the order in which they ended.
+        """
+        with self._lock:
+            return tuple(self._spans)
+
+
+def summarize_spans(spans: Sequence[Span], dropped_count: int = 0) -> str:
+    """
+    Summarize the total duration of each phase and of outbound requests in one line.
+
+    Parameters
+    ----------
+    spans : Sequence[Span]
+        The spans to summarize.
+    dropped_count : int, default ``0``
+        The number of spans which were dropped because too many spans were recorded.
+
+    Returns
+    -------
+    str
+        The summary. Phases which occurred more than once include the number of occurrences, and failed phases and
+        requests are counted.
+    """
+    phases: dict[str, list[Span]] = {}
+    calls = []
+    for span in sorted(spans, key=lambda span: span.start):
+        if span.kind == "call":
+            calls.append(span)
+        else:
+            phases.setdefault(span.name, []).append(span)
+
+    names = [name for name in PHASE_ORDER if name in phases] + [name for name in phases if name not in PHASE_ORDER]
+    parts = []
+    for name in names:
+        part = f"{name} {sum(span.duration for span in phases[name]) * 1000:.1f} ms"
+        details = []
+        if len(phases[name]) > 1:
+            details.append(f"{len(phases[name])} times")
+        failures = sum(span.outcome == "error" for span in phases[name])
+        if failures:
+            details.append(f"{failures} failed")
+        parts.append(f"{part} ({', '.join(details)})" if details else part)
+
+    summary = f"Step timing: {', '.join(parts) if parts else 'no phases recorded'}."
+    if calls:
+        failed_calls = sum(span.outcome == "error" for span in calls)
+        summary += (
+            f" {len(calls)} HTTP requests ({failed_calls} failed) took "
+            f"{sum(span.duration for span in calls) * 1000:.1f} ms."
+        )
+    if dropped_count:
+        summary += f" {dropped_count} spans were dropped."
+    return summary
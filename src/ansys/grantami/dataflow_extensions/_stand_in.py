@@ -0,0 +1,667 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Stand-in for the MI Data Flow API and the Granta MI service layer.
+
+Provides a local HTTP server which accepts the requests sent by :class:`~.MIDataflowIntegration` and by PyGranta
+clients, with configurable latency, errors, and connection limits, so that steps can be run and measured without a
+Granta MI server.
+"""
+
+from collections.abc import Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import math
+import random
+import re
+import sys
+import threading
+import time
+from types import TracebackType
+from typing import Any, Literal, Type, get_args
+
+from ._logger import logger
+
+LatencyDistribution = Literal["constant", "uniform", "exponential", "lognormal"]
+ConnectionLimitPolicy = Literal["queue", "reject"]
+
+STAND_IN_OPERATIONS = ("resume_bookmark", "log_msg_to_instance", "service_layer")
+
+_RESUME_PATH = re.compile(r"/api/workflows/[^/]+$")
+_LOG_PATH = re.compile(r"/api/logs$")
+_SERVICE_LAYER_PATH = re.compile(r"^/mi_servicelayer(?:/|$)")
+
+
+class EndpointBehavior:
+    """
+    The latency and errors of an endpoint of a :class:`DataflowStandIn` server.
+
+    The delay before each response is sampled from ``latency_distribution``:
+
+    * ``"constant"``: Every response is delayed by ``latency`` seconds.
+    * ``"uniform"``: Delays are uniformly distributed between zero and twice ``latency``.
+    * ``"exponential"``: Delays are exponentially distributed with a mean of ``latency``, as for a server which
+      processes requests from a queue.
+    * ``"lognormal"``: Delays are log-normally distributed with a median of ``latency`` and a shape parameter of
+      ``latency_sigma``, which gives a long tail of slow responses.
+
+    Parameters
+    ----------
+    latency : float, default ``0.0``
+        The typical delay in seconds before a response is sent.
+    latency_distribution : {"constant", "uniform", "exponential", "lognormal"}, default ``"constant"``
+        The distribution of response delays.
+    latency_sigma : float, default ``1.0``
+        The shape parameter of the log-normal distribution. Larger values give a longer tail.
+    error_rate : float, default ``0.0``
+        The probability that a request receives an ``error_status`` response instead of a successful response.
+    error_status : int, default ``503``
+        The HTTP status code of error responses.
+    retry_after : float | None, default ``None``
+        The value in seconds of the ``Retry-After`` header included in error responses. If ``None``, the header is not
+        included.
+    disconnect_rate : float, default ``0.0``
+        The probability that the connection is closed without a response, as if the server had failed.
+
+    Raises
+    ------
+    ValueError
+        If ``latency``, ``latency_sigma``, or ``retry_after`` is negative, if ``error_rate`` or ``disconnect_rate`` is
+        not between 0 and 1, or if ``latency_distribution`` is not a supported value.
+
+    Examples
+    --------
+    >>> throttled = EndpointBehavior(latency=0.05, latency_distribution="lognormal", error_rate=0.1, error_status=429)
+    >>> stand_in = DataflowStandIn(endpoint_behaviors={"resume_bookmark": throttled})
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_distribution: LatencyDistribution = "constant",
+        latency_sigma: float = 1.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: float | None = None,
+        disconnect_rate: float = 0.0,
+    ) -> None:
+        for name, value in [("latency", latency), ("latency_sigma", latency_sigma), ("retry_after", retry_after or 0)]:
+            if value < 0:
+                raise ValueError(f'"{name}" must not be negative. Value provided was {value}.')
+        for name, value in [("error_rate", error_rate), ("disconnect_rate", disconnect_rate)]:
+            if not 0 <= value <= 1:
+                raise ValueError(f'"{name}" must be between 0 and 1. Value provided was {value}.')
+        if latency_distribution not in get_args(LatencyDistribution):
+            raise ValueError(
+                f'Unknown latency distribution "{latency_distribution}". Must be one of '
+                f"{', '.join(get_args(LatencyDistribution))}."
+            )
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.disconnect_rate = disconnect_rate
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return (
+            f"{self.__class__.__name__}(latency={self.latency}, latency_distribution={self.latency_distribution!r}, "
+            f"latency_sigma={self.latency_sigma}, error_rate={self.error_rate}, error_status={self.error_status}, "
+            f"retry_after={self.retry_after}, disconnect_rate={self.disconnect_rate})"
+        )
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """
+        Sample the delay before a response.
+
+        Parameters
+        ----------
+        rng : random.Random
+            The random number generator.
+
+        Returns
+        -------
+        float
+            The delay in seconds.
+        """
+        if self.latency == 0:
+            return 0.0
+        if self.latency_distribution == "uniform":
+            return rng.uniform(0, 2 * self.latency)
+        if self.latency_distribution == "exponential":
+            return rng.expovariate(1 / self.latency)
+        if self.latency_distribution == "lognormal":
+            return rng.lognormvariate(math.log(self.latency), self.latency_sigma)
+        return self.latency
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """Handles requests to a :class:`DataflowStandIn` server."""
+
+    # Keep connections open between requests, in the same way as the Granta MI server.
+    protocol_version = "HTTP/1.1"
+    server: "_StandInHttpServer"
+
+    def handle(self) -> None:
+        """Handle the requests sent on a connection, if the connection limit allows it."""
+        stand_in = self.server.stand_in
+        self._rejected = not stand_in._open_connection()
+        # Closes the connection if no request is received within the idle timeout
+        self.connection.settimeout(stand_in._idle_timeout)
+        try:
+            super().handle()
+        finally:
+            if not self._rejected:
+                stand_in._close_connection()
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handle a service layer request."""
+        self._handle({})
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Handle a request to resume a workflow, or a service layer request."""
+        self._handle({"resume_bookmark": _RESUME_PATH})
+
+    def do_PUT(self) -> None:  # noqa: N802
+        """Handle a request to log a message to a workflow instance, or a service layer request."""
+        self._handle({"log_msg_to_instance": _LOG_PATH})
+
+    def do_PATCH(self) -> None:  # noqa: N802
+        """Handle a service layer request."""
+        self._handle({})
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        """Handle a service layer request."""
+        self._handle({})
+
+    def _get_operation(self, data_flow_paths: Mapping[str, re.Pattern[str]]) -> str | None:
+        """
+        Get the operation requested by the request path.
+
+        Parameters
+        ----------
+        data_flow_paths : Mapping[str, re.Pattern[str]]
+            The Data Flow API operations supported by the request method, and the patterns matched by the end of their
+            paths.
+
+        Returns
+        -------
+        str | None
+            The operation, or ``None`` if the path is not supported.
+        """
+        path = self.path.partition("?")[0]
+        if _SERVICE_LAYER_PATH.match(path):
+            return "service_layer"
+        for operation, pattern in data_flow_paths.items():
+            if pattern.search(path):
+                return operation
+        return None
+
+    def _handle(self, data_flow_paths: Mapping[str, re.Pattern[str]]) -> None:
+        """
+        Read the request body, and respond as configured for the requested operation.
+
+        Parameters
+        ----------
+        data_flow_paths : Mapping[str, re.Pattern[str]]
+            The Data Flow API operations supported by the request method, and the patterns matched by the end of their
+            paths.
+        """
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self._rejected:
+            self.close_connection = True
+            self._respond(503)
+            return
+        operation = self._get_operation(data_flow_paths)
+        if operation is None:
+            self._respond(404)
+            return
+
+        stand_in = self.server.stand_in
+        behavior = stand_in.get_behavior(operation)
+        delay, outcome = stand_in._sample(behavior)
+        if delay:
+            time.sleep(delay)
+        if outcome == "disconnect":
+            stand_in._record_request(operation, "disconnected")
+            self.close_connection = True
+            return
+        if outcome == "error":
+            stand_in._record_request(operation, "failed")
+            headers = {} if behavior.retry_after is None else {"Retry-After": f"{behavior.retry_after:g}"}
+            self._respond(behavior.error_status, headers=headers)
+            return
+        if operation == "service_layer" and "Authorization" not in self.headers:
+            # Challenge clients which have not sent credentials, in the same way as a server with Basic authentication
+            self._respond(401, headers={"WWW-Authenticate": 'Basic realm="Granta MI"'})
+            return
+        stand_in._record_request(operation, "succeeded")
+        if operation == "service_layer":
+            self._respond(200, b"{}", {"Content-Type": "application/json"})
+        else:
+            self._respond(200)
+
+    def _respond(self, status: int, body: bytes = b"", headers: Mapping[str, str] | None = None) -> None:
+        """
+        Send a response.
+
+        Parameters
+        ----------
+        status : int
+            The HTTP status code.
+        body : bytes, default ``b""``
+            The response body.
+        headers : Mapping[str, str] | None, default ``None``
+            Additional response headers.
+        """
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """
+        Log a request to the package logger at debug level instead of writing it to ``stderr``.
+
+        Parameters
+        ----------
+        format : str
+            The message format string.
+        *args
+            The message arguments.
+        """
+        logger.debug("Data Flow stand-in: " + format, *args)
+
+
+class _StandInHttpServer(ThreadingHTTPServer):
+    """A threading HTTP server with a reference to the :class:`DataflowStandIn` which owns it."""
+
+    daemon_threads = True
+    # Connections beyond the connection limit are queued or rejected by the stand-in, not by the listen backlog
+    request_queue_size = 1024
+
+    def __init__(self, address: tuple[str, int], stand_in: "DataflowStandIn") -> None:
+        super().__init__(address, _StandInRequestHandler)
+        self.stand_in = stand_in
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        """
+        Log an exception raised while handling a connection.
+
+        Connections closed or reset by the client are expected, and are logged at debug level.
+
+        Parameters
+        ----------
+        request : Any
+            The client socket.
+        client_address : Any
+            The client address.
+        """
+        exception = sys.exc_info()[1]
+        if isinstance(exception, (ConnectionError, TimeoutError)):
+            logger.debug("Data Flow stand-in: connection from %s closed: %s", client_address, exception)
+        else:
+            logger.exception("Data Flow stand-in: error handling connection from %s", client_address)
+
+
+class DataflowStandIn:
+    """
+    A local HTTP server which stands in for the MI Data Flow API and the Granta MI service layer.
+
+    The server handles the following requests:
+
+    * ``POST .../api/workflows/{id}``: Resume a workflow.
+    * ``PUT .../api/logs``: Log a message to a workflow instance.
+    * Any request to ``/mi_servicelayer`` or a path below it: Respond with an empty JSON object. Requests without an
+      ``Authorization`` header receive a Basic authentication challenge, so PyGranta clients created by
+      :meth:`~.MIDataflowIntegration.configure_pygranta_connection` with Basic credentials can connect.
+
+    Credentials are not checked, and request bodies are discarded. Payloads sent to steps which use the stand-in must
+    have their ``WorkflowUrl`` set to :attr:`url`, and the steps must not use HTTPS.
+
+    The latency and errors of each endpoint are configured with :class:`EndpointBehavior` objects. Use
+    ``max_connections`` to limit the number of open connections, to measure the effect of a server connection limit on
+    connection reuse and queuing.
+
+    Use the stand-in as a context manager, or call :meth:`start` and :meth:`stop`.
+
+    Parameters
+    ----------
+    address : tuple[str, int], default ``("127.0.0.1", 0)``
+        The address on which to listen. Use port ``0`` to select a free port.
+    behavior : EndpointBehavior | None, default ``None``
+        The behavior of endpoints which are not included in ``endpoint_behaviors``. If ``None``, responses are sent
+        immediately and requests do not fail.
+    endpoint_behaviors : Mapping[str, EndpointBehavior] | None, default ``None``
+        The behavior of individual endpoints, by operation. Keys must be ``"resume_bookmark"``,
+        ``"log_msg_to_instance"``, or ``"service_layer"``.
+    max_connections : int | None, default ``None``
+        The maximum number of connections which are handled at the same time. If ``None``, the number of connections
+        is not limited.
+    connection_limit_policy : {"queue", "reject"}, default ``"queue"``
+        The behavior when a connection is opened and ``max_connections`` connections are already open:
+
+        * ``"queue"``: Wait until another connection is closed before handling requests on the connection.
+        * ``"reject"``: Respond to the first request on the connection with status code 503 and close the connection.
+    seed : int | None, default ``None``
+        The seed for the random number generator used to sample latency and errors. Set a seed to make the sequence of
+        samples repeatable.
+    idle_timeout : float, default ``5.0``
+        The time in seconds after which a connection is closed if no request is received, as a server closes idle
+        keep-alive connections. Idle connections count towards ``max_connections`` until they are closed.
+
+    Raises
+    ------
+    ValueError
+        If ``endpoint_behaviors`` includes an unknown operation, if ``max_connections`` is less than 1, if
+        ``connection_limit_policy`` is not a supported value, or if ``idle_timeout`` is not positive.
+
+    Examples
+    --------
+    >>> with DataflowStandIn(behavior=EndpointBehavior(latency=0.02, latency_distribution="exponential")) as stand_in:
+    ...     payload["WorkflowUrl"] = stand_in.url
+    ...     step = MIDataflowIntegration.from_dict_payload(payload, use_https=False)
+    ...     step.resume_bookmark(0)
+    >>> stand_in.request_counts
+    {'resume_bookmark': 1, 'log_msg_to_instance': 0, 'service_layer': 0}
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        behavior: EndpointBehavior | None = None,
+        endpoint_behaviors: Mapping[str, EndpointBehavior] | None = None,
+        max_connections: int | None = None,
+        connection_limit_policy: ConnectionLimitPolicy = "queue",
+        seed: int | None = None,
+        idle_timeout: float = 5.0,
+    ) -> None:
+        unknown_operations = set(endpoint_behaviors or {}).difference(STAND_IN_OPERATIONS)
+        if unknown_operations:
+            raise ValueError(
+                f'Unknown operations {", ".join(sorted(unknown_operations))} in "endpoint_behaviors". Must be one of '
+                f"{', '.join(STAND_IN_OPERATIONS)}."
+            )
+        if max_connections is not None and max_connections < 1:
+            raise ValueError(f'"max_connections" must be at least 1. Value provided was {max_connections}.')
+        if connection_limit_policy not in get_args(ConnectionLimitPolicy):
+            raise ValueError(
+                f'Unknown connection limit policy "{connection_limit_policy}". Must be one of '
+                f"{', '.join(get_args(ConnectionLimitPolicy))}."
+            )
+        if idle_timeout <= 0:
+            raise ValueError(f'"idle_timeout" must be a positive number. Value provided was {idle_timeout}.')
+        self._address = address
+        self._idle_timeout = idle_timeout
+        self._behavior = behavior or EndpointBehavior()
+        self._endpoint_behaviors = dict(endpoint_behaviors or {})
+        self._max_connections = max_connections
+        self._connection_limit_policy = connection_limit_policy
+        self._rng = random.Random(seed)
+
+        self._server: _StandInHttpServer | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._connection_condition = threading.Condition(self._lock)
+        self._request_counts = dict.fromkeys(STAND_IN_OPERATIONS, 0)
+        self._error_counts = dict.fromkeys(STAND_IN_OPERATIONS, 0)
+        self._open_connections = 0
+        self._connection_count = 0
+        self._peak_connections = 0
+        self._rejected_connection_count = 0
+
+    @property
+    def url(self) -> str:
+        """
+        The URL of the stand-in, for use as the ``WorkflowUrl`` of a payload.
+
+        Returns
+        -------
+        str
+            The URL of the stand-in.
+
+        Raises
+        ------
+        RuntimeError
+            If the stand-in has not been started.
+        """
+        if self._server is None:
+            raise RuntimeError("The Data Flow stand-in has not been started.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/mi_dataflow/"
+
+    def get_behavior(self, operation: str) -> EndpointBehavior:
+        """
+        Get the behavior of an endpoint.
+
+        Parameters
+        ----------
+        operation : str
+            The operation: ``"resume_bookmark"``, ``"log_msg_to_instance"``, or ``"service_layer"``.
+
+        Returns
+        -------
+        EndpointBehavior
+            The behavior of the endpoint.
+        """
+        return self._endpoint_behaviors.get(operation, self._behavior)
+
+    @property
+    def request_counts(self) -> dict[str, int]:
+        """
+        The number of successful requests received, by operation.
+
+        Service layer requests which receive an authentication challenge are not counted.
+
+        Returns
+        -------
+        dict[str, int]
+            A dictionary with the keys ``"resume_bookmark"``, ``"log_msg_to_instance"``, and ``"service_layer"``, and
+            the number of requests as values.
+        """
+        with self._lock:
+            return dict(self._request_counts)
+
+    @property
+    def error_counts(self) -> dict[str, int]:
+        """
+        The number of requests which received an injected error response or were disconnected, by operation.
+
+        Returns
+        -------
+        dict[str, int]
+            A dictionary with the keys ``"resume_bookmark"``, ``"log_msg_to_instance"``, and ``"service_layer"``, and
+            the number of failed requests as values.
+        """
+        with self._lock:
+            return dict(self._error_counts)
+
+    @property
+    def connection_count(self) -> int:
+        """
+        The number of connections which have been opened to the stand-in, including rejected connections.
+
+        Returns
+        -------
+        int
+            The number of connections.
+        """
+        with self._lock:
+            return self._connection_count
+
+    @property
+    def peak_connections(self) -> int:
+        """
+        The maximum number of connections which have been handled at the same time.
+
+        Returns
+        -------
+        int
+            The maximum number of concurrent connections.
+        """
+        with self._lock:
+            return self._peak_connections
+
+    @property
+    def rejected_connection_count(self) -> int:
+        """
+        The number of connections which have been rejected because of the connection limit.
+
+        Returns
+        -------
+        int
+            The number of rejected connections.
+        """
+        with self._lock:
+            return self._rejected_connection_count
+
+    def _sample(self, behavior: EndpointBehavior) -> tuple[float, str]:
+        """
+        Sample the delay and outcome of a request.
+
+        Parameters
+        ----------
+        behavior : EndpointBehavior
+            The behavior of the endpoint.
+
+        Returns
+        -------
+        tuple[float, str]
+            The delay in seconds, and the outcome: ``"disconnect"``, ``"error"``, or ``"success"``.
+        """
+        with self._lock:
+            delay = behavior.sample_latency(self._rng)
+            sample = self._rng.random()
+        if sample < behavior.disconnect_rate:
+            return delay, "disconnect"
+        if sample < behavior.disconnect_rate + behavior.error_rate:
+            return delay, "error"
+        return delay, "success"
+
+    def _record_request(self, operation: str, outcome: str) -> None:
+        """
+        Count a request.
+
+        Parameters
+        ----------
+        operation : str
+            The operation.
+        outcome : str
+            ``"succeeded"``, ``"failed"``, or ``"disconnected"``.
+        """
+        with self._lock:
+            if outcome == "succeeded":
+                self._request_counts[operation] += 1
+            else:
+                self._error_counts[operation] += 1
+
+    def _open_connection(self) -> bool:
+        """
+        Count a new connection, and wait until the connection limit allows it to be handled.
+
+        Returns
+        -------
+        bool
+            ``True`` if the connection can be handled, or ``False`` if it is rejected.
+        """
+        with self._connection_condition:
+            self._connection_count += 1
+            limit = self._max_connections
+            if limit is not None and self._open_connections >= limit:
+                if self._connection_limit_policy == "reject":
+                    self._rejected_connection_count += 1
+                    return False
+                self._connection_condition.wait_for(lambda: self._open_connections < limit)
+            self._open_connections += 1
+            self._peak_connections = max(self._peak_connections, self._open_connections)
+            return True
+
+    def _close_connection(self) -> None:
+        """Count a closed connection, and allow a queued connection to be handled."""
+        with self._connection_condition:
+            self._open_connections -= 1
+            self._connection_condition.notify()
+
+    def start(self) -> None:
+        """Start listening for requests on a background thread."""
+        if self._server is not None:
+            return
+        self._server = _StandInHttpServer(self._address, self)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="DataflowStandIn", daemon=True)
+        self._thread.start()
+        logger.debug("Data Flow stand-in listening on %s", self.url)
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        assert self._thread is not None
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def serve_forever(self) -> None:
+        """Start the stand-in, and handle requests until :meth:`stop` is called from another thread."""
+        self.start()
+        thread = self._thread
+        assert thread is not None
+        thread.join()
+
+    def __enter__(self) -> "DataflowStandIn":
+        """
+        Start the stand-in.
+
+        Returns
+        -------
+        DataflowStandIn
+            This stand-in.
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Exit the context manager and stop the stand-in.
+
+        Parameters
+        ----------
+        exc_type : Type[BaseException] | None
+            The type of the exception raised in the context, if any.
+        exc_value : BaseException | None
+            The exception raised in the context, if any.
+        traceback : TracebackType | None
+            The traceback of the exception raised in the context, if any.
+        """
+        self.stop()
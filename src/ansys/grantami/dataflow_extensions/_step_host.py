@@ -0,0 +1,735 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Step host module.
+
+Runs MI Data Flow step functions in a long-lived Python process. The script triggered by MI Data Flow is reduced to a
+small launcher which forwards the payload to the host and exits with the exit code returned by the step, so that
+each step does not pay the cost of starting a new interpreter and importing its dependencies.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import contextvars
+import importlib
+import io
+import logging
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+import traceback
+from typing import Any, TextIO
+
+from ._logger import logger
+from ._mi_dataflow import _step_input, _StepInput
+from ._profiling import stop_thread_profilers
+
+StepFunction = Callable[[], "int | None"]
+
+DEFAULT_STEP_HOST_ADDRESS = ("localhost", 50717)
+DEFAULT_PRELOAD_MODULES = ("requests", "ansys.openapi.common", "ansys.grantami.core")
+DEFAULT_FORK_SERVER_PRELOAD_MODULES = ("ansys.grantami.dataflow_extensions",) + DEFAULT_PRELOAD_MODULES
+
+
+class _StepOutput:
+    """The ``stdout`` and ``stderr`` output captured for a single step."""
+
+    __slots__ = ("stdout", "stderr")
+
+    def __init__(self) -> None:
+        self.stdout = io.StringIO()
+        self.stderr = io.StringIO()
+
+
+_step_output: contextvars.ContextVar[_StepOutput | None] = contextvars.ContextVar("_step_output", default=None)
+
+
+class _StepOutputStream:
+    """
+    A text stream which writes to the output of the step running in the current context.
+
+    Outside a step, writes are passed to the original stream.
+
+    Parameters
+    ----------
+    original : TextIO
+        The stream to write to outside a step.
+    name : str
+        The name of the stream, either ``"stdout"`` or ``"stderr"``.
+    """
+
+    def __init__(self, original: TextIO, name: str) -> None:
+        self._original = original
+        self._name = name
+
+    def _target(self) -> TextIO:
+        """
+        Get the stream to write to in the current context.
+
+        Returns
+        -------
+        TextIO
+            The output buffer of the current step, or the original stream outside a step.
+        """
+        output = _step_output.get()
+        if output is None:
+            return self._original
+        return getattr(output, self._name)  # type: ignore[no-any-return]
+
+    def write(self, s: str) -> int:
+        """
+        Write a string to the stream for the current context.
+
+        Parameters
+        ----------
+        s : str
+            The string to write.
+
+        Returns
+        -------
+        int
+            The number of characters written.
+        """
+        return self._target().write(s)
+
+    def flush(self) -> None:
+        """Flush the stream for the current context."""
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Get an attribute of the original stream.
+
+        Parameters
+        ----------
+        name : str
+            The attribute name.
+
+        Returns
+        -------
+        Any
+            The attribute value.
+        """
+        return getattr(self._original, name)
+
+
+_step_output_streams_lock = threading.Lock()
+
+
+def _install_step_output_streams() -> None:
+    """
+    Replace ``sys.stdout`` and ``sys.stderr`` with streams which write to the output of the current step.
+
+    The streams are installed when a step starts rather than when the host starts, so that they are reinstalled if
+    another component replaces ``sys.stdout`` or ``sys.stderr`` while the host is running.
+    """
+    with _step_output_streams_lock:
+        if not isinstance(sys.stdout, _StepOutputStream):
+            sys.stdout = _StepOutputStream(sys.stdout, "stdout")
+        if not isinstance(sys.stderr, _StepOutputStream):
+            sys.stderr = _StepOutputStream(sys.stderr, "stderr")
+
+
+def _uninstall_step_output_streams() -> None:
+    """Restore the original ``sys.stdout`` and ``sys.stderr`` streams."""
+    with _step_output_streams_lock:
+        if isinstance(sys.stdout, _StepOutputStream):
+            sys.stdout = sys.stdout._original
+        if isinstance(sys.stderr, _StepOutputStream):
+            sys.stderr = sys.stderr._original
+
+
+class _StepLogFilter(logging.Filter):
+    """
+    A filter which only passes records logged by a step.
+
+    A record is logged by the step if it is logged in the context of the step, including threads which run in a copy
+    of this context. Records logged in other threads cannot be attributed to a step, and are only passed if no other
+    step is running.
+
+    Parameters
+    ----------
+    step_input : _StepInput
+        The input of the step.
+    """
+
+    def __init__(self, step_input: _StepInput) -> None:
+        super().__init__()
+        self.step_input = step_input
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Check whether a record was logged by the step.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            The record.
+
+        Returns
+        -------
+        bool
+            Whether the record is passed to the handlers of the step.
+        """
+        current = _step_input.get()
+        if current is None:
+            with _running_steps_lock:
+                return _running_steps == [self.step_input]
+        return current is self.step_input
+
+
+_running_steps: list[_StepInput] = []
+_running_steps_lock = threading.Lock()
+# The handlers of the loggers restored once no step is running, recorded when the first of the running steps started
+_handlers_before_steps: list[tuple[logging.Logger, list[logging.Handler]]] = []
+
+
+def _running_step_count() -> int:
+    """
+    Get the number of steps which are running in this process.
+
+    Returns
+    -------
+    int
+        The number of steps.
+    """
+    with _running_steps_lock:
+        return len(_running_steps)
+
+
+def _remove_step_log_handlers(step_input: _StepInput) -> None:
+    """
+    Remove the API log handlers created by a step from all loggers.
+
+    Parameters
+    ----------
+    step_input : _StepInput
+        The input of the step.
+    """
+    step_loggers = [logging.getLogger()] + [
+        step_logger
+        for step_logger in list(logging.Logger.manager.loggerDict.values())
+        if isinstance(step_logger, logging.Logger)
+    ]
+    for handler in step_input.log_handlers:
+        for step_logger in step_loggers:
+            step_logger.removeHandler(handler)
+        if step_input.log_filter is not None:
+            handler.removeFilter(step_input.log_filter)
+
+
+def _normalize_exit_code(result: Any) -> int:
+    """
+    Convert the value returned by a step function or passed to :class:`SystemExit` to a process exit code.
+
+    Parameters
+    ----------
+    result : Any
+        The value returned by the step function.
+
+    Returns
+    -------
+    int
+        The process exit code.
+    """
+    if result is None:
+        return 0
+    if isinstance(result, int):
+        return result
+    return 1
+
+
+def _run_step_function(step_function: StepFunction) -> int:
+    """
+    Run a step function and return its exit code, printing any unhandled exception to ``stderr``.
+
+    Parameters
+    ----------
+    step_function : StepFunction
+        The step function to run.
+
+    Returns
+    -------
+    int
+        The exit code of the step.
+    """
+    try:
+        return _normalize_exit_code(step_function())
+    except SystemExit as e:
+        if e.code is not None and not isinstance(e.code, int):
+            print(e.code, file=sys.stderr)
+        return _normalize_exit_code(e.code)
+    except Exception:
+        traceback.print_exc(file=sys.stderr)
+        return 1
+    finally:
+        stop_thread_profilers()
+
+
+@contextmanager
+def _running_step(step_input: _StepInput) -> Iterator[None]:
+    """
+    Provide the input of a step to the current context, and isolate the log handlers of the step.
+
+    API log handlers created by the step only receive records logged by the step, and are removed from all loggers
+    when the step completes. Other handlers added by the step to the root logger or to the
+    ``ansys.grantami.dataflow_extensions`` logger are removed once no step is running, so that a step does not remove
+    the handlers of a step which is still running.
+
+    Parameters
+    ----------
+    step_input : _StepInput
+        The payload and supporting files directory of the step.
+
+    Yields
+    ------
+    None
+        Control returns to the caller while the step runs.
+    """
+    step_input.log_filter = _StepLogFilter(step_input)
+    with _running_steps_lock:
+        if not _running_steps:
+            _handlers_before_steps[:] = [
+                (step_logger, list(step_logger.handlers)) for step_logger in [logging.getLogger(), logger]
+            ]
+        _running_steps.append(step_input)
+    step_input_token = _step_input.set(step_input)
+    try:
+        yield
+    finally:
+        _step_input.reset(step_input_token)
+        _remove_step_log_handlers(step_input)
+        with _running_steps_lock:
+            _running_steps.remove(step_input)
+            if not _running_steps:
+                for step_logger, handlers in _handlers_before_steps:
+                    for handler in step_logger.handlers[:]:
+                        if handler not in handlers:
+                            step_logger.removeHandler(handler)
+                _handlers_before_steps.clear()
+
+
+class StepHost:
+    """
+    A long-lived process which runs MI Data Flow step functions on behalf of a launcher script.
+
+    The host imports the step functions and their dependencies once, and then runs a step each time a launcher script
+    forwards a payload with :func:`launch_step`. Each step runs on its own thread with its own copy of the payload and
+    supporting files directory, so :class:`~.MIDataflowIntegration` objects created by the step behave as if the step
+    had been launched directly by MI Data Flow.
+
+    Output written to ``stdout`` and ``stderr`` during a step, including output from logging handlers attached to
+    these streams, is captured separately for each step and returned to the launcher. Handlers created by
+    :meth:`~.MIDataflowIntegration.get_api_log_handler` during a step only receive the records logged by that step, so
+    steps which run at the same time do not send each other's log messages to MI Data Flow. Records logged by a thread
+    which the step starts are attributed to the step if the thread runs in a copy of the step context, for example a
+    thread started with ``threading.Thread(target=contextvars.copy_context().run, args=(function,))``. Handlers added
+    to the root logger or to the ``ansys.grantami.dataflow_extensions`` logger during a step are removed when no step
+    is running.
+
+    Parameters
+    ----------
+    authkey : bytes
+        The shared secret used to authenticate launchers. The same value must be provided to :func:`launch_step`.
+    address : tuple[str, int], default ``("localhost", 50717)``
+        The address on which to listen for launchers. Use port ``0`` to select a free port, and read the selected
+        port from :attr:`address`.
+    max_concurrent_steps : int, default ``8``
+        The maximum number of steps which run at the same time. Additional steps wait until a step completes.
+    preload_modules : Iterable[str], default ``("requests", "ansys.openapi.common", "ansys.grantami.core")``
+        Modules to import when the host starts. Modules which cannot be imported are skipped.
+
+    Notes
+    -----
+    Steps share the module-level state of the host process. Step functions must not rely on global variables being
+    reset between runs.
+
+    Examples
+    --------
+    >>> host = StepHost(authkey=b"my secret")
+    >>> host.register("update_record", step_logic.main)
+    >>> host.serve_forever()
+    """
+
+    def __init__(
+        self,
+        authkey: bytes,
+        address: tuple[str, int] = DEFAULT_STEP_HOST_ADDRESS,
+        max_concurrent_steps: int = 8,
+        preload_modules: Iterable[str] = DEFAULT_PRELOAD_MODULES,
+    ) -> None:
+        self._authkey = authkey
+        self._requested_address = address
+        self._max_concurrent_steps = max_concurrent_steps
+        self._preload_modules = tuple(preload_modules)
+        self._steps: dict[str, StepFunction] = {}
+        self._listener: Listener | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._ready = threading.Event()
+        self._stopping = False
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """
+        The address on which the host is listening.
+
+        Returns
+        -------
+        tuple[str, int]
+            The host name and port.
+        """
+        if self._listener is None:
+            return self._requested_address
+        return self._listener.address  # type: ignore[no-any-return]
+
+    def register(self, name: str, step_function: StepFunction) -> None:
+        """
+        Register a step function which can be run by a launcher script.
+
+        Parameters
+        ----------
+        name : str
+            The name used by the launcher script to identify the step.
+        step_function : StepFunction
+            A function with no arguments which runs the step. The function typically instantiates
+            :class:`~.MIDataflowIntegration`, runs the business logic, and calls
+            :meth:`~.MIDataflowIntegration.resume_bookmark`. The return value is used as the exit code of the
+            launcher, where ``None`` is equivalent to ``0``.
+        """
+        self._steps[name] = step_function
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """
+        Wait until the host is accepting connections.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time in seconds to wait.
+
+        Returns
+        -------
+        bool
+            Whether the host is accepting connections.
+        """
+        return self._ready.wait(timeout)
+
+    def serve_forever(self) -> None:
+        """Accept and run steps until :meth:`shutdown` is called."""
+        self._preload()
+        try:
+            with Listener(self._requested_address, authkey=self._authkey) as listener:
+                self._listener = listener
+                logger.info("%s listening on %s", type(self).__name__, self.address)
+                self._ready.set()
+                while not self._stopping:
+                    try:
+                        connection = listener.accept()
+                    except AuthenticationError:
+                        logger.warning("Rejected a connection with an invalid authentication key.")
+                        continue
+                    except (EOFError, ConnectionError):
+                        logger.debug("A connection was closed before authentication completed.")
+                        continue
+                    if self._stopping:
+                        connection.close()
+                        break
+                    self._start_step(connection)
+        finally:
+            self._ready.clear()
+            self._wait_for_steps()
+            _uninstall_step_output_streams()
+        logger.info("%s stopped", type(self).__name__)
+
+    def _start_step(self, connection: Connection) -> None:
+        """
+        Run the step requested on a connection on a worker thread.
+
+        Parameters
+        ----------
+        connection : Connection
+            The connection to the launcher.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_concurrent_steps,
+                thread_name_prefix=type(self).__name__,
+            )
+        self._executor.submit(self._handle_connection, connection)
+
+    def _wait_for_steps(self) -> None:
+        """Wait for running steps to complete."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def shutdown(self) -> None:
+        """Stop accepting steps. Steps which are already running are allowed to complete."""
+        self._stopping = True
+        if self._ready.is_set():
+            # Wake up the accept() call in serve_forever. Connect from a separate thread, because shutdown() may be
+            # called from a signal handler running on the thread which is blocked in accept().
+            threading.Thread(target=self._wake_listener, daemon=True).start()
+
+    def _wake_listener(self) -> None:
+        """Connect to the listener so that a blocked accept() call returns."""
+        try:
+            Client(self.address, authkey=self._authkey).close()
+        except OSError:
+            pass
+
+    def _preload(self) -> None:
+        """Import the modules to preload, skipping any which are not installed."""
+        for module_name in self._preload_modules:
+            try:
+                importlib.import_module(module_name)
+            except ImportError:
+                logger.debug('Could not preload module "%s"', module_name)
+
+    def _handle_connection(self, connection: Connection) -> None:
+        """
+        Receive a step request from a launcher, run the step, and send the result.
+
+        Parameters
+        ----------
+        connection : Connection
+            The connection to the launcher.
+        """
+        with connection:
+            try:
+                request = connection.recv()
+            except EOFError:
+                return
+            response = contextvars.copy_context().run(self._run_step, request)
+            try:
+                connection.send(response)
+            except OSError:
+                logger.warning('Launcher for step "%s" disconnected before the result was sent.', request.get("step"))
+
+    def _run_step(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Run a step in the current context with the input provided by the launcher.
+
+        Parameters
+        ----------
+        request : dict[str, Any]
+            The request sent by the launcher.
+
+        Returns
+        -------
+        dict[str, Any]
+            The exit code and captured output of the step.
+        """
+        output = _StepOutput()
+        _step_output.set(output)
+        _install_step_output_streams()
+        start = time.perf_counter()
+
+        step_name = request.get("step")
+        step_function = self._steps.get(step_name)  # type: ignore[arg-type]
+        if step_function is None:
+            output.stderr.write(f'Step "{step_name}" is not registered with the step host.\n')
+            exit_code = 1
+        else:
+            with _running_step(_StepInput(request["payload"], Path(request["supporting_files_dir"]))):
+                exit_code = _run_step_function(step_function)
+
+        duration = time.perf_counter() - start
+        logger.debug('Step "%s" completed with exit code %s in %.3f s', step_name, exit_code, duration)
+        return {
+            "exit_code": exit_code,
+            "stdout": output.stdout.getvalue(),
+            "stderr": output.stderr.getvalue(),
+            "duration": duration,
+        }
+
+
+class ForkStepServer(StepHost):
+    """
+    A step host which runs each step in a new child process forked from a pre-initialized parent.
+
+    The parent process imports the step functions and their dependencies once. Each step runs in a child process
+    created with :func:`os.fork`, so every step starts with a clean copy of the parent state, but without the cost of
+    starting a new interpreter and importing its dependencies. Launchers connect to a fork server with
+    :func:`launch_step` in the same way as a :class:`StepHost`.
+
+    Requires :func:`os.fork`, which is not available on Windows.
+
+    Parameters
+    ----------
+    authkey : bytes
+        The shared secret used to authenticate launchers. The same value must be provided to :func:`launch_step`.
+    address : tuple[str, int], default ``("localhost", 50717)``
+        The address on which to listen for launchers. Use port ``0`` to select a free port.
+    max_concurrent_steps : int, default ``8``
+        The maximum number of child processes which run at the same time. Additional steps wait until a child
+        process exits.
+    preload_modules : Iterable[str], optional
+        Modules to import in the parent process. Modules which cannot be imported are skipped. By default, this package,
+        ``requests``, ``ansys.openapi.common``, and Scripting Toolkit are imported.
+
+    Raises
+    ------
+    NotImplementedError
+        If :func:`os.fork` is not available on the current platform.
+    """
+
+    def __init__(
+        self,
+        authkey: bytes,
+        address: tuple[str, int] = DEFAULT_STEP_HOST_ADDRESS,
+        max_concurrent_steps: int = 8,
+        preload_modules: Iterable[str] = DEFAULT_FORK_SERVER_PRELOAD_MODULES,
+    ) -> None:
+        if not hasattr(os, "fork"):
+            raise NotImplementedError(
+                "ForkStepServer requires os.fork, which is not available on this platform. Use StepHost instead."
+            )
+        super().__init__(
+            authkey=authkey,
+            address=address,
+            max_concurrent_steps=max_concurrent_steps,
+            preload_modules=preload_modules,
+        )
+        self._children: set[int] = set()
+
+    def _start_step(self, connection: Connection) -> None:
+        """
+        Fork a child process which runs the step requested on a connection.
+
+        Parameters
+        ----------
+        connection : Connection
+            The connection to the launcher.
+        """
+        self._reap_children(block=len(self._children) >= self._max_concurrent_steps)
+        pid = os.fork()
+        if pid == 0:
+            exit_status = 0
+            try:
+                if self._listener is not None:
+                    self._listener.close()
+                self._handle_connection(connection)
+            except BaseException:
+                exit_status = 1
+            finally:
+                os._exit(exit_status)
+        connection.close()
+        self._children.add(pid)
+
+    def _wait_for_steps(self) -> None:
+        """Wait for all child processes to exit."""
+        while self._children:
+            self._reap_children(block=True)
+
+    def _reap_children(self, block: bool) -> None:
+        """
+        Collect the exit status of child processes which have exited.
+
+        Parameters
+        ----------
+        block : bool
+            Whether to wait until at least one child process has exited.
+        """
+        options = 0 if block else os.WNOHANG
+        while self._children:
+            try:
+                pid, _ = os.waitpid(-1, options)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if pid == 0:
+                return
+            self._children.discard(pid)
+            options = os.WNOHANG
+
+
+def launch_step(
+    step_name: str,
+    authkey: bytes,
+    address: tuple[str, int] = DEFAULT_STEP_HOST_ADDRESS,
+    fallback: StepFunction | None = None,
+) -> int:
+    """
+    Forward the payload provided by MI Data Flow to a :class:`StepHost` and wait for the step to complete.
+
+    This function is intended to be the only logic in the script triggered by MI Data Flow. The captured ``stdout``
+    and ``stderr`` of the step are written to the streams of the launcher, so they are collected by MI Data Flow as
+    usual.
+
+    Parameters
+    ----------
+    step_name : str
+        The name of the step, as registered with :meth:`StepHost.register`.
+    authkey : bytes
+        The shared secret used to authenticate with the step host.
+    address : tuple[str, int], default ``("localhost", 50717)``
+        The address of the step host.
+    fallback : StepFunction, optional
+        A step function to run in the launcher process if the step host is not running.
+
+    Returns
+    -------
+    int
+        The exit code of the step.
+
+    Raises
+    ------
+    ConnectionRefusedError
+        If the step host is not running and no ``fallback`` was provided.
+
+    Examples
+    --------
+    The script added to the workflow definition in MI Data Flow Designer:
+
+    >>> import sys
+    >>> from ansys.grantami.dataflow_extensions import launch_step
+    >>> sys.exit(launch_step("update_record", authkey=b"my secret"))
+    """
+    request = {
+        "step": step_name,
+        "payload": sys.stdin.read(),
+        "supporting_files_dir": sys.path[0],
+    }
+    try:
+        connection = Client(address, authkey=authkey)
+    except ConnectionRefusedError:
+        if fallback is None:
+            raise
+        step_input_token = _step_input.set(_StepInput(request["payload"], Path(request["supporting_files_dir"])))
+        try:
+            return _run_step_function(fallback)
+        finally:
+            _step_input.reset(step_input_token)
+
+    with connection:
+        connection.send(request)
+        response = connection.recv()
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]  # type: ignore[no-any-return]
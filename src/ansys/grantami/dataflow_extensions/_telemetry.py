@@ -0,0 +1,640 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+A local SQLite store of step telemetry, which keeps the timing of each step after the step process exits.
+
+Each step adds one row when the workflow is resumed. The store can be queried for the latency percentiles of each
+workflow definition and transition, and for transitions which became slower between two time windows.
+"""
+
+from collections.abc import Iterator, Sequence
+from contextlib import closing, contextmanager
+from datetime import datetime
+from pathlib import Path
+import sqlite3
+import sys
+import threading
+from typing import Any, Mapping, NamedTuple
+
+from ._spans import PHASE_ORDER, Span
+
+# Metrics which can be queried. Durations are in seconds, and peak memory is in bytes.
+TELEMETRY_METRICS = ("total_duration", *PHASE_ORDER, "http_duration", "peak_memory")
+
+_COLUMNS = (
+    ("workflow_id", "TEXT"),
+    ("workflow_definition_id", "TEXT"),
+    ("transition_name", "TEXT"),
+    ("started_at", "REAL NOT NULL"),
+    ("exit_code", "TEXT"),
+    ("total_duration", "REAL"),
+    *((phase, "REAL") for phase in PHASE_ORDER),
+    ("http_request_count", "INTEGER"),
+    ("http_error_count", "INTEGER"),
+    ("http_duration", "REAL"),
+    ("peak_memory", "INTEGER"),
+    ("trace_id", "TEXT"),
+)
+
+_SCHEMA = (
+    f"CREATE TABLE IF NOT EXISTS steps (id INTEGER PRIMARY KEY, {', '.join(f'{n} {t}' for n, t in _COLUMNS)})",
+    "CREATE INDEX IF NOT EXISTS steps_by_transition ON steps (workflow_definition_id, transition_name, started_at)",
+    "CREATE INDEX IF NOT EXISTS steps_by_time ON steps (started_at)",
+    "CREATE INDEX IF NOT EXISTS steps_by_trace ON steps (trace_id)",
+)
+
+# The time in seconds to wait for other processes to finish writing to the database
+_BUSY_TIMEOUT = 30.0
+
+
+class StepTelemetry(NamedTuple):
+    """
+    The telemetry of one step.
+
+    Attributes
+    ----------
+    workflow_id : str | None
+        The ID of the workflow instance.
+    workflow_definition_id : str | None
+        The ID of the workflow definition.
+    transition_name : str | None
+        The name of the workflow transition which ran the step.
+    started_at : float
+        The time at which the step started, in seconds since the epoch.
+    exit_code : str | None
+        The exit code with which the workflow was resumed, or ``None`` if it is not known.
+    total_duration : float
+        The time in seconds from creating the :class:`~.MIDataflowIntegration` object until the workflow was resumed.
+    phase_durations : dict[str, float]
+        The total duration in seconds of each phase of the step which occurred. See
+        :attr:`~.MIDataflowIntegration.spans` for the phase names.
+    http_request_count : int
+        The number of HTTP requests sent to Granta MI through the shared connection pool.
+    http_error_count : int
+        The number of those requests which failed or received an error response.
+    http_duration : float
+        The total duration of those requests in seconds.
+    peak_memory : int | None
+        The peak resident memory of the step process in bytes, or ``None`` if it is not known. If several steps run in
+        the same process, this is the peak of the process so far.
+    trace_id : str | None
+        The W3C trace ID of the step, which is included in the ``traceparent`` header of the requests sent by the step.
+    """
+
+    workflow_id: str | None
+    workflow_definition_id: str | None
+    transition_name: str | None
+    started_at: float
+    exit_code: str | None
+    total_duration: float
+    phase_durations: dict[str, float]
+    http_request_count: int
+    http_error_count: int
+    http_duration: float
+    peak_memory: int | None
+    trace_id: str | None = None
+
+    @property
+    def failed(self) -> bool:
+        """
+        Whether the workflow was resumed with an exit code other than ``0``.
+
+        Returns
+        -------
+        bool
+            ``True`` if the step failed. ``False`` if the exit code is not known.
+        """
+        return self.exit_code is not None and self.exit_code != "0"
+
+
+class TelemetrySummary(NamedTuple):
+    """
+    Percentiles of a metric for the steps of one workflow definition and transition.
+
+    Attributes
+    ----------
+    workflow_definition_id : str | None
+        The ID of the workflow definition.
+    transition_name : str | None
+        The name of the workflow transition.
+    metric : str
+        The metric.
+    steps : int
+        The number of steps with a value for the metric.
+    failures : int
+        The number of those steps which resumed the workflow with an exit code other than ``0``.
+    p50 : float
+        The 50th percentile of the metric.
+    p95 : float
+        The 95th percentile of the metric.
+    p99 : float
+        The 99th percentile of the metric.
+    """
+
+    workflow_definition_id: str | None
+    transition_name: str | None
+    metric: str
+    steps: int
+    failures: int
+    p50: float
+    p95: float
+    p99: float
+
+
+class Regression(NamedTuple):
+    """
+    A workflow transition for which a metric increased between two time windows.
+
+    Attributes
+    ----------
+    workflow_definition_id : str | None
+        The ID of the workflow definition.
+    transition_name : str | None
+        The name of the workflow transition.
+    metric : str
+        The metric.
+    percentile : float
+        The compared percentile.
+    baseline : float
+        The percentile of the metric in the baseline window.
+    current : float
+        The percentile of the metric in the current window.
+    baseline_steps : int
+        The number of steps in the baseline window.
+    current_steps : int
+        The number of steps in the current window.
+    """
+
+    workflow_definition_id: str | None
+    transition_name: str | None
+    metric: str
+    percentile: float
+    baseline: float
+    current: float
+    baseline_steps: int
+    current_steps: int
+
+    @property
+    def change(self) -> float:
+        """
+        The relative increase of the metric.
+
+        Returns
+        -------
+        float
+            The increase as a fraction of the baseline value, for example ``0.5`` for an increase of 50 %. ``0.0`` if
+            both values are zero, and infinity if only the baseline value is zero.
+        """
+        if not self.baseline:
+            return float("inf") if self.current else 0.0
+        return self.current / self.baseline - 1
+
+
+def _timestamp(value: datetime | float | None) -> float | None:
+    """
+    Convert a time to seconds since the epoch.
+
+    Parameters
+    ----------
+    value : datetime.datetime | float | None
+        The time. A naive datetime is interpreted as local time.
+
+    Returns
+    -------
+    float | None
+        The time in seconds since the epoch, or ``None`` if no time is provided.
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return value
+
+
+def _check_metric(metric: str) -> None:
+    """
+    Check that a metric can be queried.
+
+    Parameters
+    ----------
+    metric : str
+        The metric name.
+
+    Raises
+    ------
+    ValueError
+        If the metric is not one of ``TELEMETRY_METRICS``.
+    """
+    if metric not in TELEMETRY_METRICS:
+        raise ValueError(f'"metric" must be one of {", ".join(TELEMETRY_METRICS)}. Value provided was "{metric}".')
+
+
+def peak_memory() -> int | None:
+    """
+    Get the peak resident memory of the current process.
+
+    Returns
+    -------
+    int | None
+        The peak resident memory in bytes, or ``None`` if it cannot be measured on this platform.
+    """
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        if not kernel32.K32GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return None
+        return int(counters.PeakWorkingSetSize)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, and in kilobytes on Linux
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def _step_telemetry(
+    spans: Sequence[Span], step: Mapping[str, Any], started_at: float, total_duration: float, memory: int | None
+) -> StepTelemetry:
+    """
+    Summarize the spans of a step.
+
+    Parameters
+    ----------
+    spans : Sequence[Span]
+        The spans recorded by the step.
+    step : Mapping[str, Any]
+        Details of the step, as passed to :meth:`~.SpanExporter.export`.
+    started_at : float
+        The time at which the step started, in seconds since the epoch.
+    total_duration : float
+        The duration of the step in seconds.
+    memory : int | None
+        The peak memory of the step process in bytes.
+
+    Returns
+    -------
+    StepTelemetry
+        The telemetry of the step.
+    """
+    phase_durations: dict[str, float] = {}
+    calls = []
+    for span in spans:
+        if span.kind == "call":
+            calls.append(span)
+        else:
+            phase_durations[span.name] = phase_durations.get(span.name, 0.0) + span.duration
+    return StepTelemetry(
+        workflow_id=step.get("workflow_id"),
+        workflow_definition_id=step.get("workflow_definition_id"),
+        transition_name=step.get("transition_name"),
+        started_at=started_at,
+        exit_code=None if step.get("exit_code") is None else str(step["exit_code"]),
+        total_duration=total_duration,
+        phase_durations=phase_durations,
+        http_request_count=len(calls),
+        http_error_count=sum(span.outcome == "error" for span in calls),
+        http_duration=sum(span.duration for span in calls),
+        peak_memory=memory,
+        trace_id=step.get("trace_id"),
+    )
+
+
+class TelemetryStore:
+    """
+    A SQLite database which records the telemetry of each step.
+
+    Pass an instance, or the path of the database file, to :class:`~.MIDataflowIntegration` as the ``telemetry_store``
+    argument to add a row for each step when the workflow is resumed. Each row records the workflow definition ID and
+    transition name, the duration of each phase of the step, the number of HTTP requests, the peak memory of the
+    process, and the exit code. The database can be written by steps which run at the same time in several processes.
+
+    Use :meth:`percentiles` to report the 50th, 95th, and 99th percentiles of a metric for each workflow definition and
+    transition, and :meth:`find_regressions` to compare two time windows.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        The database file. It is created if it does not exist.
+
+    Examples
+    --------
+    >>> store = TelemetryStore("telemetry.db")
+    >>> for summary in store.percentiles("total_duration"):
+    ...     print(summary.transition_name, summary.steps, summary.p95)
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._schema_created = False
+        self._schema_lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection to the database, creating the tables if necessary.
+
+        Changes are committed when the ``with`` block exits without an exception.
+
+        Yields
+        ------
+        sqlite3.Connection
+            The connection.
+        """
+        with closing(sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT)) as connection:
+            with self._schema_lock:
+                if not self._schema_created:
+                    # Write-ahead logging allows steps to add rows while the database is being queried
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    for statement in _SCHEMA:
+                        connection.execute(statement)
+                    connection.commit()
+                    self._schema_created = True
+            with connection:
+                yield connection
+
+    def add(self, telemetry: StepTelemetry) -> None:
+        """
+        Add the telemetry of a step.
+
+        Parameters
+        ----------
+        telemetry : StepTelemetry
+            The telemetry of the step.
+        """
+        values = {name: getattr(telemetry, name, None) for name, _ in _COLUMNS}
+        values.update({phase: telemetry.phase_durations.get(phase) for phase in PHASE_ORDER})
+        names = ", ".join(values)
+        placeholders = ", ".join(f":{name}" for name in values)
+        with self._connect() as connection:
+            connection.execute(f"INSERT INTO steps ({names}) VALUES ({placeholders})", values)
+
+    def steps(
+        self,
+        workflow_definition_id: str | None = None,
+        transition_name: str | None = None,
+        since: datetime | float | None = None,
+        until: datetime | float | None = None,
+    ) -> list[StepTelemetry]:
+        """
+        Get the telemetry of the recorded steps.
+
+        Parameters
+        ----------
+        workflow_definition_id : str | None, default ``None``
+            Only include steps of this workflow definition.
+        transition_name : str | None, default ``None``
+            Only include steps run by this transition.
+        since : datetime.datetime | float | None, default ``None``
+            Only include steps which started at or after this time. Times may be provided as seconds since the epoch.
+        until : datetime.datetime | float | None, default ``None``
+            Only include steps which started before this time.
+
+        Returns
+        -------
+        list[StepTelemetry]
+            The steps, in the order in which they started.
+        """
+        conditions, parameters = self._conditions(workflow_definition_id, transition_name, since, until)
+        names = [name for name, _ in _COLUMNS]
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(names)} FROM steps{conditions} ORDER BY started_at", parameters
+            ).fetchall()
+        steps = []
+        for row in rows:
+            values = dict(zip(names, row))
+            phase_durations = {}
+            for phase in PHASE_ORDER:
+                duration = values.pop(phase)
+                if duration is not None:
+                    phase_durations[phase] = duration
+            steps.append(StepTelemetry(phase_durations=phase_durations, **values))
+        return steps
+
+    @staticmethod
+    def _conditions(
+        workflow_definition_id: str | None,
+        transition_name: str | None,
+        since: datetime | float | None,
+        until: datetime | float | None,
+    ) -> tuple[str, list[Any]]:
+        """
+        Build the ``WHERE`` clause of a query.
+
+        Parameters
+        ----------
+        workflow_definition_id : str | None
+            The workflow definition ID.
+        transition_name : str | None
+            The transition name.
+        since : datetime.datetime | float | None
+            The earliest start time.
+        until : datetime.datetime | float | None
+            The start time before which steps are included.
+
+        Returns
+        -------
+        tuple[str, list[Any]]
+            The clause, which is empty if there are no conditions, and its parameters.
+        """
+        conditions = []
+        parameters: list[Any] = []
+        for condition, value in (
+            ("workflow_definition_id = ?", workflow_definition_id),
+            ("transition_name = ?", transition_name),
+            ("started_at >= ?", _timestamp(since)),
+            ("started_at < ?", _timestamp(until)),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def _values(
+        self, metric: str, since: datetime | float | None, until: datetime | float | None
+    ) -> dict[tuple[str | None, str | None], tuple[list[float], int]]:
+        """
+        Get the values of a metric for each workflow definition and transition.
+
+        Parameters
+        ----------
+        metric : str
+            The metric.
+        since : datetime.datetime | float | None
+            The earliest start time.
+        until : datetime.datetime | float | None
+            The start time before which steps are included.
+
+        Returns
+        -------
+        dict[tuple[str | None, str | None], tuple[list[float], int]]
+            The sorted values and the number of failed steps, keyed by workflow definition ID and transition name.
+        """
+        _check_metric(metric)
+        conditions, parameters = self._conditions(None, None, since, until)
+        conditions += " AND " if conditions else " WHERE "
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT workflow_definition_id, transition_name, {metric}, exit_code FROM steps"
+                f"{conditions}{metric} IS NOT NULL ORDER BY {metric}",
+                parameters,
+            ).fetchall()
+        values: dict[tuple[str | None, str | None], tuple[list[float], int]] = {}
+        for definition, transition, value, exit_code in rows:
+            transition_values, failures = values.get((definition, transition), ([], 0))
+            transition_values.append(value)
+            failed = exit_code is not None and exit_code != "0"
+            values[(definition, transition)] = (transition_values, failures + failed)
+        return values
+
+    def percentiles(
+        self,
+        metric: str = "total_duration",
+        since: datetime | float | None = None,
+        until: datetime | float | None = None,
+    ) -> list[TelemetrySummary]:
+        """
+        Get the 50th, 95th, and 99th percentiles of a metric for each workflow definition and transition.
+
+        Parameters
+        ----------
+        metric : str, default ``"total_duration"``
+            The metric. One of ``"total_duration"``, a phase name such as ``"business_logic"``, ``"http_duration"``, or
+            ``"peak_memory"``. Durations are in seconds, and memory is in bytes.
+        since : datetime.datetime | float | None, default ``None``
+            Only include steps which started at or after this time.
+        until : datetime.datetime | float | None, default ``None``
+            Only include steps which started before this time.
+
+        Returns
+        -------
+        list[TelemetrySummary]
+            The percentiles of each workflow definition and transition, with the highest 95th percentile first.
+
+        Raises
+        ------
+        ValueError
+            If the metric is not known.
+        """
+        from ._replay import _percentile
+
+        summaries = [
+            TelemetrySummary(
+                definition,
+                transition,
+                metric,
+                len(values),
+                failures,
+                _percentile(values, 50),
+                _percentile(values, 95),
+                _percentile(values, 99),
+            )
+            for (definition, transition), (values, failures) in self._values(metric, since, until).items()
+        ]
+        return sorted(summaries, key=lambda summary: summary.p95, reverse=True)
+
+    def find_regressions(
+        self,
+        baseline: tuple[datetime | float | None, datetime | float | None],
+        current: tuple[datetime | float | None, datetime | float | None],
+        metric: str = "total_duration",
+        percentile: float = 95,
+        threshold: float = 0.2,
+        min_steps: int = 5,
+    ) -> list[Regression]:
+        """
+        Find workflow transitions for which a percentile of a metric increased between two time windows.
+
+        Parameters
+        ----------
+        baseline : tuple[datetime.datetime | float | None, datetime.datetime | float | None]
+            The start and end of the baseline window. ``None`` leaves the window open at that end.
+        current : tuple[datetime.datetime | float | None, datetime.datetime | float | None]
+            The start and end of the window to compare with the baseline.
+        metric : str, default ``"total_duration"``
+            The metric. See :meth:`percentiles`.
+        percentile : float, default ``95``
+            The percentile to compare, between 0 and 100.
+        threshold : float, default ``0.2``
+            The relative increase above which a transition is reported, for example ``0.2`` for 20 %.
+        min_steps : int, default ``5``
+            The minimum number of steps in each window for a transition to be compared.
+
+        Returns
+        -------
+        list[Regression]
+            The transitions which regressed, with the largest relative increase first.
+
+        Raises
+        ------
+        ValueError
+            If the metric is not known, or the percentile is not between 0 and 100.
+        """
+        from ._replay import _percentile
+
+        if not 0 <= percentile <= 100:
+            raise ValueError(f'"percentile" must be between 0 and 100. Value provided was {percentile}.')
+        baseline_values = self._values(metric, *baseline)
+        regressions = []
+        for key, (values, _) in self._values(metric, *current).items():
+            if key not in baseline_values:
+                continue
+            previous = baseline_values[key][0]
+            if len(values) < min_steps or len(previous) < min_steps:
+                continue
+            baseline_value, current_value = _percentile(previous, percentile), _percentile(values, percentile)
+            if baseline_value == current_value == 0:
+                continue
+            regression = Regression(
+                *key,
+                metric,
+                percentile,
+                baseline_value,
+                current_value,
+                len(previous),
+                len(values),
+            )
+            if regression.change > threshold:
+                regressions.append(regression)
+        return sorted(regressions, key=lambda regression: regression.change, reverse=True)
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return f"{self.__class__.__name__}(path={str(self.path)!r})"
@@ -0,0 +1,152 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+W3C trace context, which identifies the requests sent by a step so that they can be correlated in server logs.
+
+See https://www.w3.org/TR/trace-context/ for the format of the ``traceparent`` header.
+"""
+
+import hashlib
+import os
+import re
+from typing import NamedTuple
+
+TRACEPARENT_HEADER = "traceparent"
+
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_HEX_TRACE_ID_PATTERN = re.compile(r"[0-9a-fA-F]{32}")
+
+
+class TraceContext(NamedTuple):
+    """
+    The W3C trace context of a step.
+
+    The trace ID is derived from the workflow ID, so that all the steps of a workflow instance share a trace, and the
+    span ID identifies the step.
+
+    Attributes
+    ----------
+    trace_id : str
+        The trace ID, as 32 lowercase hexadecimal characters.
+    span_id : str
+        The span ID of the step, as 16 lowercase hexadecimal characters.
+    sampled : bool
+        Whether the trace is sampled.
+    """
+
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    @classmethod
+    def from_workflow_id(cls, workflow_id: str | None) -> "TraceContext":
+        """
+        Create the trace context of a step of a workflow instance, with a new random span ID.
+
+        Parameters
+        ----------
+        workflow_id : str | None
+            The ID of the workflow instance. If the ID is a GUID, the trace ID is the hexadecimal digits of the GUID,
+            so that requests can be found in server logs by searching for the workflow ID without hyphens. Otherwise,
+            the trace ID is derived from a SHA-256 hash of the ID. If ``None``, a random trace ID is used.
+
+        Returns
+        -------
+        TraceContext
+            The trace context.
+        """
+        if workflow_id is None:
+            return cls(_new_trace_id(), _new_span_id())
+        digits = workflow_id.strip("{}").replace("-", "")
+        # An all-zero trace ID is invalid
+        if _HEX_TRACE_ID_PATTERN.fullmatch(digits) and digits.strip("0"):
+            trace_id = digits.lower()
+        else:
+            trace_id = hashlib.sha256(workflow_id.encode("utf-8")).hexdigest()[:32]
+        return cls(trace_id, _new_span_id())
+
+    @classmethod
+    def from_traceparent(cls, traceparent: str) -> "TraceContext":
+        """
+        Parse a ``traceparent`` header.
+
+        Parameters
+        ----------
+        traceparent : str
+            The header value.
+
+        Returns
+        -------
+        TraceContext
+            The trace context.
+
+        Raises
+        ------
+        ValueError
+            If the value is not a valid version ``00`` ``traceparent`` header.
+        """
+        match = _TRACEPARENT_PATTERN.match(traceparent.strip())
+        if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+            raise ValueError(f'Invalid traceparent header "{traceparent}".')
+        return cls(match.group(1), match.group(2), bool(int(match.group(3), 16) & 1))
+
+    @property
+    def traceparent(self) -> str:
+        """
+        The value of the ``traceparent`` header.
+
+        Returns
+        -------
+        str
+            The header value, in the form ``00-<trace_id>-<span_id>-<flags>``.
+        """
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def _new_trace_id() -> str:
+    """
+    Create a random trace ID.
+
+    Returns
+    -------
+    str
+        A trace ID, as 32 lowercase hexadecimal characters which are not all zero.
+    """
+    while True:
+        trace_id = os.urandom(16).hex()
+        if trace_id != "0" * 32:
+            return trace_id
+
+
+def _new_span_id() -> str:
+    """
+    Create a random span ID.
+
+    Returns
+    -------
+    str
+        A span ID, as 16 lowercase hexadecimal characters which are not all zero.
+    """
+    while True:
+        span_id = os.urandom(8).hex()
+        if span_id != "0" * 16:
+            return span_id
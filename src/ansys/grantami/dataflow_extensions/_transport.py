@@ -0,0 +1,611 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+HTTP transport shared by the connections made by a step.
+
+A single connection pool and TLS configuration is shared by the Data Flow API session and by PyGranta clients created
+by :class:`~.MIDataflowIntegration`, so that requests to the same Granta MI server reuse connections instead of each
+client performing its own TCP and TLS handshakes and loading its own copy of the CA certificate store.
+"""
+
+from pathlib import Path
+import socket
+import ssl
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, extract_zipped_paths
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection
+from urllib3.util.ssl_ import create_urllib3_context
+
+from ._logger import logger
+
+# urllib3 does not accept a timeout of zero, so requests sent after the deadline use this timeout and fail immediately
+MINIMUM_TIMEOUT = 0.001
+
+
+class RequestRecord(NamedTuple):
+    """
+    Details of a request sent through the shared transport, which are passed to request observers.
+
+    Attributes
+    ----------
+    request : requests.PreparedRequest
+        The request.
+    response : requests.Response | None
+        The response, or ``None`` if no response was received.
+    start : float
+        The value of :func:`time.perf_counter` when the request was started.
+    duration : float
+        The time in seconds until the response body was received, or until the response headers were received if
+        the response is streamed.
+    bytes_sent : int
+        The size of the request body in bytes.
+    bytes_received : int
+        The size of the response body in bytes, as received before decompression. For streamed responses, the value
+        of the ``Content-Length`` header is used.
+    new_connection : bool | None
+        ``True`` if a new connection was opened for the request, ``False`` if a pooled connection was reused, or
+        ``None`` if no connection was made.
+    """
+
+    request: requests.PreparedRequest
+    response: requests.Response | None
+    start: float
+    duration: float
+    bytes_sent: int
+    bytes_received: int
+    new_connection: bool | None
+
+
+RequestObserver = Callable[[RequestRecord], None]
+
+
+class TransportConfiguration:
+    """
+    Configuration of the HTTP transport shared by all connections to Granta MI made by a step.
+
+    Parameters
+    ----------
+    pool_connections : int, default ``4``
+        The number of connection pools to cache. A separate pool is used for each combination of host and TLS
+        configuration.
+    pool_maxsize : int, default ``10``
+        The maximum number of connections to keep open in each pool. Increase this value if the step sends more
+        concurrent requests to Granta MI.
+    pool_block : bool, default ``False``
+        Whether requests wait for a free connection when ``pool_maxsize`` connections are in use. If ``False``,
+        additional connections are opened and discarded after use.
+    keep_alive : bool, default ``True``
+        Whether connections are kept open and reused between requests. If ``True``, TCP keep-alive probes are also
+        enabled on each connection. If ``False``, a new connection is opened for each request.
+    gzip : bool, default ``True``
+        Whether to request compressed responses from Granta MI.
+
+    Raises
+    ------
+    ValueError
+        If ``pool_connections`` or ``pool_maxsize`` is less than 1.
+
+    Examples
+    --------
+    >>> configuration = TransportConfiguration(pool_maxsize=20)
+    >>> data_flow = MIDataflowIntegration(transport_configuration=configuration)
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        gzip: bool = True,
+    ) -> None:
+        for name, value in [("pool_connections", pool_connections), ("pool_maxsize", pool_maxsize)]:
+            if value < 1:
+                raise ValueError(f'"{name}" must be at least 1. Value provided was {value}.')
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.gzip = gzip
+
+    def __repr__(self) -> str:
+        """Printable representation of the object."""
+        return (
+            f"{self.__class__.__name__}(pool_connections={self.pool_connections}, pool_maxsize={self.pool_maxsize}, "
+            f"pool_block={self.pool_block}, keep_alive={self.keep_alive}, gzip={self.gzip})"
+        )
+
+
+def limit_timeout(timeout: Any, remaining_time: float | None) -> Any:
+    """
+    Limit a request timeout to the time remaining until the step deadline.
+
+    Parameters
+    ----------
+    timeout : float | tuple[float, float] | None
+        The request timeout in seconds, or a tuple of the connect and read timeouts.
+    remaining_time : float | None
+        The time in seconds until the step deadline, or ``None`` if the step has no deadline.
+
+    Returns
+    -------
+    float | tuple[float, float] | None
+        The limited timeout.
+    """
+    if remaining_time is None:
+        return timeout
+    remaining_time = max(remaining_time, MINIMUM_TIMEOUT)
+    if isinstance(timeout, tuple):
+        return tuple(remaining_time if value is None else min(value, remaining_time) for value in timeout)
+    if timeout is None:
+        return remaining_time
+    return min(timeout, remaining_time)
+
+
+def get_client_session(client: Any) -> requests.Session | None:
+    """
+    Get the session used by an ``ansys-openapi-common`` client factory to send requests.
+
+    The session is stored in the private ``_session`` attribute of
+    :class:`~ansys.openapi.common.ApiClientFactory`. If a future version of ``ansys-openapi-common`` no longer provides
+    this attribute, a warning is logged and ``None`` is returned.
+
+    Parameters
+    ----------
+    client : ansys.openapi.common.ApiClientFactory
+        The client factory.
+
+    Returns
+    -------
+    requests.Session | None
+        The session, or ``None`` if the client factory does not have a session attribute.
+    """
+    session = getattr(client, "_session", None)
+    if isinstance(session, requests.Session):
+        return session
+    logger.warning(
+        "Could not find the session of %s. PyGranta requests use their own connection pool, and are not recorded in "
+        "request metrics or sent with trace headers.",
+        type(client).__name__,
+    )
+    return None
+
+
+class _HttpTransport:
+    """
+    A connection pool and TLS context shared by several :class:`requests.Session` objects.
+
+    The SSL context is created once, when the first HTTPS connection is opened, and is used for every HTTPS connection
+    which is verified against the CA certificates configured for the transport.
+
+    Parameters
+    ----------
+    configuration : TransportConfiguration
+        The configuration of the connection pool.
+    verify : bool | str
+        Whether to verify server certificates, or the path to the CA certificate file or directory to use for
+        verification.
+    """
+
+    def __init__(self, configuration: TransportConfiguration, verify: bool | str) -> None:
+        self._configuration = configuration
+        self._verify = verify
+        self._ssl_context: ssl.SSLContext | None = None
+        self._ssl_context_lock = threading.Lock()
+        self._request_observers: list[RequestObserver] = []
+        # Headers added to every request which does not already set them, for example the W3C trace context
+        self.default_headers: dict[str, str] = {}
+        # Sockets which have already been used for a request, to distinguish reused connections from new ones
+        self._used_sockets: weakref.WeakSet[socket.socket] = weakref.WeakSet()
+        self._used_sockets_lock = threading.Lock()
+
+        pool_kwargs: dict[str, Any] = {}
+        if configuration.keep_alive:
+            pool_kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        self._pool_manager = PoolManager(
+            num_pools=configuration.pool_connections,
+            maxsize=configuration.pool_maxsize,
+            block=configuration.pool_block,
+            **pool_kwargs,
+        )
+        logger.debug("Created HTTP transport with %r.", configuration)
+
+    @staticmethod
+    def _create_ssl_context(verify: bool | str) -> ssl.SSLContext:
+        """
+        Create an SSL context which verifies server certificates against the provided CA certificates.
+
+        Parameters
+        ----------
+        verify : bool | str
+            ``True`` to use the CA certificates bundled with ``requests``, or the path to a CA certificate file or
+            directory.
+
+        Returns
+        -------
+        ssl.SSLContext
+            The SSL context.
+        """
+        context = create_urllib3_context()
+        ca_path = extract_zipped_paths(DEFAULT_CA_BUNDLE_PATH) if verify is True else str(verify)
+        if Path(ca_path).is_dir():
+            context.load_verify_locations(capath=ca_path)
+        else:
+            context.load_verify_locations(cafile=ca_path)
+        return context
+
+    @property
+    def configuration(self) -> TransportConfiguration:
+        """
+        The configuration of the connection pool.
+
+        Returns
+        -------
+        TransportConfiguration
+            The transport configuration.
+        """
+        return self._configuration
+
+    @property
+    def verify(self) -> bool | str:
+        """
+        The certificate verification setting used by sessions which share this transport.
+
+        Returns
+        -------
+        bool | str
+            ``False`` if certificates are not verified, ``True`` to verify certificates against public CAs, or the path
+            to the CA certificates.
+        """
+        return self._verify
+
+    @property
+    def ssl_context(self) -> ssl.SSLContext | None:
+        """
+        The SSL context used to verify server certificates.
+
+        The context is created on first access.
+
+        Returns
+        -------
+        ssl.SSLContext | None
+            The SSL context, or ``None`` if certificate verification is disabled.
+        """
+        if not self._verify:
+            return None
+        with self._ssl_context_lock:
+            if self._ssl_context is None:
+                self._ssl_context = self._create_ssl_context(self._verify)
+            return self._ssl_context
+
+    @property
+    def pool_manager(self) -> PoolManager:
+        """
+        The connection pool manager shared by all sessions.
+
+        Returns
+        -------
+        urllib3.PoolManager
+            The connection pool manager.
+        """
+        return self._pool_manager
+
+    def add_request_observer(self, observer: RequestObserver) -> None:
+        """
+        Register a function which is called after each request sent through the transport.
+
+        Observers are called on the thread which sent the request. Exceptions raised by observers are logged, and do
+        not affect the request.
+
+        Parameters
+        ----------
+        observer : Callable[[RequestRecord], None]
+            The function. It is called with the details of the request.
+        """
+        self._request_observers.append(observer)
+
+    def notify_request_observers(self, record: RequestRecord) -> None:
+        """
+        Call the registered request observers.
+
+        Parameters
+        ----------
+        record : RequestRecord
+            The details of the request.
+        """
+        for observer in self._request_observers:
+            try:
+                observer(record)
+            except Exception:
+                logger.exception("Request observer %r failed.", observer)
+
+    def is_new_connection(self, response: requests.Response) -> bool | None:
+        """
+        Check whether a response was received on a connection which had not been used for an earlier request.
+
+        Must be called before the response body is read, while the connection is held by the response.
+
+        Parameters
+        ----------
+        response : requests.Response
+            The response.
+
+        Returns
+        -------
+        bool | None
+            ``True`` if the connection is new, ``False`` if it was reused, or ``None`` if the connection is not known.
+        """
+        connection = getattr(response.raw, "connection", None)
+        sock = getattr(connection, "sock", None)
+        if sock is None:
+            return None
+        with self._used_sockets_lock:
+            if sock in self._used_sockets:
+                return False
+            self._used_sockets.add(sock)
+            return True
+
+    def create_adapter(
+        self,
+        timeout: float | None = None,
+        max_retries: Any = 0,
+        remaining_time: Callable[[], float | None] | None = None,
+    ) -> HTTPAdapter:
+        """
+        Create a transport adapter which sends requests using the shared connection pool.
+
+        Parameters
+        ----------
+        timeout : float | None, default ``None``
+            The timeout in seconds applied to requests sent without an explicit timeout.
+        max_retries : int | urllib3.util.Retry, default ``0``
+            The retry configuration of the adapter.
+        remaining_time : Callable[[], float | None], optional
+            Function which returns the time in seconds until the step deadline, or ``None`` if the step has no
+            deadline. Request timeouts are reduced so that requests do not continue after the deadline.
+
+        Returns
+        -------
+        requests.adapters.HTTPAdapter
+            The transport adapter.
+        """
+        return _TransportAdapter(self, timeout=timeout, max_retries=max_retries, remaining_time=remaining_time)
+
+    def mount(
+        self,
+        session: requests.Session,
+        timeout: float | None = None,
+        max_retries: Any = 0,
+        remaining_time: Callable[[], float | None] | None = None,
+    ) -> None:
+        """
+        Configure a session to send requests using the shared connection pool.
+
+        Parameters
+        ----------
+        session : requests.Session
+            The session to configure.
+        timeout : float | None, default ``None``
+            The timeout in seconds applied to requests sent without an explicit timeout.
+        max_retries : int | urllib3.util.Retry, default ``0``
+            The retry configuration of the adapter.
+        remaining_time : Callable[[], float | None], optional
+            Function which returns the time in seconds until the step deadline, or ``None`` if the step has no
+            deadline.
+        """
+        adapter = self.create_adapter(timeout=timeout, max_retries=max_retries, remaining_time=remaining_time)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.verify = self._verify
+        session.headers["Accept-Encoding"] = "gzip, deflate" if self._configuration.gzip else "identity"
+        if self._configuration.keep_alive:
+            session.headers["Connection"] = "keep-alive"
+        else:
+            session.headers["Connection"] = "close"
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._pool_manager.clear()
+
+
+class _TransportAdapter(HTTPAdapter):
+    """
+    A transport adapter which uses the connection pool and SSL context of a shared transport.
+
+    Parameters
+    ----------
+    transport : _HttpTransport
+        The transport which owns the connection pool.
+    timeout : float | None
+        The timeout in seconds applied to requests sent without an explicit timeout.
+    max_retries : int | urllib3.util.Retry
+        The retry configuration of the adapter.
+    remaining_time : Callable[[], float | None] | None
+        Function which returns the time in seconds until the step deadline, or ``None`` if the step has no deadline.
+    """
+
+    def __init__(
+        self,
+        transport: _HttpTransport,
+        timeout: float | None,
+        max_retries: Any,
+        remaining_time: Callable[[], float | None] | None = None,
+    ) -> None:
+        self._transport = transport
+        self.timeout = timeout
+        self._remaining_time = remaining_time
+        configuration = transport.configuration
+        super().__init__(
+            pool_connections=configuration.pool_connections,
+            pool_maxsize=configuration.pool_maxsize,
+            max_retries=max_retries,
+            pool_block=configuration.pool_block,
+        )
+
+    def init_poolmanager(  # numpydoc ignore=PR01
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        """Use the connection pool of the transport instead of creating a new one."""
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = self._transport.pool_manager
+
+    def _uses_transport_ssl_context(self, verify: Any) -> bool:
+        """
+        Check whether requests with the provided verification setting use the SSL context of the transport.
+
+        Parameters
+        ----------
+        verify : bool | str
+            The verification setting of the request.
+
+        Returns
+        -------
+        bool
+            ``True`` if the SSL context of the transport is used.
+        """
+        return bool(verify) and verify == self._transport.verify
+
+    def build_connection_pool_key_attributes(  # numpydoc ignore=PR01,RT01
+        self, request: requests.PreparedRequest, verify: Any, cert: Any = None
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Select a connection pool which uses the SSL context of the transport."""
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        if host_params["scheme"] == "https" and self._uses_transport_ssl_context(verify):
+            # The CA certificates are already loaded into the shared SSL context. Passing them to urllib3 as well
+            # would reload them for every new connection.
+            pool_kwargs.pop("ca_certs", None)
+            pool_kwargs.pop("ca_cert_dir", None)
+            pool_kwargs["ssl_context"] = self._transport.ssl_context
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn: Any, url: str, verify: Any, cert: Any) -> None:  # numpydoc ignore=PR01
+        """Configure certificate verification, without reloading CA certificates held by the SSL context."""
+        super().cert_verify(conn, url, verify, cert)
+        ssl_context = getattr(conn, "conn_kw", {}).get("ssl_context")
+        if ssl_context is not None and ssl_context is self._transport.ssl_context:
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+    def send(  # numpydoc ignore=PR01,RT01
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        proxies: dict[str, str] | None = None,
+    ) -> requests.Response:
+        """Send a request, applying the default timeout of the adapter and limiting it to the step deadline."""
+        timeout = timeout or self.timeout
+        for name, value in self._transport.default_headers.items():
+            request.headers.setdefault(name, value)
+        if self._remaining_time is not None:
+            timeout = limit_timeout(timeout, self._remaining_time())
+        start = time.perf_counter()
+        response = None
+        new_connection = None
+        try:
+            response = super().send(request, stream, timeout, verify, cert, proxies)
+            new_connection = self._transport.is_new_connection(response)
+            if not stream:
+                # The session reads the body immediately after the response is returned. Reading it here includes the
+                # time taken to receive it in the duration of the request.
+                response.content
+            return response
+        finally:
+            duration = time.perf_counter() - start
+            self._transport.notify_request_observers(
+                RequestRecord(
+                    request,
+                    response,
+                    start,
+                    duration,
+                    _body_size(request.body),
+                    _received_size(response),
+                    new_connection,
+                )
+            )
+
+    def close(self) -> None:
+        """Close proxy connections. The shared connection pool is closed by the transport."""
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+
+def _body_size(body: Any) -> int:
+    """
+    Get the size of a request body in bytes.
+
+    Parameters
+    ----------
+    body : bytes | str | None
+        The request body.
+
+    Returns
+    -------
+    int
+        The size of the body, or ``0`` if the body is streamed from a file or generator.
+    """
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return 0
+
+
+def _received_size(response: requests.Response | None) -> int:
+    """
+    Get the size of a response body in bytes, as received before decompression.
+
+    Parameters
+    ----------
+    response : requests.Response | None
+        The response.
+
+    Returns
+    -------
+    int
+        The number of bytes received if the body has been read, otherwise the value of the ``Content-Length`` header.
+    """
+    if response is None:
+        return 0
+    if getattr(response, "_content_consumed", False):
+        try:
+            return int(response.raw.tell())
+        except Exception:
+            return len(response.content or b"")
+    try:
+        return int(response.headers.get("Content-Length", 0))
+    except ValueError:
+        return 0
@@ -0,0 +1,146 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import logging
+
+from common import HTTP_URL, HTTPS_URL, TRANSITION_NAME, WORKFLOW_DEFINITION_ID, WORKFLOW_ID, basic_header
+import pytest
+
+from ansys.grantami.dataflow_extensions import (
+    AsyncMIDataflowApiLogHandler,
+    AsyncMIDataflowIntegration,
+    MIDataflowApiLogHandler,
+)
+
+
+@pytest.fixture
+def test_logger():
+    logger = logging.getLogger("test_async_logger")
+    logger.setLevel(1)
+    logger.handlers = []
+    logger.propagate = False
+    return logger
+
+
+@pytest.mark.parametrize(
+    ["fixture_name", "expected_url_root"],
+    [("basic_http", HTTP_URL), ("basic_https", HTTPS_URL), ("oidc_https", HTTPS_URL)],
+)
+def test_payload_is_parsed(fixture_name, expected_url_root, request):
+    test_case = request.getfixturevalue(fixture_name)
+    df = AsyncMIDataflowIntegration.from_dict_payload(test_case.payload, use_https=test_case.use_https)
+    assert df._df_data == test_case.payload
+    assert df._authentication_mode == test_case.auth_mode
+    assert df._dataflow_url == expected_url_root
+
+
+@pytest.mark.parametrize("return_code", [0, 1, "-42"])
+def test_resume_bookmark(requests_mock, basic_http, return_code):
+    requests_mock.post(f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}")
+
+    async def step():
+        async with AsyncMIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False) as df:
+            await df.resume_bookmark(return_code)
+
+    asyncio.run(step())
+
+    assert requests_mock.call_count == 1
+    request = requests_mock.request_history[0]
+    assert request.headers["Authorization"] == basic_header
+    data = request.json()
+    assert data["Values"]["ExitCode"] == return_code
+    assert data["WorkflowDefinitionName"] == WORKFLOW_DEFINITION_ID
+    assert data["TransitionName"] == TRANSITION_NAME
+
+
+def test_log_msg_to_instance(requests_mock, oidc_https):
+    requests_mock.put(f"{HTTPS_URL}/api/logs")
+
+    async def step():
+        async with AsyncMIDataflowIntegration.from_dict_payload(oidc_https.payload) as df:
+            await asyncio.gather(*(df.log_msg_to_instance(f"Message {i}", "Info") for i in range(20)))
+
+    asyncio.run(step())
+
+    assert requests_mock.call_count == 20
+    messages = {r.json()["Message"] for r in requests_mock.request_history}
+    assert messages == {f"Message {i}" for i in range(20)}
+    assert all(r.json()["WorkflowId"] == WORKFLOW_ID for r in requests_mock.request_history)
+
+
+def test_log_handler_sends_in_order_before_resume(requests_mock, basic_http, test_logger):
+    requests_mock.put(f"{HTTP_URL}/api/logs")
+    requests_mock.post(f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}")
+
+    async def step():
+        async with AsyncMIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False) as df:
+            handler = df.get_api_log_handler()
+            test_logger.addHandler(handler)
+            for i in range(10):
+                test_logger.warning(f"Message {i}")
+            await df.resume_bookmark(0)
+
+    asyncio.run(step())
+
+    assert requests_mock.call_count == 11
+    log_requests = requests_mock.request_history[:-1]
+    assert [r.json()["Message"] for r in log_requests] == [f"Message {i}" for i in range(10)]
+    assert all(r.json()["Level"] == "Warn" for r in log_requests)
+    assert requests_mock.request_history[-1].method == "POST"
+
+
+def test_log_handler_outside_event_loop(requests_mock, basic_http, test_logger):
+    requests_mock.put(f"{HTTP_URL}/api/logs")
+    df = AsyncMIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+    test_logger.addHandler(df.get_api_log_handler())
+
+    test_logger.info("Sent synchronously")
+
+    assert requests_mock.call_count == 1
+    assert requests_mock.request_history[0].json()["Message"] == "Sent synchronously"
+
+
+def test_http_client_is_shared(basic_http):
+    df = AsyncMIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+    assert df.http_client is df.http_client
+    assert df.http_client.session is df._api_session
+
+
+def test_sync_log_handler_raises_exception(basic_http):
+    df = AsyncMIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+    with pytest.raises(TypeError, match="AsyncMIDataflowApiLogHandler"):
+        df.get_api_log_handler(MIDataflowApiLogHandler)
+
+
+def test_invalid_concurrency_raises_exception(basic_http):
+    df = AsyncMIDataflowIntegration.from_dict_payload(
+        basic_http.payload,
+        use_https=False,
+        max_concurrent_requests=0,
+    )
+    with pytest.raises(ValueError, match="max_concurrent_requests"):
+        _ = df.http_client
+
+
+def test_handler_type_is_exported():
+    assert issubclass(AsyncMIDataflowApiLogHandler, MIDataflowApiLogHandler)
@@ -0,0 +1,158 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from ansys.openapi.common import ApiClientFactory
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+import requests
+
+from ansys.grantami.dataflow_extensions import AsyncMIDataflowIntegration, MIDataflowIntegration, RetryPolicy
+from ansys.grantami.dataflow_extensions._transport import MINIMUM_TIMEOUT, limit_timeout
+
+RESUME_URL = f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}"
+LOG_URL = f"{HTTP_URL}/api/logs"
+
+
+def _integration(test_case, cls=MIDataflowIntegration, **kwargs):
+    return cls.from_dict_payload(test_case.payload, use_https=False, **kwargs)
+
+
+@pytest.mark.parametrize(
+    ["timeout", "remaining_time", "expected"],
+    [
+        (30, None, 30),
+        (None, None, None),
+        (30, 5.0, 5.0),
+        (2, 5.0, 2),
+        (None, 5.0, 5.0),
+        ((3, 30), 5.0, (3, 5.0)),
+        ((None, 30), 5.0, (5.0, 5.0)),
+        (30, -1.0, MINIMUM_TIMEOUT),
+    ],
+)
+def test_limit_timeout(timeout, remaining_time, expected):
+    assert limit_timeout(timeout, remaining_time) == expected
+
+
+class TestDeadline:
+    @pytest.mark.parametrize("deadline", [0, -1])
+    def test_invalid_deadline_raises_exception(self, basic_http, deadline):
+        with pytest.raises(ValueError, match="deadline"):
+            _integration(basic_http, deadline=deadline)
+
+    def test_no_deadline(self, basic_http):
+        df = _integration(basic_http)
+        assert df.remaining_time is None
+        assert df._watchdog is None
+
+    def test_remaining_time(self, basic_http):
+        df = _integration(basic_http, deadline=60)
+        assert 59 < df.remaining_time <= 60
+
+    def test_request_timeout_without_deadline(self, requests_mock, basic_http):
+        requests_mock.put(LOG_URL)
+        _integration(basic_http).log_msg_to_instance("Message", "Info")
+        assert requests_mock.request_history[0].timeout == 30
+
+    def test_request_timeout_is_limited_by_deadline(self, requests_mock, basic_http):
+        requests_mock.put(LOG_URL)
+        _integration(basic_http, deadline=5).log_msg_to_instance("Message", "Info")
+        assert requests_mock.request_history[0].timeout <= 5
+
+    def test_retries_stop_at_deadline(self, requests_mock, basic_http):
+        requests_mock.put(LOG_URL, status_code=503)
+        policy = RetryPolicy(backoff_factor=10, jitter=False)
+        df = _integration(basic_http, deadline=5, retry_policy=policy)
+        with pytest.raises(requests.HTTPError):
+            df.log_msg_to_instance("Message", "Info")
+        assert requests_mock.call_count == 1
+        assert df.retry_counts["log_msg_to_instance"] == 0
+
+    def test_pygranta_timeout_is_limited_by_deadline(self, basic_http):
+        df = _integration(basic_http, deadline=60)
+        with patch.object(ApiClientFactory, "with_credentials", lambda self, **kwargs: self):
+            connection = df.configure_pygranta_connection(ApiClientFactory)
+        adapter = connection._session.get_adapter(df.service_layer_url)
+        assert 59 < adapter._remaining_time() <= 60
+
+    @pytest.mark.parametrize(["timeout", "expected"], [(None, 60000), (500, 500), (120000, 60000)])
+    def test_scripting_toolkit_timeout_is_limited_by_deadline(self, basic_http, timeout, expected):
+        df = _integration(basic_http, deadline=60)
+        assert expected - 1000 < df._limit_scripting_toolkit_timeout(timeout) <= expected
+
+    def test_scripting_toolkit_timeout_without_deadline(self, basic_http):
+        df = _integration(basic_http)
+        assert df._limit_scripting_toolkit_timeout(500) == 500
+        assert df._limit_scripting_toolkit_timeout(None) is None
+
+
+class TestWatchdog:
+    def test_watchdog_resumes_workflow(self, requests_mock, basic_http, caplog):
+        requests_mock.post(RESUME_URL)
+        df = _integration(basic_http, deadline=0.1, deadline_exit_code="Timeout")
+        df._watchdog.join(timeout=5)
+
+        assert requests_mock.call_count == 1
+        assert json.loads(requests_mock.request_history[0].text)["Values"] == {"ExitCode": "Timeout"}
+        assert "Step deadline exceeded" in caplog.text
+
+        df.resume_bookmark(0)
+        assert requests_mock.call_count == 1
+
+    def test_resume_stops_watchdog(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        df = _integration(basic_http, deadline=0.5)
+        df.resume_bookmark(0)
+        df._watchdog.join(timeout=5)
+
+        assert not df._watchdog.is_alive()
+        assert requests_mock.call_count == 1
+        assert json.loads(requests_mock.request_history[0].text)["Values"] == {"ExitCode": 0}
+
+    def test_watchdog_does_not_interrupt_resume_in_progress(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        df = _integration(basic_http, deadline=60)
+        with df._resume_lock:
+            df._on_deadline()
+        assert requests_mock.call_count == 0
+
+    def test_watchdog_failure_is_logged(self, requests_mock, basic_http, caplog):
+        requests_mock.post(RESUME_URL, status_code=400)
+        df = _integration(basic_http, deadline=0.1)
+        df._watchdog.join(timeout=5)
+        assert "Failed to resume the workflow after the step deadline was exceeded" in caplog.text
+
+    def test_async_resume_after_watchdog_is_ignored(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        df = _integration(basic_http, cls=AsyncMIDataflowIntegration, deadline=0.1)
+        df._watchdog.join(timeout=5)
+
+        async def main():
+            async with df:
+                await df.resume_bookmark(0)
+
+        asyncio.run(main())
+        assert requests_mock.call_count == 1
@@ -0,0 +1,145 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import sys
+
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+
+from ansys.grantami.dataflow_extensions import JsonSerializer, MIDataflowIntegration, OrjsonSerializer
+from ansys.grantami.dataflow_extensions._json import default_json_serializer
+
+DOCUMENTS = [
+    {"Values": {"ExitCode": 0}, "WorkflowDefinitionName": "Definition", "TransitionName": "Transition"},
+    {"WorkflowId": "67eb55ff", "Message": 'Unicode é ✓, escapes "\\\n\t', "Level": "Info"},
+    [1, -1, 0.1, -0.0, 1.5e300, 1e16, 1e-07, 5e-324, 2**64, -(2**70), True, False, None],
+    {"nested": [{"a": []}, {}], "": ""},
+    "string",
+]
+
+
+@pytest.fixture
+def orjson_serializer():
+    pytest.importorskip("orjson")
+    return OrjsonSerializer()
+
+
+class TestSerializers:
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_stdlib_dumps_compact_utf8(self, document):
+        result = JsonSerializer().dumps(document)
+        assert result == json.dumps(document, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        assert json.loads(result) == document
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_orjson_output_equivalent(self, document, orjson_serializer):
+        assert json.loads(orjson_serializer.dumps(document)) == json.loads(JsonSerializer().dumps(document))
+
+    @pytest.mark.parametrize("document", [d for d in DOCUMENTS if not isinstance(d, list)])
+    def test_orjson_output_identical(self, document, orjson_serializer):
+        assert orjson_serializer.dumps(document) == JsonSerializer().dumps(document)
+
+    def test_orjson_exponent_format(self, orjson_serializer):
+        assert orjson_serializer.dumps([1e16, 1e-07]) == b"[1e16,1e-7]"
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_orjson_loads_identical(self, document, orjson_serializer):
+        text = json.dumps(document)
+        assert orjson_serializer.loads(text) == JsonSerializer().loads(text)
+        assert orjson_serializer.loads(text.encode("utf-8")) == document
+
+    def test_orjson_loads_stdlib_extensions(self, orjson_serializer):
+        assert orjson_serializer.loads("[123456789012345678901234567890, Infinity]") == [
+            123456789012345678901234567890,
+            float("inf"),
+        ]
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), {"a": [float("-inf")]}])
+    def test_non_finite_floats_rejected(self, value):
+        with pytest.raises(ValueError):
+            JsonSerializer().dumps(value)
+
+    def test_orjson_non_finite_floats_are_null(self, orjson_serializer):
+        assert orjson_serializer.dumps({"a": [float("nan"), float("-inf")]}) == b'{"a":[null,null]}'
+
+    def test_invalid_json_raises(self, orjson_serializer):
+        for serializer in [JsonSerializer(), orjson_serializer]:
+            with pytest.raises(json.JSONDecodeError):
+                serializer.loads('{"a": ')
+
+    def test_unserializable_raises_type_error(self, orjson_serializer):
+        for serializer in [JsonSerializer(), orjson_serializer]:
+            with pytest.raises(TypeError):
+                serializer.dumps(object())
+
+
+class TestDefaultSerializer:
+    def test_orjson_used_if_installed(self, orjson_serializer):
+        assert isinstance(default_json_serializer(), OrjsonSerializer)
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        serializer = default_json_serializer()
+        assert type(serializer) is JsonSerializer
+
+
+class _CountingSerializer(JsonSerializer):
+    def __init__(self):
+        self.loads_count = 0
+        self.dumps_count = 0
+
+    def loads(self, data):
+        self.loads_count += 1
+        return super().loads(data)
+
+    def dumps(self, obj):
+        self.dumps_count += 1
+        return super().dumps(obj)
+
+
+class TestIntegration:
+    def test_custom_serializer(self, requests_mock, basic_http):
+        serializer = _CountingSerializer()
+        df = MIDataflowIntegration.from_string_payload(
+            basic_http.payload_str, use_https=False, json_serializer=serializer
+        )
+        assert df._json_serializer is serializer
+        assert df._df_data == basic_http.payload
+        assert serializer.loads_count == 1
+
+        requests_mock.post(f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}")
+        df.resume_bookmark(0)
+        assert serializer.dumps_count == 1
+        request = requests_mock.request_history[0]
+        assert request.headers["Content-Type"] == "application/json"
+        assert request.body == JsonSerializer().dumps(request.json())
+
+    def test_payload_string_format_unchanged(self, basic_http):
+        df = basic_http.dataflow_integration
+        expected = dict(basic_http.payload, AuthorizationHeader="<HeaderRemoved>")
+        assert df.get_payload_as_string() == json.dumps(expected)
+        assert df.get_payload_as_string(indent=True) == json.dumps(expected, indent=4)
+
+    def test_payload_string_unexpected_argument(self, basic_http):
+        with pytest.raises(TypeError, match=r"get_payload_as_string\(\) got an unexpected keyword argument 'foo'"):
+            basic_http.dataflow_integration.get_payload_as_string(foo=True)
@@ -0,0 +1,75 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+DEFERRED_MODULES = [
+    "requests",
+    "requests_negotiate_sspi",
+    "ansys.openapi.common",
+    "ansys.grantami.core",
+    "GRANTA_MIScriptingToolkit",
+    "asyncio",
+    "cProfile",
+    "pstats",
+]
+
+
+def _modules_after(statement: str) -> list[str]:
+    script = f"import json, sys\n{statement}\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_package_import_defers_dependencies():
+    modules = _modules_after("import ansys.grantami.dataflow_extensions")
+    assert [m for m in DEFERRED_MODULES if m in modules] == []
+
+
+def test_constructor_defers_dependencies():
+    statement = (
+        "from ansys.grantami.dataflow_extensions import MIDataflowIntegration\n"
+        "MIDataflowIntegration.from_dict_payload({'WorkflowUrl': 'http://localhost/mi_workflow_2',"
+        " 'ClientCredentialType': 'Windows', 'AuthorizationHeader': '', 'WorkflowId': 'a',"
+        " 'WorkflowDefinitionId': 'b', 'TransitionName': 'c'}, use_https=False)"
+    )
+    modules = _modules_after(statement)
+    assert [m for m in DEFERRED_MODULES if m in modules] == []
+
+
+@pytest.mark.parametrize("name", ["AsyncMIDataflowIntegration", "StepHost", "__version__"])
+def test_lazy_attributes_resolve(name):
+    import ansys.grantami.dataflow_extensions as package
+
+    assert getattr(package, name) is not None
+    assert name in dir(package)
+
+
+def test_unknown_attribute_raises():
+    import ansys.grantami.dataflow_extensions as package
+
+    with pytest.raises(AttributeError):
+        package.DoesNotExist
@@ -0,0 +1,169 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import math
+
+import pytest
+
+from ansys.grantami.dataflow_extensions import (
+    DataflowStandIn,
+    EndpointBehavior,
+    LoadLevelResult,
+    LoadTestResult,
+    StepWorkload,
+    run_load_test,
+)
+from ansys.grantami.dataflow_extensions.__main__ import main
+
+
+def _level(concurrency, durations, failures=0):
+    return LoadLevelResult(concurrency, durations, {}, failures=failures, retries=0, elapsed=1.0)
+
+
+class TestStepWorkload:
+    @pytest.mark.parametrize("name", ["log_messages", "pygranta_calls", "business_logic_duration"])
+    def test_negative_argument_raises_exception(self, name):
+        with pytest.raises(ValueError, match=name):
+            StepWorkload(**{name: -1})
+
+    def test_to_dict_round_trip(self):
+        workload = StepWorkload(log_messages=2, pygranta_calls=3, business_logic_duration=0.5, exit_code=1)
+        assert repr(StepWorkload(**workload.to_dict())) == repr(workload)
+
+
+class TestLoadTestResult:
+    def test_level_summary(self):
+        level = LoadLevelResult(
+            4, [0.01, 0.02, 0.03], {"resume_bookmark": [0.001, 0.003]}, failures=1, retries=2, elapsed=0.5
+        )
+        assert level.steps == 4
+        assert level.error_rate == 0.25
+        assert level.throughput == 6.0
+        assert level.operations == ["resume_bookmark"]
+        summary = level.summary()
+        assert summary["p50_ms"] == pytest.approx(20)
+        assert summary["max_ms"] == pytest.approx(30)
+        assert summary["resume_bookmark_p50_ms"] == pytest.approx(2)
+        assert summary["retries"] == 2
+
+    def test_empty_level(self):
+        level = _level(1, [], failures=2)
+        assert level.error_rate == 1.0
+        assert math.isnan(level.percentile(95))
+        assert math.isnan(level.summary()["max_ms"])
+
+    def test_max_sustainable_concurrency(self):
+        result = LoadTestResult([_level(1, [0.1]), _level(8, [0.15]), _level(32, [0.25]), _level(64, [0.12])])
+        assert result.max_sustainable_concurrency() == 8
+        assert result.max_sustainable_concurrency(latency_factor=3) == 64
+
+    def test_max_sustainable_concurrency_with_errors(self):
+        result = LoadTestResult([_level(1, [0.1]), _level(8, [0.1] * 9, failures=1)])
+        assert result.max_sustainable_concurrency() == 1
+        assert result.max_sustainable_concurrency(max_error_rate=0.2) == 8
+
+    def test_max_sustainable_concurrency_fails_at_first_level(self):
+        assert LoadTestResult([_level(1, [], failures=1)]).max_sustainable_concurrency() is None
+
+
+class TestRunLoadTest:
+    def test_steps_run_workload(self):
+        workload = StepWorkload(log_messages=2, pygranta_calls=1)
+        with DataflowStandIn() as stand_in:
+            result = run_load_test([1, 3], workload, dataflow_url=stand_in.url)
+            assert stand_in.request_counts == {"resume_bookmark": 16, "log_msg_to_instance": 32, "service_layer": 32}
+        assert [level.steps for level in result.levels] == [4, 12]
+        assert [level.concurrency for level in result.levels] == [1, 3]
+        level = result.levels[1]
+        assert level.failures == 0
+        assert level.operations == ["log_msg_to_instance", "pygranta_connect", "pygranta_request", "resume_bookmark"]
+        assert level.percentile(50) > level.percentile(50, "resume_bookmark")
+
+    def test_default_stand_in(self):
+        result = run_load_test([2], steps_per_level=3)
+        assert result.levels[0].steps == 3
+        assert result.levels[0].operations == ["resume_bookmark"]
+
+    def test_failures_are_counted(self):
+        behavior = EndpointBehavior(error_rate=1, error_status=400)
+        with DataflowStandIn(endpoint_behaviors={"resume_bookmark": behavior}) as stand_in:
+            result = run_load_test([2], steps_per_level=4, dataflow_url=stand_in.url)
+        assert result.levels[0].failures == 4
+        assert result.levels[0].error_rate == 1.0
+
+    def test_retries_are_counted(self):
+        behavior = EndpointBehavior(disconnect_rate=0.3)
+        with DataflowStandIn(endpoint_behaviors={"log_msg_to_instance": behavior}, seed=2) as stand_in:
+            result = run_load_test([2], StepWorkload(log_messages=5), steps_per_level=4, dataflow_url=stand_in.url)
+            assert result.levels[0].retries == stand_in.error_counts["log_msg_to_instance"] > 0
+
+    def test_payload_factory(self, basic_http):
+        payloads = []
+
+        def factory(url):
+            payloads.append({**basic_http.payload, "WorkflowUrl": url})
+            return payloads[-1]
+
+        run_load_test([1], steps_per_level=2, payload_factory=factory)
+        assert len(payloads) == 2
+
+    def test_process_mode(self):
+        with DataflowStandIn() as stand_in:
+            result = run_load_test(
+                [2], StepWorkload(log_messages=1), steps_per_level=2, mode="process", dataflow_url=stand_in.url
+            )
+            assert stand_in.request_counts["resume_bookmark"] == 2
+        assert result.levels[0].failures == 0
+        assert result.levels[0].operations == ["log_msg_to_instance", "resume_bookmark"]
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"concurrency_levels": [1, 0]}, {"steps_per_level": 0}, {"mode": "fork"}],
+    )
+    def test_invalid_arguments_raise_exception(self, kwargs):
+        with pytest.raises(ValueError):
+            run_load_test(**{"concurrency_levels": [1], **kwargs})
+
+    def test_command_line(self, capsys):
+        exit_code = main(
+            [
+                "load-test",
+                "--concurrency",
+                "1,2",
+                "--steps-per-level",
+                "2",
+                "--log-messages",
+                "1",
+                "--record-count",
+                "100",
+            ]
+        )
+        assert exit_code == 0
+        output = capsys.readouterr().out
+        assert "throughput_per_s" in output
+        assert "Maximum sustainable concurrency" in output
+
+        main(["load-test", "--concurrency", "2", "--steps-per-level", "2", "--latency", "0.01", "--json"])
+        summary = json.loads(capsys.readouterr().out)
+        assert summary[0]["concurrency"] == 2
+        assert summary[0]["p50_ms"] >= 10
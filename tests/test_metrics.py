@@ -0,0 +1,216 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import time
+
+from ansys.openapi.common import ApiClientFactory
+from common import WORKFLOW_ID
+import pytest
+import requests
+
+from ansys.grantami.dataflow_extensions import DataflowStandIn, HttpMetrics, MetricsServer, MIDataflowIntegration
+from ansys.grantami.dataflow_extensions.__main__ import _build_parser
+from ansys.grantami.dataflow_extensions._metrics import _endpoint, _lock_file, _parse
+from ansys.grantami.dataflow_extensions._transport import RequestRecord
+
+URL = "http://localhost/mi_dataflow/api/logs"
+
+
+def _record(duration=0.1, status_code=200, new_connection=True, url=URL, method="PUT"):
+    request = requests.Request(method, url, data=b"12345").prepare()
+    response = None
+    if status_code is not None:
+        response = requests.Response()
+        response.status_code = status_code
+    return RequestRecord(request, response, 0.0, duration, 5, 10, new_connection)
+
+
+def _sample(samples, name, **labels):
+    return sum(
+        value
+        for key, value in samples.items()
+        if key.partition("{")[0] == name and all(f'{label}="{value}"' in key for label, value in labels.items())
+    )
+
+
+@pytest.mark.parametrize(
+    ["url", "expected"],
+    [
+        ("http://host:8080/mi_dataflow/api/logs", ("host:8080", "/mi_dataflow/api/logs")),
+        (f"https://host/mi_dataflow//api/workflows/{WORKFLOW_ID}", ("host", "/mi_dataflow/api/workflows/{id}")),
+        ("https://user@host/mi_servicelayer/api/items/42?name=a", ("host", "/mi_servicelayer/api/items/{id}")),
+        ("https://host", ("host", "/")),
+    ],
+)
+def test_endpoint(url, expected):
+    assert _endpoint(url) == expected
+
+
+class TestHttpMetrics:
+    @pytest.mark.parametrize("buckets", [[], [0, 1], [1, 1], [2, 1]])
+    def test_invalid_buckets_raise_exception(self, buckets):
+        with pytest.raises(ValueError, match="buckets"):
+            HttpMetrics(buckets)
+
+    def test_histogram(self):
+        metrics = HttpMetrics(buckets=[0.1, 1])
+        for duration in (0.05, 0.1, 0.5, 2):
+            metrics.observe(_record(duration))
+        samples = _parse(metrics.to_prometheus())
+        name = "granta_dataflow_http_request_duration_seconds"
+        assert _sample(samples, f"{name}_bucket", le="0.1") == 2
+        assert _sample(samples, f"{name}_bucket", le="1") == 3
+        assert _sample(samples, f"{name}_bucket", le="+Inf") == 4
+        assert _sample(samples, f"{name}_count") == 4
+        assert _sample(samples, f"{name}_sum") == pytest.approx(2.65)
+
+    def test_counters(self):
+        metrics = HttpMetrics()
+        metrics.observe(_record(status_code=200, new_connection=True))
+        metrics.observe(_record(status_code=503, new_connection=False))
+        metrics.observe(_record(status_code=None, new_connection=None))
+        samples = _parse(metrics.to_prometheus())
+        assert _sample(samples, "granta_dataflow_http_requests_total", status="200") == 1
+        assert _sample(samples, "granta_dataflow_http_requests_total", status="503") == 1
+        assert _sample(samples, "granta_dataflow_http_requests_total", status="none") == 1
+        assert _sample(samples, "granta_dataflow_http_request_body_bytes_total") == 15
+        assert _sample(samples, "granta_dataflow_http_response_body_bytes_total") == 30
+        assert _sample(samples, "granta_dataflow_http_connection_requests_total", connection="new") == 1
+        assert _sample(samples, "granta_dataflow_http_connection_requests_total", connection="reused") == 1
+
+    def test_labels(self):
+        metrics = HttpMetrics()
+        metrics.observe(_record(url=f"http://localhost/mi_dataflow/api/workflows/{WORKFLOW_ID}", method="POST"))
+        text = metrics.to_prometheus()
+        assert (
+            'granta_dataflow_http_requests_total{host="localhost",method="POST",'
+            'endpoint="/mi_dataflow/api/workflows/{id}",status="200"} 1'
+        ) in text.splitlines()
+        assert "# TYPE granta_dataflow_http_request_duration_seconds histogram" in text
+
+    def test_reset(self):
+        metrics = HttpMetrics()
+        metrics.observe(_record())
+        metrics.reset()
+        assert _parse(metrics.to_prometheus()) == {}
+
+    def test_write_replaces_file(self, tmp_path):
+        path = tmp_path / "metrics.prom"
+        metrics = HttpMetrics()
+        metrics.observe(_record())
+        metrics.write_prometheus(path)
+        metrics.write_prometheus(path)
+        assert _sample(_parse(path.read_text()), "granta_dataflow_http_requests_total") == 1
+        assert [p.name for p in tmp_path.iterdir()] == ["metrics.prom"]
+
+    def test_write_merges_file(self, tmp_path):
+        path = tmp_path / "metrics.prom"
+        first, second = HttpMetrics(), HttpMetrics()
+        first.observe(_record(duration=0.001))
+        second.observe(_record(duration=0.001))
+        second.observe(_record(url="http://localhost/mi_servicelayer/api/v1alpha/schema", method="GET"))
+        first.write_prometheus(path, merge=True)
+        second.write_prometheus(path, merge=True)
+        samples = _parse(path.read_text())
+        requests_total = "granta_dataflow_http_requests_total"
+        assert _sample(samples, requests_total, endpoint="/mi_dataflow/api/logs") == 2
+        assert _sample(samples, requests_total, endpoint="/mi_servicelayer/api/v1alpha/schema") == 1
+        assert _sample(samples, "granta_dataflow_http_request_duration_seconds_bucket", le="0.005") == 2
+        assert [p.name for p in tmp_path.iterdir()] == ["metrics.prom"]
+
+    def test_serve(self):
+        metrics = HttpMetrics()
+        metrics.observe(_record())
+        server = metrics.serve()
+        try:
+            response = requests.get(server.url)
+        finally:
+            server.stop()
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert response.text == metrics.to_prometheus()
+
+
+class TestLockFile:
+    def test_lock_times_out(self, tmp_path):
+        path = tmp_path / "metrics.prom"
+        with _lock_file(path):
+            with pytest.raises(TimeoutError):
+                with _lock_file(path, timeout=0.05):
+                    pass
+        assert list(tmp_path.iterdir()) == []
+
+    def test_stale_lock_is_removed(self, tmp_path):
+        path = tmp_path / "metrics.prom"
+        lock_path = tmp_path / "metrics.prom.lock"
+        lock_path.touch()
+        stale = time.time() - 60
+        os.utime(lock_path, (stale, stale))
+        with _lock_file(path, timeout=1, stale_after=30):
+            assert lock_path.exists()
+        assert not lock_path.exists()
+
+
+class TestIntegrationMetrics:
+    def test_requests_are_measured(self, basic_http):
+        metrics = HttpMetrics()
+        with DataflowStandIn() as stand_in:
+            payload = {**basic_http.payload, "WorkflowUrl": stand_in.url}
+            df = MIDataflowIntegration.from_dict_payload(payload, use_https=False, http_metrics=metrics)
+            df.configure_pygranta_connection(ApiClientFactory).connect()
+            df.log_msg_to_instance("Message", "Info")
+            df.resume_bookmark(0)
+        assert df.http_metrics is metrics
+
+        samples = _parse(metrics.to_prometheus())
+        requests_total = "granta_dataflow_http_requests_total"
+        assert _sample(samples, requests_total, endpoint="/mi_dataflow/api/logs", status="200") == 1
+        assert _sample(samples, requests_total, endpoint="/mi_dataflow/api/workflows/{id}", status="200") == 1
+        assert _sample(samples, requests_total, endpoint="/mi_servicelayer", status="401") == 1
+        assert _sample(samples, requests_total, endpoint="/mi_servicelayer", status="200") == 1
+        assert _sample(samples, "granta_dataflow_http_connection_requests_total", connection="new") == 1
+        assert _sample(samples, "granta_dataflow_http_connection_requests_total", connection="reused") == 3
+        assert _sample(samples, "granta_dataflow_http_request_body_bytes_total", endpoint="/mi_dataflow/api/logs") > 0
+
+    def test_metrics_file_is_updated_at_resume(self, basic_http, tmp_path):
+        path = tmp_path / "metrics.prom"
+        with DataflowStandIn() as stand_in:
+            payload = {**basic_http.payload, "WorkflowUrl": stand_in.url}
+            for _ in range(2):
+                df = MIDataflowIntegration.from_dict_payload(payload, use_https=False, http_metrics=path)
+                df.resume_bookmark(0)
+        samples = _parse(path.read_text())
+        assert _sample(samples, "granta_dataflow_http_requests_total", status="200") == 2
+
+    def test_requests_are_not_measured_by_default(self, basic_http):
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        assert df.http_metrics is None
+
+
+def test_serve_metrics_arguments():
+    args = _build_parser().parse_args(["serve-metrics", "metrics.prom"])
+    assert (args.host, args.port) == ("127.0.0.1", 9464)
+
+
+def test_metrics_server_requires_start():
+    with pytest.raises(RuntimeError, match="not been started"):
+        MetricsServer(str).url
@@ -20,11 +20,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
 import json
 import logging
 from pathlib import Path
 import sys
+import threading
 from typing import Literal
+from unittest.mock import patch
 
 from common import (
     CERT_FILE,
@@ -42,7 +46,8 @@ from common import (
 )
 import pytest
 
-from ansys.grantami.dataflow_extensions import MIDataflowIntegration
+from ansys.grantami.dataflow_extensions import JsonSerializer, MIDataflowIntegration, MIDataflowQueuedApiLogHandler
+from ansys.grantami.dataflow_extensions._mi_dataflow import _step_input, _StepInput
 
 
 class TestInstantiationFromDict:
@@ -203,6 +208,87 @@ class TestInstantiationFromDict:
         pass
 
 
+class TestInstantiationFromPayload:
+    @pytest.fixture(autouse=True)
+    def stdin_not_read(self, monkeypatch):
+        class _UnreadableStdin:
+            def read(self, *args):
+                raise AssertionError("stdin must not be read")
+
+        stdin = _UnreadableStdin()
+        monkeypatch.setattr(sys, "stdin", stdin)
+        yield
+        assert sys.stdin is stdin
+
+    def test_mapping(self, basic_http):
+        df = MIDataflowIntegration.from_payload(basic_http.payload, use_https=False)
+        assert df._df_data == basic_http.payload
+        assert df._df_data is not basic_http.payload
+
+    def test_mapping_not_serialized(self, basic_http):
+        with patch("json.loads") as loads, patch("json.dumps") as dumps:
+            MIDataflowIntegration.from_payload(basic_http.payload, use_https=False, json_serializer=JsonSerializer())
+        loads.assert_not_called()
+        dumps.assert_not_called()
+
+    @pytest.mark.parametrize("lazy_payload", [False, True])
+    def test_text_file(self, basic_http, lazy_payload):
+        df = MIDataflowIntegration.from_payload(
+            StringIO(basic_http.payload_str), use_https=False, lazy_payload=lazy_payload
+        )
+        assert df._df_data == basic_http.payload
+
+    @pytest.mark.parametrize("lazy_payload", [False, True])
+    def test_binary_file(self, basic_http, lazy_payload):
+        df = MIDataflowIntegration.from_payload(
+            BytesIO(basic_http.payload_str.encode("utf-8")), use_https=False, lazy_payload=lazy_payload
+        )
+        assert df._df_data == basic_http.payload
+
+    def test_string_parsed_once(self, basic_http):
+        with patch("json.loads", wraps=json.loads) as loads:
+            MIDataflowIntegration.from_string_payload(
+                basic_http.payload_str, use_https=False, json_serializer=JsonSerializer()
+            )
+        loads.assert_called_once()
+
+    def test_concurrent_construction(self, basic_http):
+        payloads = [dict(basic_http.payload, WorkflowId=f"workflow-{index}") for index in range(50)]
+        barrier = threading.Barrier(len(payloads))
+
+        def construct(payload):
+            barrier.wait()
+            return MIDataflowIntegration.from_payload(payload, use_https=False)
+
+        with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+            integrations = list(executor.map(construct, payloads))
+        assert [df._df_data["WorkflowId"] for df in integrations] == [p["WorkflowId"] for p in payloads]
+
+    def test_step_input_restored(self, basic_http, tmp_path):
+        token = _step_input.set(_StepInput("{}", tmp_path))
+        try:
+            df = MIDataflowIntegration.from_payload(basic_http.payload, use_https=False)
+            assert df._supporting_files_dir == tmp_path
+            assert _step_input.get().payload == "{}"
+        finally:
+            _step_input.reset(token)
+        assert _step_input.get() is None
+
+
+class TestConstructorDebugLogging:
+    def test_payload_not_serialized_if_debug_disabled(self, basic_http, caplog):
+        caplog.set_level(logging.INFO)
+        with patch.object(MIDataflowIntegration, "get_payload_as_string") as mock:
+            MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        mock.assert_not_called()
+        assert "Dataflow data received" not in caplog.text
+
+    def test_payload_serialized_if_debug_enabled(self, basic_http, debug_caplog):
+        MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        assert "Dataflow data received" in debug_caplog.text
+        assert '"AuthorizationHeader": "<HeaderRemoved>"' in debug_caplog.text
+
+
 class TestInstantiationFromStr:
     @pytest.mark.parametrize("test_case_name", ["basic_https", "windows_https", "oidc_https"])
     @pytest.mark.parametrize("verify_ssl", [True, False])
@@ -355,6 +441,51 @@ class TestPayloadAccess:
         data = df.get_payload_as_string()
         assert "AuthorizationHeader" in data
 
+    @pytest.mark.parametrize("fixture_name", ["basic_https", "oidc_https"])
+    def test_payload_string_includes_credentials(self, fixture_name, request):
+        df = request.getfixturevalue(fixture_name).dataflow_integration
+        data = json.loads(df.get_payload_as_string(include_credentials=True))
+        assert data["AuthorizationHeader"] == df._df_data["AuthorizationHeader"]
+        assert df.get_payload_as_dict()["AuthorizationHeader"] == "<HeaderRemoved>"
+
+    def test_payload_string_is_cached(self, basic_https):
+        df = basic_https.dataflow_integration
+        assert df.get_payload_as_string() is df.get_payload_as_string()
+        assert df.get_payload_as_string(indent=True) is df.get_payload_as_string(indent=True)
+        assert json.loads(df.get_payload_as_string(indent=True)) == json.loads(df.get_payload_as_string())
+
+    def test_payload_string_unexpected_keyword_raises_type_error(self, basic_https):
+        with pytest.raises(TypeError, match="unexpected keyword argument 'foo'"):
+            basic_https.dataflow_integration.get_payload_as_string(foo=True)
+
+    def test_payload_dict_is_independent_copy(self, basic_https):
+        df = basic_https.dataflow_integration
+        data = df.get_payload_as_dict()
+        data["WorkflowId"] = "Modified"
+        data["Record"]["Database"] = "Modified"
+        assert df.get_payload_as_dict() == json.loads(df.get_payload_as_string())
+        assert df._df_data["WorkflowId"] != "Modified"
+        assert df._df_data["Record"]["Database"] != "Modified"
+
+    @pytest.mark.parametrize("fixture_name", ["basic_https", "oidc_https"])
+    def test_payload_view_auth_header_is_scrubbed(self, fixture_name, request):
+        df = request.getfixturevalue(fixture_name).dataflow_integration
+        assert df.payload["AuthorizationHeader"] == "<HeaderRemoved>"
+        assert dict(df.payload) == df.get_payload_as_dict()
+
+    def test_payload_view_does_not_copy(self, basic_https):
+        df = basic_https.dataflow_integration
+        assert df.payload["Record"]._data is df._df_data["Record"]
+
+    def test_payload_view_is_read_only(self, basic_https):
+        payload = basic_https.dataflow_integration.payload
+        with pytest.raises(TypeError):
+            payload["WorkflowId"] = "Modified"
+        with pytest.raises(TypeError):
+            payload["Record"]["Database"] = "Modified"
+        with pytest.raises(TypeError):
+            payload["Attributes"]["Record"]["Value"][0] = "Modified"
+
 
 class TestURLs:
     @pytest.mark.parametrize("fixture_name", ["windows_https", "basic_https", "oidc_https"])
@@ -745,6 +876,146 @@ class TestApiLogHandler:
             test_logger.log(45, "This is a test message with an invalid level")
 
 
+class TestQueuedApiLogHandler:
+    @pytest.fixture
+    def test_logger(self):
+        logger = logging.getLogger("test_queued_logger")
+        logger.setLevel(1)
+        logger.handlers = []
+        logger.propagate = False
+        return logger
+
+    @pytest.fixture
+    def blocked_callback(self):
+        # A callback which records messages, but does not return until the test releases it
+        started = threading.Event()
+        release = threading.Event()
+        messages = []
+
+        def callback(msg, level):
+            started.set()
+            release.wait(timeout=5)
+            messages.append((msg, level))
+
+        return callback, started, release, messages
+
+    def test_messages_sent_in_order(self, test_logger):
+        messages = []
+        handler = MIDataflowQueuedApiLogHandler(lambda msg, level: messages.append((msg, level)))
+        test_logger.addHandler(handler)
+
+        for i in range(50):
+            test_logger.info(f"Message {i}")
+        test_logger.error("Last message")
+        handler.flush()
+
+        assert messages == [(f"Message {i}", "Info") for i in range(50)] + [("Last message", "Error")]
+        assert handler.queued_count == 51
+        assert handler.sent_count == 51
+        assert handler.dropped_count == 0
+        assert handler.pending_count == 0
+        handler.close()
+
+    def test_drop_newest(self, test_logger, blocked_callback):
+        callback, started, release, messages = blocked_callback
+        handler = MIDataflowQueuedApiLogHandler(callback, max_queue_size=2, overflow_policy="drop_newest")
+        test_logger.addHandler(handler)
+
+        test_logger.info("In flight")
+        # Wait for the background thread to take the first message from the queue
+        started.wait(timeout=5)
+        for i in range(5):
+            test_logger.info(f"Queued {i}")
+        release.set()
+        handler.flush()
+
+        assert [msg for msg, _ in messages] == ["In flight", "Queued 0", "Queued 1"]
+        assert handler.dropped_count == 3
+        assert handler.sent_count == 3
+        handler.close()
+
+    def test_drop_oldest(self, test_logger, blocked_callback):
+        callback, started, release, messages = blocked_callback
+        handler = MIDataflowQueuedApiLogHandler(callback, max_queue_size=2, overflow_policy="drop_oldest")
+        test_logger.addHandler(handler)
+
+        test_logger.info("In flight")
+        started.wait(timeout=5)
+        for i in range(5):
+            test_logger.info(f"Queued {i}")
+        release.set()
+        handler.flush()
+
+        assert [msg for msg, _ in messages] == ["In flight", "Queued 3", "Queued 4"]
+        assert handler.dropped_count == 3
+        handler.close()
+
+    def test_block_does_not_lose_messages(self, test_logger):
+        messages = []
+        handler = MIDataflowQueuedApiLogHandler(lambda msg, level: messages.append(msg), max_queue_size=1)
+        test_logger.addHandler(handler)
+
+        for i in range(100):
+            test_logger.info(f"Message {i}")
+        handler.flush()
+
+        assert messages == [f"Message {i}" for i in range(100)]
+        assert handler.dropped_count == 0
+        handler.close()
+
+    def test_failed_message_is_counted(self, test_logger, monkeypatch):
+        monkeypatch.setattr(logging, "raiseExceptions", False)
+
+        def callback(msg, level):
+            if msg == "Fails":
+                raise ConnectionError()
+
+        handler = MIDataflowQueuedApiLogHandler(callback)
+        test_logger.addHandler(handler)
+        test_logger.info("Fails")
+        test_logger.info("Succeeds")
+        handler.flush()
+
+        assert handler.failed_count == 1
+        assert handler.sent_count == 1
+        handler.close()
+
+    def test_invalid_level_raises_exception(self, test_logger):
+        handler = MIDataflowQueuedApiLogHandler(lambda msg, level: None)
+        test_logger.addHandler(handler)
+        with pytest.raises(KeyError, match="Log level 45 is not supported"):
+            test_logger.log(45, "This is a test message with an invalid level")
+        handler.close()
+
+    @pytest.mark.parametrize(
+        ["max_queue_size", "overflow_policy", "match"],
+        [(0, "block", "max_queue_size"), (10, "drop_all", "Unknown overflow policy")],
+    )
+    def test_invalid_arguments_raise_exception(self, max_queue_size, overflow_policy, match):
+        with pytest.raises(ValueError, match=match):
+            MIDataflowQueuedApiLogHandler(
+                lambda msg, level: None,
+                max_queue_size=max_queue_size,
+                overflow_policy=overflow_policy,
+            )
+
+    def test_resume_bookmark_flushes_handler(self, requests_mock, basic_http, test_logger):
+        df = basic_http.dataflow_integration
+        handler = df.get_api_log_handler(MIDataflowQueuedApiLogHandler, max_queue_size=10)
+        test_logger.addHandler(handler)
+
+        requests_mock.put(f"{HTTP_URL}/api/logs")
+        requests_mock.post(f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}")
+        for i in range(20):
+            test_logger.info(f"Message {i}")
+        df.resume_bookmark(0)
+
+        assert requests_mock.call_count == 21
+        assert [r.json()["Message"] for r in requests_mock.request_history[:-1]] == [f"Message {i}" for i in range(20)]
+        assert requests_mock.request_history[-1].method == "POST"
+        handler.close()
+
+
 @pytest.mark.parametrize("fixture_name", ["basic_http", "basic_https", "windows_http", "windows_https", "oidc_https"])
 def test_supporting_files(fixture_name, request):
     df = request.getfixturevalue(fixture_name).dataflow_integration
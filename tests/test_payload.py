@@ -0,0 +1,356 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import base64
+import json
+import os
+import time
+
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+
+from ansys.grantami.dataflow_extensions import (
+    CustomValueFile,
+    CustomValues,
+    MIDataflowIntegration,
+    PayloadAttribute,
+    PayloadRecord,
+    RecordReference,
+    WorkflowPayload,
+    _payload,
+)
+from ansys.grantami.dataflow_extensions._payload import (
+    LazyPayload,
+    _PayloadView,
+    _ReadOnlyMapping,
+    _ReadOnlySequence,
+    redact_payload,
+)
+
+
+class TestReadOnlyViews:
+    def test_nested_containers_are_wrapped(self):
+        data = {"a": {"b": [1, {"c": 2}]}}
+        view = _ReadOnlyMapping(data)
+        assert isinstance(view["a"], _ReadOnlyMapping)
+        assert isinstance(view["a"]["b"], _ReadOnlySequence)
+        assert isinstance(view["a"]["b"][1], _ReadOnlyMapping)
+        assert view["a"]["b"][1]["c"] == 2
+
+    def test_sequence_equality_and_slicing(self):
+        view = _ReadOnlySequence([1, 2, 3])
+        assert view == [1, 2, 3]
+        assert view != [1, 2]
+        assert view[1:] == [2, 3]
+        assert isinstance(view[1:], _ReadOnlySequence)
+        assert view != "123"
+
+    def test_mapping_equality(self):
+        assert _ReadOnlyMapping({"a": [1]}) == {"a": [1]}
+
+    def test_mapping_reflects_underlying_data(self):
+        data = {"a": 1}
+        view = _ReadOnlyMapping(data)
+        data["b"] = 2
+        assert view["b"] == 2
+
+    @pytest.mark.parametrize("value", ["Basic abc", "Bearer abc"])
+    def test_payload_view_redacts(self, value):
+        view = _PayloadView({"AuthorizationHeader": value})
+        assert view["AuthorizationHeader"] == "<HeaderRemoved>"
+        assert dict(view) == {"AuthorizationHeader": "<HeaderRemoved>"}
+
+    def test_payload_view_empty_header(self):
+        assert _PayloadView({"AuthorizationHeader": ""})["AuthorizationHeader"] == ""
+
+
+class TestRedactPayload:
+    def test_redacted_copy_is_shallow(self):
+        data = {"AuthorizationHeader": "Basic abc", "Record": {}}
+        result = redact_payload(data)
+        assert result["AuthorizationHeader"] == "<HeaderRemoved>"
+        assert data["AuthorizationHeader"] == "Basic abc"
+        assert result["Record"] is data["Record"]
+
+    def test_no_credentials_returns_original(self):
+        data = {"AuthorizationHeader": ""}
+        assert redact_payload(data) is data
+
+
+class TestRecordReference:
+    def test_from_string(self):
+        reference = RecordReference.from_string("d2f51a3d-c274-4a1e-b7c9-8ba2976202cc+MI_Training")
+        assert reference == ("d2f51a3d-c274-4a1e-b7c9-8ba2976202cc", "MI_Training")
+        assert reference.history_guid == "d2f51a3d-c274-4a1e-b7c9-8ba2976202cc"
+        assert reference.database_key == "MI_Training"
+
+    @pytest.mark.parametrize("value", ["", "d2f51a3d-c274-4a1e-b7c9-8ba2976202cc", "+MI_Training", "guid+"])
+    def test_invalid_reference_raises_value_error(self, value):
+        with pytest.raises(ValueError, match="is not in the format"):
+            RecordReference.from_string(value)
+
+    def test_database_keys_are_shared(self):
+        first = RecordReference.from_string("a+" + "".join(["MI_", "Training"]))
+        second = RecordReference.from_string("b+" + "".join(["MI_", "Training"]))
+        assert first.database_key is second.database_key
+
+
+class TestWorkflowPayload:
+    @pytest.fixture
+    def payload(self, basic_https):
+        data = basic_https.dataflow_integration.get_payload_as_dict()
+        data["Attributes"]["Record"]["Value"] = [
+            "guid-1+MI_Training",
+            "guid-2+Other_Database",
+            "guid-3+MI_Training",
+        ]
+        data["Attributes"]["Thickness"] = {"Value": 1.5, "Unit": "mm"}
+        data["CustomValues"] = {"Key": "Value"}
+        return WorkflowPayload.from_dict(data)
+
+    def test_top_level_values(self, payload):
+        assert payload.workflow_id == "67eb55ff-363a-42c7-9793-df363f1ecc83"
+        assert payload.client_credential_type == "Basic"
+        assert payload.custom_values["Key"] == "Value"
+
+    def test_record(self, payload):
+        assert isinstance(payload.record, PayloadRecord)
+        assert payload.record.database_key == "MI_Training"
+        assert payload.record.table_name == "Metals Pedigree"
+        assert payload.record.reference == RecordReference("d2f51a3d-c274-4a1e-b7c9-8ba2976202cc", "MI_Training")
+
+    def test_attributes(self, payload):
+        attribute = payload.attributes["Thickness"]
+        assert isinstance(attribute, PayloadAttribute)
+        assert (attribute.name, attribute.value, attribute.unit) == ("Thickness", 1.5, "mm")
+        assert payload.attributes["TransitionId"].unit is None
+        assert "Missing" not in payload.attributes
+
+    def test_record_references_indexed_by_database(self, payload):
+        assert len(payload.record_references) == 3
+        assert payload.database_keys == ("MI_Training", "Other_Database")
+        assert payload.get_record_references("MI_Training") == (
+            RecordReference("guid-1", "MI_Training"),
+            RecordReference("guid-3", "MI_Training"),
+        )
+        assert payload.get_record_references("Other_Database") == (RecordReference("guid-2", "Other_Database"),)
+        assert payload.get_record_references("Missing") == ()
+
+    def test_slots(self, payload):
+        with pytest.raises(AttributeError):
+            payload.unknown = None
+        with pytest.raises(AttributeError):
+            payload.record.unknown = None
+
+    def test_invalid_record_reference_is_ignored(self, caplog):
+        payload = WorkflowPayload.from_dict({"Attributes": {"Record": {"Value": ["invalid", "guid+DB"]}}})
+        assert payload.record_references == (RecordReference("guid", "DB"),)
+        assert payload.record is None
+        assert "invalid" in caplog.text
+
+    def test_single_record_reference(self):
+        payload = WorkflowPayload.from_dict({"Attributes": {"Record": {"Value": "guid+DB"}}})
+        assert payload.record_references == (RecordReference("guid", "DB"),)
+
+    def test_integration_payload_parsed_once(self, basic_https):
+        df = basic_https.dataflow_integration
+        assert df.workflow_payload is df.workflow_payload
+        assert df.workflow_payload.get_record_references("MI_Training") == (
+            RecordReference("d2f51a3d-c274-4a1e-b7c9-8ba2976202cc", "MI_Training"),
+        )
+
+
+class TestLazyPayload:
+    @pytest.fixture
+    def payload(self, basic_https):
+        data = basic_https.dataflow_integration.get_payload_as_dict(include_credentials=True)
+        data["CustomValues"] = {"File": 'escaped \\ "quotes" and {brackets} [ ]', "Number": -1.5e3, "Flag": None}
+        data["Empty"] = {}
+        return data
+
+    @pytest.mark.parametrize("indent", [None, 4])
+    def test_matches_eager_load(self, payload, indent):
+        lazy = LazyPayload(json.dumps(payload, indent=indent))
+        assert lazy == payload
+        assert list(lazy) == list(payload)
+        assert lazy.to_dict() == payload
+
+    def test_only_required_keys_are_decoded(self, payload):
+        lazy = LazyPayload(json.dumps(payload))
+        decoded = {key for key in lazy if lazy.is_decoded(key)}
+        assert decoded == {
+            "WorkflowUrl",
+            "ClientCredentialType",
+            "AuthorizationHeader",
+            "WorkflowId",
+            "WorkflowDefinitionId",
+            "TransitionName",
+        }
+        assert lazy["CustomValues"] == payload["CustomValues"]
+        assert lazy.is_decoded("CustomValues")
+        assert not lazy.is_decoded("Attributes")
+
+    def test_text_released_when_decoded(self, payload):
+        lazy = LazyPayload(json.dumps(payload))
+        lazy.to_dict()
+        assert lazy._text == ""
+
+    def test_duplicate_keys_use_last_value(self):
+        lazy = LazyPayload('{"Attributes": 1, "WorkflowId": "a", "Attributes": 2, "WorkflowId": "b"}')
+        assert lazy.to_dict() == json.loads('{"Attributes": 1, "WorkflowId": "a", "Attributes": 2, "WorkflowId": "b"}')
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "[]", '{"a": 1', '{"a": {}', '{"a": 1} x', '{"a" 1}', '{"a": 1 "b": 2}', '{"a": "b}', '{"WorkflowId": x}'],
+    )
+    def test_invalid_json_raises(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            LazyPayload(text)
+
+    def test_invalid_deferred_value_raises_on_access(self):
+        lazy = LazyPayload('{"Attributes": [tru]}')
+        with pytest.raises(json.JSONDecodeError):
+            lazy["Attributes"]
+
+    @pytest.mark.parametrize("long_value_length", [2_000, 2_000_000])
+    def test_scan_is_linear_with_long_string_after_short_strings(self, long_value_length, monkeypatch):
+        custom_values = {f"Value{i}": "short" for i in range(8000)}
+        custom_values["File"] = "A" * long_value_length
+        text = json.dumps({"WorkflowId": "a", "CustomValues": custom_values, "Attributes": [{"a": "b"}] * 100})
+
+        searches = []
+        structural_character = _payload._STRUCTURAL_CHARACTER
+
+        class CountingPattern:
+            def search(self, string, position):
+                searches.append(position)
+                return structural_character.search(string, position)
+
+        monkeypatch.setattr(_payload, "_STRUCTURAL_CHARACTER", CountingPattern())
+        start = time.perf_counter()
+        lazy = LazyPayload(text)
+        elapsed = time.perf_counter() - start
+
+        # One search for each key, value, and bracket, and each search starts after the previous one
+        assert len(searches) < 3 * len(custom_values) + 1000
+        assert searches == sorted(searches)
+        assert elapsed < 2
+        assert lazy["CustomValues"] == custom_values
+
+    @pytest.mark.parametrize("fixture_name", ["basic_http", "windows_http"])
+    def test_integration(self, fixture_name, request):
+        test_case = request.getfixturevalue(fixture_name)
+        eager = test_case.dataflow_integration
+        df = MIDataflowIntegration.from_string_payload(test_case.payload_str, use_https=False, lazy_payload=True)
+        assert isinstance(df._df_data, LazyPayload)
+        assert not df._df_data.is_decoded("Attributes")
+        assert df.get_payload_as_dict() == eager.get_payload_as_dict()
+        assert df.workflow_payload.record_references == eager.workflow_payload.record_references
+
+
+class TestCustomValueFile:
+    DATA = os.urandom(100_000)
+
+    @pytest.fixture
+    def file(self):
+        file = CustomValueFile.from_base64("File", base64.b64encode(self.DATA).decode())
+        yield file
+        file.close()
+
+    def test_decoded_to_file(self, file):
+        assert file.size == len(self.DATA)
+        assert file.path.read_bytes() == self.DATA
+        with file.open() as f:
+            assert f.read() == self.DATA
+
+    def test_buffer(self, file):
+        assert file.buffer[:] == self.DATA
+        assert file.buffer is file.buffer
+        with pytest.raises(TypeError):
+            file.buffer[0] = 0
+
+    def test_close_deletes_file(self, file):
+        file.buffer
+        path = file.path
+        file.close()
+        assert file.closed
+        assert not path.exists()
+        with pytest.raises(ValueError, match="has been closed"):
+            file.buffer
+        file.close()
+
+    def test_empty_value(self):
+        file = CustomValueFile.from_base64("Empty", "")
+        assert file.size == 0
+        assert file.buffer == b""
+        file.close()
+
+    @pytest.mark.parametrize("value", ["not base64!", "YWJj=ZGVm", "YWJ"])
+    def test_invalid_base64_returns_none(self, value, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        assert CustomValueFile.from_base64("File", value) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_chunked_decode(self, monkeypatch):
+        monkeypatch.setattr("ansys.grantami.dataflow_extensions._payload._BASE64_CHUNK_SIZE", 8)
+        file = CustomValueFile.from_base64("File", base64.b64encode(self.DATA).decode())
+        assert file.path.read_bytes() == self.DATA
+        file.close()
+
+
+class TestCustomValues:
+    DATA = os.urandom(3_000)
+    ENCODED = base64.b64encode(DATA).decode()
+
+    def test_large_base64_value_is_spilled(self):
+        custom_values = CustomValues({"File": self.ENCODED, "Small": "YWJj"}, spill_threshold=1_000)
+        file = custom_values["File"]
+        assert isinstance(file, CustomValueFile)
+        assert file.buffer[:] == self.DATA
+        assert custom_values["File"] is file
+        assert custom_values["Small"] == "YWJj"
+        custom_values.close()
+        assert file.closed
+        assert custom_values["File"] == self.ENCODED
+
+    def test_large_text_value_is_not_spilled(self):
+        text = "Not Base64 " * 200
+        custom_values = CustomValues({"Text": text}, spill_threshold=1_000)
+        assert custom_values["Text"] == text
+
+    def test_no_threshold(self):
+        assert CustomValues({"File": self.ENCODED})["File"] == self.ENCODED
+
+    def test_files_deleted_on_resume(self, requests_mock, basic_http):
+        payload = basic_http.payload
+        payload["CustomValues"] = {"File": self.ENCODED}
+        df = MIDataflowIntegration.from_dict_payload(payload, use_https=False, custom_value_spill_threshold=1_000)
+        file = df.workflow_payload.custom_values["File"]
+        assert file.path.exists()
+        requests_mock.post(f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}")
+        df.resume_bookmark(0)
+        assert file.closed
+        assert not file.path.exists()
+        assert json.loads(df.get_payload_as_string())["CustomValues"]["File"] == self.ENCODED
+
+    def test_default_threshold(self, basic_http):
+        assert basic_http.dataflow_integration.workflow_payload.custom_values._spill_threshold == 1_048_576
@@ -0,0 +1,113 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import base64
+import json
+
+import pytest
+
+from ansys.grantami.dataflow_extensions import CustomValueFile, MIDataflowIntegration, generate_payload
+from ansys.grantami.dataflow_extensions.__main__ import main
+
+
+@pytest.mark.parametrize(
+    ["client_credential_type", "header_prefix"], [("Windows", ""), ("Basic", "Basic "), ("None", "Bearer ")]
+)
+def test_payload_is_valid_for_credential_type(client_credential_type, header_prefix):
+    payload = generate_payload(client_credential_type)
+    assert payload["AuthorizationHeader"].startswith(header_prefix)
+    data_flow = MIDataflowIntegration.from_dict_payload(payload, use_https=True)
+    assert data_flow.workflow_payload.client_credential_type == client_credential_type
+    assert data_flow.workflow_payload.workflow_id == payload["WorkflowId"]
+
+
+def test_record_references_are_distributed_across_databases():
+    payload = generate_payload(record_count=10, database_count=3)
+    workflow_payload = MIDataflowIntegration.from_dict_payload(payload).workflow_payload
+    assert len(workflow_payload.record_references) == 10
+    assert workflow_payload.database_keys == ("MI_Training", "MI_Database_1", "MI_Database_2")
+    assert [len(workflow_payload.get_record_references(key)) for key in workflow_payload.database_keys] == [4, 3, 3]
+    assert workflow_payload.record.reference == workflow_payload.record_references[0]
+
+
+def test_no_record_references():
+    payload = generate_payload(record_count=0)
+    assert "Record" not in payload
+    assert payload["Attributes"]["Record"] == {"Value": []}
+
+
+def test_attributes():
+    payload = generate_payload(attribute_count=6, attribute_value_size=100)
+    attributes = MIDataflowIntegration.from_dict_payload(payload).workflow_payload.attributes
+    assert len(attributes) == 8
+    assert len(attributes["Attribute 0"].value) == 100
+    assert isinstance(attributes["Attribute 1"].value, float)
+    assert attributes["Attribute 1"].unit is not None
+    assert len(attributes["Attribute 2"].value) == 4
+
+
+def test_custom_values_and_blobs():
+    payload = generate_payload(custom_value_count=2, custom_value_size=5000, blob_count=2, blob_size=3000)
+    custom_values = MIDataflowIntegration.from_dict_payload(
+        payload, custom_value_spill_threshold=1000
+    ).workflow_payload.custom_values
+    assert list(custom_values) == ["Custom value 0", "Custom value 1", "Blob 0", "Blob 1"]
+    assert custom_values["Custom value 0"] == payload["CustomValues"]["Custom value 0"]
+    assert len(custom_values["Custom value 1"]) == 5000
+    blob = custom_values["Blob 1"]
+    assert isinstance(blob, CustomValueFile)
+    assert blob.size == 3000
+    assert bytes(blob.buffer) == base64.b64decode(payload["CustomValues"]["Blob 1"])
+    custom_values.close()
+
+
+def test_seed_makes_payload_repeatable():
+    arguments = {"client_credential_type": "None", "record_count": 5, "attribute_count": 5, "blob_count": 1}
+    assert generate_payload(**arguments, seed=1) == generate_payload(**arguments, seed=1)
+    assert generate_payload(**arguments, seed=1) != generate_payload(**arguments, seed=2)
+    assert generate_payload()["WorkflowId"] != generate_payload()["WorkflowId"]
+
+
+@pytest.mark.parametrize(
+    ["kwargs", "match"],
+    [
+        ({"client_credential_type": "OIDC"}, "ClientCredentialType"),
+        ({"database_count": 0}, "database_count"),
+        ({"record_count": -1}, "record_count"),
+        ({"blob_size": -1}, "blob_size"),
+    ],
+)
+def test_invalid_arguments_raise_exception(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        generate_payload(**kwargs)
+
+
+def test_command_line(capsys, tmp_path):
+    arguments = ["generate-payload", "--client-credential-type", "Windows", "--record-count", "3", "--seed", "4"]
+    assert main(arguments) == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload == generate_payload("Windows", record_count=3, seed=4)
+
+    output = tmp_path / "payload.json"
+    main(["generate-payload", "--blob-count", "1", "--blob-size", "30", "--output", str(output), "--indent", "2"])
+    payload = json.loads(output.read_text())
+    assert len(base64.b64decode(payload["CustomValues"]["Blob 0"])) == 30
@@ -0,0 +1,250 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import asyncio
+import cProfile
+from pathlib import Path
+import pstats
+import sys
+
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+
+from ansys.grantami.dataflow_extensions import (
+    AsyncMIDataflowIntegration,
+    MIDataflowIntegration,
+    ProfiledFunction,
+    StepProfile,
+)
+from ansys.grantami.dataflow_extensions._mi_dataflow import _profiling_requested, _StepInput
+from ansys.grantami.dataflow_extensions._profiling import (
+    _active_profilers,
+    _collapsed_stacks,
+    _hot_functions,
+    _label,
+    _StepProfiler,
+)
+from ansys.grantami.dataflow_extensions._step_host import _run_step_function, _running_step
+
+RESUME_URL = f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}"
+LOG_URL = f"{HTTP_URL}/api/logs"
+
+
+def _busy_leaf(n):
+    return sum(i * i for i in range(n))
+
+
+def _busy_parent():
+    return _busy_leaf(20_000) + _busy_leaf(10_000)
+
+
+def _profile(function):
+    profiler = cProfile.Profile()
+    profiler.runcall(function)
+    return pstats.Stats(profiler).stats
+
+
+def _log_messages(requests_mock):
+    return [request.json()["Message"] for request in requests_mock.request_history if request.url == LOG_URL]
+
+
+@pytest.mark.parametrize(
+    ["custom_values", "expected"],
+    [
+        (None, False),
+        ({}, False),
+        ({"ProfileStep": True}, True),
+        ({"ProfileStep": "True"}, True),
+        ({"ProfileStep": " yes "}, True),
+        ({"ProfileStep": 1}, True),
+        ({"ProfileStep": False}, False),
+        ({"ProfileStep": "false"}, False),
+        ({"ProfileStep": ""}, False),
+    ],
+)
+def test_profiling_requested(custom_values, expected):
+    assert _profiling_requested(custom_values) is expected
+
+
+def test_label():
+    assert _label((str(Path("steps") / "my_step.py"), 12, "main")) == "my_step.py:12(main)"
+    assert _label(("~", 0, "<built-in method builtins.sum>")) == "<built-in method builtins.sum>"
+
+
+class TestStatistics:
+    def test_hot_functions(self):
+        hot_functions = _hot_functions(_profile(_busy_parent), 3)
+        assert len(hot_functions) == 3
+        assert all(isinstance(function, ProfiledFunction) for function in hot_functions)
+        own_times = [function.own_time for function in hot_functions]
+        assert own_times == sorted(own_times, reverse=True)
+        assert any("_busy_leaf" in function.function or "genexpr" in function.function for function in hot_functions)
+
+    def test_collapsed_stacks(self):
+        stats = _profile(_busy_parent)
+        stacks = dict(_collapsed_stacks(stats))
+        leaf_stacks = [stack for stack in stacks if stack.split(";")[-1].endswith("(<genexpr>)")]
+        assert leaf_stacks
+        assert all("(_busy_parent);" in stack and "(_busy_leaf);" in stack for stack in leaf_stacks)
+        assert all(count > 0 for count in stacks.values())
+        # The own time of each function is divided between its stacks, so the totals are preserved
+        total_own_time = sum(values[2] for values in stats.values())
+        assert sum(stacks.values()) == pytest.approx(total_own_time * 1e6, rel=0.05)
+
+    def test_recursive_calls_are_not_followed(self):
+        def recurse(n):
+            return 0 if n == 0 else recurse(n - 1) + _busy_leaf(1000)
+
+        stacks = dict(_collapsed_stacks(_profile(lambda: recurse(20))))
+        assert any("(recurse)" in stack for stack in stacks)
+        assert all(stack.count("(recurse)") <= 1 for stack in stacks)
+
+
+class TestStepProfiler:
+    def test_profile_is_written(self, tmp_path):
+        profiler = _StepProfiler(tmp_path / "profiles", "step: name")
+        assert profiler.start()
+        _busy_parent()
+        profile = profiler.stop()
+        assert isinstance(profile, StepProfile)
+        assert profile.duration > 0
+        assert profile.pstats_file == tmp_path / "profiles" / "step_name.pstats"
+        assert profile.collapsed_stack_file == tmp_path / "profiles" / "step_name.collapsed.txt"
+        assert pstats.Stats(str(profile.pstats_file)).total_calls > 0
+        assert "(_busy_leaf)" in profile.collapsed_stack_file.read_text()
+
+    def test_stop_without_start(self, tmp_path):
+        assert _StepProfiler(tmp_path, "step").stop() is None
+
+    def test_write_failure_is_logged(self, tmp_path, caplog):
+        directory = tmp_path / "file"
+        directory.write_text("")
+        profiler = _StepProfiler(directory, "step")
+        profiler.start()
+        profile = profiler.stop()
+        assert profile.pstats_file is None
+        assert profile.collapsed_stack_file is None
+        assert "Failed to write the step profile" in caplog.text
+
+    def test_format(self, tmp_path):
+        profile = StepProfile(1.5, [ProfiledFunction("my_step.py:12(main)", 3, 0.5, 1.25)], tmp_path / "a.pstats", None)
+        assert profile.format().splitlines() == [
+            "Step profile: business logic took 1.500 s. Top 1 functions by own time:",
+            "  0.500 s own, 1.250 s cumulative, 3 calls: my_step.py:12(main)",
+            f"Profile written to {tmp_path / 'a.pstats'} and None",
+        ]
+
+
+class TestIntegrationProfiling:
+    def test_profile_is_logged_before_resume(self, requests_mock, basic_http, tmp_path):
+        requests_mock.post(RESUME_URL)
+        requests_mock.put(LOG_URL)
+        df = MIDataflowIntegration.from_dict_payload(
+            basic_http.payload, use_https=False, profile_step=True, profile_dir=tmp_path
+        )
+        _busy_parent()
+        df.resume_bookmark(0)
+
+        profile = df.step_profile
+        assert profile.pstats_file.parent == tmp_path
+        assert profile.pstats_file.name.startswith("dataflow_profile_Python_")
+        assert " " not in profile.pstats_file.name
+        assert profile.pstats_file.name.endswith(f"_{df.trace_context.span_id}.pstats")
+        assert profile.collapsed_stack_file.is_file()
+        (message,) = _log_messages(requests_mock)
+        assert message == profile.format()
+        assert requests_mock.last_request.url == RESUME_URL
+
+    def test_custom_value_enables_profiling(self, requests_mock, basic_http, tmp_path):
+        requests_mock.post(RESUME_URL)
+        requests_mock.put(LOG_URL)
+        payload = {**basic_http.payload, "CustomValues": {"ProfileStep": "true"}}
+        df = MIDataflowIntegration.from_dict_payload(payload, use_https=False, profile_dir=tmp_path)
+        df.resume_bookmark(0)
+        assert df.step_profile is not None
+
+    def test_argument_overrides_custom_value(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        payload = {**basic_http.payload, "CustomValues": {"ProfileStep": "true"}}
+        df = MIDataflowIntegration.from_dict_payload(payload, use_https=False, profile_step=False)
+        df.resume_bookmark(0)
+        assert df.step_profile is None
+        assert _log_messages(requests_mock) == []
+
+    def test_not_profiled_by_default(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        df.resume_bookmark(0)
+        assert df.step_profile is None
+
+    def test_log_failure_does_not_prevent_resume(self, requests_mock, basic_http, tmp_path, caplog):
+        requests_mock.post(RESUME_URL)
+        requests_mock.put(LOG_URL, status_code=500)
+        df = MIDataflowIntegration.from_dict_payload(
+            basic_http.payload, use_https=False, profile_step=True, profile_dir=tmp_path
+        )
+        df.resume_bookmark(0)
+        assert requests_mock.last_request.url == RESUME_URL
+        assert "Failed to log the step profile" in caplog.text
+
+    def test_async_integration(self, requests_mock, basic_http, tmp_path):
+        requests_mock.post(RESUME_URL)
+        requests_mock.put(LOG_URL)
+
+        async def step():
+            async with AsyncMIDataflowIntegration.from_dict_payload(
+                basic_http.payload, use_https=False, profile_step=True, profile_dir=tmp_path
+            ) as df:
+                _busy_parent()
+                await df.resume_bookmark(0)
+            return df
+
+        df = asyncio.run(step())
+        assert df.step_profile.pstats_file.is_file()
+        assert _log_messages(requests_mock) == [df.step_profile.format()]
+
+    def test_failed_step_stops_profiler(self, requests_mock, basic_http, tmp_path, caplog):
+        def step():
+            MIDataflowIntegration(use_https=False, profile_step=True, profile_dir=tmp_path)
+            _busy_parent()
+            raise RuntimeError("Business logic failed")
+
+        with _running_step(_StepInput(basic_http.payload, tmp_path)):
+            assert _run_step_function(step) == 1
+        assert _active_profilers == {}
+        assert len(list(tmp_path.glob("*.pstats"))) == 1
+        assert "completed without resuming the workflow" in caplog.text
+        assert requests_mock.request_history == []
+
+    def test_not_profiled_with_other_steps_on_python_3_12(self, basic_http, tmp_path, monkeypatch, caplog):
+        monkeypatch.setattr(sys, "version_info", (3, 12, 0))
+        with _running_step(_StepInput(basic_http.payload, tmp_path)):
+            with _running_step(_StepInput(basic_http.payload, tmp_path)):
+                df = MIDataflowIntegration(use_https=False, profile_step=True, profile_dir=tmp_path)
+        assert df._profiler is None
+        assert "other steps are running" in caplog.text
+
+    def test_profiled_with_single_step_on_python_3_12(self, basic_http, tmp_path, monkeypatch):
+        monkeypatch.setattr(sys, "version_info", (3, 12, 0))
+        with _running_step(_StepInput(basic_http.payload, tmp_path)):
+            df = MIDataflowIntegration(use_https=False, profile_step=True, profile_dir=tmp_path)
+            assert df._profiler is not None
+            df._stop_profiler()
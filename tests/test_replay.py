@@ -0,0 +1,230 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import gzip
+import json
+import math
+import sys
+import threading
+
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+import requests
+
+from ansys.grantami.dataflow_extensions import (
+    AsyncMIDataflowIntegration,
+    CapturedStep,
+    DataflowStandIn,
+    MIDataflowIntegration,
+    read_capture_file,
+    replay,
+)
+from ansys.grantami.dataflow_extensions.__main__ import main
+from ansys.grantami.dataflow_extensions._payload import REDACTED_AUTHORIZATION_HEADER
+from ansys.grantami.dataflow_extensions._replay import ReplayResult, _percentile
+
+RESUME_URL = f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}"
+
+
+def _captured_step(payload, transition_name=None):
+    if transition_name is not None:
+        payload = {**payload, "TransitionName": transition_name}
+    return CapturedStep(payload=payload, captured_at="", exit_code=0, timing={}, retry_counts={})
+
+
+def _resuming_step():
+    MIDataflowIntegration(use_https=False).resume_bookmark(0)
+
+
+class TestCapture:
+    def test_resume_appends_redacted_payload(self, requests_mock, basic_http, tmp_path):
+        requests_mock.post(RESUME_URL)
+        capture_file = tmp_path / "capture.jsonl.gz"
+        for exit_code in (0, 2):
+            df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False, capture_file=capture_file)
+            df.resume_bookmark(exit_code)
+
+        steps = list(read_capture_file(capture_file))
+        assert [step.exit_code for step in steps] == [0, 2]
+        assert steps[0].payload == {**basic_http.payload, "AuthorizationHeader": REDACTED_AUTHORIZATION_HEADER}
+        assert steps[0].step_name == basic_http.payload["TransitionName"]
+        assert steps[0].retry_counts == {"resume_bookmark": 0, "log_msg_to_instance": 0}
+        assert steps[0].captured_at.endswith("+00:00")
+        timing = steps[0].timing
+        assert set(timing) == {"initialization", "step", "resume", "total"}
+        assert 0 <= timing["initialization"] <= timing["step"] <= timing["total"]
+
+    def test_each_record_is_a_gzip_member(self, requests_mock, basic_http, tmp_path):
+        requests_mock.post(RESUME_URL)
+        capture_file = tmp_path / "capture.jsonl.gz"
+        for _ in range(2):
+            MIDataflowIntegration.from_dict_payload(
+                basic_http.payload, use_https=False, capture_file=capture_file
+            ).resume_bookmark(0)
+        lines = gzip.decompress(capture_file.read_bytes()).decode().splitlines()
+        assert len(lines) == 2
+        assert all(json.loads(line)["payload"]["WorkflowId"] == WORKFLOW_ID for line in lines)
+
+    def test_failed_resume_is_not_captured(self, requests_mock, basic_http, tmp_path):
+        requests_mock.post(RESUME_URL, status_code=400)
+        capture_file = tmp_path / "capture.jsonl.gz"
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False, capture_file=capture_file)
+        with pytest.raises(requests.HTTPError):
+            df.resume_bookmark(0)
+        assert not capture_file.exists()
+
+    def test_capture_failure_does_not_fail_step(self, requests_mock, basic_http, tmp_path, caplog):
+        requests_mock.post(RESUME_URL)
+        capture_file = tmp_path / "missing" / "capture.jsonl.gz"
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False, capture_file=capture_file)
+        df.resume_bookmark(0)
+        assert df._resumed
+        assert "Failed to record the step" in caplog.text
+
+    def test_async_resume_is_captured(self, requests_mock, basic_http, tmp_path):
+        import asyncio
+
+        requests_mock.post(RESUME_URL)
+        capture_file = tmp_path / "capture.jsonl.gz"
+
+        async def step():
+            async with AsyncMIDataflowIntegration.from_dict_payload(
+                basic_http.payload, use_https=False, capture_file=capture_file
+            ) as df:
+                await df.resume_bookmark(1)
+
+        asyncio.run(step())
+        assert [step.exit_code for step in read_capture_file(capture_file)] == [1]
+
+    def test_truncated_record_is_ignored(self, tmp_path, caplog):
+        capture_file = tmp_path / "capture.jsonl.gz"
+        record = json.dumps({"payload": {"TransitionName": "A"}, "exit_code": 0}).encode() + b"\n"
+        capture_file.write_bytes(gzip.compress(record) + gzip.compress(record)[:-10])
+        steps = list(read_capture_file(capture_file))
+        assert len(steps) == 1
+        assert "truncated record" in caplog.text
+
+    def test_invalid_record_raises_exception(self, tmp_path):
+        capture_file = tmp_path / "capture.jsonl.gz"
+        capture_file.write_bytes(gzip.compress(b'{"exit_code": 0}\n'))
+        with pytest.raises(ValueError, match="Record 1"):
+            list(read_capture_file(capture_file))
+
+
+class TestReplay:
+    def test_percentile(self):
+        assert _percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+        assert _percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+        assert _percentile([5.0], 99) == 5.0
+        assert math.isnan(_percentile([], 50))
+
+    def test_result_summary(self):
+        result = ReplayResult({"A": [0.003, 0.001, 0.002], "B": [0.004]}, {"A": 1, "B": 0}, elapsed=2.0, concurrency=2)
+        assert result.step_names == ["A", "B"]
+        assert result.count() == 4
+        assert result.count("A") == 3
+        assert result.failure_count() == 1
+        assert result.percentile(50, "A") == pytest.approx(0.002)
+        assert result.throughput == 2.0
+        summary = result.summary()
+        assert summary["A"]["runs"] == 3
+        assert summary["A"]["max_ms"] == pytest.approx(3.0)
+        assert summary["all"]["p50_ms"] == pytest.approx(2.5)
+        assert summary["all"]["throughput_per_s"] == 2.0
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_replay_runs_each_step(self, basic_http, concurrency):
+        steps = [_captured_step(basic_http.payload, name) for name in ("A", "B", "A")]
+        with DataflowStandIn() as stand_in:
+            result = replay(steps, _resuming_step, concurrency=concurrency, repeat=3, dataflow_url=stand_in.url)
+            assert stand_in.request_counts["resume_bookmark"] == 9
+        assert result.count("A") == 6
+        assert result.count("B") == 3
+        assert result.failure_count() == 0
+        assert result.concurrency == concurrency
+        assert result.percentile(99) > 0
+
+    @pytest.mark.parametrize("fixture", ["basic_http", "oidc_https", "windows_http"])
+    def test_credentials_are_replaced(self, fixture, request):
+        payload = request.getfixturevalue(fixture).payload
+        result = replay([_captured_step(payload)], _resuming_step)
+        assert result.count() == 1
+        assert result.failure_count() == 0
+
+    def test_steps_run_concurrently(self, basic_http):
+        barrier = threading.Barrier(4, timeout=5)
+
+        def step():
+            barrier.wait()
+            _resuming_step()
+
+        result = replay([_captured_step(basic_http.payload)] * 4, step, concurrency=4)
+        assert result.failure_count() == 0
+
+    def test_failures_are_counted_and_logged(self, basic_http, caplog, capsys):
+        def step():
+            print("Step output")
+            raise RuntimeError("Step failed")
+
+        result = replay([_captured_step(basic_http.payload)] * 2, step)
+        assert result.failure_count() == 2
+        assert len([record for record in caplog.records if "failed with exit code 1" in record.message]) == 1
+        assert "RuntimeError: Step failed" in caplog.text
+        assert "Step output" not in capsys.readouterr().out
+
+    def test_replay_from_capture_file(self, basic_http, tmp_path):
+        capture_file = tmp_path / "capture.jsonl.gz"
+        with DataflowStandIn() as stand_in:
+            payload = {**basic_http.payload, "WorkflowUrl": stand_in.url}
+            MIDataflowIntegration.from_dict_payload(
+                payload, use_https=False, capture_file=capture_file
+            ).resume_bookmark(0)
+        result = replay(capture_file, _resuming_step)
+        assert result.count(basic_http.payload["TransitionName"]) == 1
+
+    @pytest.mark.parametrize("argument", ["concurrency", "repeat"])
+    def test_invalid_argument_raises_exception(self, argument):
+        with pytest.raises(ValueError, match=argument):
+            replay([], _resuming_step, **{argument: 0})
+
+    def test_command_line(self, basic_http, tmp_path, monkeypatch, capsys):
+        capture_file = tmp_path / "capture.jsonl.gz"
+        with gzip.open(capture_file, "wt") as f:
+            f.write(json.dumps({"payload": basic_http.payload, "exit_code": 0}) + "\n")
+        (tmp_path / "replay_steps.py").write_text(
+            "from ansys.grantami.dataflow_extensions import MIDataflowIntegration\n"
+            "def step():\n"
+            "    MIDataflowIntegration(use_https=False).resume_bookmark(0)\n"
+        )
+        monkeypatch.setattr(sys, "path", list(sys.path))
+
+        exit_code = main(
+            ["replay", str(capture_file), "--step", "replay_steps:step", "--path", str(tmp_path), "--repeat", "2"]
+        )
+        assert exit_code == 0
+        output = capsys.readouterr().out
+        assert basic_http.payload["TransitionName"] in output
+        assert "Throughput" in output
+
+        exit_code = main(["replay", str(capture_file), "--step", "replay_steps:step", "--json"])
+        assert exit_code == 0
+        assert json.loads(capsys.readouterr().out)["all"]["runs"] == 1
@@ -0,0 +1,225 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+from email.utils import formatdate
+import time
+from unittest.mock import MagicMock
+
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from ansys.grantami.dataflow_extensions import AsyncMIDataflowIntegration, MIDataflowIntegration, RetryPolicy
+
+RESUME_URL = f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}"
+LOG_URL = f"{HTTP_URL}/api/logs"
+
+
+def _response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def _integration(test_case, cls=MIDataflowIntegration, **kwargs):
+    kwargs.setdefault("retry_policy", RetryPolicy(backoff_factor=0.0, max_attempts=3))
+    return cls.from_dict_payload(test_case.payload, use_https=False, **kwargs)
+
+
+class TestRetryPolicy:
+    @pytest.mark.parametrize(
+        ["kwargs", "match"],
+        [
+            ({"max_attempts": 0}, "max_attempts"),
+            ({"backoff_factor": -1}, "backoff_factor"),
+            ({"backoff_max": -1}, "backoff_max"),
+        ],
+    )
+    def test_invalid_arguments_raise_exception(self, kwargs, match):
+        with pytest.raises(ValueError, match=match):
+            RetryPolicy(**kwargs)
+
+    def test_exponential_backoff_is_capped(self):
+        policy = RetryPolicy(backoff_factor=1.0, backoff_max=5.0, jitter=False)
+        assert [policy.get_delay(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    def test_jitter_randomizes_delay(self):
+        policy = RetryPolicy(backoff_factor=1.0, jitter=True)
+        random_value = MagicMock(return_value=0.25)
+        assert policy.get_delay(3, random_value=random_value) == 0.25
+        random_value.assert_called_once_with(0.0, 4.0)
+
+    @pytest.mark.parametrize(["retry_after", "expected"], [("2", 2.0), ("120", 10.0), ("invalid", 0.5)])
+    def test_retry_after_seconds(self, retry_after, expected):
+        policy = RetryPolicy(backoff_factor=0.5, backoff_max=10.0, jitter=False)
+        assert policy.get_delay(1, _response(503, {"Retry-After": retry_after})) == expected
+
+    def test_retry_after_date(self):
+        policy = RetryPolicy(backoff_factor=0.0, backoff_max=10.0, jitter=False)
+        retry_after = formatdate(time.time() + 5, usegmt=True)
+        assert 3.0 < policy.get_delay(1, _response(503, {"Retry-After": retry_after})) <= 5.0
+
+    @pytest.mark.parametrize(["status_code", "expected"], [(503, True), (429, True), (400, False), (404, False)])
+    def test_retryable_response(self, status_code, expected):
+        assert RetryPolicy().is_retryable_response(_response(status_code)) is expected
+
+    @pytest.mark.parametrize(
+        ["exception", "retry_connection_errors", "expected"],
+        [
+            (requests.ConnectionError(), True, True),
+            (requests.Timeout(), True, True),
+            (requests.ConnectionError(), False, False),
+            (ValueError(), True, False),
+        ],
+    )
+    def test_retryable_exception(self, exception, retry_connection_errors, expected):
+        policy = RetryPolicy(retry_connection_errors=retry_connection_errors)
+        assert policy.is_retryable_exception(exception) is expected
+
+    @pytest.mark.parametrize(
+        ["exception", "expected"],
+        [
+            (requests.ConnectTimeout(), True),
+            (requests.ConnectionError(MaxRetryError(None, "/", NewConnectionError(None, "Connection refused"))), True),
+            (requests.ReadTimeout(), False),
+            (requests.ConnectionError(ProtocolError("Connection aborted.")), False),
+            (requests.ConnectionError(), False),
+        ],
+    )
+    def test_non_idempotent_request_retried_only_if_not_sent(self, exception, expected):
+        policy = RetryPolicy()
+        assert policy.is_retryable_exception(exception, idempotent=False) is expected
+        assert policy.is_retryable_exception(exception) is True
+
+
+class TestResumeBookmarkRetries:
+    def test_retryable_status_is_retried(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, [{"status_code": 503}, {"status_code": 502}, {"status_code": 200}])
+        df = _integration(basic_http)
+        df.resume_bookmark(0)
+        assert requests_mock.call_count == 3
+        assert df.retry_counts == {"resume_bookmark": 2, "log_msg_to_instance": 0}
+
+    def test_connection_error_is_retried(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, [{"exc": requests.ConnectionError}, {"status_code": 200}])
+        df = _integration(basic_http)
+        df.resume_bookmark(0)
+        assert requests_mock.call_count == 2
+        assert df.retry_counts["resume_bookmark"] == 1
+
+    def test_retries_are_logged(self, requests_mock, basic_http, caplog):
+        requests_mock.post(RESUME_URL, [{"status_code": 503}, {"status_code": 200}])
+        _integration(basic_http).resume_bookmark(0)
+        assert "resume_bookmark request failed with HTTP status 503 (attempt 1 of 3)" in caplog.text
+
+    def test_exhausted_retries_raise_exception(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, status_code=503)
+        df = _integration(basic_http)
+        with pytest.raises(requests.HTTPError):
+            df.resume_bookmark(0)
+        assert requests_mock.call_count == 3
+        assert df.retry_counts["resume_bookmark"] == 2
+
+    def test_non_retryable_status_raises_exception(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, status_code=400)
+        df = _integration(basic_http)
+        with pytest.raises(requests.HTTPError):
+            df.resume_bookmark(0)
+        assert requests_mock.call_count == 1
+
+    @pytest.mark.parametrize(
+        "exception",
+        [requests.ReadTimeout, requests.ConnectionError(ProtocolError("Connection aborted.", ConnectionResetError()))],
+    )
+    def test_request_which_may_have_been_received_is_retried(self, requests_mock, basic_http, exception):
+        requests_mock.post(RESUME_URL, [{"exc": exception}, {"status_code": 200}])
+        df = _integration(basic_http)
+        df.resume_bookmark(0)
+        assert requests_mock.call_count == 2
+        assert df.retry_counts["resume_bookmark"] == 1
+
+    def test_connection_error_not_retried_if_disabled(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, exc=requests.ConnectionError)
+        df = _integration(basic_http, retry_policy=RetryPolicy(retry_connection_errors=False))
+        with pytest.raises(requests.ConnectionError):
+            df.resume_bookmark(0)
+        assert requests_mock.call_count == 1
+
+    def test_repeated_resume_is_ignored(self, requests_mock, basic_http, caplog):
+        requests_mock.post(RESUME_URL)
+        df = _integration(basic_http)
+        df.resume_bookmark(0)
+        df.resume_bookmark(1)
+        assert requests_mock.call_count == 1
+        assert "has already been resumed" in caplog.text
+
+    def test_failed_resume_can_be_repeated(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, [{"status_code": 400}, {"status_code": 200}])
+        df = _integration(basic_http)
+        with pytest.raises(requests.HTTPError):
+            df.resume_bookmark(0)
+        df.resume_bookmark(0)
+        assert requests_mock.call_count == 2
+
+    def test_default_policy(self, basic_http):
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        assert df.retry_policy.max_attempts == 5
+
+
+class TestLogRetries:
+    def test_log_message_is_retried(self, requests_mock, basic_http, caplog):
+        requests_mock.put(LOG_URL, [{"status_code": 503}, {"status_code": 200}])
+        df = _integration(basic_http)
+        df.log_msg_to_instance("Message", "Info")
+        assert requests_mock.call_count == 2
+        assert df.retry_counts == {"resume_bookmark": 0, "log_msg_to_instance": 1}
+        assert "request failed" not in caplog.text
+
+
+class TestAsyncRetries:
+    def test_resume_bookmark_is_retried(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, [{"status_code": 503}, {"status_code": 200}])
+        df = _integration(basic_http, cls=AsyncMIDataflowIntegration)
+
+        async def main():
+            async with df:
+                await df.resume_bookmark(0)
+                await df.resume_bookmark(0)
+
+        asyncio.run(main())
+        assert requests_mock.call_count == 2
+        assert df.retry_counts["resume_bookmark"] == 1
+
+    def test_exhausted_retries_raise_exception(self, requests_mock, basic_http):
+        requests_mock.put(LOG_URL, exc=requests.ConnectionError)
+        df = _integration(basic_http, cls=AsyncMIDataflowIntegration)
+
+        async def main():
+            async with df:
+                await df.log_msg_to_instance("Message", "Info")
+
+        with pytest.raises(requests.ConnectionError):
+            asyncio.run(main())
+        assert requests_mock.call_count == 3
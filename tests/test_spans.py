@@ -0,0 +1,307 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import json
+import logging
+import threading
+
+from ansys.openapi.common import ApiClientFactory
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+
+from ansys.grantami.dataflow_extensions import (
+    AsyncMIDataflowIntegration,
+    DataflowStandIn,
+    JsonFileSpanExporter,
+    MIDataflowIntegration,
+    Span,
+    SpanExporter,
+)
+from ansys.grantami.dataflow_extensions._spans import _SpanRecorder, summarize_spans
+
+RESUME_URL = f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}"
+LOG_URL = f"{HTTP_URL}/api/logs"
+
+
+class ListSpanExporter(SpanExporter):
+    def __init__(self):
+        self.exports = []
+
+    def export(self, spans, step):
+        self.exports.append((spans, step))
+
+
+class FailingSpanExporter(SpanExporter):
+    def export(self, spans, step):
+        raise RuntimeError("Export failed")
+
+
+class TimeoutLock:
+    """A lock which raises an exception instead of waiting indefinitely, so that a deadlock fails the test."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timed_out = False
+
+    def __enter__(self):
+        if not self._lock.acquire(timeout=1):
+            self.timed_out = True
+            raise RuntimeError("Lock not acquired")
+
+    def __exit__(self, *args):
+        self._lock.release()
+
+
+def _phase_names(spans):
+    return [span.name for span in spans if span.kind == "phase"]
+
+
+class TestSpanRecorder:
+    def test_span_records_phase(self):
+        recorder = _SpanRecorder(1000.0, 10.0)
+        with recorder.span("phase_name", key="value") as attributes:
+            attributes["other"] = 1
+        (span,) = recorder.spans
+        assert span.name == "phase_name"
+        assert span.kind == "phase"
+        assert span.outcome == "ok"
+        assert span.attributes == {"key": "value", "other": 1}
+        assert span.duration >= 0
+
+    def test_span_records_exception(self):
+        recorder = _SpanRecorder(1000.0, 10.0)
+        with pytest.raises(KeyError):
+            with recorder.span("phase_name"):
+                raise KeyError("key")
+        (span,) = recorder.spans
+        assert span.outcome == "error"
+        assert span.attributes == {"error": "KeyError"}
+
+    def test_start_is_converted_to_epoch_time(self):
+        recorder = _SpanRecorder(1000.0, 10.0)
+        recorder.add("call", "call", 12.5, 0.25)
+        assert recorder.spans[0].start == 1002.5
+
+    def test_summary(self):
+        spans = [
+            Span("business_logic", "phase", 3.0, 1.0, "ok", {}),
+            Span("parse_payload", "phase", 1.0, 0.002, "ok", {}),
+            Span("custom_phase", "phase", 2.0, 0.5, "ok", {}),
+            Span("log_shipping", "phase", 3.5, 0.01, "ok", {}),
+            Span("log_shipping", "phase", 3.6, 0.02, "error", {}),
+            Span("http_request", "call", 3.5, 0.01, "ok", {}),
+            Span("http_request", "call", 3.6, 0.02, "error", {}),
+        ]
+        assert summarize_spans(spans) == (
+            "Step timing: parse_payload 2.0 ms, business_logic 1000.0 ms, log_shipping 30.0 ms (2 times, 1 failed), "
+            "custom_phase 500.0 ms. 2 HTTP requests (1 failed) took 30.0 ms."
+        )
+
+    def test_repeated_spans_are_dropped_after_limit(self, caplog):
+        recorder = _SpanRecorder(1000.0, 10.0, max_spans=3)
+        for _ in range(5):
+            recorder.add("http_request", "call", 11.0, 0.1)
+        recorder.add("business_logic", "phase", 11.0, 1.0)
+        recorder.add("business_logic", "phase", 11.0, 1.0)
+        assert [span.name for span in recorder.spans] == ["http_request"] * 3 + ["business_logic"]
+        assert recorder.dropped_count == 3
+        assert caplog.text.count("Further repeated spans are dropped") == 1
+
+    def test_summary_with_dropped_spans(self):
+        assert summarize_spans([], dropped_count=2) == "Step timing: no phases recorded. 2 spans were dropped."
+
+    def test_empty_summary(self):
+        assert summarize_spans([]) == "Step timing: no phases recorded."
+
+
+class TestIntegrationSpans:
+    def test_resume_records_phases(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        requests_mock.put(LOG_URL)
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        df.log_msg_to_instance("Message", "Info")
+        df.resume_bookmark(0)
+        assert _phase_names(df.spans) == [
+            "parse_payload",
+            "initialization",
+            "log_shipping",
+            "business_logic",
+            "resume_bookmark",
+        ]
+        assert all(span.outcome == "ok" for span in df.spans)
+        business_logic = next(span for span in df.spans if span.name == "business_logic")
+        initialization = next(span for span in df.spans if span.name == "initialization")
+        assert business_logic.start == pytest.approx(initialization.start + initialization.duration)
+
+    def test_dropped_span_warning_sent_to_api_log_handler(self, requests_mock, basic_http):
+        requests_mock.put(LOG_URL)
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        df._span_recorder = _SpanRecorder(1000.0, 10.0, max_spans=3)
+        lock = TimeoutLock()
+        df._span_recorder._lock = lock
+        handler = df.get_api_log_handler()
+        logger = logging.getLogger("ansys.grantami.dataflow_extensions")
+        logger.addHandler(handler)
+        try:
+            for _ in range(5):
+                df.log_msg_to_instance("Message", "Info")
+        finally:
+            logger.removeHandler(handler)
+        assert not lock.timed_out
+        messages = [request.json()["Message"] for request in requests_mock.request_history]
+        assert any("Further repeated spans are dropped" in message for message in messages)
+
+    def test_non_zero_exit_code_is_an_error(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        df.resume_bookmark(2)
+        business_logic = next(span for span in df.spans if span.name == "business_logic")
+        assert business_logic.outcome == "error"
+        assert business_logic.attributes == {"exit_code": 2}
+
+    def test_failed_resume_is_an_error(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, status_code=400)
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        with pytest.raises(Exception):
+            df.resume_bookmark(0)
+        resume = next(span for span in df.spans if span.name == "resume_bookmark")
+        assert resume.outcome == "error"
+        assert resume.attributes == {"exit_code": 0, "error": "HTTPError"}
+
+    def test_pygranta_connection_and_requests(self, basic_http):
+        with DataflowStandIn() as stand_in:
+            workflow_url = stand_in.url
+            payload = {**basic_http.payload, "WorkflowUrl": workflow_url}
+            df = MIDataflowIntegration.from_dict_payload(payload, use_https=False)
+            df.configure_pygranta_connection(ApiClientFactory).connect()
+            df.resume_bookmark(0)
+
+        (connection,) = [span for span in df.spans if span.name == "pygranta_connection"]
+        assert connection.attributes == {"client": "ApiClientFactory"}
+        requests = [span for span in df.spans if span.kind == "call"]
+        # The Service Layer challenges the first request, which is then sent with credentials
+        assert [(span.attributes["method"], span.attributes["status_code"]) for span in requests] == [
+            ("GET", 401),
+            ("GET", 200),
+            ("POST", 200),
+        ]
+        assert [span.outcome for span in requests] == ["error", "ok", "ok"]
+        assert requests[-1].attributes["url"].startswith(workflow_url)
+        assert requests[-1].attributes["url"].endswith(f"/api/workflows/{WORKFLOW_ID}")
+        assert connection.start <= requests[0].start
+        assert requests[1].start + requests[1].duration <= connection.start + connection.duration
+
+    def test_log_span_summary(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        log_mock = requests_mock.put(LOG_URL)
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False, log_span_summary=True)
+        df.resume_bookmark(0)
+        assert log_mock.call_count == 1
+        message = log_mock.last_request.json()["Message"]
+        assert message.startswith("Step timing: parse_payload ")
+        assert "business_logic" in message
+
+    def test_failed_span_summary_does_not_prevent_resume(self, requests_mock, basic_http, caplog):
+        resume_mock = requests_mock.post(RESUME_URL)
+        requests_mock.put(LOG_URL, status_code=400)
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False, log_span_summary=True)
+        with caplog.at_level(logging.WARNING):
+            df.resume_bookmark(0)
+        assert resume_mock.call_count == 1
+        assert "Failed to log the step timing summary" in caplog.text
+
+    def test_async_integration_records_phases(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        requests_mock.put(LOG_URL)
+
+        async def step():
+            async with AsyncMIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False) as df:
+                await df.log_msg_to_instance("Message", "Info")
+                await df.resume_bookmark(0)
+            return df
+
+        df = asyncio.run(step())
+        assert _phase_names(df.spans) == [
+            "parse_payload",
+            "initialization",
+            "log_shipping",
+            "business_logic",
+            "resume_bookmark",
+        ]
+
+
+class TestSpanExport:
+    def test_exporter_receives_spans_at_resume(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL)
+        exporter = ListSpanExporter()
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False, span_exporter=exporter)
+        assert exporter.exports == []
+        df.resume_bookmark(1)
+        ((spans, step),) = exporter.exports
+        assert spans == df.spans
+        assert step["workflow_id"] == WORKFLOW_ID
+        assert step["workflow_definition_id"] == basic_http.payload["WorkflowDefinitionId"]
+        assert step["transition_name"] == basic_http.payload["TransitionName"]
+        assert step["exit_code"] == 1
+        assert step["started_at"].endswith("+00:00")
+
+    def test_failed_resume_is_not_exported(self, requests_mock, basic_http):
+        requests_mock.post(RESUME_URL, status_code=400)
+        exporter = ListSpanExporter()
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False, span_exporter=exporter)
+        with pytest.raises(Exception):
+            df.resume_bookmark(0)
+        assert exporter.exports == []
+
+    def test_failed_export_is_logged(self, requests_mock, basic_http, caplog):
+        requests_mock.post(RESUME_URL)
+        df = MIDataflowIntegration.from_dict_payload(
+            basic_http.payload, use_https=False, span_exporter=FailingSpanExporter()
+        )
+        df.resume_bookmark(0)
+        assert "Failed to export the step timing spans" in caplog.text
+
+    def test_json_file_exporter(self, requests_mock, basic_http, tmp_path):
+        requests_mock.post(RESUME_URL)
+        path = tmp_path / "spans.jsonl"
+        for exit_code in (0, 1):
+            MIDataflowIntegration.from_dict_payload(
+                basic_http.payload, use_https=False, span_exporter=path
+            ).resume_bookmark(exit_code)
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["exit_code"] for line in lines] == [0, 1]
+        assert [span["name"] for span in lines[0]["spans"]] == [
+            "parse_payload",
+            "initialization",
+            "business_logic",
+            "resume_bookmark",
+        ]
+        assert set(lines[0]["spans"][0]) == {"name", "kind", "start", "duration", "outcome", "attributes"}
+
+    def test_json_file_exporter_repr(self, tmp_path):
+        assert repr(JsonFileSpanExporter("spans.jsonl")) == "JsonFileSpanExporter(path='spans.jsonl')"
+
+    def test_base_exporter_is_abstract(self):
+        with pytest.raises(TypeError):
+            SpanExporter()
@@ -0,0 +1,215 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import ThreadPoolExecutor
+import statistics
+import time
+
+from ansys.openapi.common import ApiClientFactory
+import pytest
+import requests
+
+from ansys.grantami.dataflow_extensions import DataflowStandIn, EndpointBehavior, MIDataflowIntegration, RetryPolicy
+from ansys.grantami.dataflow_extensions.__main__ import _build_parser
+
+FAST_RETRIES = RetryPolicy(backoff_factor=0.001, jitter=False)
+
+
+def _integration(test_case, stand_in, **kwargs):
+    payload = {**test_case.payload, "WorkflowUrl": stand_in.url}
+    return MIDataflowIntegration.from_dict_payload(payload, use_https=False, **kwargs)
+
+
+class TestEndpointBehavior:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"latency": -1},
+            {"latency_sigma": -1},
+            {"retry_after": -1},
+            {"error_rate": 1.5},
+            {"disconnect_rate": -0.1},
+            {"latency_distribution": "normal"},
+        ],
+    )
+    def test_invalid_arguments_raise_exception(self, kwargs):
+        with pytest.raises(ValueError):
+            EndpointBehavior(**kwargs)
+
+    @pytest.mark.parametrize(
+        ["distribution", "expected_median"],
+        [("constant", 0.1), ("uniform", 0.1), ("exponential", 0.1 * 0.693), ("lognormal", 0.1)],
+    )
+    def test_latency_distribution(self, distribution, expected_median):
+        import random
+
+        behavior = EndpointBehavior(latency=0.1, latency_distribution=distribution)
+        rng = random.Random(1)
+        samples = [behavior.sample_latency(rng) for _ in range(5000)]
+        assert min(samples) >= 0
+        assert statistics.median(samples) == pytest.approx(expected_median, rel=0.1)
+
+    def test_zero_latency(self):
+        import random
+
+        assert EndpointBehavior(latency_distribution="lognormal").sample_latency(random.Random()) == 0
+
+    def test_repr(self):
+        assert repr(EndpointBehavior(latency=0.5)).startswith("EndpointBehavior(latency=0.5, ")
+
+
+class TestDataflowStandIn:
+    def test_requests_are_counted(self, basic_http):
+        with DataflowStandIn() as stand_in:
+            df = _integration(basic_http, stand_in)
+            df.log_msg_to_instance("Message", "Info")
+            df.resume_bookmark(0)
+            assert stand_in.request_counts == {"resume_bookmark": 1, "log_msg_to_instance": 1, "service_layer": 0}
+            assert stand_in.connection_count == 1
+
+    def test_unknown_path_returns_not_found(self):
+        with DataflowStandIn() as stand_in:
+            response = requests.post(stand_in.url + "api/unknown", json={})
+        assert response.status_code == 404
+        assert stand_in.request_counts["resume_bookmark"] == 0
+
+    def test_url_before_start_raises_exception(self):
+        with pytest.raises(RuntimeError, match="not been started"):
+            DataflowStandIn().url
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"endpoint_behaviors": {"unknown": EndpointBehavior()}},
+            {"max_connections": 0},
+            {"connection_limit_policy": "drop"},
+        ],
+    )
+    def test_invalid_arguments_raise_exception(self, kwargs):
+        with pytest.raises(ValueError):
+            DataflowStandIn(**kwargs)
+
+    def test_pygranta_client_connects_to_service_layer(self, basic_http):
+        with DataflowStandIn() as stand_in:
+            df = _integration(basic_http, stand_in)
+            client = df.configure_pygranta_connection(ApiClientFactory).connect()
+            assert client.api_url == df.service_layer_url
+            assert stand_in.request_counts["service_layer"] == 1
+
+    def test_service_layer_challenges_requests_without_credentials(self):
+        with DataflowStandIn() as stand_in:
+            service_layer_url = stand_in.url.replace("mi_dataflow", "mi_servicelayer")
+            response = requests.get(service_layer_url)
+            assert response.status_code == 401
+            assert response.headers["WWW-Authenticate"].startswith("Basic")
+            response = requests.get(service_layer_url + "api/v1alpha/schema", auth=("user", "password"))
+            assert response.status_code == 200
+            assert response.json() == {}
+
+    def test_latency_is_injected(self, basic_http):
+        behavior = EndpointBehavior(latency=0.2)
+        with DataflowStandIn(endpoint_behaviors={"log_msg_to_instance": behavior}) as stand_in:
+            df = _integration(basic_http, stand_in)
+            start = time.perf_counter()
+            df.log_msg_to_instance("Message", "Info")
+            assert time.perf_counter() - start >= 0.2
+            start = time.perf_counter()
+            df.resume_bookmark(0)
+            assert time.perf_counter() - start < 0.2
+
+    def test_latency_is_limited_by_deadline(self, basic_http):
+        with DataflowStandIn(behavior=EndpointBehavior(latency=5)) as stand_in:
+            df = _integration(basic_http, stand_in, deadline=0.5, retry_policy=RetryPolicy(max_attempts=1))
+            with pytest.raises(requests.Timeout):
+                df.log_msg_to_instance("Message", "Info")
+
+    def test_injected_errors_are_retried(self, basic_http):
+        behavior = EndpointBehavior(error_rate=0.5, error_status=429, retry_after=0)
+        with DataflowStandIn(behavior=behavior, seed=3) as stand_in:
+            df = _integration(basic_http, stand_in, retry_policy=RetryPolicy(max_attempts=20, backoff_factor=0.001))
+            for _ in range(10):
+                df.log_msg_to_instance("Message", "Info")
+            errors = stand_in.error_counts["log_msg_to_instance"]
+        assert errors > 0
+        assert df.retry_counts["log_msg_to_instance"] == errors
+
+    def test_error_response(self):
+        behavior = EndpointBehavior(error_rate=1, error_status=429, retry_after=2.5)
+        with DataflowStandIn(behavior=behavior) as stand_in:
+            response = requests.put(stand_in.url + "api/logs", json={})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2.5"
+        assert stand_in.error_counts["log_msg_to_instance"] == 1
+
+    def test_disconnects_are_retried(self, basic_http):
+        with DataflowStandIn(behavior=EndpointBehavior(disconnect_rate=0.5), seed=1) as stand_in:
+            df = _integration(basic_http, stand_in, retry_policy=RetryPolicy(max_attempts=20, backoff_factor=0.001))
+            for _ in range(10):
+                df.log_msg_to_instance("Message", "Info")
+            assert stand_in.error_counts["log_msg_to_instance"] > 0
+            assert stand_in.request_counts["log_msg_to_instance"] == 10
+
+    def test_seed_makes_errors_repeatable(self):
+        def failures(seed):
+            with (
+                DataflowStandIn(behavior=EndpointBehavior(error_rate=0.5), seed=seed) as stand_in,
+                requests.Session() as s,
+            ):
+                return [s.put(stand_in.url + "api/logs").status_code for _ in range(20)]
+
+        assert failures(7) == failures(7)
+
+    def test_connection_limit_queues_connections(self):
+        with DataflowStandIn(behavior=EndpointBehavior(latency=0.05), max_connections=2) as stand_in:
+            with ThreadPoolExecutor(6) as executor:
+                statuses = list(executor.map(lambda _: requests.put(stand_in.url + "api/logs").status_code, range(6)))
+            assert statuses == [200] * 6
+            assert stand_in.connection_count == 6
+            assert stand_in.peak_connections == 2
+
+    def test_connection_limit_rejects_connections(self):
+        with DataflowStandIn(max_connections=1, connection_limit_policy="reject") as stand_in:
+            with requests.Session() as first:
+                assert first.put(stand_in.url + "api/logs").status_code == 200
+                response = requests.put(stand_in.url + "api/logs")
+            assert response.status_code == 503
+            assert response.headers["Connection"] == "close"
+            assert stand_in.rejected_connection_count == 1
+
+    def test_command_line_arguments(self):
+        args = _build_parser().parse_args(
+            [
+                "stand-in",
+                "--port",
+                "0",
+                "--latency",
+                "0.1",
+                "--latency-distribution",
+                "lognormal",
+                "--max-connections",
+                "4",
+            ]
+        )
+        assert args.latency == 0.1
+        assert args.latency_distribution == "lognormal"
+        assert args.max_connections == 4
+        assert args.connection_limit_policy == "queue"
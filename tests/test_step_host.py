@@ -0,0 +1,422 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import contextvars
+from io import StringIO
+import json
+import logging
+from multiprocessing.connection import Client
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+
+from ansys.grantami.dataflow_extensions import (
+    ForkStepServer,
+    MIDataflowApiLogHandler,
+    MIDataflowIntegration,
+    StepHost,
+    launch_step,
+)
+from ansys.grantami.dataflow_extensions._mi_dataflow import _step_input, _StepInput
+from ansys.grantami.dataflow_extensions._step_host import _running_step
+
+AUTHKEY = b"test secret"
+
+
+@pytest.fixture
+def step_host():
+    host = StepHost(authkey=AUTHKEY, address=("localhost", 0), preload_modules=[])
+    thread = threading.Thread(target=host.serve_forever, daemon=True)
+    thread.start()
+    assert host.wait_until_ready(timeout=5)
+    yield host
+    host.shutdown()
+    thread.join(timeout=5)
+
+
+def _launch(monkeypatch, payload, step_name, address, **kwargs):
+    monkeypatch.setattr(sys, "stdin", StringIO(json.dumps(payload)))
+    return launch_step(step_name, authkey=AUTHKEY, address=address, **kwargs)
+
+
+def test_step_runs_in_host(step_host, basic_http, requests_mock, monkeypatch, capsys):
+    requests_mock.post(f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}")
+    host_thread = threading.get_ident()
+    step_threads = []
+
+    def step():
+        step_threads.append(threading.get_ident())
+        df = MIDataflowIntegration(use_https=False)
+        print(f"Transition: {df._df_data['TransitionName']}")
+        print("Step warning", file=sys.stderr)
+        df.resume_bookmark(0)
+        return 3
+
+    step_host.register("my_step", step)
+    exit_code = _launch(monkeypatch, basic_http.payload, "my_step", step_host.address)
+
+    assert exit_code == 3
+    assert step_threads and step_threads[0] != host_thread
+    captured = capsys.readouterr()
+    assert f"Transition: {basic_http.payload['TransitionName']}" in captured.out
+    assert "Step warning" in captured.err
+    assert requests_mock.call_count == 1
+
+
+def test_supporting_files_dir_is_forwarded(step_host, basic_http, monkeypatch, tmp_path):
+    supporting_files_dirs = []
+
+    def step():
+        supporting_files_dirs.append(MIDataflowIntegration(use_https=False).supporting_files_dir)
+
+    step_host.register("my_step", step)
+    monkeypatch.setattr(sys, "path", [str(tmp_path)] + sys.path[1:])
+    exit_code = _launch(monkeypatch, basic_http.payload, "my_step", step_host.address)
+
+    assert exit_code == 0
+    assert supporting_files_dirs == [Path(tmp_path)]
+
+
+def test_concurrent_steps_are_isolated(step_host, basic_http, monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def step():
+        df = MIDataflowIntegration(use_https=False)
+        barrier.wait()
+        print(df._df_data["WorkflowId"])
+
+    step_host.register("my_step", step)
+    results = {}
+
+    def launch(workflow_id):
+        payload = dict(basic_http.payload, WorkflowId=workflow_id)
+        # Each launcher thread needs its own stdin and stdout, so send the request directly instead of using
+        # launch_step
+        request = {"step": "my_step", "payload": json.dumps(payload), "supporting_files_dir": sys.path[0]}
+        with Client(step_host.address, authkey=AUTHKEY) as connection:
+            connection.send(request)
+            results[workflow_id] = connection.recv()
+
+    threads = [threading.Thread(target=launch, args=(workflow_id,)) for workflow_id in ("first", "second")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert results["first"]["stdout"] == "first\n"
+    assert results["second"]["stdout"] == "second\n"
+
+
+def test_exception_returns_failure(step_host, basic_http, monkeypatch, capsys):
+    def step():
+        raise RuntimeError("Business logic failed")
+
+    step_host.register("my_step", step)
+    exit_code = _launch(monkeypatch, basic_http.payload, "my_step", step_host.address)
+
+    assert exit_code == 1
+    assert "RuntimeError: Business logic failed" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(["code", "expected"], [(None, 0), (4, 4), ("Error message", 1)])
+def test_system_exit(step_host, basic_http, monkeypatch, code, expected):
+    def step():
+        sys.exit(code)
+
+    step_host.register("my_step", step)
+    assert _launch(monkeypatch, basic_http.payload, "my_step", step_host.address) == expected
+
+
+def test_handlers_added_by_step_are_removed(step_host, basic_http, monkeypatch):
+    root_logger = logging.getLogger()
+    handlers_before = list(root_logger.handlers)
+
+    def step():
+        root_logger.addHandler(logging.StreamHandler())
+
+    step_host.register("my_step", step)
+    _launch(monkeypatch, basic_http.payload, "my_step", step_host.address)
+
+    assert root_logger.handlers == handlers_before
+
+
+class ListApiLogHandler(MIDataflowApiLogHandler):
+    def __init__(self, callback):
+        super().__init__(callback)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _api_log_handler(step_logger):
+    handler = MIDataflowIntegration(use_https=False).get_api_log_handler(ListApiLogHandler)
+    step_logger.addHandler(handler)
+    return handler
+
+
+def test_concurrent_steps_have_isolated_log_handlers(basic_http):
+    step_logger = logging.getLogger("concurrent_steps_api_logger")
+    step_logger.setLevel(logging.INFO)
+    logged = threading.Barrier(2, timeout=5)
+    a_finished = threading.Event()
+    handlers = {}
+    handlers_after_a_finished = []
+
+    def step(name):
+        with _running_step(_StepInput(basic_http.payload, Path.cwd())):
+            handlers[name] = _api_log_handler(step_logger)
+            logged.wait()
+            step_logger.info("%s secret", name)
+            logged.wait()
+            if name == "B":
+                assert a_finished.wait(timeout=5)
+                handlers_after_a_finished.extend(step_logger.handlers)
+                step_logger.info("B after A finished")
+        if name == "A":
+            a_finished.set()
+
+    threads = [threading.Thread(target=step, args=(name,)) for name in "AB"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert handlers["A"].messages == ["A secret"]
+    assert handlers["B"].messages == ["B secret", "B after A finished"]
+    assert handlers_after_a_finished == [handlers["B"]]
+    assert step_logger.handlers == []
+    assert handlers["A"].filters == handlers["B"].filters == []
+
+
+def test_records_from_other_threads_reach_only_running_step(basic_http):
+    step_logger = logging.getLogger("single_step_api_logger")
+    step_logger.setLevel(logging.INFO)
+    with _running_step(_StepInput(basic_http.payload, Path.cwd())):
+        handler = _api_log_handler(step_logger)
+        thread = threading.Thread(target=step_logger.info, args=("From worker thread",))
+        thread.start()
+        thread.join()
+    step_logger.info("After step")
+    assert handler.messages == ["From worker thread"]
+
+
+def test_records_from_copied_context_reach_step(basic_http):
+    step_logger = logging.getLogger("copied_context_api_logger")
+    step_logger.setLevel(logging.INFO)
+    other_step_running = threading.Event()
+    other_step_finished = threading.Event()
+
+    def other_step():
+        with _running_step(_StepInput(basic_http.payload, Path.cwd())):
+            other_step_running.set()
+            assert other_step_finished.wait(timeout=5)
+
+    other_thread = threading.Thread(target=other_step)
+    other_thread.start()
+    assert other_step_running.wait(timeout=5)
+    try:
+        with _running_step(_StepInput(basic_http.payload, Path.cwd())):
+            handler = _api_log_handler(step_logger)
+            threads = [
+                threading.Thread(target=contextvars.copy_context().run, args=(step_logger.info, "Copied context")),
+                threading.Thread(target=step_logger.info, args=("New context",)),
+            ]
+            for thread in threads:
+                thread.start()
+                thread.join()
+    finally:
+        other_step_finished.set()
+        other_thread.join(timeout=5)
+    assert handler.messages == ["Copied context"]
+
+
+def test_watchdog_records_reach_step(basic_http, requests_mock):
+    requests_mock.post(f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}")
+    package_logger = logging.getLogger("ansys.grantami.dataflow_extensions")
+    other_step_finished = threading.Event()
+
+    def other_step():
+        with _running_step(_StepInput(basic_http.payload, Path.cwd())):
+            assert other_step_finished.wait(timeout=5)
+
+    other_thread = threading.Thread(target=other_step)
+    other_thread.start()
+    try:
+        with _running_step(_StepInput(basic_http.payload, Path.cwd())):
+            df = MIDataflowIntegration(use_https=False, deadline=0.05)
+            handler = df.get_api_log_handler(ListApiLogHandler)
+            package_logger.addHandler(handler)
+            df._watchdog.join(timeout=5)
+    finally:
+        other_step_finished.set()
+        other_thread.join(timeout=5)
+    assert any("Step deadline exceeded" in message for message in handler.messages)
+
+
+def test_handlers_are_restored_when_no_step_is_running(basic_http):
+    root_logger = logging.getLogger()
+    handlers_before = list(root_logger.handlers)
+    a_handler = logging.NullHandler()
+    b_finished = threading.Event()
+    handlers_after_b_finished = []
+
+    def step_b():
+        with _running_step(_StepInput(basic_http.payload, Path.cwd())):
+            pass
+        b_finished.set()
+
+    with _running_step(_StepInput(basic_http.payload, Path.cwd())):
+        root_logger.addHandler(a_handler)
+        thread = threading.Thread(target=step_b)
+        thread.start()
+        assert b_finished.wait(timeout=5)
+        handlers_after_b_finished.extend(root_logger.handlers)
+    thread.join(timeout=5)
+    assert a_handler in handlers_after_b_finished
+    assert root_logger.handlers == handlers_before
+
+
+def test_unauthenticated_connection_is_ignored(step_host, basic_http, monkeypatch):
+    socket.create_connection(step_host.address).close()
+    with pytest.raises(Exception):
+        Client(step_host.address, authkey=b"wrong secret")
+
+    step_host.register("my_step", lambda: 6)
+    assert _launch(monkeypatch, basic_http.payload, "my_step", step_host.address) == 6
+
+
+def test_unknown_step(step_host, basic_http, monkeypatch, capsys):
+    exit_code = _launch(monkeypatch, basic_http.payload, "missing_step", step_host.address)
+    assert exit_code == 1
+    assert 'Step "missing_step" is not registered' in capsys.readouterr().err
+
+
+def test_fallback_when_host_not_running(basic_http, monkeypatch, unused_address):
+    workflow_ids = []
+
+    def step():
+        workflow_ids.append(MIDataflowIntegration(use_https=False)._df_data["WorkflowId"])
+        return 2
+
+    exit_code = _launch(monkeypatch, basic_http.payload, "my_step", unused_address, fallback=step)
+
+    assert exit_code == 2
+    assert workflow_ids == [WORKFLOW_ID]
+
+
+def test_fallback_does_not_leak_payload(basic_http, monkeypatch, unused_address):
+    _launch(monkeypatch, basic_http.payload, "my_step", unused_address, fallback=lambda: 0)
+    assert _step_input.get() is None
+
+
+def test_no_fallback_when_host_not_running_raises_exception(basic_http, monkeypatch, unused_address):
+    with pytest.raises(ConnectionRefusedError):
+        _launch(monkeypatch, basic_http.payload, "my_step", unused_address)
+
+
+@pytest.fixture
+def unused_address():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()
+
+
+STEP_MODULE = """
+import os
+from ansys.grantami.dataflow_extensions import MIDataflowIntegration
+
+STATE = []
+
+
+def main():
+    df = MIDataflowIntegration(use_https=False)
+    STATE.append(df._df_data["WorkflowId"])
+    print(df._df_data["WorkflowId"], os.getpid(), len(STATE))
+    return 5
+"""
+
+
+@pytest.fixture
+def fork_server(tmp_path, unused_address):
+    (tmp_path / "fork_server_steps.py").write_text(textwrap.dedent(STEP_MODULE))
+    authkey_file = tmp_path / "authkey"
+    authkey_file.write_bytes(AUTHKEY)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "ansys.grantami.dataflow_extensions",
+            "fork-server",
+            "--port",
+            str(unused_address[1]),
+            "--authkey-file",
+            str(authkey_file),
+            "--path",
+            str(tmp_path),
+            "--step",
+            "my_step=fork_server_steps:main",
+        ],
+    )
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            Client(unused_address, authkey=AUTHKEY).close()
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                pytest.fail("Fork server did not start")
+            time.sleep(0.05)
+    yield process, unused_address
+    process.terminate()
+    process.wait(timeout=10)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork is not available on this platform")
+def test_fork_server_runs_each_step_in_a_new_child(fork_server, basic_http, monkeypatch, capsys):
+    process, address = fork_server
+    outputs = []
+    for workflow_id in ("first", "second"):
+        payload = dict(basic_http.payload, WorkflowId=workflow_id)
+        assert _launch(monkeypatch, payload, "my_step", address) == 5
+        outputs.append(capsys.readouterr().out.split())
+
+    (first_id, first_pid, first_count), (second_id, second_pid, second_count) = outputs
+    assert (first_id, second_id) == ("first", "second")
+    assert len({first_pid, second_pid, str(process.pid)}) == 3
+    # Module state modified by a step is not visible to the next step
+    assert first_count == second_count == "1"
+
+
+@pytest.mark.skipif(hasattr(os, "fork"), reason="os.fork is available on this platform")
+def test_fork_server_not_supported():
+    with pytest.raises(NotImplementedError, match="os.fork"):
+        ForkStepServer(authkey=AUTHKEY)
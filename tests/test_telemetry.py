@@ -0,0 +1,240 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import json
+import time
+
+from common import HTTP_URL, WORKFLOW_ID
+import pytest
+
+from ansys.grantami.dataflow_extensions import (
+    DataflowStandIn,
+    MIDataflowIntegration,
+    StepTelemetry,
+    TelemetryStore,
+)
+from ansys.grantami.dataflow_extensions.__main__ import _time_argument, main
+from ansys.grantami.dataflow_extensions._telemetry import Regression, _step_telemetry, peak_memory
+
+RESUME_URL = f"{HTTP_URL}/api/workflows/{WORKFLOW_ID}"
+DAY = 86400
+
+
+def _telemetry(total_duration, started_at=1000.0, transition_name="Step", exit_code="0", definition="definition"):
+    return StepTelemetry(
+        workflow_id="workflow",
+        workflow_definition_id=definition,
+        transition_name=transition_name,
+        started_at=started_at,
+        exit_code=exit_code,
+        total_duration=total_duration,
+        phase_durations={"business_logic": total_duration / 2},
+        http_request_count=2,
+        http_error_count=0,
+        http_duration=0.01,
+        peak_memory=1024,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TelemetryStore(tmp_path / "telemetry.db")
+
+
+@pytest.fixture
+def regressed_store(store):
+    now = time.time()
+    for i in range(10):
+        store.add(_telemetry(1.0, started_at=now - 10 * DAY + i, transition_name="Slower"))
+        store.add(_telemetry(1.6, started_at=now - DAY + i, transition_name="Slower"))
+        store.add(_telemetry(1.0, started_at=now - 10 * DAY + i, transition_name="Unchanged"))
+        store.add(_telemetry(1.05, started_at=now - DAY + i, transition_name="Unchanged"))
+    return store
+
+
+class TestTelemetryStore:
+    def test_add_and_read_steps(self, store):
+        telemetry = _telemetry(2.0)
+        store.add(telemetry)
+        assert store.steps() == [telemetry]
+
+    def test_filter_steps(self, store):
+        for started_at, transition_name in [(100, "A"), (200, "B"), (300, "A")]:
+            store.add(_telemetry(1.0, started_at=started_at, transition_name=transition_name))
+        assert [step.started_at for step in store.steps(transition_name="A")] == [100, 300]
+        assert [step.started_at for step in store.steps(since=200)] == [200, 300]
+        assert [step.started_at for step in store.steps(until=datetime.fromtimestamp(200, timezone.utc))] == [100]
+        assert store.steps(workflow_definition_id="other") == []
+
+    def test_percentiles(self, store):
+        for i in range(1, 101):
+            store.add(_telemetry(i / 100, transition_name="Slow", exit_code="0" if i % 10 else "1"))
+            store.add(_telemetry(i / 1000, transition_name="Fast"))
+        slow, fast = store.percentiles()
+        assert (slow.transition_name, slow.steps, slow.failures) == ("Slow", 100, 10)
+        assert slow.p50 == pytest.approx(0.505)
+        assert slow.p95 == pytest.approx(0.9505)
+        assert slow.p99 == pytest.approx(0.9901)
+        assert (fast.transition_name, fast.metric) == ("Fast", "total_duration")
+
+    def test_phase_percentiles(self, store):
+        store.add(_telemetry(2.0))
+        (summary,) = store.percentiles("business_logic")
+        assert summary.p50 == 1.0
+        assert store.percentiles("scripting_toolkit_session") == []
+
+    def test_invalid_metric_raises_exception(self, store):
+        with pytest.raises(ValueError, match="metric"):
+            store.percentiles("steps; DROP TABLE steps")
+
+    def test_find_regressions(self, regressed_store):
+        now = time.time()
+        (regression,) = regressed_store.find_regressions((now - 14 * DAY, now - 7 * DAY), (now - 7 * DAY, None))
+        assert regression.transition_name == "Slower"
+        assert regression.change == pytest.approx(0.6)
+        assert (regression.baseline_steps, regression.current_steps) == (10, 10)
+
+    def test_find_regressions_threshold_and_minimum_steps(self, regressed_store):
+        now = time.time()
+        baseline, current = (None, now - 7 * DAY), (now - 7 * DAY, None)
+        assert len(regressed_store.find_regressions(baseline, current, threshold=0.01)) == 2
+        assert regressed_store.find_regressions(baseline, current, min_steps=11) == []
+
+    def test_find_regressions_ignores_zero_metric(self, regressed_store):
+        now = time.time()
+        baseline, current = (None, now - 7 * DAY), (now - 7 * DAY, None)
+        assert regressed_store.find_regressions(baseline, current, metric="scripting_toolkit_session") == []
+
+    def test_unknown_exit_code_is_not_a_failure(self, store):
+        store.add(_telemetry(1.0, exit_code=None))
+        store.add(_telemetry(1.0, exit_code="1"))
+        step = store.steps()[0]
+        assert step.exit_code is None
+        assert not step.failed
+        (summary,) = store.percentiles()
+        assert (summary.steps, summary.failures) == (2, 1)
+
+    def test_invalid_percentile_raises_exception(self, store):
+        with pytest.raises(ValueError, match="percentile"):
+            store.find_regressions((None, None), (None, None), percentile=101)
+
+    def test_concurrent_writes(self, store):
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda i: store.add(_telemetry(i)), range(20)))
+        assert len(store.steps()) == 20
+
+    def test_repr(self):
+        assert repr(TelemetryStore("telemetry.db")) == "TelemetryStore(path='telemetry.db')"
+
+
+def test_peak_memory():
+    assert peak_memory() > 1024**2
+
+
+class TestIntegrationTelemetry:
+    def test_resume_adds_step(self, basic_http, tmp_path):
+        path = tmp_path / "telemetry.db"
+        with DataflowStandIn() as stand_in:
+            payload = {**basic_http.payload, "WorkflowUrl": stand_in.url}
+            df = MIDataflowIntegration.from_dict_payload(payload, use_https=False, telemetry_store=path)
+            df.log_msg_to_instance("Message", "Info")
+            df.resume_bookmark(3)
+
+        (step,) = TelemetryStore(path).steps()
+        assert step.workflow_id == WORKFLOW_ID
+        assert step.workflow_definition_id == basic_http.payload["WorkflowDefinitionId"]
+        assert step.transition_name == basic_http.payload["TransitionName"]
+        assert step.exit_code == "3"
+        assert step.failed
+        assert set(step.phase_durations) == {
+            "parse_payload",
+            "initialization",
+            "log_shipping",
+            "business_logic",
+            "resume_bookmark",
+        }
+        assert step.total_duration >= sum(step.phase_durations[name] for name in ("initialization", "business_logic"))
+        assert (step.http_request_count, step.http_error_count) == (2, 0)
+        assert step.peak_memory > 0
+
+    def test_failed_telemetry_is_logged(self, requests_mock, basic_http, tmp_path, caplog):
+        requests_mock.post(RESUME_URL)
+        path = tmp_path / "missing" / "telemetry.db"
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False, telemetry_store=path)
+        df.resume_bookmark(0)
+        assert "Failed to record the step telemetry" in caplog.text
+
+
+class TestTelemetryCommands:
+    def test_report(self, store, capsys):
+        store.add(_telemetry(0.5))
+        assert main(["telemetry-report", str(store.path)]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].split() == ["workflow", "definition", "transition", "steps", "failures"] + [
+            f"p{percentile}_ms" for percentile in (50, 95, 99)
+        ]
+        assert lines[1].split() == ["definition", "Step", "1", "0", "500.0", "500.0", "500.0"]
+
+    def test_report_json(self, store, capsys):
+        store.add(_telemetry(0.5))
+        assert main(["telemetry-report", str(store.path), "--metric", "peak_memory", "--json"]) == 0
+        (summary,) = json.loads(capsys.readouterr().out)
+        assert summary["p50"] == 1024
+
+    def test_compare(self, regressed_store, capsys):
+        assert main(["telemetry-compare", str(regressed_store.path)]) == 1
+        (line,) = capsys.readouterr().out.splitlines()
+        assert line.startswith("definition Slower: p95 total_duration 1000.0 ms -> 1600.0 ms (+60%, 10 -> 10 steps)")
+
+    def test_compare_without_regressions(self, regressed_store, capsys):
+        assert main(["telemetry-compare", str(regressed_store.path), "--window", "1d"]) == 0
+        assert capsys.readouterr().out.startswith("No transitions regressed")
+
+
+@pytest.mark.parametrize(
+    ["value", "expected_age"],
+    [("30s", 30), ("15m", 900), ("12h", 43200), ("7d", 7 * DAY), ("2w", 14 * DAY)],
+)
+def test_relative_time_argument(value, expected_age):
+    assert time.time() - _time_argument(value) == pytest.approx(expected_age, abs=5)
+
+
+def test_iso_time_argument():
+    assert _time_argument("2026-01-31T12:00:00+00:00") == datetime(2026, 1, 31, 12, tzinfo=timezone.utc).timestamp()
+
+
+def test_invalid_time_argument():
+    with pytest.raises(argparse.ArgumentTypeError):
+        _time_argument("yesterday")
+
+
+def test_regression_change_without_baseline():
+    assert Regression("definition", "Step", "http_duration", 95, 0.0, 0.0, 5, 5).change == 0.0
+    assert Regression("definition", "Step", "http_duration", 95, 0.0, 1.0, 5, 5).change == float("inf")
+
+
+def test_step_telemetry_without_exit_code():
+    telemetry = _step_telemetry([], {"workflow_id": "workflow"}, 1000.0, 1.0, None)
+    assert telemetry.exit_code is None
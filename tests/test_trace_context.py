@@ -0,0 +1,134 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import hashlib
+import json
+import re
+
+from ansys.openapi.common import ApiClientFactory
+from common import WORKFLOW_ID
+import pytest
+
+from ansys.grantami.dataflow_extensions import (
+    DataflowStandIn,
+    JsonFileSpanExporter,
+    MIDataflowIntegration,
+    TelemetryStore,
+    TraceContext,
+)
+from ansys.grantami.dataflow_extensions._trace_context import TRACEPARENT_HEADER
+
+
+class TestTraceContext:
+    def test_trace_id_from_guid(self):
+        context = TraceContext.from_workflow_id("{3F2504E0-4F89-11D3-9A0C-0305E82C3301}")
+        assert context.trace_id == "3f2504e04f8911d39a0c0305e82c3301"
+        assert re.fullmatch(r"[0-9a-f]{16}", context.span_id)
+        assert context.sampled
+
+    def test_trace_id_from_other_id(self):
+        context = TraceContext.from_workflow_id("workflow-1")
+        assert context.trace_id == hashlib.sha256(b"workflow-1").hexdigest()[:32]
+
+    def test_zero_guid_is_hashed(self):
+        context = TraceContext.from_workflow_id("00000000-0000-0000-0000-000000000000")
+        assert context.trace_id != "0" * 32
+
+    def test_trace_id_without_workflow_id_is_random(self):
+        first, second = TraceContext.from_workflow_id(None), TraceContext.from_workflow_id(None)
+        assert re.fullmatch(r"[0-9a-f]{32}", first.trace_id)
+        assert first.trace_id != second.trace_id
+
+    def test_span_ids_differ(self):
+        assert TraceContext.from_workflow_id(WORKFLOW_ID).span_id != TraceContext.from_workflow_id(WORKFLOW_ID).span_id
+
+    def test_traceparent(self):
+        context = TraceContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")
+        assert context.traceparent == "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+        assert context._replace(sampled=False).traceparent.endswith("-00")
+
+    def test_traceparent_round_trip(self):
+        context = TraceContext.from_workflow_id(WORKFLOW_ID)
+        assert TraceContext.from_traceparent(context.traceparent) == context
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "",
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7",
+            "00-00000000000000000000000000000000-00f067aa0ba902b7-01",
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01",
+            "ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+            "00-4BF92F3577B34DA6A3CE929D0E0E4736-00f067aa0ba902b7-01",
+        ],
+    )
+    def test_invalid_traceparent_raises_exception(self, value):
+        with pytest.raises(ValueError, match="traceparent"):
+            TraceContext.from_traceparent(value)
+
+
+class TestIntegrationTraceContext:
+    def _run_step(self, payload, **kwargs):
+        records = []
+        with DataflowStandIn() as stand_in:
+            payload = {**payload, "WorkflowUrl": stand_in.url}
+            df = MIDataflowIntegration.from_dict_payload(payload, use_https=False, **kwargs)
+            df._transport.add_request_observer(records.append)
+            df.configure_pygranta_connection(ApiClientFactory).connect()
+            df.log_msg_to_instance("Message", "Info")
+            df.resume_bookmark(0)
+        return df, records
+
+    def test_trace_context_is_derived_from_workflow_id(self, basic_http):
+        df = MIDataflowIntegration.from_dict_payload(basic_http.payload, use_https=False)
+        assert df.trace_context.trace_id == TraceContext.from_workflow_id(WORKFLOW_ID).trace_id
+
+    def test_payload_without_workflow_id(self, basic_http):
+        payload = {key: value for key, value in basic_http.payload.items() if key != "WorkflowId"}
+        df = MIDataflowIntegration.from_dict_payload(payload, use_https=False)
+        assert re.fullmatch(r"[0-9a-f]{32}", df.trace_context.trace_id)
+        assert df.trace_context.traceparent.startswith(f"00-{df.trace_context.trace_id}-")
+
+    def test_header_is_sent(self, basic_http):
+        df, records = self._run_step(basic_http.payload)
+        urls = [record.request.url for record in records]
+        assert any("/api/logs" in url for url in urls)
+        assert any("/api/workflows/" in url for url in urls)
+        assert any("/mi_servicelayer" in url for url in urls)
+        assert {record.request.headers[TRACEPARENT_HEADER] for record in records} == {df.trace_context.traceparent}
+
+    def test_header_is_not_sent_when_disabled(self, basic_http):
+        _, records = self._run_step(basic_http.payload, propagate_trace_context=False)
+        assert records
+        assert all(TRACEPARENT_HEADER not in record.request.headers for record in records)
+
+    def test_trace_id_is_exported(self, basic_http, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        df, _ = self._run_step(basic_http.payload, span_exporter=JsonFileSpanExporter(path))
+        (exported,) = [json.loads(line) for line in path.read_text().splitlines()]
+        assert exported["trace_id"] == df.trace_context.trace_id
+        assert exported["span_id"] == df.trace_context.span_id
+
+    def test_trace_id_is_stored(self, basic_http, tmp_path):
+        store = TelemetryStore(tmp_path / "telemetry.db")
+        df, _ = self._run_step(basic_http.payload, telemetry_store=store)
+        (step,) = store.steps()
+        assert step.trace_id == df.trace_context.trace_id
@@ -0,0 +1,232 @@
+# Copyright (C) 2025 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from unittest.mock import MagicMock
+
+from ansys.openapi.common import ApiClientFactory, OIDCSessionBuilder, SessionConfiguration
+from common import PASSWORD, USERNAME
+import pytest
+import requests
+
+from ansys.grantami.dataflow_extensions import MIDataflowIntegration, TransportConfiguration
+from ansys.grantami.dataflow_extensions._transport import _HttpTransport, get_client_session
+
+
+class _RenamedSessionFactory(ApiClientFactory):
+    # Simulates a version of ansys-openapi-common which stores the session in a different attribute
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requests_session = self.__dict__.pop("_session")
+
+    def with_credentials(self, username, password, domain=None):
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connection_count += 1
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.server.request_headers.append(dict(self.headers))
+        if "Authorization" in self.headers:
+            self.send_response(200)
+        else:
+            self.send_response(401)
+            self.send_header("WWW-Authenticate", 'Basic realm="Granta MI"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):  # noqa: N802
+        self._respond()
+
+    def do_POST(self):  # noqa: N802
+        self._respond()
+
+    def do_PUT(self):  # noqa: N802
+        self._respond()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("localhost", 0), _Handler)
+    server.connection_count = 0
+    server.request_headers = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def local_basic_http(basic_http, server):
+    host, port = server.server_address[:2]
+    basic_http.payload["WorkflowUrl"] = f"http://{host}:{port}/mi_dataflow"
+    return basic_http
+
+
+def _integration(test_case, **kwargs):
+    return MIDataflowIntegration.from_dict_payload(test_case.payload, use_https=False, **kwargs)
+
+
+class TestTransportConfiguration:
+    @pytest.mark.parametrize("name", ["pool_connections", "pool_maxsize"])
+    def test_invalid_pool_size_raises_exception(self, name):
+        with pytest.raises(ValueError, match=name):
+            TransportConfiguration(**{name: 0})
+
+    def test_repr(self):
+        assert repr(TransportConfiguration(pool_maxsize=20)) == (
+            "TransportConfiguration(pool_connections=4, pool_maxsize=20, pool_block=False, keep_alive=True, gzip=True)"
+        )
+
+
+class TestSharedTransport:
+    def test_api_session_reuses_connection(self, local_basic_http, server):
+        df = _integration(local_basic_http)
+        df.log_msg_to_instance("First", "Info")
+        df.log_msg_to_instance("Second", "Info")
+        assert server.connection_count == 1
+
+    def test_keep_alive_disabled_opens_new_connections(self, local_basic_http, server):
+        df = _integration(local_basic_http, transport_configuration=TransportConfiguration(keep_alive=False))
+        df.log_msg_to_instance("First", "Info")
+        df.log_msg_to_instance("Second", "Info")
+        assert server.connection_count == 2
+        assert server.request_headers[0]["Connection"] == "close"
+
+    @pytest.mark.parametrize(["gzip", "accept_encoding"], [(True, "gzip, deflate"), (False, "identity")])
+    def test_accept_encoding(self, local_basic_http, server, gzip, accept_encoding):
+        df = _integration(local_basic_http, transport_configuration=TransportConfiguration(gzip=gzip))
+        df.log_msg_to_instance("Message", "Info")
+        assert server.request_headers[0]["Accept-Encoding"] == accept_encoding
+
+    def test_pygranta_connection_shares_connection_pool(self, local_basic_http, server):
+        df = _integration(local_basic_http)
+        connection = df.configure_pygranta_connection(ApiClientFactory)
+        df.log_msg_to_instance("Message", "Info")
+
+        pygranta_adapter = connection._session.get_adapter(df.service_layer_url)
+        api_adapter = df._api_session.get_adapter(df.service_layer_url)
+        assert pygranta_adapter.poolmanager is api_adapter.poolmanager
+        assert server.connection_count == 1
+        assert server.request_headers[-1]["Authorization"] == requests.auth._basic_auth_str(USERNAME, PASSWORD)
+
+    def test_pygranta_connection_keeps_timeout_and_retries(self, local_basic_http):
+        df = _integration(local_basic_http)
+        configuration = SessionConfiguration(request_timeout=50, retry_count=5)
+        connection = df.configure_pygranta_connection(ApiClientFactory, configuration)
+        adapter = connection._session.get_adapter(df.service_layer_url)
+        assert adapter.timeout == 50
+        assert adapter.max_retries.total == 5
+
+    def test_pygranta_connection_without_session_attribute(self, local_basic_http, caplog):
+        df = _integration(local_basic_http)
+        connection = df.configure_pygranta_connection(_RenamedSessionFactory)
+        assert isinstance(connection, _RenamedSessionFactory)
+        assert "Could not find the session of _RenamedSessionFactory" in caplog.text
+        pygranta_adapter = connection._requests_session.get_adapter(df.service_layer_url)
+        api_adapter = df._api_session.get_adapter(df.service_layer_url)
+        assert pygranta_adapter.poolmanager is not api_adapter.poolmanager
+
+    def test_closing_session_does_not_close_shared_pool(self, local_basic_http, server):
+        df = _integration(local_basic_http)
+        connection = df.configure_pygranta_connection(ApiClientFactory)
+        connection._session.close()
+        df.log_msg_to_instance("Message", "Info")
+        assert server.connection_count == 1
+
+    def test_request_observers_are_notified(self, local_basic_http):
+        df = _integration(local_basic_http)
+        observed = []
+        df._transport.add_request_observer(observed.append)
+        df.log_msg_to_instance("First", "Info")
+        df.log_msg_to_instance("Second", "Info")
+        assert [record.response.status_code for record in observed] == [200, 200]
+        assert [record.new_connection for record in observed] == [True, False]
+        assert observed[0].bytes_sent == len(observed[0].request.body)
+        assert observed[0].bytes_received == 0
+
+    def test_request_observer_exceptions_are_logged(self, local_basic_http, caplog):
+        def observer(record):
+            raise RuntimeError("Observer failed")
+
+        df = _integration(local_basic_http)
+        df._transport.add_request_observer(observer)
+        df.log_msg_to_instance("Message", "Info")
+        assert "RuntimeError: Observer failed" in caplog.text
+
+
+class TestOpenApiCommonPrivateAttributes:
+    # configure_pygranta_connection relies on these private attributes of ansys-openapi-common. If these tests fail,
+    # update get_client_session for the new version.
+    def test_client_factory_session(self):
+        factory = ApiClientFactory("http://my_server_name/mi_servicelayer")
+        assert isinstance(factory._session, requests.Session)
+        assert get_client_session(factory) is factory._session
+
+    def test_oidc_access_token_replaces_session(self):
+        factory = ApiClientFactory("http://my_server_name/mi_servicelayer")
+        session = requests.Session()
+        session_factory = MagicMock()
+        session_factory.get_session_with_access_token.return_value = session
+        result = OIDCSessionBuilder(factory, session_factory).with_access_token(access_token="token")
+        assert get_client_session(result) is session
+
+    def test_missing_session_logs_warning(self, caplog):
+        assert get_client_session(object()) is None
+        assert "Could not find the session of object" in caplog.text
+
+
+class TestSslContext:
+    @pytest.fixture
+    def https_request(self):
+        return requests.Request("GET", "https://my_server_name/mi_servicelayer").prepare()
+
+    def test_ssl_context_is_created_once(self):
+        transport = _HttpTransport(TransportConfiguration(), verify=True)
+        assert transport.ssl_context is transport.ssl_context
+
+    def test_verified_requests_use_shared_ssl_context(self, https_request):
+        transport = _HttpTransport(TransportConfiguration(), verify=True)
+        adapter = transport.create_adapter()
+        _, pool_kwargs = adapter.build_connection_pool_key_attributes(https_request, verify=True)
+        assert pool_kwargs["ssl_context"] is transport.ssl_context
+        assert "ca_certs" not in pool_kwargs
+
+    def test_unverified_requests_do_not_use_ssl_context(self, https_request):
+        transport = _HttpTransport(TransportConfiguration(), verify=False)
+        adapter = transport.create_adapter()
+        _, pool_kwargs = adapter.build_connection_pool_key_attributes(https_request, verify=False)
+        assert transport.ssl_context is None
+        assert "ssl_context" not in pool_kwargs
+        assert pool_kwargs["cert_reqs"] == "CERT_NONE"